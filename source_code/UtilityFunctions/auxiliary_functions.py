@@ -1,9 +1,18 @@
 import numpy as np
 from openpyxl import load_workbook
+import os
 import pandas as pd
+from scipy.sparse import csr_matrix
 import warnings
 import bisect
 
+# Data read by function read_interp_file, with keys (path, sheet, action, \
+# INTIAL); each value stores also the modification time of the file.
+_interp_file_cache = dict()
+# Sparse operators of the space interpolation built by function \
+# get_space_operator, with keys (conductor, component, square_wave, xvec).
+_space_operator_cache = dict()
+
 
 def check_repeated_headings(input_file, sheet):
     """[summary]
@@ -38,33 +47,22 @@ def check_repeated_headings(input_file, sheet):
 # End fuction check_repeated_headings.
 
 
-def check_headers(cond, path_input, path_operation, sheet_input, sheet_operation):
+def check_headers(cond, dict_sheets, sheet_input, sheet_operation):
     """[summary]
 
     Args:
         cond ([type]): [description]
-        path_input ([type]): [description]
-        path_operation ([type]): [description]
+        dict_sheets ([type]): [description]
         sheet_input ([type]): [description]
         sheet_operation ([type]): [description]
 
     Raises:
         SyntaxError: [description]
     """
-    header_input = list(
-        pd.read_excel(
-            path_input, sheet_name=sheet_input.title, skiprows=2, header=0, index_col=0
-        ).columns
-    )
-    header_operation = list(
-        pd.read_excel(
-            path_operation,
-            sheet_name=sheet_operation.title,
-            skiprows=2,
-            header=0,
-            index_col=0,
-        ).columns
-    )
+    # Headers are taken from the sheets already parsed in method \
+    # conductor_components_instance of class Conductors.
+    header_input = list(dict_sheets["input"][sheet_input.title].columns)
+    header_operation = list(dict_sheets["operation"][sheet_operation.title].columns)
 
     for ii in range(len(header_input)):
         if header_input[ii] != header_operation[ii]:
@@ -254,7 +252,7 @@ def interpolation(conductor, comp, MM, tvec, f_path, sheet, *xvec, **options):
     #                                          vector                       many
     ##############################################################################
     #
-    # Invoked functions/methods: none
+    # Invoked functions/methods: _interp_in_time, get_space_operator
     #
     ##############################################################################
     # N.B yy has the same shape of xcoord and is an np array
@@ -275,18 +273,9 @@ def interpolation(conductor, comp, MM, tvec, f_path, sheet, *xvec, **options):
         if (xvec[0] >= 0 and all(np.diff(xvec) >= 0)) and (
             tvec[0] >= 0 and all(np.diff(tvec) >= 0)
         ):
-            # Check that time @ which I perform interpolation is within tvec values, \
-            # if not yy is given by spatial interpolation @ time = tvec[0] or \
-            # time = tvec[-1] (cdp, 07/2020)
-            yy = np.zeros(conductor.dict_discretization["N_nod"], dtype=float)
-            lower_bound = np.min(
-                np.nonzero(conductor.dict_discretization["xcoord"] >= xvec[0])
-            )
-            upper_bound = np.max(
-                np.nonzero(conductor.dict_discretization["xcoord"] <= xvec[-1])
-            )
             if options["Flag_name"] == "IQFUN":
                 # Interpolation to get external flux (cdp, 11/2020)
+                yy = np.zeros(conductor.dict_discretization["N_nod"], dtype=float)
                 if comp.dict_operation["IQFUN"] == -1:
                     # square wave in time and space (cdp, 11/2020)
                     if (
@@ -295,125 +284,25 @@ def interpolation(conductor, comp, MM, tvec, f_path, sheet, *xvec, **options):
                         and conductor.cond_time[-1] >= 0
                     ):
                         # search in time (cdp, 11/2020)
-                        # array smart (cdp, 11/2020)
                         ii = np.max(np.nonzero(tvec <= conductor.cond_time[-1]))
-                        # Square wave in time and space: at any times xcoord < lower_bound \
-                        # and xcoord > upper_bound are equal to 0.0 (cdp, 10/2020)
-                        if conductor.cond_time[-1] <= tvec[-2]:
-                            yy[lower_bound : upper_bound + 1] = MM[0, ii]
-                        else:
-                            yy[lower_bound : upper_bound + 1] = MM[0, ii + 1]
-                        # end if (cdp, 10/2020)
+                        if conductor.cond_time[-1] > tvec[-2]:
+                            ii = ii + 1
+                        # End if conductor.cond_time[-1].
+                        # Square wave in time and space: at any times xcoord < xvec[0] \
+                        # and xcoord > xvec[-1] are equal to 0.0 (cdp, 10/2020)
+                        yy = get_space_operator(
+                            conductor, comp, xvec, square_wave=True
+                        ).dot(MM[:, ii])
                     # end if conductor.cond_time[-1] (cdp, 11/2020)
                 # end if comp.dict_operation["IQFUN"]
             else:
-                if (
-                    conductor.cond_time[-1] >= tvec[0]
-                    and conductor.cond_time[-1] < tvec[-1]
-                    and conductor.cond_time[-1] >= 0
-                ):
-                    yy[0:lower_bound] = MM[0, ii] + (
-                        conductor.cond_time[-1] - tvec[ii]
-                    ) / (tvec[ii + 1] - tvec[ii]) * (MM[0, ii + 1] - MM[0, ii])
-                    for kk in range(len(xvec) - 1):
-                        lb = np.min(
-                            np.nonzero(
-                                conductor.dict_discretization["xcoord"] >= xvec[kk]
-                            )
-                        )
-                        ub = np.max(
-                            np.nonzero(
-                                conductor.dict_discretization["xcoord"] <= xvec[kk + 1]
-                            )
-                        )
-                        if (ii < tvec.shape[0] - 1) and (ub <= upper_bound):
-                            fx = (
-                                conductor.dict_discretization["xcoord"][lb : ub + 1]
-                                - xvec[kk]
-                            ) / (xvec[kk + 1] - xvec[kk])
-                            # interpolation in time (cdp)
-                            yy_t_j = MM[kk, ii] + (
-                                conductor.cond_time[-1] - tvec[ii]
-                            ) / (tvec[ii + 1] - tvec[ii]) * (
-                                MM[kk, ii + 1] - MM[kk, ii]
-                            )
-                            yy_t_jplus1 = MM[kk + 1, ii] + (
-                                conductor.cond_time[-1] - tvec[ii]
-                            ) / (tvec[ii + 1] - tvec[ii]) * (
-                                MM[kk + 1, ii + 1] - MM[kk + 1, ii]
-                            )
-                            # interpolation in space (cdp)
-                            yy[lb : ub + 1] = yy_t_j + (yy_t_jplus1 - yy_t_j) * fx
-                            if ub == upper_bound:
-                                yy[ub] = MM[kk + 1, ii] + (
-                                    conductor.cond_time[-1] - tvec[ii]
-                                ) / (tvec[ii + 1] - tvec[ii]) * (
-                                    MM[kk + 1, ii + 1] - MM[kk + 1, ii]
-                                )
-                        elif (ii == tvec.shape[0] - 1) and (ub <= upper_bound):
-                            fx = (
-                                conductor.dict_discretization["xcoord"][lb : ub + 1]
-                                - xvec[kk]
-                            ) / (xvec[kk + 1] - xvec[kk])
-                            yy[lb : ub + 1] = (
-                                MM[kk, ii] + (MM[kk + 1, ii] - MM[kk, ii]) * fx
-                            )
-                            if ub == upper_bound:
-                                yy[ub] = MM[kk + 1, ii]
-                    yy[upper_bound + 1 : len(yy)] = MM[kk + 1, ii] + (
-                        conductor.cond_time[-1] - tvec[ii]
-                    ) / (tvec[ii + 1] - tvec[ii]) * (
-                        MM[kk + 1, ii + 1] - MM[kk + 1, ii]
-                    )
-                elif conductor.cond_time[-1] < tvec[0] and conductor.cond_time[-1] >= 0:
-                    # time > 0 always (cdp, 07/2020)
-                    yy[0:lower_bound] = MM[0, 0]
-                    for kk in range(len(xvec) - 1):
-                        lb = np.min(
-                            np.nonzero(
-                                conductor.dict_discretization["xcoord"] >= xvec[kk]
-                            )
-                        )
-                        ub = np.max(
-                            np.nonzero(
-                                conductor.dict_discretization["xcoord"] <= xvec[kk + 1]
-                            )
-                        )
-                        fx = (
-                            conductor.dict_discretization["xcoord"][lb : ub + 1]
-                            - xvec[kk]
-                        ) / (xvec[kk + 1] - xvec[kk])
-                        # spatial interpolation @ time = tvec[0] (cdp, 07/2020)
-                        yy[lb : ub + 1] = MM[kk, 0] + (MM[kk + 1, 0] - MM[kk, 0]) * fx
-                    yy[upper_bound + 1 : len(yy)] = MM[kk + 1, 0]
-                elif conductor.cond_time[-1] >= tvec[-1]:
-                    # time > 0 always (cdp, 07/2020)
-                    yy[0:lower_bound] = MM[0, -1]
-                    for kk in range(len(xvec) - 1):
-                        lb = np.min(
-                            np.nonzero(
-                                conductor.dict_discretization["xcoord"] >= xvec[kk]
-                            )
-                        )
-                        ub = np.max(
-                            np.nonzero(
-                                conductor.dict_discretization["xcoord"] <= xvec[kk + 1]
-                            )
-                        )
-                        fx = (
-                            conductor.dict_discretization["xcoord"][lb : ub + 1]
-                            - xvec[kk]
-                        ) / (xvec[kk + 1] - xvec[kk])
-                        # spatial interpolation @ time = tvec[-1] (cdp, 07/2020)
-                        yy[lb : ub + 1] = (
-                            MM[kk, -1] + (MM[kk + 1, -1] - MM[kk, -1]) * fx
-                        )
-                    yy[upper_bound + 1 : len(yy)] = MM[kk + 1, -1]
-                else:
-                    raise ValueError(
-                        f"ERROR in {interpolation.__name__}: time must \
-                        be positive scalar!\ntime = {conductor.cond_time[-1]}"
-                    )
+                # Interpolation in time of the data at xvec, then interpolation \
+                # in space with the operator of the mesh (constant values for \
+                # xcoord < xvec[0] and xcoord > xvec[-1]).
+                yy = get_space_operator(conductor, comp, xvec).dot(
+                    _interp_in_time(MM, tvec, conductor.cond_time[-1])
+                )
+            # End if options["Flag_name"].
         else:
             raise ValueError(
                 f"ERROR in {interpolation.__name__}: xvec and/or \
@@ -423,33 +312,8 @@ def interpolation(conductor, comp, MM, tvec, f_path, sheet, *xvec, **options):
     elif options.get("action") == "time":
         # time-only interpolation (cdp, 07/2020)
         if tvec[0] >= 0 and all(np.diff(tvec) >= 0):
-            yy = np.zeros(len(MM[:, 0]))  # one value for each row on MM
-            if (
-                conductor.cond_time[-1] >= tvec[0]
-                and conductor.cond_time[-1] < tvec[-1]
-                and conductor.cond_time[-1] >= 0
-            ):
-                # search in time (cdp)
-                # array smart (cdp)
-                ii = np.max(np.nonzero(tvec <= conductor.cond_time[-1]))
-                for kk in range(len(yy)):
-                    yy[kk] = MM[kk, ii] + (conductor.cond_time[-1] - tvec[ii]) / (
-                        tvec[ii + 1] - tvec[ii]
-                    ) * (MM[kk, ii + 1] - MM[kk, ii])
-            elif (
-                conductor.cond_time[-1] < tvec[0] and conductor.cond_time[-1] >= 0
-            ):  # time > 0 always (cdp, 07/2020)
-                for kk in range(len(yy)):
-                    yy[kk] = MM[kk, 0]
-            elif conductor.cond_time[-1] >= tvec[-1]:
-                # time > 0 always (cdp, 07/2020)
-                for kk in range(len(yy)):
-                    yy[kk] = MM[kk, -1]
-            else:
-                raise ValueError(
-                    f"ERROR in {interpolation.__name__}: time must \
-                        be positive scalar!\ntime = {conductor.cond_time[-1]}"
-                )
+            # one value for each row on MM
+            yy = _interp_in_time(MM, tvec, conductor.cond_time[-1])
         else:
             raise ValueError(
                 f"ERROR in {interpolation.__name__}: tvec is not \
@@ -459,11 +323,147 @@ def interpolation(conductor, comp, MM, tvec, f_path, sheet, *xvec, **options):
     return yy
 
 
+def _interp_in_time(MM, tvec, time):
+
+    """
+    ##############################################################################
+    #              _interp_in_time(MM, tvec, time)
+    ##############################################################################
+    #
+    # Function that interpolates linearly in time all the rows of MM; for
+    # time < tvec[0] and time >= tvec[-1] the first and the last column of MM
+    # are returned. The returned array is always a new array, since MM may be
+    # read only (see function read_interp_file).
+    #
+    ##############################################################################
+    """
+
+    if time >= tvec[0] and time < tvec[-1] and time >= 0:
+        # search in time (cdp)
+        ii = np.max(np.nonzero(tvec <= time))
+        return MM[:, ii] + (time - tvec[ii]) / (tvec[ii + 1] - tvec[ii]) * (
+            MM[:, ii + 1] - MM[:, ii]
+        )
+    elif time < tvec[0] and time >= 0:  # time > 0 always (cdp, 07/2020)
+        return np.array(MM[:, 0], dtype=float)
+    elif time >= tvec[-1]:
+        return np.array(MM[:, -1], dtype=float)
+    else:
+        raise ValueError(
+            f"ERROR in {interpolation.__name__}: time must \
+                be positive scalar!\ntime = {time}"
+        )
+    # End if time.
+
+
+def get_space_operator(conductor, comp, xvec, square_wave=False):
+
+    """
+    ##############################################################################
+    #              get_space_operator(conductor, comp, xvec, square_wave)
+    ##############################################################################
+    #
+    # Function that returns the sparse matrix (N_nod x len(xvec)) of the
+    # linear interpolation from xvec to the nodes of the mesh of conductor:
+    # nodes with xcoord < xvec[0] or xcoord > xvec[-1] take the first or the
+    # last value. With square_wave = True the matrix gives the first value of
+    # the data in the nodes with xvec[0] <= xcoord <= xvec[-1] and 0.0
+    # elsewhere. Matrices are stored in _space_operator_cache and built again
+    # only if the mesh changes.
+    #
+    ##############################################################################
+    """
+
+    xcoord = conductor.dict_discretization["xcoord"]
+    key = (conductor.ID, comp.ID, square_wave, xvec.tobytes())
+    if key in _space_operator_cache and np.array_equal(
+        _space_operator_cache[key]["xcoord"], xcoord
+    ):
+        return _space_operator_cache[key]["operator"]
+    # End if key.
+    rows = np.arange(xcoord.size)
+    if square_wave:
+        rows = rows[(xcoord >= xvec[0]) & (xcoord <= xvec[-1])]
+        cols = np.zeros(rows.size, dtype=int)
+        weights = np.ones(rows.size)
+    elif xvec.size == 1:
+        cols = np.zeros(rows.size, dtype=int)
+        weights = np.ones(rows.size)
+    else:
+        # Segment of xvec that contains each node; nodes equal to an inner \
+        # value of xvec belong to the segment on its right.
+        ind = np.clip(np.searchsorted(xvec, xcoord, side="right") - 1, 0, xvec.size - 2)
+        dx = xvec[ind + 1] - xvec[ind]
+        fx = np.divide(xcoord - xvec[ind], dx, out=np.zeros(xcoord.size), where=dx > 0)
+        fx = np.clip(fx, 0.0, 1.0)
+        rows = np.concatenate((rows, rows))
+        cols = np.concatenate((ind, ind + 1))
+        weights = np.concatenate((1.0 - fx, fx))
+    # End if square_wave.
+    operator = csr_matrix(
+        (weights, (rows, cols)), shape=(xcoord.size, xvec.size), dtype=float
+    )
+    _space_operator_cache[key] = dict(xcoord=xcoord.copy(), operator=operator)
+    return operator
+
+
+def clear_interp_file_cache():
+
+    """
+    ##############################################################################
+    #              clear_interp_file_cache()
+    ##############################################################################
+    #
+    # Function that empties the caches of functions read_interp_file and
+    # get_space_operator; it is invoked when a new simulation is created.
+    #
+    ##############################################################################
+    """
+
+    _interp_file_cache.clear()
+    _space_operator_cache.clear()
+
+
 def read_interp_file(file_path, comp, *INTIAL, **options):
 
     """
     ##############################################################################
-    #              Read_interp_file(file_path, comp)
+    #              read_interp_file(file_path, comp)
+    ##############################################################################
+    #
+    # Function that returns the data to be interpolated from .xlsx files (see
+    # function _parse_interp_file). Files are parsed only the first time, or
+    # if they are modified, and stored in _interp_file_cache with key
+    # (path, sheet, action, INTIAL); the stored arrays are read only. The last
+    # returned value is the name of the sheet.
+    #
+    ##############################################################################
+    """
+
+    key = (
+        os.path.abspath(file_path),
+        comp.ID,
+        options.get("action"),
+        INTIAL[:1],
+    )
+    mtime = os.path.getmtime(file_path)
+    if key not in _interp_file_cache or _interp_file_cache[key]["mtime"] != mtime:
+        data = _parse_interp_file(file_path, comp, *INTIAL, **options)
+        # Keep only the name of the sheet, so that the workbook is released.
+        data[-1] = data[-1].title
+        for value in data[1:-1]:
+            value.setflags(write=False)
+        # End for value.
+        _interp_file_cache[key] = dict(mtime=mtime, data=data)
+    # End if key.
+    return list(_interp_file_cache[key]["data"])
+
+
+def _parse_interp_file(file_path, comp, *INTIAL, **options):
+
+    """
+    ##############################################################################
+    #              _parse_interp_file(file_path, comp)
     ##############################################################################
     #
     # Function that reads data to be interpolated from .xlsx files.
@@ -0,0 +1,214 @@
+# Functions for the event triggered capture of the spatial distributions: the \
+# last CAPTURE_NSTEP spatial states of a conductor are kept in memory in a \
+# ring buffer, fed at each time step; when a trigger condition is met (e.g. \
+# quench onset) the states in the ring buffer and the ones of the following \
+# CAPTURE_POST_NSTEP time steps are saved at full time resolution, in folder \
+# Capture_{number} of the spatial distributions output. Outside these windows \
+# the spatial distributions are saved only at the times of sheet Space of \
+# the diagnostic file.
+
+import os
+
+import numpy as np
+
+from UtilityFunctions.output import get_space_snapshot, write_spatial_distribution
+from UtilityFunctions.output_writer import submit_output
+
+
+def _allocate_ring(capture, snapshot, n_step):
+
+    """
+    Function that allocates the ring buffer of capture: one array of shape \
+    (n_step, size) for each quantity in snapshot.
+    """
+
+    capture["Ring"] = {
+        name: np.zeros((n_step, np.size(values))) for name, values in snapshot.items()
+    }
+    capture["Head"] = 0
+    capture["Count"] = 0
+
+    # end of the function _allocate_ring
+
+
+def _is_ring_compatible(capture, snapshot):
+
+    """
+    Function that returns True if the ring buffer of capture can store \
+    snapshot (same quantities with the same sizes, i.e. same mesh).
+    """
+
+    ring = capture["Ring"]
+    return ring is not None and all(
+        name in ring and ring[name].shape[1] == np.size(values)
+        for name, values in snapshot.items()
+    )
+
+    # end of the function _is_ring_compatible
+
+
+def _is_triggered(conductor, snapshot):
+
+    """
+    Function that evaluates the trigger conditions of the capture with the \
+    current solution in snapshot: temperature of a strand larger than its \
+    current sharing temperature in any node (CAPTURE_T_CS), maximum \
+    temperature larger than CAPTURE_TMAX, maximum rate of change of the \
+    temperature (with respect to the previous state in the ring buffer) \
+    larger than CAPTURE_DTDT. Conditions with a null threshold are ignored.
+    """
+
+    capture = conductor.dict_capture
+    if conductor.dict_input["CAPTURE_T_CS"]:
+        for s_comp in conductor.dict_obj_inventory["SolidComponents"]["Objects"]:
+            if "T_cur_sharing" in s_comp.dict_node_pt and np.any(
+                s_comp.dict_node_pt["temperature"]
+                > s_comp.dict_node_pt["T_cur_sharing"]
+            ):
+                return True
+            # End if "T_cur_sharing".
+        # End for s_comp.
+    # End if conductor.dict_input["CAPTURE_T_CS"].
+    names = [name for name in snapshot if name.endswith("_temperature")]
+    if conductor.dict_input["CAPTURE_TMAX"] > 0.0 and any(
+        np.max(snapshot[name]) > conductor.dict_input["CAPTURE_TMAX"] for name in names
+    ):
+        return True
+    # End if conductor.dict_input["CAPTURE_TMAX"].
+    if conductor.dict_input["CAPTURE_DTDT"] > 0.0 and capture["Count"] > 0:
+        ring = capture["Ring"]
+        previous = (capture["Head"] - 1) % ring["time"].shape[0]
+        delta_t = snapshot["time"] - ring["time"][previous, 0]
+        if delta_t > 0.0 and any(
+            np.max(np.abs(snapshot[name] - ring[name][previous])) / delta_t
+            > conductor.dict_input["CAPTURE_DTDT"]
+            for name in names
+        ):
+            return True
+        # End if delta_t.
+    # End if conductor.dict_input["CAPTURE_DTDT"].
+    return False
+
+    # end of the function _is_triggered
+
+
+def capture_spatial_states(simulation, conductor):
+
+    """
+    Function called at each time step: stores the current spatial state of \
+    conductor in the ring buffer, evaluates the trigger conditions and \
+    collects the states of the capture window. A capture starts when the \
+    trigger conditions become true (they must become false before the next \
+    capture), at most CAPTURE_MAX_NUMBER times.
+    """
+
+    if conductor.dict_input["CAPTURE_NSTEP"] == 0:
+        return
+    # End if conductor.dict_input["CAPTURE_NSTEP"].
+    capture = conductor.dict_capture
+    snapshot = get_space_snapshot(conductor)
+    if not _is_ring_compatible(capture, snapshot):
+        # First call or new mesh: previous states are discarded.
+        _allocate_ring(capture, snapshot, conductor.dict_input["CAPTURE_NSTEP"])
+    # End if not.
+    # The trigger is evaluated before the ring buffer is updated, since the \
+    # rate of change of the temperature uses the previous state.
+    flag_trigger = _is_triggered(conductor, snapshot)
+    ring = capture["Ring"]
+    for name, values in snapshot.items():
+        ring[name][capture["Head"]] = values
+    # End for name.
+    capture["Head"] = (capture["Head"] + 1) % conductor.dict_input["CAPTURE_NSTEP"]
+    capture["Count"] = min(capture["Count"] + 1, conductor.dict_input["CAPTURE_NSTEP"])
+
+    if capture["Window"] is not None:
+        # Post trigger window: store the current state.
+        for name, values in snapshot.items():
+            capture["Window"][name][capture["Row"]] = values
+        # End for name.
+        capture["Row"] = capture["Row"] + 1
+        if capture["Row"] == capture["Window"]["time"].shape[0]:
+            _save_capture(simulation, conductor)
+        # End if capture["Row"].
+    elif (
+        flag_trigger
+        and capture["Armed"]
+        and capture["Number"] < conductor.dict_input["CAPTURE_MAX_NUMBER"]
+    ):
+        # Start a capture window with the states in the ring buffer (from \
+        # the oldest to the current one) followed by CAPTURE_POST_NSTEP rows.
+        order = (
+            capture["Head"] - capture["Count"] + np.arange(capture["Count"])
+        ) % conductor.dict_input["CAPTURE_NSTEP"]
+        capture["Window"] = dict()
+        for name, values in ring.items():
+            capture["Window"][name] = np.zeros(
+                (
+                    capture["Count"] + conductor.dict_input["CAPTURE_POST_NSTEP"],
+                    values.shape[1],
+                )
+            )
+            capture["Window"][name][: capture["Count"]] = values[order]
+        # End for name.
+        capture["Row"] = capture["Count"]
+        capture["Number"] = capture["Number"] + 1
+        print(
+            f"Conductor {conductor.ID}: capture {capture['Number']} triggered at time {snapshot['time']} s\n"
+        )
+        if capture["Row"] == capture["Window"]["time"].shape[0]:
+            _save_capture(simulation, conductor)
+        # End if capture["Row"].
+    # End if capture["Window"].
+    # The next capture needs the trigger conditions to become false before.
+    capture["Armed"] = not flag_trigger
+
+    # end of the function capture_spatial_states
+
+
+def _save_capture(simulation, conductor):
+
+    """
+    Function that hands the filled rows of the current capture window to the \
+    output writer, that saves them in folder Capture_{number} of the spatial \
+    distributions output.
+    """
+
+    capture = conductor.dict_capture
+    dict_data = {
+        name: values[: capture["Row"]] for name, values in capture["Window"].items()
+    }
+    columns = [
+        f"time = {time} (s)"
+        for time in np.around(dict_data["time"][:, 0], abs(simulation.n_digit))
+    ]
+    f_path = os.path.join(
+        simulation.dict_path[f"Output_Space_{conductor.ID}_dir"],
+        f"Capture_{capture['Number']}",
+    )
+    os.makedirs(f_path, exist_ok=True)
+    # The window is not modified after the submission: it is replaced below.
+    submit_output(
+        simulation.output_writer,
+        write_spatial_distribution,
+        f_path,
+        dict_data,
+        columns,
+    )
+    capture["Window"] = None
+    capture["Row"] = 0
+
+    # end of the function _save_capture
+
+
+def close_capture(simulation, conductor):
+
+    """
+    Function called at the end of the simulation: saves the capture window \
+    still open, if any.
+    """
+
+    if conductor.dict_capture["Window"] is not None:
+        _save_capture(simulation, conductor)
+    # End if conductor.dict_capture["Window"].
+
+    # end of the function close_capture
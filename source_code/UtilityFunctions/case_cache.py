@@ -0,0 +1,142 @@
+# Functions to store in a single binary file (case file) the data read from \
+# the .xlsx input files of a simulation: the workbooks loaded with openpyxl \
+# and the DataFrames read with pandas. The case file is identified by a hash \
+# of the content of the .xlsx files, so it is used again only if none of \
+# them changed.
+
+import hashlib
+import openpyxl
+import os
+import pandas as pd
+import pickle
+
+# Default folder of the case files: at the same level of folder \
+# Simulations_results.
+CASE_CACHE_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "Case_cache")
+)
+# Data of the case that is currently used, see function open_case.
+_case = dict(Path=None, Files=frozenset(), Workbooks=dict(), Frames=dict())
+
+
+def get_case_hash(base_path):
+
+    """
+    Function that evaluates the sha1 hash of the names and of the content of \
+    all the .xlsx files in folder base_path, together with the versions of \
+    pandas and openpyxl (that write the case file). Returns the hash and the \
+    set of the absolute paths of the hashed files.
+    """
+
+    sha = hashlib.sha1(f"{pd.__version__}_{openpyxl.__version__}".encode())
+    files = set()
+    for f_name in sorted(os.listdir(base_path)):
+        path = os.path.abspath(os.path.join(base_path, f_name))
+        # Skip the temporary files of Excel (~$*.xlsx).
+        if f_name.endswith(".xlsx") and not f_name.startswith("~$"):
+            sha.update(f_name.encode())
+            with open(path, "rb") as reader:
+                sha.update(reader.read())
+            files.add(path)
+        # End if f_name.
+    # End for f_name.
+    return sha.hexdigest(), frozenset(files)
+
+    # end of the function get_case_hash
+
+
+def open_case(base_path, folder=CASE_CACHE_DIR):
+
+    """
+    Function that selects the case file of the input files in base_path: if \
+    it exists in folder it is loaded, otherwise an empty case is created and \
+    it is filled by functions cached_load_workbook and cached_read_excel.
+    """
+
+    case_hash, files = get_case_hash(base_path)
+    path = os.path.join(folder, f"{case_hash}.pkl")
+    _case.update(Path=path, Files=files, Workbooks=dict(), Frames=dict())
+    if os.path.isfile(path):
+        with open(path, "rb") as reader:
+            data = pickle.load(reader)
+        _case.update(Workbooks=data["Workbooks"], Frames=data["Frames"])
+    # End if os.path.isfile.
+    _case["Modified"] = False
+
+    # end of the function open_case
+
+
+def save_case():
+
+    """
+    Function that writes the current case file, only if new data were added \
+    after it was opened.
+    """
+
+    if _case["Path"] is None or not _case["Modified"]:
+        return
+    # End if _case["Path"].
+    os.makedirs(os.path.dirname(_case["Path"]), exist_ok=True)
+    # The file is written with a temporary name and then renamed, so that \
+    # processes running in parallel never read incomplete files.
+    tmp_path = f"{_case['Path']}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as writer:
+        pickle.dump(
+            dict(Workbooks=_case["Workbooks"], Frames=_case["Frames"]),
+            writer,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    os.replace(tmp_path, _case["Path"])
+    _case["Modified"] = False
+
+    # end of the function save_case
+
+
+def cached_load_workbook(path, **kwargs):
+
+    """
+    Function that returns the workbook in path (see openpyxl.load_workbook) \
+    from the current case; files that do not belong to the case are always \
+    loaded from disk. The returned workbook is shared, so it must not be \
+    modified.
+    """
+
+    path = os.path.abspath(path)
+    if path not in _case["Files"]:
+        return openpyxl.load_workbook(path, **kwargs)
+    # End if path.
+    key = (path, repr(sorted(kwargs.items())))
+    if key not in _case["Workbooks"]:
+        _case["Workbooks"][key] = openpyxl.load_workbook(path, **kwargs)
+        _case["Modified"] = True
+    # End if key.
+    return _case["Workbooks"][key]
+
+    # end of the function cached_load_workbook
+
+
+def cached_read_excel(path, **kwargs):
+
+    """
+    Function that returns the result of pd.read_excel(path, **kwargs) from \
+    the current case; files that do not belong to the case are always read \
+    from disk. A copy of the stored data is returned.
+    """
+
+    path = os.path.abspath(path)
+    if path not in _case["Files"]:
+        return pd.read_excel(path, **kwargs)
+    # End if path.
+    key = (path, repr(sorted(kwargs.items())))
+    if key not in _case["Frames"]:
+        _case["Frames"][key] = pd.read_excel(path, **kwargs)
+        _case["Modified"] = True
+    # End if key.
+    data = _case["Frames"][key]
+    if isinstance(data, dict):
+        # sheet_name=None: dictionary of DataFrames.
+        return {sheet: frame.copy() for sheet, frame in data.items()}
+    # End if isinstance.
+    return data.copy()
+
+    # end of the function cached_read_excel
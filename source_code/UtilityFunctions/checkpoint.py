@@ -0,0 +1,212 @@
+# Functions to store the state of a running simulation in a checkpoint file \
+# and to restart the simulation from the latest checkpoint. A checkpoint \
+# stores the conductors (with dict_Step, the nodal and Gauss point values of \
+# all the components, the save index i_save and the buffers of the time \
+# evolutions not yet written), the time and step counters of the simulation \
+# and the size of the output files of the time evolutions, so that a \
+# restarted simulation gives the same results of an uninterrupted one.
+
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+from UtilityFunctions.case_cache import get_case_hash
+
+# Number of checkpoint files kept on disk if key CHECKPOINT_KEEP of the \
+# transient input is not given.
+CHECKPOINT_KEEP = 2
+
+
+def set_checkpoint_input(simulation):
+
+    """
+    Function that builds dictionary simulation.dict_checkpoint from the \
+    optional keys of the transient input: CHECKPOINT_STEPS (checkpoint every \
+    given number of time steps), CHECKPOINT_WALLTIME (checkpoint every given \
+    number of seconds of wall time) and CHECKPOINT_KEEP (number of checkpoint \
+    files kept on disk). Without CHECKPOINT_STEPS and CHECKPOINT_WALLTIME no \
+    checkpoint is saved.
+    """
+
+    simulation.dict_checkpoint = dict(Steps=None, Walltime=None, Keep=CHECKPOINT_KEEP)
+    for key in ["Steps", "Walltime", "Keep"]:
+        value = simulation.transient_input.get(f"CHECKPOINT_{key.upper()}", np.nan)
+        if not pd.isna(value):
+            if value <= 0:
+                raise ValueError(
+                    f"ERROR in {set_checkpoint_input.__name__}: CHECKPOINT_{key.upper()} in file {simulation.starter_file} must be positive; current value is {value}.\n"
+                )
+            # End if value.
+            simulation.dict_checkpoint[key] = value
+        # End if not.
+    # End for key.
+    simulation.dict_checkpoint["Keep"] = int(simulation.dict_checkpoint["Keep"])
+    # Wall time of the last checkpoint (or of the start of the solution).
+    simulation.dict_checkpoint["Last_walltime"] = time.perf_counter()
+
+    # end of the function set_checkpoint_input
+
+
+def checkpoint_dir(simulation):
+
+    """
+    Function that returns the folder of the checkpoint files of simulation.
+    """
+
+    return os.path.join(
+        simulation.dict_path["Sub_dir"],
+        simulation.transient_input["SIMULATION"],
+        "Checkpoint",
+    )
+
+    # end of the function checkpoint_dir
+
+
+def is_checkpoint_due(simulation):
+
+    """
+    Function that returns True if a checkpoint must be saved at the current \
+    time step, according to the intervals in simulation.dict_checkpoint.
+    """
+
+    steps = simulation.dict_checkpoint["Steps"]
+    walltime = simulation.dict_checkpoint["Walltime"]
+    return (steps is not None and simulation.num_step % int(steps) == 0) or (
+        walltime is not None
+        and time.perf_counter() - simulation.dict_checkpoint["Last_walltime"]
+        >= walltime
+    )
+
+    # end of the function is_checkpoint_due
+
+
+def _output_files(simulation):
+
+    """
+    Function that returns the paths of the output files written during the \
+    transient solution (time evolutions).
+    """
+
+    files = list()
+    for conductor in simulation.list_of_Conductors:
+        f_path = simulation.dict_path[f"Output_Time_{conductor.ID}_dir"]
+        files.extend(
+            os.path.join(f_path, f_name)
+            for f_name in sorted(os.listdir(f_path))
+            if f_name.endswith(".tsv")
+        )
+    # End for conductor.
+    return files
+
+    # end of the function _output_files
+
+
+def save_checkpoint(simulation):
+
+    """
+    Function that saves the state of simulation in file \
+    checkpoint_{num_step}.pkl of the checkpoint folder and removes the \
+    oldest checkpoints, keeping simulation.dict_checkpoint["Keep"] files. \
+    Pending output is written before, so that the checkpoint stores the size \
+    of the complete output files.
+    """
+
+    if simulation.output_writer is not None:
+        simulation.output_writer.flush()
+    # End if simulation.output_writer.
+    for conductor in simulation.list_of_Conductors:
+        for dataset in conductor.dict_space_store.values():
+            if dataset is not None:
+                dataset.flush()
+            # End if dataset.
+        # End for dataset.
+    # End for conductor.
+    state = dict(
+        Case_hash=get_case_hash(simulation.basePath)[0],
+        num_step=simulation.num_step,
+        simulation_time=simulation.simulation_time,
+        simulation_time_step=simulation.simulation_time_step,
+        dict_qsource=simulation.dict_qsource,
+        list_of_Conductors=simulation.list_of_Conductors,
+        File_size={path: os.path.getsize(path) for path in _output_files(simulation)},
+    )
+    folder = checkpoint_dir(simulation)
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"checkpoint_{simulation.num_step:010d}.pkl")
+    # The file is written with a temporary name, forced to disk and then \
+    # renamed, so that a crash never leaves an incomplete checkpoint.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as writer:
+        pickle.dump(state, writer, protocol=pickle.HIGHEST_PROTOCOL)
+        writer.flush()
+        os.fsync(writer.fileno())
+    os.replace(tmp_path, path)
+    # Rotation: remove the oldest checkpoints.
+    for old_path in _list_checkpoints(folder)[: -simulation.dict_checkpoint["Keep"]]:
+        os.remove(old_path)
+    # End for old_path.
+    simulation.dict_checkpoint["Last_walltime"] = time.perf_counter()
+    print(f"Saved checkpoint {path}\n")
+
+    # end of the function save_checkpoint
+
+
+def _list_checkpoints(folder):
+
+    """
+    Function that returns the paths of the checkpoint files in folder, from \
+    the oldest to the latest.
+    """
+
+    if not os.path.isdir(folder):
+        return list()
+    # End if not.
+    return [
+        os.path.join(folder, f_name)
+        for f_name in sorted(os.listdir(folder))
+        if f_name.startswith("checkpoint_") and f_name.endswith(".pkl")
+    ]
+
+    # end of the function _list_checkpoints
+
+
+def load_checkpoint(simulation):
+
+    """
+    Function that restores the state of simulation from the latest \
+    checkpoint file: the conductors built from the input files are replaced \
+    by the saved ones and the output files of the time evolutions are \
+    truncated to their size at the checkpoint. Returns the path of the \
+    checkpoint file.
+    """
+
+    list_path = _list_checkpoints(checkpoint_dir(simulation))
+    if not list_path:
+        raise ValueError(
+            f"ERROR in {load_checkpoint.__name__}: no checkpoint of simulation {simulation.transient_input['SIMULATION']} in folder {checkpoint_dir(simulation)}.\n"
+        )
+    # End if not.
+    with open(list_path[-1], "rb") as reader:
+        state = pickle.load(reader)
+    if state["Case_hash"] != get_case_hash(simulation.basePath)[0]:
+        raise ValueError(
+            f"ERROR in {load_checkpoint.__name__}: input files in {simulation.basePath} changed after checkpoint {list_path[-1]} was saved; impossible to restart the simulation.\n"
+        )
+    # End if state["Case_hash"].
+    simulation.num_step = state["num_step"]
+    simulation.simulation_time = state["simulation_time"]
+    simulation.simulation_time_step = state["simulation_time_step"]
+    simulation.dict_qsource = state["dict_qsource"]
+    simulation.list_of_Conductors = state["list_of_Conductors"]
+    # Remove the output written after the checkpoint.
+    for path, size in state["File_size"].items():
+        with open(path, "r+b") as writer:
+            writer.truncate(size)
+    # End for path.
+    simulation.dict_checkpoint["Last_walltime"] = time.perf_counter()
+    return list_path[-1]
+
+    # end of the function load_checkpoint
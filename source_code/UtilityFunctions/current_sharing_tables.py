@@ -0,0 +1,118 @@
+# Functions to build and interpolate tables of the current sharing \
+# temperature of the superconductors on uniform grids of magnetic field, \
+# strain (Nb3Sn only) and operating current density.
+
+import numpy as np
+import warnings
+
+
+def build_cur_sharing_table(jc_function, grids, constants, t_max, n_iter=50):
+
+    """
+    Function that evaluates the current sharing temperature in all the \
+    points of grids inverting jc_function(T, *field_args, *constants) = JOP \
+    (jc_function is one of the critical_current_density_* functions of \
+    folder Properties_of_materials) with a vectorized bisection in [0, t_max] \
+    (n_iter halvings). grids is the list of the 1D uniform grids of the \
+    field arguments (field and, for Nb3Sn, strain) followed by the grid of \
+    JOP; constants are Tc0m, Bc20m and c0. The current sharing temperature \
+    is 0 where JOP is larger than the critical current density at 0 K. \
+    Returns a dictionary with the grids (key Grids) and the values (key \
+    Values, array with one dimension for each grid).
+    """
+
+    mesh = np.meshgrid(*grids, indexing="ij")
+    points = [coord.flatten() for coord in mesh]
+    field_args, jop = points[:-1], points[-1]
+    t_lower = np.zeros(jop.shape)
+    t_upper = t_max * np.ones(jop.shape)
+    # Points with a current sharing temperature larger than 0 K.
+    ind = np.nonzero(jc_function(t_lower, *field_args, *constants) > jop)[0]
+    field_args = [arg[ind] for arg in field_args]
+    for _ in range(n_iter):
+        t_mid = (t_lower[ind] + t_upper[ind]) / 2.0
+        above = jc_function(t_mid, *field_args, *constants) > jop[ind]
+        t_lower[ind] = np.where(above, t_mid, t_lower[ind])
+        t_upper[ind] = np.where(above, t_upper[ind], t_mid)
+    # End for _.
+    values = np.zeros(jop.shape)
+    values[ind] = (t_lower[ind] + t_upper[ind]) / 2.0
+    return dict(Grids=grids, Values=values.reshape(mesh[0].shape))
+
+    # end of the function build_cur_sharing_table
+
+
+def interp_cur_sharing_table(table, coords):
+
+    """
+    Function that interpolates linearly the values of table in the points \
+    coords (list of arrays, one for each grid). Since the grids are uniform \
+    the cells are found without searching; points outside the grids are \
+    clipped to the boundary with a warning.
+    """
+
+    index = list()
+    weight = list()
+    for grid, coord in zip(table["Grids"], coords):
+        coord = np.atleast_1d(coord)
+        if coord.min() < grid[0] or coord.max() > grid[-1]:
+            warnings.warn(
+                f"Value out of the current sharing temperature table range [{grid[0]:g}, {grid[-1]:g}]; values are clipped.\n"
+            )
+        # End if coord.min().
+        position = np.clip((coord - grid[0]) / (grid[1] - grid[0]), 0.0, grid.size - 1)
+        ind = np.minimum(position.astype(int), grid.size - 2)
+        index.append(ind)
+        weight.append(position - ind)
+    # End for grid.
+    values = 0.0
+    # Sum on the 2**(number of grids) corners of the cell.
+    for corner in np.ndindex(*(2,) * len(index)):
+        corner_weight = 1.0
+        for ind_c, ww in zip(corner, weight):
+            corner_weight = corner_weight * (ww if ind_c else 1.0 - ww)
+        # End for ind_c.
+        values = (
+            values
+            + corner_weight
+            * table["Values"][tuple(ind + ind_c for ind, ind_c in zip(index, corner))]
+        )
+    # End for corner.
+    return values
+
+    # end of the function interp_cur_sharing_table
+
+
+def newton_cur_sharing(jc_function, temperature, field_args, jop, constants, n_iter):
+
+    """
+    Function that improves the current sharing temperature temperature with \
+    n_iter Newton iterations on jc_function(T, *field_args, *constants) = jop \
+    (jc_function is one of the critical_current_density_* functions). The \
+    derivative is evaluated with central finite differences; points where \
+    the derivative is not negative (e.g. above the critical temperature) are \
+    not modified.
+    """
+
+    delta = 1e-6
+    temperature = np.array(temperature, copy=True)
+    for _ in range(n_iter):
+        ind = np.nonzero(temperature > delta)[0]
+        if ind.size == 0:
+            break
+        # End if ind.size.
+        args = [np.atleast_1d(arg)[ind] for arg in field_args]
+        residual = jc_function(temperature[ind], *args, *constants) - jop
+        derivative = (
+            jc_function(temperature[ind] + delta, *args, *constants)
+            - jc_function(temperature[ind] - delta, *args, *constants)
+        ) / (2.0 * delta)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.where(derivative < 0.0, residual / derivative, 0.0)
+        # End with.
+        step[~np.isfinite(step)] = 0.0
+        temperature[ind] = np.maximum(temperature[ind] - step, 0.0)
+    # End for _.
+    return temperature
+
+    # end of the function newton_cur_sharing
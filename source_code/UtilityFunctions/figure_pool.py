@@ -0,0 +1,77 @@
+# Functions to render the figures of the post processing in a pool of \
+# processes with the non interactive backend Agg. A figure task is a tuple \
+# (function, args): function is a module level function of \
+# UtilityFunctions.plots that loads only the .tsv file it plots, saves its \
+# figures and returns a list of tuples (path of the figure, elapsed time in \
+# s); args contains only paths, labels and small arrays, so tasks can be \
+# sent to the worker processes.
+
+import multiprocessing
+import os
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _init_worker():
+
+    """
+    Function executed at the start of each worker process: selects the non \
+    interactive backend Agg before UtilityFunctions.plots is imported.
+    """
+
+    os.environ["MPLBACKEND"] = "Agg"
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+    # end of the function _init_worker
+
+
+def render_figures(tasks, workers=1):
+
+    """
+    Function that executes the figure tasks and prints the time spent for \
+    each figure. With workers = 1 the tasks are executed one after the other \
+    by the calling process (with its backend); with workers > 1 they are \
+    executed by a pool of at most workers processes, started with method \
+    spawn: the main script must then be protected by \
+    if __name__ == "__main__" (see simulation_batch.py). Returns the list of \
+    tuples (path of the figure, elapsed time in s).
+    """
+
+    if workers < 1:
+        raise ValueError(
+            f"ERROR in {render_figures.__name__}: number of workers must be positive; current value is {workers}.\n"
+        )
+    # End if workers.
+    t_start = time.perf_counter()
+    workers = min(workers, len(tasks))
+    timings = list()
+    if workers <= 1:
+        for function, args in tasks:
+            timings.extend(function(*args))
+        # End for function.
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        ) as executor:
+            futures = [executor.submit(function, *args) for function, args in tasks]
+            # Results are collected in the order of the tasks; the first error \
+            # of a worker is raised here.
+            for future in futures:
+                timings.extend(future.result())
+            # End for future.
+        # End with ProcessPoolExecutor.
+    # End if workers.
+    for path, elapsed in timings:
+        print(f"Figure {path}: {elapsed:.3f} s")
+    # End for path.
+    print(
+        f"Rendered {len(timings)} figures in {time.perf_counter() - t_start:.1f} s with {max(workers, 1)} worker(s)\n"
+    )
+    return timings
+
+    # end of the function render_figures
@@ -0,0 +1,357 @@
+# Functions to build, store and interpolate tables of the coolant properties \
+# on a (temperature, pressure) grid.
+
+import numpy as np
+import os
+import warnings
+from CoolProp.CoolProp import AbstractState, PT_INPUTS, get_parameter_index
+
+# Default folder of the property tables: at the same level of folder \
+# Simulations_results.
+TABLES_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "Fluid_property_tables")
+)
+# CoolProp aliases of the tabulated properties.
+TABLE_ALIASES = (
+    "Dmass",
+    "Hmass",
+    "Cpmass",
+    "Cvmass",
+    "speed_of_sound",
+    "conductivity",
+    "viscosity",
+    "isobaric_expansion_coefficient",
+    "isothermal_compressibility",
+    "Prandtl",
+)
+# Maximum allowed relative error of the tables with respect to CoolProp, \
+# evaluated in the centers of the cells of the grid: in the cells where it is \
+# exceeded (e.g. near the critical point) properties are evaluated with \
+# CoolProp instead of interpolated.
+TABLE_TOLERANCE = 1e-3
+# Fraction of the cells evaluated with CoolProp above which a finer grid is \
+# suggested with a warning.
+TABLE_FALLBACK_WARNING = 1e-2
+# Tables already loaded by the current process, with the same key of the \
+# file name.
+_loaded_tables = dict()
+# AbstractState objects used in the cells evaluated with CoolProp, with the \
+# fluid type as key.
+_abstract_states = dict()
+
+
+def get_table_name(fluid_type, t_range, p_range, n_temp, n_press):
+
+    """
+    Function that returns the name of the file of the table of fluid \
+    fluid_type (without extension); the name is unique for each fluid type, \
+    grid range and grid size.
+    """
+
+    return (
+        f"{fluid_type}_T_{t_range[0]:g}_{t_range[1]:g}_{n_temp}"
+        f"_P_{p_range[0]:g}_{p_range[1]:g}_{n_press}"
+    )
+
+    # end of the function get_table_name
+
+
+def _eval_state(abstract_state, keys, temperature, pressure):
+
+    """
+    Function that evaluates with CoolProp the properties keys in the point \
+    (temperature, pressure). CoolProp raises ValueError on the states it can \
+    not evaluate (e.g. on the saturation or melting line) and returns NaN for \
+    some properties (e.g. the conductivity of helium in a region close to \
+    the critical point): the corresponding values are NaN.
+    """
+
+    values = np.full(len(keys), np.nan)
+    try:
+        abstract_state.update(PT_INPUTS, pressure, temperature)
+    except ValueError:
+        return values
+    # End try.
+    for kk, key in enumerate(keys):
+        try:
+            values[kk] = abstract_state.keyed_output(key)
+        except ValueError:
+            pass
+        # End try.
+    # End for kk.
+    return values
+
+    # end of the function _eval_state
+
+
+def build_property_table(fluid_type, t_range, p_range, n_temp, n_press):
+
+    """
+    Function that evaluates with CoolProp the properties in TABLE_ALIASES on a \
+    grid equally spaced in log(temperature) and in pressure. Returns a \
+    dictionary with the grid coordinates (keys log_temperature and pressure), \
+    the values of the properties (key Values, array of shape \
+    (len(TABLE_ALIASES), n_temp, n_press)) and the maximum relative error of \
+    the bicubic interpolation with respect to CoolProp for each property (key \
+    Max_error), evaluated in the centers of the cells of the grid, together \
+    with the number of grid points where CoolProp fails (key N_nan). Cells \
+    where the error of any property exceeds TABLE_TOLERANCE, or that can not \
+    be interpolated because of NaN values, are flagged in key Fallback \
+    (array of shape (n_temp - 1, n_press - 1)): function \
+    interp_property_table evaluates them with CoolProp, so Max_error refers \
+    to the other cells.
+    """
+
+    abstract_state = AbstractState("HEOS", fluid_type)
+    keys = [get_parameter_index(alias) for alias in TABLE_ALIASES]
+    log_temperature = np.linspace(np.log(t_range[0]), np.log(t_range[1]), n_temp)
+    pressure = np.linspace(p_range[0], p_range[1], n_press)
+
+    def eval_grid(temperature, press):
+        values = np.zeros((len(keys), temperature.size, press.size))
+        for ii, temp in enumerate(temperature):
+            for jj, pp in enumerate(press):
+                # NaN values where CoolProp fails, counted by key N_nan.
+                values[:, ii, jj] = _eval_state(abstract_state, keys, temp, pp)
+            # End for jj.
+        # End for ii.
+        return values
+
+    values = eval_grid(np.exp(log_temperature), pressure)
+    table = dict(
+        log_temperature=log_temperature,
+        pressure=pressure,
+        Values=values,
+        Fallback=np.zeros((n_temp - 1, n_press - 1), dtype=bool),
+        Fluid=fluid_type,
+    )
+    # Check the accuracy in the centers of the cells.
+    log_temperature_c = (log_temperature[:-1] + log_temperature[1:]) / 2.0
+    pressure_c = (pressure[:-1] + pressure[1:]) / 2.0
+    reference = eval_grid(np.exp(log_temperature_c), pressure_c)
+    temperature_c, pressure_c = np.meshgrid(
+        np.exp(log_temperature_c), pressure_c, indexing="ij"
+    )
+    interpolated = interp_property_table(
+        table, temperature_c.flatten(), pressure_c.flatten()
+    ).reshape(reference.shape)
+    error = np.abs(interpolated - reference) / np.maximum(
+        np.abs(reference), np.finfo(float).tiny
+    )
+    # Cells with NaN values (of the grid or of CoolProp in the center) are \
+    # flagged as well, since the comparison with NaN is False.
+    table["Fallback"] = np.any(~(error <= TABLE_TOLERANCE), axis=0)
+    table["Max_error"] = np.max(
+        np.where(table["Fallback"], 0.0, error), axis=(1, 2), initial=0.0
+    )
+    table["N_nan"] = np.sum(np.isnan(values), axis=(1, 2))
+    return table
+
+    # end of the function build_property_table
+
+
+def get_property_table(
+    fluid_type, t_range, p_range, n_temp, n_press, folder=TABLES_DIR
+):
+
+    """
+    Function that returns the table of the properties of fluid fluid_type. \
+    The table is built (function build_property_table) and saved in folder \
+    only the first time; afterwards it is loaded from the .npz file of the \
+    grid and from the .npy file of the values, that is memory mapped in read \
+    only mode, so that all the processes on the same node share the same \
+    physical memory. A warning is raised if the accuracy of the table is \
+    worse than TABLE_TOLERANCE.
+    """
+
+    name = get_table_name(fluid_type, t_range, p_range, n_temp, n_press)
+    if name in _loaded_tables:
+        return _loaded_tables[name]
+    # End if name.
+    grid_path = os.path.join(folder, f"{name}.npz")
+    values_path = os.path.join(folder, f"{name}.npy")
+    if not (os.path.isfile(grid_path) and os.path.isfile(values_path)):
+        table = build_property_table(fluid_type, t_range, p_range, n_temp, n_press)
+        os.makedirs(folder, exist_ok=True)
+        # Files are written with a temporary name and then renamed, so that \
+        # processes running in parallel never read incomplete files.
+        tmp_suffix = f".{os.getpid()}.tmp"
+        with open(values_path + tmp_suffix, "wb") as writer:
+            np.save(writer, table["Values"])
+        with open(grid_path + tmp_suffix, "wb") as writer:
+            np.savez(
+                writer,
+                log_temperature=table["log_temperature"],
+                pressure=table["pressure"],
+                Max_error=table["Max_error"],
+                N_nan=table["N_nan"],
+                Fallback=table["Fallback"],
+                Fluid=np.array(fluid_type),
+                aliases=np.array(TABLE_ALIASES),
+            )
+        os.replace(values_path + tmp_suffix, values_path)
+        os.replace(grid_path + tmp_suffix, grid_path)
+    # End if not.
+    with np.load(grid_path) as grid:
+        if tuple(grid["aliases"]) != TABLE_ALIASES:
+            raise ValueError(
+                f"ERROR in {get_property_table.__name__}: properties in {grid_path} are {tuple(grid['aliases'])} instead of {TABLE_ALIASES}; remove the file to build it again.\n"
+            )
+        # End if tuple.
+        if "Fallback" not in grid:
+            raise ValueError(
+                f"ERROR in {get_property_table.__name__}: {grid_path} was built by a previous version, without the cells evaluated with CoolProp; remove the file to build it again.\n"
+            )
+        # End if "Fallback".
+        table = dict(
+            log_temperature=grid["log_temperature"],
+            pressure=grid["pressure"],
+            Max_error=grid["Max_error"],
+            N_nan=grid["N_nan"],
+            Fallback=grid["Fallback"],
+            Fluid=str(grid["Fluid"]),
+        )
+    table["Values"] = np.load(values_path, mmap_mode="r")
+    for alias, n_nan in zip(TABLE_ALIASES, table["N_nan"]):
+        if n_nan > 0:
+            warnings.warn(
+                f"Table {name}: CoolProp can not evaluate {alias} in {n_nan} grid points (NaN values); the cells around them are evaluated with CoolProp.\n"
+            )
+        # End if n_nan.
+    # End for alias.
+    if table["Fallback"].mean() > TABLE_FALLBACK_WARNING:
+        warnings.warn(
+            f"Table {name}: {table['Fallback'].mean():.1%} of the cells exceed the tolerance {TABLE_TOLERANCE:.0e} and are evaluated with CoolProp; consider a finer grid.\n"
+        )
+    # End if table["Fallback"].mean().
+    _loaded_tables[name] = table
+    return table
+
+    # end of the function get_property_table
+
+
+def _cubic_weights(tt):
+
+    """
+    Function that evaluates the weights of the cubic convolution (Catmull-Rom) \
+    of the four grid points around the query point; tt is the normalized \
+    distance of the query point from the grid point on its left.
+    """
+
+    return np.array(
+        [
+            ((-0.5 * tt + 1.0) * tt - 0.5) * tt,
+            (1.5 * tt - 2.5) * tt * tt + 1.0,
+            ((-1.5 * tt + 2.0) * tt + 0.5) * tt,
+            (0.5 * tt - 0.5) * tt * tt,
+        ]
+    )
+
+    # end of the function _cubic_weights
+
+
+def _grid_index(grid, coord):
+
+    """
+    Function that finds with np.searchsorted the cell of grid that contains \
+    coord, limited to the cells with a neighbour on both sides, and the \
+    normalized position of coord in the cell.
+    """
+
+    index = np.clip(np.searchsorted(grid, coord) - 1, 1, grid.size - 3)
+    return index, (coord - grid[index]) / (grid[index + 1] - grid[index])
+
+    # end of the function _grid_index
+
+
+def interp_property_table(table, temperature, pressure):
+
+    """
+    Function that interpolates all the properties of table in the points \
+    (temperature, pressure) with the bicubic convolution on the 4 x 4 grid \
+    points around each point; points in the cells flagged in \
+    table["Fallback"] are evaluated with CoolProp. Points outside the table \
+    are clipped to the table boundary with a warning. Returns an array of \
+    shape (len(TABLE_ALIASES), temperature.size).
+    """
+
+    log_temperature = np.log(np.atleast_1d(temperature))
+    pressure = np.atleast_1d(pressure)
+    if (
+        log_temperature.min() < table["log_temperature"][0]
+        or log_temperature.max() > table["log_temperature"][-1]
+        or pressure.min() < table["pressure"][0]
+        or pressure.max() > table["pressure"][-1]
+    ):
+        warnings.warn(
+            f"Temperature or pressure out of the property table range: T in [{np.exp(table['log_temperature'][0]):g}, {np.exp(table['log_temperature'][-1]):g}] K, P in [{table['pressure'][0]:g}, {table['pressure'][-1]:g}] Pa; values are clipped.\n"
+        )
+        log_temperature = np.clip(
+            log_temperature, table["log_temperature"][0], table["log_temperature"][-1]
+        )
+        pressure = np.clip(pressure, table["pressure"][0], table["pressure"][-1])
+    # End if log_temperature.
+    ind_t, tt = _grid_index(table["log_temperature"], log_temperature)
+    ind_p, tp = _grid_index(table["pressure"], pressure)
+    weight_t = _cubic_weights(tt)
+    weight_p = _cubic_weights(tp)
+    values = np.zeros((table["Values"].shape[0], log_temperature.size))
+    for ii in range(4):
+        for jj in range(4):
+            values += (
+                weight_t[ii]
+                * weight_p[jj]
+                * table["Values"][:, ind_t + ii - 1, ind_p + jj - 1]
+            )
+        # End for jj.
+    # End for ii.
+    # Cells (not limited to the ones with a neighbour on both sides) of the \
+    # points.
+    cell_t = np.clip(
+        np.searchsorted(table["log_temperature"], log_temperature) - 1,
+        0,
+        table["log_temperature"].size - 2,
+    )
+    cell_p = np.clip(
+        np.searchsorted(table["pressure"], pressure) - 1,
+        0,
+        table["pressure"].size - 2,
+    )
+    ind = np.nonzero(table["Fallback"][cell_t, cell_p])[0]
+    if ind.size > 0:
+        values[:, ind] = _eval_fallback(
+            table["Fluid"], np.exp(log_temperature[ind]), pressure[ind]
+        )
+    # End if ind.size.
+    return values
+
+    # end of the function interp_property_table
+
+
+def _eval_fallback(fluid_type, temperature, pressure):
+
+    """
+    Function that evaluates with CoolProp the properties in TABLE_ALIASES in \
+    the points of the cells flagged in key Fallback of the table. Returns an \
+    array of shape (len(TABLE_ALIASES), temperature.size); raises ValueError \
+    if CoolProp can not evaluate a point.
+    """
+
+    if fluid_type not in _abstract_states:
+        _abstract_states[fluid_type] = AbstractState("HEOS", fluid_type)
+    # End if fluid_type.
+    keys = [get_parameter_index(alias) for alias in TABLE_ALIASES]
+    values = np.zeros((len(keys), temperature.size))
+    for ii in range(temperature.size):
+        values[:, ii] = _eval_state(
+            _abstract_states[fluid_type], keys, temperature[ii], pressure[ii]
+        )
+        if np.any(np.isnan(values[:, ii])):
+            raise ValueError(
+                f"ERROR in {interp_property_table.__name__}: CoolProp can not evaluate the properties {[alias for alias, value in zip(TABLE_ALIASES, values[:, ii]) if np.isnan(value)]} of {fluid_type} at T = {temperature[ii]} K, P = {pressure[ii]} Pa.\n"
+            )
+        # End if np.any.
+    # End for ii.
+    return values
+
+    # end of the function _eval_fallback
@@ -0,0 +1,224 @@
+# Functions to build, store and interpolate tables of the properties of the \
+# materials in folder Properties_of_materials on uniform grids in \
+# log(temperature) and magnetic field.
+
+import hashlib
+import inspect
+import numpy as np
+import os
+import warnings
+
+# Default folder of the material tables: at the same level of folder \
+# Simulations_results.
+MATERIAL_TABLES_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "Material_property_tables")
+)
+# Maximum allowed relative error of the tables with respect to the analytic \
+# fits, evaluated in the centers of the cells of the grid.
+MATERIAL_TABLE_TOLERANCE = 1e-3
+# Tables already loaded by the current process, with the same key of the \
+# file name.
+_loaded_material_tables = dict()
+
+
+def get_material_table_name(function, t_range, n_temp, b_range, n_field, args):
+
+    """
+    Function that returns the name of the file of the table of function \
+    (without extension). The name is unique for each function, grid and \
+    additional argument (e.g. RRR) and includes a short hash of the source \
+    file of the function, so that tables are built again if the fits change.
+    """
+
+    with open(inspect.getsourcefile(function), "rb") as reader:
+        source_hash = hashlib.sha1(reader.read()).hexdigest()[:8]
+    name = f"{function.__name__}_T_{t_range[0]:g}_{t_range[1]:g}_{n_temp}"
+    if b_range is not None:
+        name += f"_B_{b_range[0]:g}_{b_range[1]:g}_{n_field}"
+    # End if b_range.
+    for arg in args:
+        name += f"_{arg:g}"
+    # End for arg.
+    return f"{name}_{source_hash}"
+
+    # end of the function get_material_table_name
+
+
+def _eval_material_function(function, temperature, field, args):
+
+    """
+    Function that evaluates function in the points of the 2D arrays \
+    temperature and field (None for functions of temperature only).
+    """
+
+    if field is None:
+        return function(temperature.flatten(), *args).reshape(temperature.shape)
+    else:
+        return function(temperature.flatten(), field.flatten(), *args).reshape(
+            temperature.shape
+        )
+    # End if field.
+
+    # end of the function _eval_material_function
+
+
+def build_material_table(function, t_range, n_temp, b_range=None, n_field=1, args=()):
+
+    """
+    Function that samples function on a grid equally spaced in \
+    log(temperature) and, if b_range is not None, in magnetic field; the \
+    signature of function must be function(temperature, *args) or \
+    function(temperature, field, *args). Returns a dictionary with the grid \
+    (keys log_temperature and field), the sampled values (key Values, array \
+    of shape (n_temp, n_field)), the maximum relative error of the linear \
+    interpolation with respect to function (key Max_error), evaluated in the \
+    centers of the cells of the grid, and the (temperature, field) point where \
+    it is found (key Max_error_point).
+    """
+
+    log_temperature = np.linspace(np.log(t_range[0]), np.log(t_range[1]), n_temp)
+    if b_range is None:
+        field = np.zeros(1)
+    else:
+        field = np.linspace(b_range[0], b_range[1], n_field)
+    # End if b_range.
+    table = dict(log_temperature=log_temperature, field=field)
+    temperature, field_grid = np.meshgrid(np.exp(log_temperature), field, indexing="ij")
+    table["Values"] = _eval_material_function(
+        function, temperature, None if b_range is None else field_grid, args
+    )
+    # Check the accuracy in the centers of the cells.
+    log_temperature_c = (log_temperature[:-1] + log_temperature[1:]) / 2.0
+    if b_range is None:
+        field_c = field
+    else:
+        field_c = (field[:-1] + field[1:]) / 2.0
+    # End if b_range.
+    temperature_c, field_grid_c = np.meshgrid(
+        np.exp(log_temperature_c), field_c, indexing="ij"
+    )
+    field_grid_c = None if b_range is None else field_grid_c
+    reference = _eval_material_function(function, temperature_c, field_grid_c, args)
+    interpolated = interp_material_table(
+        table,
+        temperature_c.flatten(),
+        None if b_range is None else field_grid_c.flatten(),
+    ).reshape(reference.shape)
+    error = np.abs(interpolated - reference) / np.maximum(
+        np.abs(reference), np.finfo(float).tiny
+    )
+    # Largest errors are usually found close to the discontinuities of the \
+    # piecewise fits, so also the point of the maximum error is stored.
+    ind = np.unravel_index(np.nanargmax(error), error.shape)
+    table["Max_error"] = error[ind]
+    table["Max_error_point"] = np.array([temperature_c[ind], field_c[ind[1]]])
+    return table
+
+    # end of the function build_material_table
+
+
+def get_material_table(
+    function,
+    t_range,
+    n_temp,
+    b_range=None,
+    n_field=1,
+    args=(),
+    folder=MATERIAL_TABLES_DIR,
+):
+
+    """
+    Function that returns the table of function. The table is built \
+    (function build_material_table) and saved in folder only the first time; \
+    afterwards it is loaded from the .npz file. A warning is raised if the \
+    accuracy of the table is worse than MATERIAL_TABLE_TOLERANCE.
+    """
+
+    name = get_material_table_name(function, t_range, n_temp, b_range, n_field, args)
+    if name in _loaded_material_tables:
+        return _loaded_material_tables[name]
+    # End if name.
+    path = os.path.join(folder, f"{name}.npz")
+    if not os.path.isfile(path):
+        table = build_material_table(function, t_range, n_temp, b_range, n_field, args)
+        os.makedirs(folder, exist_ok=True)
+        # The file is written with a temporary name and then renamed, so that \
+        # processes running in parallel never read incomplete files.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as writer:
+            np.savez(writer, **table)
+        os.replace(tmp_path, path)
+    # End if not.
+    with np.load(path) as data:
+        table = {key: data[key] for key in data.files}
+    table["Max_error"] = float(table["Max_error"])
+    if table["Max_error"] > MATERIAL_TABLE_TOLERANCE:
+        warnings.warn(
+            f"Table {name}: maximum relative error is {table['Max_error']:.2e} (> {MATERIAL_TABLE_TOLERANCE:.0e}) at T = {table['Max_error_point'][0]:g} K, B = {table['Max_error_point'][1]:g} T; consider a finer grid if the fit is continuous there.\n"
+        )
+    # End if table["Max_error"].
+    _loaded_material_tables[name] = table
+    return table
+
+    # end of the function get_material_table
+
+
+def material_table_report():
+
+    """
+    Function that returns a dictionary with the maximum relative error of \
+    each table loaded by the current process with respect to its analytic \
+    fit and the (temperature, field) point where it is found.
+    """
+
+    return {
+        name: (table["Max_error"], tuple(table["Max_error_point"]))
+        for name, table in _loaded_material_tables.items()
+    }
+
+    # end of the function material_table_report
+
+
+def _uniform_grid_index(grid, coord, label):
+
+    """
+    Function that finds the cell of the uniform grid that contains coord and \
+    the normalized position of coord in the cell; points outside the grid are \
+    clipped to the grid boundary with a warning.
+    """
+
+    if coord.min() < grid[0] or coord.max() > grid[-1]:
+        warnings.warn(
+            f"{label} out of the material table range [{grid[0]:g}, {grid[-1]:g}]; values are clipped.\n"
+        )
+    # End if coord.min().
+    position = np.clip((coord - grid[0]) / (grid[1] - grid[0]), 0.0, grid.size - 1)
+    index = np.minimum(position.astype(int), grid.size - 2)
+    return index, position - index
+
+    # end of the function _uniform_grid_index
+
+
+def interp_material_table(table, temperature, field=None):
+
+    """
+    Function that interpolates linearly table in temperature (and in field \
+    for tables that depend on the magnetic field). Since the grid is uniform \
+    the cells are found without searching.
+    """
+
+    temperature = np.atleast_1d(temperature)
+    ind_t, tt = _uniform_grid_index(
+        table["log_temperature"], np.log(temperature), "log(temperature)"
+    )
+    values = table["Values"]
+    if values.shape[1] == 1:
+        return (1.0 - tt) * values[ind_t, 0] + tt * values[ind_t + 1, 0]
+    # End if values.shape[1].
+    field = np.broadcast_to(field, temperature.shape)
+    ind_b, tb = _uniform_grid_index(table["field"], field, "Magnetic field")
+    return (1.0 - tt) * (
+        (1.0 - tb) * values[ind_t, ind_b] + tb * values[ind_t, ind_b + 1]
+    ) + tt * ((1.0 - tb) * values[ind_t + 1, ind_b] + tb * values[ind_t + 1, ind_b + 1])
+
+    # end of the function interp_material_table
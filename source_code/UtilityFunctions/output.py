@@ -4,6 +4,32 @@ import numpy as np
 import pandas as pd
 import os
 
+from UtilityFunctions.output_writer import submit_output
+
+# Properties saved at the inlet and at the outlet of the fluid components and \
+# headers of the columns of files {ID}_inlet_outlet_te.tsv (see function \
+# save_simulation_time).
+PROPERTIES_INL_OUT = [
+    "velocity",
+    "pressure",
+    "temperature",
+    "total_density",
+    "mass_flow_rate",
+]
+HEADERS_INL_OUT = [
+    "time (s)",
+    "velocity_inl (m/s)",
+    "pressure_inl (Pa)",
+    "temperature_inl (K)",
+    "total_density_inl (kg/m^3)",
+    "mass_flow_rate_inl (kg/s)",
+    "velocity_out (m/s)",
+    "pressure_out (Pa)",
+    "temperature_out (K)",
+    "total_density_out (kg/m^3)",
+    "mass_flow_rate_out (kg/s)",
+]
+
 
 def save_properties(conductor, f_path):
 
@@ -84,7 +110,62 @@ def save_properties(conductor, f_path):
 # end function Save_properties
 
 
-def save_simulation_space(conductor, f_path, n_digit):
+def _space_store_dataset(conductor, f_path, name, size):
+
+    """
+    Function that returns the dataset name of the binary store of the spatial
+    distributions of conductor: a float64 array of shape (len(Space_save), size)
+    saved in file f_path/{name}_sd.npy and memory mapped, with one row for each
+    time at which the spatial distributions are saved. The file is created with
+    its final size the first time the dataset is used, so rows are written
+    directly in place.
+    """
+
+    if conductor.dict_space_store.get(name) is None:
+        if name in conductor.dict_space_store:
+            # The dataset was created before the checkpoint from which the \
+            # simulation is restarted (see module checkpoint): open it again.
+            conductor.dict_space_store[name] = np.lib.format.open_memmap(
+                os.path.join(f_path, f"{name}_sd.npy"), mode="r+"
+            )
+        else:
+            conductor.dict_space_store[name] = np.lib.format.open_memmap(
+                os.path.join(f_path, f"{name}_sd.npy"),
+                mode="w+",
+                dtype=float,
+                shape=(len(conductor.Space_save), size),
+            )
+        # End if name.
+    # End if conductor.dict_space_store.get(name).
+    return conductor.dict_space_store[name]
+
+
+# End function _space_store_dataset.
+
+
+def _write_space_rows(conductor, f_path, row, snapshot):
+
+    """
+    Function that writes the arrays of dictionary snapshot (keys are the names
+    of the datasets) in row row of the datasets of the binary store of the
+    spatial distributions.
+    """
+
+    for name, values in snapshot.items():
+        dataset = _space_store_dataset(conductor, f_path, name, values.size)
+        if row >= dataset.shape[0]:
+            raise ValueError(
+                f"ERROR in {save_simulation_space.__name__}: conductor {conductor.ID} can save only {dataset.shape[0]} spatial distributions (sheet Space of file {conductor.file_input['OUTPUT']}).\n"
+            )
+        # End if row.
+        dataset[row] = values
+    # End for name.
+
+
+# End function _write_space_rows.
+
+
+def save_simulation_space(conductor, f_path, n_digit, writer=None):
 
     """
     Function that save on files with suitable file names transient solution,
@@ -93,321 +174,160 @@ def save_simulation_space(conductor, f_path, n_digit):
     """
 
     # Save transient solution for each Conductors objects at each \
-    # iteration_store iteration. For each conductor component, solution is \
-    # stored in a dedicated file. FluidComponents stored variables are velocity, \
-    # pressure and temperature together with spatial discretization, while for \
-    # SolidComponents only temperature and spatial discretization are stored. \
-    # (cdp, 08/2020)
+    # iteration_store iteration. For each conductor component and property, \
+    # solution is stored in a dedicated dataset of the binary store (files \
+    # {ID}_{property}_sd.npy, one row for each saving time). FluidComponents \
+    # stored variables are velocity, pressure, temperature and density, while \
+    # for SolidComponents only temperature is stored; spatial discretization \
+    # and times are stored in datasets xcoord and time. (cdp, 08/2020)
     # Hypothesis: for different input files parameters there are different \
     # simulation names (cdp, 08/2020)
+    # Values are copied in dictionary snapshot, that is written by writer (if \
+    # not None) while the solution goes on.
 
-    # get the time at which the saving is made
-    time = round(conductor.Space_save[conductor.i_save], n_digit)
     conductor.num_step_save[conductor.i_save] = conductor.cond_num_step
-    # end if len(tt[0]) (cdp, 12/2020)
-    prop_chan = ["xcoord", "velocity", "pressure", "temperature", "total_density"]
-    header_chan = (
-        "xcoord (m)	velocity (m/s)	pressure (Pa)	temperature (K)	total_density (kg/m^3)"
+    snapshot = {
+        name: np.array(values, dtype=float).reshape(-1)
+        for name, values in get_space_snapshot(conductor).items()
+    }
+    submit_output(
+        writer, _write_space_rows, conductor, f_path, conductor.i_save, snapshot
     )
+    # update conductor.i_save (cdp, 01/2021)
+    conductor.i_save = conductor.i_save + 1
+
+
+# end function Save_simulation_space (cdp, 10/2020)
+
+
+def get_space_snapshot(conductor):
+
+    """
+    Function that returns the dictionary of the quantities saved in the
+    spatial distributions (keys are the names of the datasets of the binary
+    store): values are not copied, they are the arrays of the current
+    solution.
+    """
+
+    prop_chan = ["velocity", "pressure", "temperature", "total_density"]
+    snapshot = dict(xcoord=conductor.dict_discretization["xcoord"])
     for fluid_comp in conductor.dict_obj_inventory["FluidComponents"]["Objects"]:
-        file_path = os.path.join(
-            f_path, f"{fluid_comp.ID}_({conductor.cond_num_step})_sd.tsv"
-        )
-        A_chan = np.zeros((conductor.dict_discretization["N_nod"], len(prop_chan)))
-        for ii in range(len(prop_chan)):
-            if prop_chan[ii] == "xcoord":
-                A_chan[:, ii] = conductor.dict_discretization[prop_chan[ii]]
-            else:
-                A_chan[:, ii] = fluid_comp.coolant.dict_node_pt[prop_chan[ii]]
-            # end if prop_chan[ii] (cdp, 01/2021)
-        # end for ii (cdp, 01/2021)
-        with open(file_path, "w") as writer:
-            np.savetxt(writer, A_chan, delimiter="\t", header=header_chan, comments="")
+        for prop in prop_chan:
+            snapshot[f"{fluid_comp.ID}_{prop}"] = fluid_comp.coolant.dict_node_pt[prop]
+        # end for prop (cdp, 01/2021)
     # end for fluid_comp (cdp, 10/2020)
-    # headers_s_comp = "xcoord (m)	temperature (K)	density (kg/m^3)	spec_heat_p (J/kg/K)	ther_cond (W/m/K)	EXFTLX (W/m)	JHTFLX (W/m^2)"
-    # prop_s_comp = ["xcoord", "temperature", "total_density", "total_isobaric_specific_heat", \
-    # 							"total_thermal_conductivity", "EXTFLX", "JHTFLX"]
-    headers_s_comp = "xcoord (m)	temperature (K)"
-    prop_s_comp = ["xcoord", "temperature"]
+    prop_s_comp = ["temperature"]
     for s_comp in conductor.dict_obj_inventory["SolidComponents"]["Objects"]:
-        file_path = os.path.join(
-            f_path, f"{s_comp.ID}_({conductor.cond_num_step})_sd.tsv"
-        )
-        A_s_comp = np.zeros((conductor.dict_discretization["N_nod"], len(prop_s_comp)))
-        for ii in range(len(prop_s_comp)):
-            if prop_s_comp[ii] == "xcoord":
-                A_s_comp[:, ii] = conductor.dict_discretization[prop_s_comp[ii]]
-            else:
-                A_s_comp[:, ii] = s_comp.dict_node_pt[prop_s_comp[ii]]
-                if prop_s_comp[ii] == "EXTFLX" or prop_s_comp[ii] == "JHTFLX":
-                    A_s_comp[:, ii] = s_comp.dict_node_pt[prop_s_comp[ii]][:, 0]
-                # end if prop_s_comp[ii] (cdp, 01/2021)
-            # end if prop_s_comp[ii] (cdp, 01/2021)
-        # end for ii (cdp, 01/2021)
-        with open(file_path, "w") as writer:
-            np.savetxt(
-                writer, A_s_comp, delimiter="\t", header=headers_s_comp, comments=""
-            )
+        for prop in prop_s_comp:
+            snapshot[f"{s_comp.ID}_{prop}"] = s_comp.dict_node_pt[prop]
+        # end for prop (cdp, 01/2021)
     # end for s_comp (cdp, 10/2020)
-    # Check if dictionary conductor.heat_rad_jk is not empty in order to save the content in a file.
-    if bool(conductor.heat_rad_jk):
-        # Build path to save temporary file with the spatial distribution of the heat exchanged by radiation between jackets at each required time step.
-        f_path_heat_rad = os.path.join(
-            f_path, f"Heat_rad_inner_({conductor.cond_num_step})_sd.tsv"
-        )
-        # Build the dataframe from dictionary and save it as tsv file.
-        pd.DataFrame.from_dict(conductor.heat_rad_jk, dtype=float).to_csv(
-            f_path_heat_rad, sep="\t", index=False, header=True
-        )
-    
-    if bool(conductor.heat_exchange_jk_env):
-        # Build path to save temporary file with the spatial distribution of the heat exchanged by convection and/or radiation between outer surface of the conductor and the environment at each required time step.
-        f_path_ex_jk_env = os.path.join(
-            f_path, f"Heat_exch_env_({conductor.cond_num_step})_sd.tsv"
-        )
-        # Build the dataframe from dictionary and save it as tsv file.
-        pd.DataFrame.from_dict(conductor.heat_exchange_jk_env, dtype=float).to_csv(
-            f_path_ex_jk_env, sep="\t", index=False, header=True
-        )
+    # Spatial distribution of the heat exchanged by radiation between jackets \
+    # and of the heat exchanged by convection and/or radiation between outer \
+    # surface of the conductor and the environment.
+    for radix, dict_heat in (
+        ("Heat_rad", conductor.heat_rad_jk),
+        ("Heat_exch", conductor.heat_exchange_jk_env),
+    ):
+        for key, value in dict_heat.items():
+            snapshot[f"{radix}_{key}"] = value
+        # End for key.
+    # End for radix.
 
     # Save the actual times at which the simulation spatial distributions are \
     # saved (cdp, 01/2021)
-    file_name = "Time_sd_actual.tsv"
-    path_save = os.path.join(f_path, file_name)
-    if conductor.i_save == 0:
-        with open(path_save, "w") as writer:
-            np.savetxt(
-                writer,
-                np.array([conductor.cond_time[-1]]),
-                header="time (s)",
-                comments="",
-                delimiter="\t",
-            )
-    else:
-        with open(path_save, "a") as writer:
-            np.savetxt(
-                writer, np.array([conductor.cond_time[-1]]), comments="", delimiter="\t"
-            )
-    # end if conductor.i_save (cdp, 01/2021)
-    # update conductor.i_save (cdp, 01/2021)
-    conductor.i_save = conductor.i_save + 1
+    snapshot["time"] = conductor.cond_time[-1]
+    return snapshot
 
 
-# end function Save_simulation_space (cdp, 10/2020)
+# End function get_space_snapshot.
 
 
-def reorganize_spatial_distribution(cond, f_path, n_digit):
+def close_space_store(cond):
+
     """
-    Function that reorganizes the files of the spatial distribution collecting in a single file for each property the spatial distribution at user defined times. In this way the file format is like the ones of the time evolution and this should simplify plots and furter data analysis. (cdp, 11/2020)
+    Function that flushes to disk the datasets of the binary store of the
+    spatial distributions and releases the memory maps.
     """
-    list_ch_key = ["velocity", "pressure", "temperature", "total_density"]
-    # list_sol_key = ["temperature", "total_density", "total_isobaric_specific_heat", "total_thermal_conductivity", \
-    # 							 "EXTFLX", "JHTFLX"]
-    list_sol_key = ["temperature"]
-    # lists all the file .tsv in subfolder Space (cdp, 11/2020)
-    # Round the time to save to n_digit digits only once
-    time = np.around(cond.Space_save, n_digit)
-    # loop on FluidComponents (cdp, 11/2020)
-    for fluid_comp in cond.dict_obj_inventory["FluidComponents"]["Objects"]:
-        # create a list of files that have the fluid_comp.ID and User in the name \
-        # exploiting list compreension: these files are the ones that will be \
-        # reorganized by this function (cdp, 11/2020)
-        # list_ch_file = [ff for ff in list_file if (fluid_comp.ID in ff and "User" in ff)]
-        # declare the dictionary of data frame (cdp, 11/2020)
-        dict_df = dict()
-        dict_df_new = dict()
-        if fluid_comp.ID == cond.dict_obj_inventory["FluidComponents"]["Objects"][0].ID:
-            # declare dictionary to store the spatial diccretizations only once \
-            # (cdp, 01/2021)
-            dict_xcoord = dict()
-        # end if fluid_comp (cdp, 01/2021)
-        for ii in range(len(cond.Space_save)):
-            file_name = f"{fluid_comp.ID}_({cond.num_step_save[ii]})_sd.tsv"
-            file_load = os.path.join(f_path, file_name)
-            # Load file file_name as data frame as a value of dictionary \
-            # corresponding to key file_name (cdp, 11/2020)
-            dict_df[file_name] = pd.read_csv(
-                filepath_or_buffer=file_load, delimiter="\t"
-            )
-            # Delete the old file format.
-            os.remove(file_load)
-            if (
-                fluid_comp.ID
-                == cond.dict_obj_inventory["FluidComponents"]["Objects"][0].ID
-            ):
-                # store the spatial discretizations at each required time step in file \
-                # xcoord.tsv only once (cdp,01/2021)
-                dict_xcoord[f"time = {time[ii]} (s)"] = dict_df[file_name]["xcoord (m)"]
-            # end if fluid_comp.ID (cdp, 01/2021)
-            if ii == 0:
-                # get columns names only the first time (cdp, 11/2020)
-                header = list(dict_df[file_name].columns.values.tolist())
-                for jj in range(len(list_ch_key)):
-                    prop = list_ch_key[jj]
-                    # decompose the data frame in four dataframes (cdp, 11/2020)
-                    dict_df_new[prop] = dict_df[file_name].filter(
-                        items=[header[jj + 1]]
-                    )
-                    # rename data frames columns (cdp, 11/2020)
-                    dict_df_new[prop].rename(
-                        columns={header[jj + 1]: f"time = {time[ii]} (s)"}, inplace=True
-                    )
-                # end for jj (cdp, 11/2020)
-            else:
-                for jj in range(len(list_ch_key)):
-                    prop = list_ch_key[jj]
-                    # construct the new data frames with concat method (cdp, 11/2020)
-                    dict_df_new[prop] = pd.concat(
-                        [
-                            dict_df_new[prop],
-                            dict_df[file_name].filter(items=[header[jj + 1]]),
-                        ],
-                        axis=1,
-                    )
-                    dict_df_new[prop].rename(
-                        columns={header[jj + 1]: f"time = {time[ii]} (s)"}, inplace=True
-                    )
-                # end for jj (cdp, 11/2020)
-            # end if ii (cdp, 11/2020)
-        # end for ii (cdp, 11/2020)
-        # for loop to save the new data frame (cdp, 11/2020)
-        for prop in list_ch_key:
-            # build file name (cdp, 11/2020)
-            file_name = f"{fluid_comp.ID}_{prop}_sd.tsv"
-            # build path to save the file (cdp, 11/2020)
-            path_save = os.path.join(f_path, file_name)
-            # save the data frame, without the row index name (cdp, 11/2020)
-            dict_df_new[prop].to_csv(path_save, sep="\t", index=False)
-        # end for prop (cdp, 11/2020)
-        if fluid_comp.ID == cond.dict_obj_inventory["FluidComponents"]["Objects"][0].ID:
-            # convert the dictionary to a DataFrame (cdp,01/2021)
-            df_xcoord = pd.DataFrame(dict_xcoord)
-            # build file name (cdp, 01/2021)
-            file_name = f"xcoord.tsv"
-            path_save = os.path.join(f_path, file_name)
-            # save the DataFrame as file xcoord.tsv
-            df_xcoord.to_csv(path_save, sep="\t", index=False)
-            # end if fluid_comp.ID (cdp, 01/2021)
-    # end for fluid_comp (cdp, 11/2020)
-    # loop on SolidComponents (cdp, 11/2020)
-    for s_comp in cond.dict_obj_inventory["SolidComponents"]["Objects"]:
-        # declare the dictionary of data frame (cdp, 11/2020)
-        dict_df = dict()
-        dict_df_new = dict()
-        for ii in range(len(cond.Space_save)):
-            file_name = f"{s_comp.ID}_({cond.num_step_save[ii]})_sd.tsv"
-            file_load = os.path.join(f_path, file_name)
-            # Load file file_name as data frame as a value of dictionary \
-            # corresponding to key file_name (cdp, 11/2020)
-            dict_df[file_name] = pd.read_csv(
-                filepath_or_buffer=file_load, delimiter="\t"
-            )
-            # Delete the old file format.
-            os.remove(file_load)
-            if ii == 0:
-                # get columns names only the first time (cdp, 11/2020)
-                header = list(dict_df[file_name].columns.values.tolist())
-                for jj in range(len(list_sol_key)):
-                    prop = list_sol_key[jj]
-                    # decompose the data frame in four dataframes (cdp, 11/2020)
-                    dict_df_new[prop] = dict_df[file_name].filter(
-                        items=[header[jj + 1]]
-                    )
-                    # rename data frames columns (cdp, 11/2020)
-                    dict_df_new[prop].rename(
-                        columns={header[jj + 1]: f"time = {time[ii]} (s)"}, inplace=True
-                    )
-            else:
-                for jj in range(len(list_sol_key)):
-                    prop = list_sol_key[jj]
-                    # construct the new data frames with concat method (cdp, 11/2020)
-                    dict_df_new[prop] = pd.concat(
-                        [
-                            dict_df_new[prop],
-                            dict_df[file_name].filter(items=[header[jj + 1]]),
-                        ],
-                        axis=1,
-                    )
-                    dict_df_new[prop].rename(
-                        columns={header[jj + 1]: f"time = {time[ii]} (s)"}, inplace=True
-                    )
-            # end if ii (cdp, 11/2020)
-        # end for ii (cdp, 11/2020)
-        # for loop to save the new data frame (cdp, 11/2020)
-        for prop in list_sol_key:
-            # build file name (cdp, 11/2020)
-            file_name = f"{s_comp.ID}_{prop}_sd.tsv"
-            # build path to save the file (cdp, 11/2020)
-            path_save = os.path.join(f_path, file_name)
-            # save the data frame, without the row index name (cdp, 11/2020)
-            dict_df_new[prop].to_csv(path_save, sep="\t", index=False)
-    # end for s_comp (cdp, 11/2020)
 
-    # Manage files with heat exhanged between inner jackets by radiation.
-    reorganize_heat_sd(cond, f_path, "Heat_rad_inner", "Heat_rad", n_digit)
-    # Manage files with heat exhanged between outer onductor surface and environment by concection and/or radiation.
-    reorganize_heat_sd(cond, f_path, "Heat_exch_env", "Heat_exch", n_digit)
+    for dataset in cond.dict_space_store.values():
+        if dataset is not None:
+            dataset.flush()
+        # End if dataset.
+    # End for dataset.
+    cond.dict_space_store.clear()
 
 
-# end function Reorganize_spatial_distribution (cdp, 11/2020)
+# End function close_space_store.
 
 
-def reorganize_heat_sd(cond, f_path, radix_old, radix_new, n_digit):
-    """Function that reorganizes the files with the spatial distribution of the heat exchanged between inner jackets by radiation and between the outer surface of the conductor and the environment by convection and/or radiation.
+def load_space_store(f_path, name, n_save=None):
+
+    """
+    Function that loads dataset name of the binary store of the spatial
+    distributions in folder f_path (memory mapped, read only); only the first
+    n_save rows (saved spatial distributions) are returned if n_save is given.
+    """
+
+    dataset = np.load(os.path.join(f_path, f"{name}_sd.npy"), mmap_mode="r")
+    return dataset if n_save is None else dataset[:n_save]
 
-    N.B. Questa funzione potrebbe essere adattata anche per riorganizzare i file delle distribuzioni spaziali dei componenti (deriva da questa con qualche semplificazione). Mi sembra troppo complicata: vedere se possibile semplificare.
 
-    Args:
-        cond ([type]): [description]
-        f_path ([type]): [description]
-        radix_old ([type]): [description]
-        radix_new ([type]): [description]
+# End function load_space_store.
+
+
+def export_spatial_distribution(cond, f_path, n_digit):
     """
-    old = dict()
-    new = dict()
-    cols = list()
+    Function that exports the binary store of the spatial distributions to the .tsv files used by the plots and for furter data analysis: for each component and property a file with one column for each saving time (file format like the ones of the time evolution), file xcoord.tsv with the spatial discretizations and file Time_sd_actual.tsv with the actual saving times. (cdp, 11/2020)
+    """
+    close_space_store(cond)
+    # Round the time to save to n_digit digits only once
     time = np.around(cond.Space_save, n_digit)
-    for ii in range(len(cond.Space_save)):
-        file_name = f"{radix_old}_({cond.num_step_save[ii]})_sd.tsv"
-        file_load = os.path.join(f_path, file_name)
-        # Check if file exist and if True load it.
-        if os.path.isfile(file_load):
-            old[file_name] = pd.read_csv(file_load, delimiter="\t")
-            # Delete the old file format.
-            os.remove(file_load)
-            if ii == 0:
-                # get columns names only the first time.
-                cols = old[file_name].columns.values.tolist()
-                for col in cols:
-                    # decompose the old dataframe in a sub set of dataframes.
-                    new[col] = old[file_name].filter(items=[col])
-                    # rename dataframes columns.
-                    new[col].rename(
-                        columns={col: f"time = {time[ii]} (s)"}, inplace=True
-                    )
-            else:
-                for col in cols:
-                    # construct the new dataframes with concat method (cdp, 11/2020)
-                    new[col] = pd.concat(
-                        [new[col], old[file_name].filter(items=[col])], axis="columns"
-                    )
-                    new[col].rename(
-                        columns={col: f"time = {time[ii]} (s)"}, inplace=True
-                    )
-            # end if ii (cdp, 11/2020)
-        # End os.path.isfile.
-    # end for ii (cdp, 11/2020)
-    # for loop to save the new data frame (cdp, 11/2020)
-    for col in cols:
-        # build file name (cdp, 11/2020)
-        file_name = f"{radix_new}_{col}_sd.tsv"
-        # build path to save the file (cdp, 11/2020)
-        path_save = os.path.join(f_path, file_name)
-        # save the data frame, without the row index name (cdp, 11/2020)
-        new[col].to_csv(path_save, sep="\t", index=False)
-
-
-# end function reorganize_heat_sd.
+    columns = [f"time = {time[ii]} (s)" for ii in range(cond.i_save)]
+    names = ["xcoord"]
+    names.extend(
+        f"{fluid_comp.ID}_{prop}"
+        for fluid_comp in cond.dict_obj_inventory["FluidComponents"]["Objects"]
+        for prop in ["velocity", "pressure", "temperature", "total_density"]
+    )
+    names.extend(
+        f"{s_comp.ID}_temperature"
+        for s_comp in cond.dict_obj_inventory["SolidComponents"]["Objects"]
+    )
+    names.extend(f"Heat_rad_{key}" for key in cond.heat_rad_jk)
+    names.extend(f"Heat_exch_{key}" for key in cond.heat_exchange_jk_env)
+    names.append("time")
+    write_spatial_distribution(
+        f_path,
+        {name: load_space_store(f_path, name, cond.i_save) for name in names},
+        columns,
+    )
+
+
+# end function export_spatial_distribution (cdp, 11/2020)
+
+
+def write_spatial_distribution(f_path, dict_data, columns):
+    """
+    Function that writes in folder f_path the .tsv files of the spatial distributions in dictionary dict_data (keys are the names of the datasets, values are arrays with one row for each saving time): one file for each name with columns named as in list columns, file xcoord.tsv with the spatial discretizations and file Time_sd_actual.tsv with the actual saving times (key time).
+    """
+    for name, data in dict_data.items():
+        if name == "time":
+            with open(os.path.join(f_path, "Time_sd_actual.tsv"), "w") as writer:
+                np.savetxt(writer, data, header="time (s)", comments="", delimiter="\t")
+            # End with.
+        else:
+            # File xcoord.tsv keeps its historical name.
+            file_name = "xcoord.tsv" if name == "xcoord" else f"{name}_sd.tsv"
+            # save the data frame, without the row index name (cdp, 11/2020)
+            pd.DataFrame(data.T, columns=columns).to_csv(
+                os.path.join(f_path, file_name), sep="\t", index=False
+            )
+        # End if name.
+    # End for name.
+
+
+# End function write_spatial_distribution.
 
 
 def save_simulation_time(simulation, conductor):
@@ -416,278 +336,223 @@ def save_simulation_time(simulation, conductor):
     Function to save time evolution of velocity, pressure, temperature, inlet
     and outlet mass flowrate of channels; temperature, magnetic field and
     current sharing temperature of strands and jackets temperature. (cdp, 08/2020)
+    Values are collected in buffers of conductor.CHUNCK_SIZE rows (one column
+    for the time and one for each probe): a full buffer is written to file
+    with a single write.
     """
 
-    # At each time step find the index corresponding to the maximum node \
-    # lower or equal to the user defined coordinate. This is done at each \
-    # time step since the spatial discretization may change and/or user may \
-    # modify the spatial coordinates wrt which saving the variables (cdp, 08/2020)
-
-    ind_xcoord = {
-        f"xcoord = {conductor.Time_save[ii]} (m)": np.max(
-            np.nonzero(
-                conductor.dict_discretization["xcoord"] <= conductor.Time_save[ii]
-            )
-        )
-        for ii in range(conductor.Time_save.size)
-    }
+    # Indexes of the maximum nodes lower or equal to the user defined \
+    # coordinates; evaluated again only if the spatial discretization changes.
+    index = get_probe_index(conductor)
+    # Files are written by simulation.output_writer (if not None) while the \
+    # solution goes on.
+    writer = simulation.output_writer
     # construct file header only once (cdp, 08/2020)
     if simulation.num_step == 0:
         headers = ["time (s)"]
-        headers.extend([str(key) for key in ind_xcoord.keys()])
-        headers_inl_out = [
-            "time (s)",
-            "velocity_inl (m/s)",
-            "pressure_inl (Pa)",
-            "temperature_inl (K)",
-            "total_density_inl (kg/m^3)",
-            "mass_flow_rate_inl (kg/s)",
-            "velocity_out (m/s)",
-            "pressure_out (Pa)",
-            "temperature_out (K)",
-            "total_density_out (kg/m^3)",
-            "mass_flow_rate_out (kg/s)",
-        ]
+        headers.extend([f"xcoord = {xcoord} (m)" for xcoord in conductor.Time_save])
+        conductor.dict_probe["row"] = 0
         for f_comp in conductor.dict_obj_inventory["FluidComponents"]["Objects"]:
             # Loop on velocity, pressure, temperature and total density.
-            for key, value in f_comp.coolant.time_evol.items():
-                # Inizialize dictionary corresponding to key to a dictionary of empty lists for the first time.
-                f_comp.coolant.time_evol[key] = initialize_dictionaty_te(
-                    value, ind_xcoord
+            for key in f_comp.coolant.time_evol.keys():
+                # Allocate the buffer corresponding to key.
+                f_comp.coolant.time_evol[key] = np.zeros(
+                    (conductor.CHUNCK_SIZE, len(headers))
                 )
                 # Save the headings only ones.
-                pd.DataFrame(columns=headers).to_csv(
+                submit_output(
+                    writer,
+                    _write_tsv_header,
                     os.path.join(
                         simulation.dict_path[f"Output_Time_{conductor.ID}_dir"],
                         f"{f_comp.ID}_{key}_te.tsv",
                     ),
-                    sep="\t",
-                    index=False,
-                    header=True,
+                    headers,
                 )
             # End for key.
+            f_comp.coolant.time_evol_io = np.zeros(
+                (conductor.CHUNCK_SIZE, len(HEADERS_INL_OUT))
+            )
             # Save the headings only ones.
-            pd.DataFrame(columns=headers_inl_out).to_csv(
+            submit_output(
+                writer,
+                _write_tsv_header,
                 os.path.join(
                     simulation.dict_path[f"Output_Time_{conductor.ID}_dir"],
                     f"{f_comp.ID}_inlet_outlet_te.tsv",
                 ),
-                sep="\t",
-                index=False,
-                header=True,
+                HEADERS_INL_OUT,
             )
         # End for f_comp.
         for s_comp in conductor.dict_obj_inventory["SolidComponents"]["Objects"]:
-            # Loop on velocity, pressure, temperature and total density.
-            for key, value in s_comp.time_evol.items():
-                # Inizialize dictionary corresponding to key to a dictionary of empty lists for the first time.
-                s_comp.time_evol[key] = initialize_dictionaty_te(value, ind_xcoord)
+            # Loop on temperature, magnetic field and current sharing temperature.
+            for key in s_comp.time_evol.keys():
+                # Allocate the buffer corresponding to key.
+                s_comp.time_evol[key] = np.zeros((conductor.CHUNCK_SIZE, len(headers)))
                 # Save the headings only ones.
-                pd.DataFrame(columns=headers).to_csv(
+                submit_output(
+                    writer,
+                    _write_tsv_header,
                     os.path.join(
                         simulation.dict_path[f"Output_Time_{conductor.ID}_dir"],
                         f"{s_comp.ID}_{key}_te.tsv",
                     ),
-                    sep="\t",
-                    index=False,
-                    header=True,
+                    headers,
                 )
             # End for key.
         # End for s_comp.
     # End if simulation.num_step (cdp, 10/2020)
 
-    # convert conductor.cond_time list to np.array (cdp, 10/2020)
-    time = np.array(conductor.cond_time[-1])
+    time = conductor.cond_time[-1]
+    # Row of the buffers to be filled and number of filled rows.
+    row = conductor.dict_probe["row"]
+    n_row = row + 1
+    flag_tend = (
+        abs(conductor.cond_time[-1] - simulation.transient_input["TEND"])
+        / simulation.transient_input["TEND"]
+        <= 1e-6
+    )
 
     # FluidComponents objects (cdp, 08/2020)
     for fluid_comp in conductor.dict_obj_inventory["FluidComponents"]["Objects"]:
         # Loop on velocity, pressure, temperature and total density.
-        for key, value in fluid_comp.coolant.time_evol.items():
-            # Update the contend of the dictionary of lists with propertiy values at selected xcoord and current time.
-            fluid_comp.coolant.time_evol[key] = update_values(
-                value, fluid_comp.coolant.dict_node_pt[key], time, ind_xcoord
-            )
-            # Write the content of the dictionary to file, if conditions are satisfied.
-            fluid_comp.coolant.time_evol[key] = save_te_on_file(
-                conductor,
-                fluid_comp.coolant.time_evol[key],
+        for key, buffer in fluid_comp.coolant.time_evol.items():
+            # Gather the property values at the probes.
+            buffer[row, 0] = time
+            buffer[row, 1:] = fluid_comp.coolant.dict_node_pt[key][index]
+            # Write the buffer to file, if conditions are satisfied.
+            fluid_comp.coolant.time_evol[key] = _save_te_buffer(
+                buffer,
+                n_row,
                 os.path.join(
                     simulation.dict_path[f"Output_Time_{conductor.ID}_dir"],
                     f"{fluid_comp.ID}_{key}_te.tsv",
                 ),
-                simulation.transient_input["TEND"],
-                ind_xcoord,
+                flag_tend,
+                writer,
             )
         # End for key.
 
-        # Inlet and outlet quantities (cdp, 08/2020)
-        file_name_io = os.path.join(
-            simulation.dict_path[f"Output_Time_{conductor.ID}_dir"],
-            f"{fluid_comp.ID}_inlet_outlet_te.tsv",
-        )
-        fluid_comp.coolant.time_evol_io["time (s)"].append(time)
-        # Append inlet properties to list; use dict.update to avoid error (do not understood why with fluid_comp.coolant.time_evol_io.update does not work).
-        dict.update(
-            {
-                key: value.append(
-                    fluid_comp.coolant.dict_node_pt[key.split("_inl")[0]][0]
-                )
-                for key, value in fluid_comp.coolant.time_evol_io.items()
-                if "inl" in key
-            }
-        )
-        # Append outlet properties to list.
-        dict.update(
-            {
-                key: value.append(
-                    fluid_comp.coolant.dict_node_pt[key.split("_out")[0]][-1]
-                )
-                for key, value in fluid_comp.coolant.time_evol_io.items()
-                if "out" in key
-            }
+        # Inlet and outlet quantities (cdp, 08/2020): the row is viewed as \
+        # a (2, n_prop) array, with inlet values in the first row and outlet \
+        # values in the second one.
+        buffer = fluid_comp.coolant.time_evol_io
+        buffer[row, 0] = time
+        values_io = buffer[row, 1:].reshape(2, -1)
+        for ii, prop in enumerate(PROPERTIES_INL_OUT):
+            values_io[:, ii] = fluid_comp.coolant.dict_node_pt[prop][[0, -1]]
+        # End for ii.
+        # Write the buffer to file, if conditions are satisfied.
+        fluid_comp.coolant.time_evol_io = _save_te_buffer(
+            buffer,
+            n_row,
+            os.path.join(
+                simulation.dict_path[f"Output_Time_{conductor.ID}_dir"],
+                f"{fluid_comp.ID}_inlet_outlet_te.tsv",
+            ),
+            flag_tend,
+            writer,
         )
-        # Write the content of the dictionary to file, if conditions are satisfied.
-        if len(fluid_comp.coolant.time_evol_io["time (s)"]) == conductor.CHUNCK_SIZE:
-            pd.DataFrame(
-                fluid_comp.coolant.time_evol_io,
-                columns=list(fluid_comp.coolant.time_evol_io.keys()),
-                dtype=float,
-            ).to_csv(
-                file_name_io,
-                sep="\t",
-                mode="a",
-                chunksize=conductor.CHUNCK_SIZE,
-                index=False,
-                header=False,
-            )
-            # Initialize empty dictionary.
-            fluid_comp.coolant.time_evol_io.update(
-                {key: list() for key in fluid_comp.coolant.time_evol_io.keys()}
-            )
-        elif (
-            abs(conductor.cond_time[-1] - simulation.transient_input["TEND"])
-            / simulation.transient_input["TEND"]
-            <= 1e-6
-        ):
-            pd.DataFrame(
-                fluid_comp.coolant.time_evol_io,
-                columns=list(fluid_comp.coolant.time_evol_io.keys()),
-                dtype=float,
-            ).to_csv(
-                file_name_io,
-                sep="\t",
-                mode="a",
-                chunksize=conductor.CHUNCK_SIZE,
-                index=False,
-                header=False,
-            )
-        # End if len().
     # End for fluid_comp.
 
     # SolidComponents objects (cdp, 08/2020)
     for s_comp in conductor.dict_obj_inventory["SolidComponents"]["Objects"]:
-        for key, value in s_comp.time_evol.items():
-            # Update the contend of the dictionary of lists with propertiy values at selected xcoord and current time.
-            s_comp.time_evol[key] = update_values(
-                value, s_comp.dict_node_pt[key], time, ind_xcoord
-            )
-            # Write the content of the dictionary to file, if conditions are satisfied.
-            s_comp.time_evol[key] = save_te_on_file(
-                conductor,
-                s_comp.time_evol[key],
+        for key, buffer in s_comp.time_evol.items():
+            # Gather the property values at the probes.
+            buffer[row, 0] = time
+            buffer[row, 1:] = s_comp.dict_node_pt[key][index]
+            # Write the buffer to file, if conditions are satisfied.
+            s_comp.time_evol[key] = _save_te_buffer(
+                buffer,
+                n_row,
                 os.path.join(
                     simulation.dict_path[f"Output_Time_{conductor.ID}_dir"],
                     f"{s_comp.ID}_{key}_te.tsv",
                 ),
-                simulation.transient_input["TEND"],
-                ind_xcoord,
+                flag_tend,
+                writer,
             )
         # End for key.
     # End for s_comp.
+    # Full buffers are written and replaced: restart from the first row.
+    conductor.dict_probe["row"] = n_row % conductor.CHUNCK_SIZE
 
-    if (
-        abs(conductor.cond_time[-1] - simulation.transient_input["TEND"])
-        / simulation.transient_input["TEND"]
-        <= 1e-6
-    ):
+    if flag_tend:
         # TEND is reached: save the conductor time in file Time.tsv exploiting pandas series
-        pd.Series(conductor.cond_time, name="time (s)", dtype=float).to_csv(
+        submit_output(
+            writer,
+            _write_time,
             os.path.join(
                 simulation.dict_path[f"Output_Time_{conductor.ID}_dir"], "Time.tsv"
             ),
-            sep="\t",
-            header=True,
-            index=False,
+            np.array(conductor.cond_time, dtype=float),
         )
-    # End if abs.
+    # End if flag_tend.
 
 
 # end function Save_simulation_time (cdp, 08/2020)
 
 
-def initialize_dictionaty_te(val, ind_xcoord):
+def get_probe_index(conductor):
+    """Function that evaluates the indexes of the maximum nodes lower or equal to the coordinates conductor.Time_save at which the time evolutions are saved. Indexes are stored in dictionary conductor.dict_probe together with a copy of the spatial discretization: they are evaluated again only if the spatial discretization changes."""
 
-    val = {"time (s)": list()}
-    val.update({key: list() for key in ind_xcoord.keys()})
-    return val
+    probe = conductor.dict_probe
+    xcoord = conductor.dict_discretization["xcoord"]
+    if probe["xcoord"] is None or not np.array_equal(probe["xcoord"], xcoord):
+        # xcoord is sorted in ascending order.
+        probe["index"] = np.searchsorted(xcoord, conductor.Time_save, side="right") - 1
+        probe["xcoord"] = np.array(xcoord, copy=True)
+    # End if probe["xcoord"].
+    return probe["index"]
 
 
-# End function initialize_dictionaty_te.
+# End function get_probe_index.
 
 
-def update_values(val, prop, time, ind_xcoord):
+def _save_te_buffer(buffer, n_row, file_name, flag_tend, writer=None):
+    """Function that writes the first n_row rows of buffer to file file_name if buffer is full or if TEND is reached. A full buffer is handed to writer and replaced by a new one, that is returned; otherwise buffer is returned."""
 
-    val["time (s)"].append(time)
-    # Use dict.update to avoid error (do not understood why with val.update does not work).
-    dict.update(
-        {
-            key: value.append(prop[ind_xcoord[key]])
-            for key, value in val.items()
-            if "xcoord" in key
-        }
-    )
-    return val
+    if n_row == buffer.shape[0]:
+        # buffer is not modified after the submission: it is replaced below.
+        submit_output(writer, _append_tsv_rows, file_name, buffer)
+        buffer = np.zeros_like(buffer)
+    elif flag_tend:
+        submit_output(writer, _append_tsv_rows, file_name, buffer[:n_row].copy())
+    # End if n_row.
+    return buffer
 
 
-# End function update_values.
+# End function _save_te_buffer.
 
 
-def save_te_on_file(conductor, val, file_name, tend, ind_xcoord):
-    """Function that saves the time evolution of selectet variables at given saptial coordinates.
+def _write_tsv_header(file_name, headers):
+    """Function that creates file file_name with the headers of the columns only."""
+    pd.DataFrame(columns=headers).to_csv(file_name, sep="\t", index=False, header=True)
 
-    Args:
-        conductor ([type]): [description]
-        df ([type]): [description]
-        file_name ([type]): [description]
-        tend ([type]): [description]
 
-    Returns:
-        [type]: [description]
-    """
-    if len(val["time (s)"]) == conductor.CHUNCK_SIZE:
-        pd.DataFrame(val, columns=list(val.keys()), dtype=float).to_csv(
-            file_name,
-            sep="\t",
-            mode="a",
-            chunksize=conductor.CHUNCK_SIZE,
-            index=False,
-            header=False,
-        )
-        val = initialize_dictionaty_te(val, ind_xcoord)
-    elif abs(conductor.cond_time[-1] - tend) / tend <= 1e-6:
-        pd.DataFrame(val, columns=list(val.keys()), dtype=float).to_csv(
-            file_name,
-            sep="\t",
-            mode="a",
-            chunksize=conductor.CHUNCK_SIZE,
-            index=False,
-            header=False,
+# End function _write_tsv_header.
+
+
+def _append_tsv_rows(file_name, values):
+    """Function that appends to file file_name the rows of the 2D array values with a single write; values are formatted like in the files written by pandas."""
+    with open(file_name, "a") as f_out:
+        f_out.write(
+            "".join("\t".join(map(repr, row)) + "\n" for row in values.tolist())
         )
-    # End if len(df.index).
-    return val
+    # End with.
+
+
+# End function _append_tsv_rows.
+
+
+def _write_time(file_name, time):
+    """Function that saves the times of the simulation in file file_name."""
+    pd.Series(time, name="time (s)", dtype=float).to_csv(
+        file_name, sep="\t", header=True, index=False
+    )
 
 
-# End function save_te_on_file.
+# End function _write_time.
 
 
 def save_convergence_data(cond, f_path, *n_digit, space_conv=True):
@@ -0,0 +1,93 @@
+# Class of the thread that writes the simulation output (time evolutions and \
+# spatial distributions) in background, so that the solution of the transient \
+# does not wait for the disk.
+
+import queue
+import threading
+
+
+class OutputWriter(threading.Thread):
+    """Thread that executes in order the output functions submitted by the solver. Functions are stored in a bounded queue: if the queue is full, method submit waits until the thread makes room (backpressure), so memory can not grow without limit. Arguments of the submitted functions must not be modified after the submission (use copies of the arrays). The first error raised by a function is raised again in the main thread by the following call to submit, flush or close."""
+
+    # Default maximum number of functions waiting in the queue.
+    QUEUE_SIZE = 64
+
+    def __init__(self, queue_size=QUEUE_SIZE):
+        # Daemon thread: it does not keep alive the process if the solver \
+        # stops with an error.
+        super().__init__(name="OutputWriter", daemon=True)
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.error = None
+        self.start()
+
+    # End method __init__.
+
+    def run(self):
+        """Method that executes the submitted functions until None is found in the queue; after an error the remaining functions are discarded."""
+        while True:
+            task = self.queue.get()
+            try:
+                if task is None:
+                    return
+                # End if task.
+                if self.error is None:
+                    function, args = task
+                    function(*args)
+                # End if self.error.
+            except Exception as err:
+                self.error = err
+            finally:
+                self.queue.task_done()
+            # End try.
+        # End while.
+
+    # End method run.
+
+    def _raise_error(self):
+        """Method that raises in the calling thread the error of the writer thread, if any."""
+        if self.error is not None:
+            raise RuntimeError(
+                f"ERROR in thread {self.name}: output not saved.\n"
+            ) from self.error
+        # End if self.error.
+
+    # End method _raise_error.
+
+    def submit(self, function, *args):
+        """Method that adds function(*args) to the queue, waiting if the queue is full."""
+        self._raise_error()
+        if not self.is_alive():
+            raise RuntimeError(f"ERROR in thread {self.name}: writer is closed.\n")
+        # End if not.
+        self.queue.put((function, args))
+
+    # End method submit.
+
+    def flush(self):
+        """Method that waits until all the submitted functions are executed."""
+        self.queue.join()
+        self._raise_error()
+
+    # End method flush.
+
+    def close(self):
+        """Method that executes all the submitted functions and stops the thread."""
+        if self.is_alive():
+            self.queue.put(None)
+            self.join()
+        # End if self.is_alive.
+        self._raise_error()
+
+    # End method close.
+
+
+def submit_output(writer, function, *args):
+    """Function that submits function(*args) to writer or, if writer is None, executes it immediately."""
+    if writer is None:
+        function(*args)
+    else:
+        writer.submit(function, *args)
+    # End if writer.
+
+
+# End function submit_output.
@@ -1,15 +1,25 @@
 import matplotlib
+import os
 
-matplotlib.use("TkAgg")
+# The interactive backend is used only if no backend is selected with the \
+# environment variable MPLBACKEND (e.g. MPLBACKEND=Agg on machines without \
+# display, see simulation_batch.py).
+if "MPLBACKEND" not in os.environ:
+    matplotlib.use("TkAgg")
 import matplotlib.pyplot as plt
 
 # from matplotlib import animation as animation
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import os
 import numpy as np
 import pandas as pd
+import time
 import warnings
 
+from UtilityFunctions.figure_pool import render_figures
+
+# Minimum wall time (s) between two redraws of the real time plots: the \
+# solution goes on between the redraws, that are made at most at 2 Hz.
+RTP_DRAW_INTERVAL = 0.5
+
 
 def plot_properties(simulation, cond, what="initialization"):
 
@@ -17,7 +27,26 @@ def plot_properties(simulation, cond, what="initialization"):
     Function that makes singles plots of the properties of initialization or of the final solution. (cdp, 08/2020)
     """
 
-    flag_chan = False
+    render_figures(
+        properties_figure_tasks(simulation, cond, what), simulation.figure_workers
+    )
+    print("Plotted " + what + "\n")
+
+
+# end function Plot_properties (cdp, 08/2020)
+
+
+def properties_figure_tasks(simulation, cond, what="initialization"):
+    """Function that builds the figure tasks of the properties of initialization or of the final solution of conductor cond (one task for each component, see module UtilityFunctions.figure_pool).
+
+    Args:
+        simulation (object): object simulation instance of class Simulations.
+        cond (object): object conductor instance of class Conductors.
+        what (str, optional): "initialization" or "solution". Defaults to "initialization".
+
+    Returns:
+        list: list of tuples (function, args) with function plot_properties_file.
+    """
     if what == "initialization":
         dict_path = dict(
             Load=simulation.dict_path[f"Output_Initialization_{cond.ID}_dir"],
@@ -29,13 +58,15 @@ def plot_properties(simulation, cond, what="initialization"):
             Save=simulation.dict_path[f"Figures_Solution_{cond.ID}_dir"],
         )
     # end if what (cdp, 12/2020)
-    # Loop on FluidComponents (cdp, 12/2020)
-    for fluid_comp in cond.dict_obj_inventory["FluidComponents"]["Objects"]:
+    tasks = list()
+    # Loop on FluidComponents and SolidComponents.
+    for comp in (
+        cond.dict_obj_inventory["FluidComponents"]["Objects"]
+        + cond.dict_obj_inventory["SolidComponents"]["Objects"]
+    ):
         # load values
-        file_load = os.path.join(dict_path["Load"], f"{fluid_comp.ID}.tsv")
-        # Load data in file_load as pandas DataFrame
-        load_chan = pd.read_csv(filepath_or_buffer=file_load, delimiter="\t")
-        folder_save = os.path.join(dict_path["Save"], fluid_comp.ID)
+        file_load = os.path.join(dict_path["Load"], f"{comp.ID}.tsv")
+        folder_save = os.path.join(dict_path["Save"], comp.ID)
         # Create target Directory if do not exist (cdp, 07/2020)
         if not os.path.exists(folder_save):
             os.makedirs(folder_save)
@@ -43,86 +74,69 @@ def plot_properties(simulation, cond, what="initialization"):
         else:
             print(f"Directory {folder_save} already exists\n")
         # end if (cdp, 07/2020)
-        if flag_chan == False:
-            # get the list of saved properties (cdp, 12/2020)
-            prop_chan = list(load_chan.columns.values.tolist())
-            flag_chan = True
-        # end if flag_chan (cdp, 12/2020)
-        for p_name in prop_chan[1:]:
-            ind = p_name.find(" ")
-            y_name, units = plot_nomenclature_y(p_name[:ind])
-            # path to save figures (cdp, 07/2020)
-            save_fig_path_eps = os.path.join(folder_save, f"{p_name[:ind]}.eps")
-            # save_fig_path_pdf = os.path.join(folder_save, f"{p_name[:ind]}.pdf")
-            Figure, ax = plt.subplots(
-                num=(
-                    simulation.transient_input["SIMULATION"]
-                    + f" {cond.ID}, {fluid_comp.ID}:"
-                    f" {p_name[:ind]}"
-                ),
-                figsize=(7.0, 6.0),
-            )
-            ax.plot(load_chan[prop_chan[0]], load_chan[p_name], "k-", linewidth=2.0)
-            ax.grid(True)
-            ax.set(
-                xlabel="$x\ (m)$",
-                ylabel=f"{y_name} {units}",
-                title=f"{cond.ID}, {fluid_comp.ID}: {p_name[:ind]}",
-            )
-            plt.savefig(save_fig_path_eps, orientation="portrait", transparent=False)
-            # plt.savefig(save_fig_path_pdf, orientation = "portrait", \
-            # 																										transparent = False)
-            plt.close()
-    # end for fluid_comp (cdp, 12/2020)
-    # Loop on SolidComponents (cdp, 12/2020)
-    for s_comp in cond.dict_obj_inventory["SolidComponents"]["Objects"]:
-        # load values
-        file_load = os.path.join(dict_path["Load"], f"{s_comp.ID}.tsv")
-        # Load data in file_load as pandas DataFrame
-        load_s_comp = pd.read_csv(filepath_or_buffer=file_load, delimiter="\t")
-        folder_save = os.path.join(dict_path["Save"], s_comp.ID)
-        # Create target Directory if do not exist (cdp, 07/2020)
-        if not os.path.exists(folder_save):
-            os.makedirs(folder_save)
-            print(f"Created directory {folder_save}\n")
-        else:
-            print(f"Directory {folder_save} already exists\n")
-        # end if (cdp, 07/2020)
-        # get the list of saved properties (cdp, 12/2020)
-        prop_s_comp = list(load_s_comp.columns.values.tolist())
-        # end if flag_s_comp (cdp, 12/2020)
-        for p_name in prop_s_comp[1:]:
-            ind = p_name.find(" ")
-            y_name, units = plot_nomenclature_y(p_name[:ind])
-            # path to save figures (cdp, 07/2020)
-            save_fig_path_eps = os.path.join(folder_save, f"{p_name[:ind]}.eps")
-            # save_fig_path_pdf = os.path.join(folder_save, f"{p_name[:ind]}.pdf")
-            Figure, ax = plt.subplots(
-                num=(
-                    simulation.transient_input["SIMULATION"]
-                    + f" {cond.ID}, {s_comp.ID}:"
-                    f" {p_name[:ind]}"
+        tasks.append(
+            (
+                plot_properties_file,
+                (
+                    file_load,
+                    folder_save,
+                    f"{simulation.transient_input['SIMULATION']} {cond.ID}, {comp.ID}:",
+                    f"{cond.ID}, {comp.ID}:",
                 ),
-                figsize=(7.0, 6.0),
-            )
-            ax.plot(
-                load_s_comp[prop_s_comp[0]], load_s_comp[p_name], "k-", linewidth=2.0
-            )
-            ax.grid(True)
-            ax.set(
-                xlabel="$x\ (m)$",
-                ylabel=f"{y_name} {units}",
-                title=f"{cond.ID}, {s_comp.ID}: {p_name[:ind]}",
             )
-            plt.savefig(save_fig_path_eps, orientation="portrait", transparent=False)
-            # plt.savefig(save_fig_path_pdf, orientation = "portrait", \
-            # 																								transparent = False)
-            plt.close()
-    # end for s_comp (cdp, 12/2020)
-    print("Plotted " + what + "\n")
+        )
+    # End for comp.
+    return tasks
 
 
-# end function Plot_properties (cdp, 08/2020)
+# End function properties_figure_tasks.
+
+
+def plot_properties_file(file_load, folder_save, fig_num, fig_title):
+    """Function that makes a figure for each property (column) in file file_load, with the spatial coordinate (first column) as abscissa.
+
+    Args:
+        file_load (str): path of the .tsv file with the properties of a component.
+        folder_save (str): folder where the figures are saved.
+        fig_num (str): beginning of the identifier of the figures.
+        fig_title (str): beginning of the title of the figures.
+
+    Returns:
+        list: list of tuples (path of the figure, elapsed time in s).
+    """
+    # Load data in file_load as pandas DataFrame
+    load_comp = pd.read_csv(filepath_or_buffer=file_load, delimiter="\t")
+    # get the list of saved properties (cdp, 12/2020)
+    prop_comp = list(load_comp.columns.values.tolist())
+    timings = list()
+    for p_name in prop_comp[1:]:
+        t_start = time.perf_counter()
+        ind = p_name.find(" ")
+        y_name, units = plot_nomenclature_y(p_name[:ind])
+        # path to save figures (cdp, 07/2020)
+        save_fig_path_eps = os.path.join(folder_save, f"{p_name[:ind]}.eps")
+        # save_fig_path_pdf = os.path.join(folder_save, f"{p_name[:ind]}.pdf")
+        Figure, ax = plt.subplots(
+            num=f"{fig_num} {p_name[:ind]}",
+            figsize=(7.0, 6.0),
+        )
+        ax.plot(load_comp[prop_comp[0]], load_comp[p_name], "k-", linewidth=2.0)
+        ax.grid(True)
+        ax.set(
+            xlabel="$x\ (m)$",
+            ylabel=f"{y_name} {units}",
+            title=f"{fig_title} {p_name[:ind]}",
+        )
+        plt.savefig(save_fig_path_eps, orientation="portrait", transparent=False)
+        # plt.savefig(save_fig_path_pdf, orientation = "portrait", \
+        # 																										transparent = False)
+        plt.close()
+        timings.append((save_fig_path_eps, time.perf_counter() - t_start))
+    # End for p_name.
+    return timings
+
+
+# End function plot_properties_file.
 
 
 def plot_nomenclature_y(prop):
@@ -164,6 +178,25 @@ def make_plots(simulation, kind="Space_distr"):
     """
     Function that makes plots of spatial discretization and of time evolution according to the **option argument. (cdp, 11/2020)
     """
+
+    render_figures(
+        distribution_figure_tasks(simulation, kind), simulation.figure_workers
+    )
+
+
+# end function Make_plots (cdp, 11/2020)
+
+
+def distribution_figure_tasks(simulation, kind="Space_distr"):
+    """Function that builds the figure tasks of the spatial distributions or of the time evolutions of all the conductors (one task for each .tsv file, see module UtilityFunctions.figure_pool).
+
+    Args:
+        simulation (object): object simulation instance of class Simulations.
+        kind (str, optional): "Space_distr" or "Time_evol". Defaults to "Space_distr".
+
+    Returns:
+        list: list of tuples (function, args) with function plot_space_distribution_file or plot_time_evolution_file.
+    """
     # list of colors (cdp, 11/2020)
     colors = ["k", "r", "b", "g", "c"]
     # maximum number of axes for each figure 4 (cdp, 11/2020)
@@ -202,19 +235,18 @@ def make_plots(simulation, kind="Space_distr"):
         )
         prop_jk = ["temperature"]
     # end if kind (cdp, 11/2020)
-    dict_values = {}  # dictionary declaration (cdp, 09/2020)
+    tasks = list()
     # loop on conductorts objects (cdp,11/2020)
     for cond in simulation.list_of_Conductors:
-        dict_values[cond.ID] = {}  # dictionary declaration (cdp, 09/2020)
         if kind == "Space_distr":
             # unify the array (cdp, 11/2020)
             kind_save = np.around(cond.Space_save, simulation.n_digit)
             root_load_path = simulation.dict_path[f"Output_Space_{cond.ID}_dir"]
             des = "sd"
             root_save_path = simulation.dict_path[f"Figures_Space_{cond.ID}_dir"]
-            abscissa = pd.read_csv(
-                os.path.join(root_load_path, "xcoord.tsv"), delimiter="\t"
-            )
+            # The spatial coordinates are loaded by the worker that makes the \
+            # figure.
+            xcoord_file = os.path.join(root_load_path, "xcoord.tsv")
             # plot features (cdp, 01/2021)
             # unify the array (cdp, 11/2020)
             # uni_label = cond.Space_save
@@ -264,18 +296,12 @@ def make_plots(simulation, kind="Space_distr"):
         # end for nn (cdp, 11/2020)
         # Loop on FluidComponents (cdp, 11/2020)
         for fluid_comp in cond.dict_obj_inventory["FluidComponents"]["Objects"]:
-            # dictionary declaration (cdp, 09/2020)
-            dict_values[cond.ID][fluid_comp.ID] = {}
             # Load properties value for channels (cdp, 09/2020)
             for prop in prop_chan:
                 # load file (cdp, 09/2020)
                 file_load = os.path.join(
                     root_load_path, f"{fluid_comp.ID}_{prop}_{des}.tsv"
                 )
-                # dictionary declaration (cdp, 09/2020)
-                dict_values[cond.ID][fluid_comp.ID][prop] = pd.read_csv(
-                    filepath_or_buffer=file_load, delimiter="\t"
-                )
                 folder_save = os.path.join(root_save_path, fluid_comp.ID)
                 # Create target Directory if do not exist (cdp, 09/2020)
                 if not os.path.exists(folder_save):
@@ -289,9 +315,10 @@ def make_plots(simulation, kind="Space_distr"):
                 if kind == "Space_distr":
                     # call function Make_plots_sd_actually to make plots of spatial \
                     # distributions (cpd, 10/2020)
-                    make_plots_sd_actually(
-                        abscissa,
-                        dict_values[cond.ID][fluid_comp.ID][prop],
+                    task = plot_space_distribution_file, (
+                        xcoord_file,
+                        file_load,
+                        False,
                         prop,
                         folder_save,
                         N_lines_tot_max,
@@ -303,7 +330,7 @@ def make_plots(simulation, kind="Space_distr"):
                         ascissa,
                         sup_title,
                         leg_title,
-                        figures=N_figure,
+                        N_figure,
                     )
                 elif kind == "Time_evol":
                     # call function Make_plots_te_actually to make plots of time \
@@ -318,8 +345,8 @@ def make_plots(simulation, kind="Space_distr"):
                         N_l_t = 2 * np.ones(1, dtype=int)
                         # Number of axes (cdp, 01/2021)
                         N_ax = np.ones(1, dtype=int)
-                        make_plots_te_actually(
-                            dict_values[cond.ID][fluid_comp.ID][prop],
+                        task = plot_time_evolution_file, (
+                            file_load,
                             prop,
                             folder_save,
                             N_l_t_m,
@@ -331,10 +358,11 @@ def make_plots(simulation, kind="Space_distr"):
                             ascissa,
                             sup_title,
                             leg_title,
+                            1,
                         )
                     else:
-                        make_plots_te_actually(
-                            dict_values[cond.ID][fluid_comp.ID][prop],
+                        task = plot_time_evolution_file, (
+                            file_load,
                             prop,
                             folder_save,
                             N_lines_tot_max,
@@ -346,15 +374,15 @@ def make_plots(simulation, kind="Space_distr"):
                             ascissa,
                             sup_title,
                             leg_title,
-                            figures=N_figure,
+                            N_figure,
                         )
                     # end if prop (cdp, 01/2021)
                 # end if kind (cdp, 01/2021)
+                tasks.append(task)
             # end for prop (cdp, 10/2020)
         # end for fluid_comp (cdp, 10/2020)
         # Loop on SolidComponents (cdp, 11/2020)
         for s_comp in cond.dict_obj_inventory["SolidComponents"]["Objects"]:
-            dict_values[cond.ID][s_comp.ID] = {}
             if s_comp.NAME != cond.dict_obj_inventory["Jacket"]["Name"]:
                 # Strands objects (cdp, 09/2020)
                 # Load properties value for strands (cdp, 09/2020)
@@ -368,10 +396,6 @@ def make_plots(simulation, kind="Space_distr"):
                 file_load = os.path.join(
                     root_load_path, f"{s_comp.ID}_{prop}_{des}.tsv"
                 )
-                # dictionary declaration (cdp, 09/2020)
-                dict_values[cond.ID][s_comp.ID][prop] = pd.read_csv(
-                    filepath_or_buffer=file_load, delimiter="\t"
-                )
                 folder_save = os.path.join(root_save_path, s_comp.ID)
                 # Create target Directory if do not exist (cdp, 09/2020)
                 if not os.path.exists(folder_save):
@@ -384,9 +408,10 @@ def make_plots(simulation, kind="Space_distr"):
                 if kind == "Space_distr":
                     # call function Make_plots_sd_actually to make plots of spatial \
                     # distributions (cpd, 10/2020)
-                    make_plots_sd_actually(
-                        abscissa,
-                        dict_values[cond.ID][s_comp.ID][prop],
+                    task = plot_space_distribution_file, (
+                        xcoord_file,
+                        file_load,
+                        False,
                         prop,
                         folder_save,
                         N_lines_tot_max,
@@ -398,13 +423,13 @@ def make_plots(simulation, kind="Space_distr"):
                         ascissa,
                         sup_title,
                         leg_title,
-                        figures=N_figure,
+                        N_figure,
                     )
                 elif kind == "Time_evol":
                     # call function Make_plots_te_actually to make plots of time \
                     # evolutions (cpd, 10/2020)
-                    make_plots_te_actually(
-                        dict_values[cond.ID][s_comp.ID][prop],
+                    task = plot_time_evolution_file, (
+                        file_load,
                         prop,
                         folder_save,
                         N_lines_tot_max,
@@ -416,24 +441,14 @@ def make_plots(simulation, kind="Space_distr"):
                         ascissa,
                         sup_title,
                         leg_title,
-                        figures=N_figure,
+                        N_figure,
                     )
                 # end if kind (cdp, 01/2021)
+                tasks.append(task)
             # end for prop (cdp, 11/2020)
         # end for s_comp (cdp, 11/2020)
 
         if kind == "Space_distr":
-            # Evaluate the Gauss coordinate to make the plot, conversion to numpy necessaty otherwise nan values arise.
-            x_gauss = pd.DataFrame(
-                {
-                    abscissa.columns[ii]: (
-                        abscissa.iloc[:-1, ii].to_numpy()
-                        + abscissa.iloc[1:, ii].to_numpy()
-                    )
-                    / 2.0
-                    for ii in range(len(abscissa.columns))
-                }
-            )
             for rr in range(cond.dict_obj_inventory["SolidComponents"]["Number"]):
                 jk_r = cond.dict_obj_inventory["SolidComponents"]["Objects"][rr]
                 for cc in range(
@@ -447,16 +462,16 @@ def make_plots(simulation, kind="Space_distr"):
                         prop = f"Heat_rad_{jk_r.ID}_{jk_c.ID}"
                         # Build file path.
                         file_load = os.path.join(root_load_path, f"{prop}_{des}.tsv")
-                        # Load file as dataframe.
-                        values = pd.read_csv(file_load, delimiter="\t")
                         folder_save = os.path.join(root_save_path)
                         sup_title = (
                             f"{cond.ID} {jk_r.ID} {jk_c.ID} Heat rad: {title_comp}"
                         )
-                        # Plot the heat exchanged by radiation between jackets.
-                        make_plots_sd_actually(
-                            x_gauss,
-                            values,
+                        # Plot the heat exchanged by radiation between jackets \
+                        # (the values are given at the Gauss points).
+                        task = plot_space_distribution_file, (
+                            xcoord_file,
+                            file_load,
+                            True,
                             prop,
                             folder_save,
                             N_lines_tot_max,
@@ -468,8 +483,9 @@ def make_plots(simulation, kind="Space_distr"):
                             ascissa,
                             sup_title,
                             leg_title,
-                            figures=N_figure,
+                            N_figure,
                         )
+                        tasks.append(task)
                     # End if abs().
                 # End for cc.
             if (
@@ -481,14 +497,13 @@ def make_plots(simulation, kind="Space_distr"):
                 prop = f"Heat_exch_{simulation.environment.KIND}_{jk_r.ID}"
                 # Build file path.
                 file_load = os.path.join(root_load_path, f"{prop}_{des}.tsv")
-                # Load file as dataframe.
-                values = pd.read_csv(file_load, delimiter="\t")
                 folder_save = os.path.join(root_save_path)
                 sup_title = f"{cond.ID} {simulation.environment.KIND} {jk_r.ID} Heat exch: {title_comp}"
                 # Plot the heat exchanged by radiation between jackets.
-                make_plots_sd_actually(
-                    x_gauss,
-                    values,
+                task = plot_space_distribution_file, (
+                    xcoord_file,
+                    file_load,
+                    True,
                     prop,
                     folder_save,
                     N_lines_tot_max,
@@ -500,15 +515,66 @@ def make_plots(simulation, kind="Space_distr"):
                     ascissa,
                     sup_title,
                     leg_title,
-                    figures=N_figure,
+                    N_figure,
                 )
+                tasks.append(task)
             # End if cond.dict_df_coupling["contact_perimeter_flag"].
         # End for rr.
 
     # end for cond (cdp, 11/2020)
+    return tasks
 
 
-# end function Make_plots (cdp, 11/2020)
+# End function distribution_figure_tasks.
+
+
+def plot_space_distribution_file(xcoord_file, file_load, flag_gauss, *args):
+    """Function that loads the spatial coordinates and the spatial distribution in file file_load and calls function make_plots_sd_actually.
+
+    Args:
+        xcoord_file (str): path of file xcoord.tsv with the spatial coordinates.
+        file_load (str): path of the .tsv file with the spatial distribution.
+        flag_gauss (bool): if True the values are given at the Gauss points, in the middle of the spatial coordinates.
+        *args: arguments of function make_plots_sd_actually after xvalues and yvalues.
+
+    Returns:
+        list: list of tuples (path of the figure, elapsed time in s).
+    """
+    abscissa = pd.read_csv(xcoord_file, delimiter="\t")
+    if flag_gauss:
+        # Evaluate the Gauss coordinate to make the plot, conversion to numpy necessaty otherwise nan values arise.
+        abscissa = pd.DataFrame(
+            {
+                abscissa.columns[ii]: (
+                    abscissa.iloc[:-1, ii].to_numpy() + abscissa.iloc[1:, ii].to_numpy()
+                )
+                / 2.0
+                for ii in range(len(abscissa.columns))
+            }
+        )
+    # End if flag_gauss.
+    values = pd.read_csv(filepath_or_buffer=file_load, delimiter="\t")
+    return make_plots_sd_actually(abscissa, values, *args)
+
+
+# End function plot_space_distribution_file.
+
+
+def plot_time_evolution_file(file_load, *args):
+    """Function that loads the time evolution in file file_load and calls function make_plots_te_actually.
+
+    Args:
+        file_load (str): path of the .tsv file with the time evolution.
+        *args: arguments of function make_plots_te_actually after values.
+
+    Returns:
+        list: list of tuples (path of the figure, elapsed time in s).
+    """
+    values = pd.read_csv(filepath_or_buffer=file_load, delimiter="\t")
+    return make_plots_te_actually(values, *args)
+
+
+# End function plot_time_evolution_file.
 
 
 def make_plots_sd_actually(
@@ -530,11 +596,14 @@ def make_plots_sd_actually(
     """
     Function that actually makes plots of the spatial distribution. (cdp, 11/2020)
     Updated (cdp, 01/2021)
+    Returns the list of tuples (path of the figure, elapsed time in s).
     """
+    timings = list()
     header_full = list(xvalues.columns.values.tolist())
     # end if p_name (cdp, 10/2020)
     # Loop on figures (cdp, 11/2020)
     for nn in range(figures):
+        t_start = time.perf_counter()
         # Path to save figures (cdp, 10/2020)
         if figures > 1:
             dict_save_fig_path = dict(
@@ -768,7 +837,9 @@ def make_plots_sd_actually(
                 "Not possible to plot more tha 4 axes for each figure. There is something odd in function Make_plots during evaluation of the number of figures and axes.\n"
             )
         # end if N_axes[nn] (cdp, 10/2020)
+        timings.append((dict_save_fig_path["eps"], time.perf_counter() - t_start))
     # end for nn (cdp, 11/2020)
+    return timings
 
 
 # end function Make_plots_sd_actually (cdp, 01/2021)
@@ -792,7 +863,9 @@ def make_plots_te_actually(
     """
     Function that actually makes plots of the time evolution. (cdp, 11/2020)
     Updated (cdp, 01/2021)
+    Returns the list of tuples (path of the figure, elapsed time in s).
     """
+    timings = list()
     if p_name == "inlet_outlet":
         # when data came from file inlet_outlet, the required property is the mass \
         # flow rate (cdp, 10/2020)
@@ -804,6 +877,7 @@ def make_plots_te_actually(
     # end if p_name (cdp, 10/2020)
     # Loop on figures (cdp, 11/2020)
     for nn in range(figures):
+        t_start = time.perf_counter()
         # Path to save figures (cdp, 10/2020)
         if figures > 1:
             dict_save_fig_path = dict(
@@ -1055,7 +1129,9 @@ def make_plots_te_actually(
                 "Not possible to plot more than 4 axes for each figure. There is something odd in function Make_plots during evaluation of the number of figures and axes.\n"
             )
         # end if N_axes[nn] (cdp, 10/2020)
+        timings.append((dict_save_fig_path["eps"], time.perf_counter() - t_start))
     # end for nn (cdp, 11/2020)
+    return timings
 
 
 # end function Make_plots_te_actually (cdp, 01/2021)
@@ -1147,6 +1223,14 @@ def create_real_time_plots(simulation, conductor):
             simulation, conductor, s_comp
         )
     # End for s_comp.
+    # Wall time of the last redraw of the real time plots of conductor.
+    conductor.rtp_last_draw = 0.0
+    # Show the figures without blocking (only with interactive backends).
+    if matplotlib.get_backend().lower() in [
+        backend.lower() for backend in matplotlib.rcsetup.interactive_bk
+    ]:
+        plt.show(block=False)
+    # End if matplotlib.get_backend().
 
 
 # End function _create_real_time_plots.
@@ -1172,6 +1256,9 @@ def create_real_time_plots_max_temperature(simulation, conductor, comp):
         title=f"{conductor.ID} {comp.ID} max temperature time evol",
     )
     comp.axes_max_temp.set_xlim([0.0, simulation.transient_input["TEND"]])
+    comp.rtp_max_temp = _create_rtp_series(
+        simulation, comp.axes_max_temp, styles=["k."], labels=[None]
+    )
 
 
 # End function create_real_time_plots_max_temperature.
@@ -1198,11 +1285,131 @@ def create_real_time_plots_inlet_outlet_mfr(simulation, conductor, f_comp):
         title=f"{conductor.ID} {f_comp.ID} inlet and outlet mfr time evol",
     )
     f_comp.axes_io_mfr.set_xlim([0.0, simulation.transient_input["TEND"]])
+    f_comp.rtp_io_mfr = _create_rtp_series(
+        simulation, f_comp.axes_io_mfr, styles=["co", "b."], labels=["Inlet", "Outlet"]
+    )
 
 
 # End function create_real_time_plots_inlet_outlet_mfr.
 
 
+def _create_rtp_series(simulation, axes, styles, labels):
+    """Function _create_rtp_series creates one line for each series of a real time plot (rtp) and the preallocated arrays of their values; lines are animated (they are drawn only by blitting) if the canvas supports blitting.
+
+    Args:
+        simulation (object): object simulation instance of class Simulations.
+        axes (object): axes of the real time plot.
+        styles (list): format strings of the lines.
+        labels (list): labels of the lines.
+
+    Returns:
+        dict: lines, arrays of time and values (one column for each line), number of stored values and background of the axes used for blitting.
+    """
+    # Initial number of stored values, arrays are doubled when full.
+    size = int(
+        min(
+            simulation.transient_input["TEND"] / simulation.transient_input["STPMIN"]
+            + 2,
+            1e5,
+        )
+    )
+    blit = axes.figure.canvas.supports_blit
+    series = dict(
+        lines=[
+            axes.plot([], [], style, label=label, animated=blit)[0]
+            for style, label in zip(styles, labels)
+        ],
+        time=np.zeros(size),
+        values=np.zeros((size, len(styles))),
+        number=0,
+        background=None,
+    )
+    # The background is saved again after any full draw of the figure (e.g. \
+    # when the window is resized).
+    axes.figure.canvas.mpl_connect(
+        "draw_event", lambda event: series.update(background=None)
+    )
+    return series
+
+
+# End function _create_rtp_series.
+
+
+def _append_rtp_values(series, time_value, values):
+    """Function _append_rtp_values stores the values at time time_value in the arrays of a real time plot series, doubling the arrays if they are full.
+
+    Args:
+        series (dict): series of the real time plot (see function _create_rtp_series).
+        time_value (float): time of the values.
+        values (list): one value for each line of the series.
+    """
+    if series["number"] == series["time"].size:
+        series["time"] = np.concatenate((series["time"], np.zeros_like(series["time"])))
+        series["values"] = np.concatenate(
+            (series["values"], np.zeros_like(series["values"]))
+        )
+    # End if series["number"].
+    series["time"][series["number"]] = time_value
+    series["values"][series["number"]] = values
+    series["number"] = series["number"] + 1
+
+
+# End function _append_rtp_values.
+
+
+def _set_rtp_data(series):
+    """Function _set_rtp_data sets the stored values as data of the lines of a real time plot series.
+
+    Args:
+        series (dict): series of the real time plot (see function _create_rtp_series).
+
+    Returns:
+        int: number of stored values.
+    """
+    number = series["number"]
+    for ii, line in enumerate(series["lines"]):
+        line.set_data(series["time"][:number], series["values"][:number, ii])
+    # End for ii.
+    return number
+
+
+# End function _set_rtp_data.
+
+
+def _draw_rtp_series(series, axes):
+    """Function _draw_rtp_series redraws the lines of a real time plot series: the axes are fully drawn only when the y limits must be extended (and the first time), otherwise only the lines are drawn on the saved background (blitting).
+
+    Args:
+        series (dict): series of the real time plot (see function _create_rtp_series).
+        axes (object): axes of the real time plot.
+    """
+    number = _set_rtp_data(series)
+    canvas = axes.figure.canvas
+    v_min = series["values"][:number].min()
+    v_max = series["values"][:number].max()
+    y_min, y_max = axes.get_ylim()
+    if series["background"] is None or v_min < y_min or v_max > y_max:
+        # Extend the y limits with a margin, to limit the number of full draws.
+        margin = 0.1 * max(v_max - v_min, abs(v_max), 1e-3)
+        axes.set_ylim(v_min - margin, v_max + margin)
+        canvas.draw()
+        if canvas.supports_blit:
+            series["background"] = canvas.copy_from_bbox(axes.bbox)
+        # End if canvas.supports_blit.
+    elif canvas.supports_blit:
+        canvas.restore_region(series["background"])
+    # End if series["background"].
+    if canvas.supports_blit:
+        for line in series["lines"]:
+            axes.draw_artist(line)
+        # End for line.
+        canvas.blit(axes.bbox)
+    # End if canvas.supports_blit.
+
+
+# End function _draw_rtp_series.
+
+
 def do_nothing(simulation, cond=None, comp=None):
     """Function do_nothing does nothing; necessay in the branchless coding.
 
@@ -1217,85 +1424,118 @@ def do_nothing(simulation, cond=None, comp=None):
 # End function do_nothing.
 
 
-def update_real_time_plots(conductor):
-    """Function update_real_time_plots is the main function that allows to update the real time plots at each time step.
+def update_real_time_plots(conductor, force=False):
+    """Function update_real_time_plots is the main function that allows to update the real time plots at each time step. Values are stored at each call, while figures are redrawn at most every RTP_DRAW_INTERVAL seconds (or if force is True), so the solution does not wait for the rendering.
 
     Args:
         conductor (object): object conductor instance of class Conductors.
+        force (bool, optional): flag to redraw the figures. Defaults to False.
     """
+    flag_draw = (
+        force or time.perf_counter() - conductor.rtp_last_draw >= RTP_DRAW_INTERVAL
+    )
     for f_comp in conductor.dict_obj_inventory["FluidComponents"]["Objects"]:
 
         # When the GUI works add the default to true.
 
         # If flag Show_fig is set to TRUE update the real time plot of maximum f_comp temperature (invoke function update_real_time_plots_max_temperature); else does nothing.
         f_comp.update_rtp_max_temperature[f_comp.coolant.dict_input["Show_fig"]](
-            conductor, f_comp
+            conductor, f_comp, flag_draw
         )
         # If flag Show_fig is set to TRUE update the real time plot of inlet and outlet f_comp mass flow rate (invoke function update_real_time_plots_inlet_outlet_mfr); else does nothing.
         f_comp.update_rtp_io_mfr[f_comp.coolant.dict_input["Show_fig"]](
-            conductor, f_comp
+            conductor, f_comp, flag_draw
         )
     # End for f_comp.
 
     for s_comp in conductor.dict_obj_inventory["SolidComponents"]["Objects"]:
         # If flag Show_fig is set to TRUE update the real time plot of maximum s_comp temperature (invoke function update_real_time_plots_max_temperature); else does nothing.
         s_comp.update_rtp_max_temperature[s_comp.dict_input["Show_fig"]](
-            conductor, s_comp
+            conductor, s_comp, flag_draw
         )
         # End for s_comp.
 
-    plt.pause(5e-3)
+    if flag_draw:
+        # Process the pending events of the interactive backends without \
+        # waiting (plt.pause would wait at least its interval).
+        for manager in plt._pylab_helpers.Gcf.get_all_fig_managers():
+            manager.canvas.flush_events()
+        # End for manager.
+        conductor.rtp_last_draw = time.perf_counter()
+    # End if flag_draw.
 
     # End function update_real_time_plots.
 
 
-def update_real_time_plots_max_temperature(conductor, comp):
+def update_real_time_plots_max_temperature(conductor, comp, flag_draw=True):
     """Function update_real_time_plots_max_temperature updates the real time plots of the maximum temperature time evolution of each component (comp) object.
 
     Args:
         conductor (object): object conductor instance of class Conductors.
         comp (object): can be any object instance of classes FluidComponents, MixSCStabilizet, SuperConductor Stabilizer or Jacket.
+        flag_draw (bool, optional): flag to redraw the figure. Defaults to True.
     """
     if comp.KIND == "Fluid_component":
-        comp.axes_max_temp.plot(
-            conductor.cond_time[-1],
-            comp.coolant.dict_node_pt["temperature"].max(),
-            "k.",
-        )
+        temperature = comp.coolant.dict_node_pt["temperature"]
     else:
-        comp.axes_max_temp.plot(
-            conductor.cond_time[-1], comp.dict_node_pt["temperature"].max(), "k."
-        )
+        temperature = comp.dict_node_pt["temperature"]
+    _append_rtp_values(comp.rtp_max_temp, conductor.cond_time[-1], temperature.max())
+    if flag_draw:
+        _draw_rtp_series(comp.rtp_max_temp, comp.axes_max_temp)
+    # End if flag_draw.
 
 
 # End function update_real_time_plots_max_temperature.
 
 
-def update_real_time_plots_inlet_outlet_mfr(conductor, f_comp):
+def update_real_time_plots_inlet_outlet_mfr(conductor, f_comp, flag_draw=True):
     """Function update_real_time_plots_inlet_outlet_mfr updates the real time plots of the inlet and outlet time evolution of fluid_component (f_comp) objects.
 
     Args:
         conductor (object): object conductor instance of class Conductors.
         f_comp (object): object fluid_component instance of class FluidComponents.
+        flag_draw (bool, optional): flag to redraw the figure. Defaults to True.
     """
     # Aggiustare per tener conto della effettiva direzione del flusso di refrigerante.
-    f_comp.axes_io_mfr.plot(
+    _append_rtp_values(
+        f_comp.rtp_io_mfr,
         conductor.cond_time[-1],
-        f_comp.coolant.dict_node_pt["mass_flow_rate"][0],
-        "co",
-        label="Inlet",
-    )
-    f_comp.axes_io_mfr.plot(
-        conductor.cond_time[-1],
-        f_comp.coolant.dict_node_pt["mass_flow_rate"][-1],
-        "b.",
-        label="Outlet",
+        f_comp.coolant.dict_node_pt["mass_flow_rate"][[0, -1]],
     )
+    if flag_draw:
+        _draw_rtp_series(f_comp.rtp_io_mfr, f_comp.axes_io_mfr)
+    # End if flag_draw.
 
 
 # End function update_real_time_plots_inlet_outlet_mfr.
 
 
+def close_real_time_plots(conductor):
+    """Function close_real_time_plots draws the real time plots of conductor at the end of the simulation with all the stored values; lines are no longer animated, so they are drawn also when the figures are saved.
+
+    Args:
+        conductor (object): object conductor instance of class Conductors.
+    """
+    components = list(conductor.dict_obj_inventory["FluidComponents"]["Objects"])
+    components.extend(conductor.dict_obj_inventory["SolidComponents"]["Objects"])
+    for comp in components:
+        for key in ["rtp_max_temp", "rtp_io_mfr"]:
+            if hasattr(comp, key):
+                series = getattr(comp, key)
+                for line in series["lines"]:
+                    line.set_animated(False)
+                # End for line.
+                # Full draw, with the y limits extended to all the values.
+                series["background"] = None
+                _draw_rtp_series(series, series["lines"][0].axes)
+            # End if hasattr.
+        # End for key.
+    # End for comp.
+
+
+# End function close_real_time_plots.
+
+
 def create_legend_rtp(conductor):
     """Function create_legend_rtp is the main fucntion to add legend to the real time plots.
 
@@ -1318,6 +1558,8 @@ def add_legend_rtp(f_comp):
         f_comp (object): object fluid_component instance of class FluidComponents.
     """
     f_comp.axes_io_mfr.legend(loc="best", fontsize=8, framealpha=0.2)
+    # The legend is drawn at the next full draw.
+    f_comp.rtp_io_mfr["background"] = None
     # comp.axes_max_temp.legend(loc = 'best', fontsize = 8, framealpha = 0.2)
 
 
@@ -2,8 +2,8 @@
 
 import numpy as np
 import os
-import re
 from scipy.linalg import solve_banded
+from scipy.linalg.lapack import dgbtrf, dgbtrs
 from UtilityFunctions.auxiliary_functions import get_from_xlsx
 
 
@@ -139,16 +139,31 @@ def step(conductor, environment, qsource, num_step):
 
     path = os.path.join(conductor.BASE_PATH, conductor.file_input["EXTERNAL_FLOW"])
     TINY = 1.0e-5
-    str_check = "no interface"
 
     # CLUCA ADDNOD = MAXNOD*(ICOND-1)
 
-    # Matrices initialization (cdp, 07/2020)
-    MASMAT = np.zeros((conductor.dict_band["Full"], conductor.dict_N_equation["Total"]))
-    FLXMAT = np.zeros((conductor.dict_band["Full"], conductor.dict_N_equation["Total"]))
-    SORMAT = np.zeros((conductor.dict_band["Full"], conductor.dict_N_equation["Total"]))
-    DIFMAT = np.zeros((conductor.dict_band["Full"], conductor.dict_N_equation["Total"]))
-    SYSMAT = np.zeros((conductor.dict_band["Full"], conductor.dict_N_equation["Total"]))
+    # Matrices and vectors are taken from the workspace allocated once in \
+    # method initialization of class Conductors; they are allocated again \
+    # only if the size of the problem changed (e.g. new mesh).
+    if conductor.dict_Workspace.get("Size") != (
+        conductor.dict_discretization["Grid_input"]["NELEMS"],
+        conductor.dict_N_equation["NODOFS"],
+        conductor.dict_band["Full"],
+        conductor.dict_N_equation["Total"],
+    ):
+        conductor.dict_Workspace = allocate_step_workspace(conductor)
+    # End if conductor.dict_Workspace.get("Size").
+    # Matrices initialization (cdp, 07/2020): set to zeros in place.
+    MASMAT = conductor.dict_Workspace["MASMAT"]
+    MASMAT[:] = 0.0
+    FLXMAT = conductor.dict_Workspace["FLXMAT"]
+    FLXMAT[:] = 0.0
+    SORMAT = conductor.dict_Workspace["SORMAT"]
+    SORMAT[:] = 0.0
+    DIFMAT = conductor.dict_Workspace["DIFMAT"]
+    DIFMAT[:] = 0.0
+    # SYSMAT is completely overwritten below.
+    SYSMAT = conductor.dict_Workspace["SYSMAT"]
     if conductor.dict_input["METHOD"] == "BE" or conductor.dict_input["METHOD"] == "CN":
         # Backward Euler or Crank-Nicolson (cdp, 10/2020)
         if conductor.cond_num_step > 1:
@@ -158,12 +173,21 @@ def step(conductor, environment, qsource, num_step):
                 :, 0
             ].copy()
             conductor.dict_Step["SYSLOD"][:, 0] = 0.0
+    elif conductor.dict_input["METHOD"] == "AM4":
+        # Adams-Moulton order 4 (cdp, 10/2020)
+        if conductor.cond_num_step > 1:
+            # Shift the colums by one towards right; the new first column at \
+            # the current time step is assembled below (cdp, 10/2020)
+            conductor.dict_Step["SYSLOD"][:, 1:4] = conductor.dict_Step["SYSLOD"][
+                :, 0:3
+            ].copy()
+            conductor.dict_Step["SYSLOD"][:, 0] = 0.0
 
     # SYSVAR = np.zeros(conductor.dict_N_equation["Total"])
-    ASCALING = np.zeros(conductor.dict_N_equation["Total"])
-    UPWEQT = np.zeros(conductor.dict_N_equation["NODOFS"])
-    # Known terms vector (cdp, 10/2020)
-    Known = np.zeros(conductor.dict_N_equation["Total"])
+    UPWEQT = conductor.dict_Workspace["UPWEQT"]
+    UPWEQT[:] = 0.0
+    # Known terms vector (cdp, 10/2020): completely overwritten below.
+    Known = conductor.dict_Workspace["Known"]
 
     # qsource initialization to zeros (cdp, 07/2020)
     # questa inizializzazione è provvisoria, da capire cosa succede quando ci \
@@ -204,129 +228,97 @@ def step(conductor, environment, qsource, num_step):
 
     # COMPUTE AND ASSEMBLE THE ELEMENT NON-LINEAR MATRICES AND LOADS
 
-    # Compute the array of the center coordinate of the mesh for each interval \
-    # (cdp, 07/2020)
-    XMED = (
-        np.array(
-            conductor.dict_discretization["xcoord"][:-1]
-            + conductor.dict_discretization["xcoord"][1:]
-        )
-        / 2.0
-    )
     conductor.dict_discretization["Delta_x"] = (
         conductor.dict_discretization["xcoord"][1:]
         - conductor.dict_discretization["xcoord"][:-1]
     )
 
-    # dictionaties declaration (cdp, 07/2020)
-    conductor.dict_Gauss_pt["K1"] = {}
-    conductor.dict_Gauss_pt["K2"] = {}
-    conductor.dict_Gauss_pt["K3"] = {}
-
-    for rr in range(conductor.dict_obj_inventory["FluidComponents"]["Number"]):
+    # K', K'' and K''' are evaluated only for the interfaces between channels \
+    # listed in conductor.dict_interf_table["ch_ch"]; row ii of the arrays \
+    # stored in the workspace is for the interface in position ii of the \
+    # table. Parameters usefull to constuct recurrent coefficients of matrix \
+    # S elements (cdp, 09/2020)
+    conductor.dict_Gauss_pt["K1"] = conductor.dict_Workspace["K1"]
+    conductor.dict_Gauss_pt["K2"] = conductor.dict_Workspace["K2"]
+    conductor.dict_Gauss_pt["K3"] = conductor.dict_Workspace["K3"]
+    for key in ["K1", "K2", "K3"]:
+        conductor.dict_Gauss_pt[key][:] = 0.0
+    # End for key.
+
+    for ii, (rr, cc) in enumerate(conductor.dict_interf_table["ch_ch"]["Pairs"]):
         fluid_comp_r = conductor.dict_obj_inventory["FluidComponents"]["Objects"][rr]
-        for cc in range(
-            rr + 1, conductor.dict_obj_inventory["FluidComponents"]["Number"]
-        ):
-            fluid_comp_c = conductor.dict_obj_inventory["FluidComponents"]["Objects"][
-                cc
-            ]
-
-            if (
-                conductor.dict_df_coupling["contact_perimeter_flag"].at[
-                    fluid_comp_r.ID, fluid_comp_c.ID
-                ]
-                == 1
-            ):
-                # Construct interface name: it can be found also in \
-                # dict_topology["ch_ch"] but a search in dictionaties \
-                # "Hydraulic_parallel" and "Thermal_contact" should be performed, \
-                # which makes thinks not easy to do; it is simpler to construct \
-                # interface names combining channels ID (cdp, 09/2020)
-                interface_name = f"{fluid_comp_r.ID}_{fluid_comp_c.ID}"
-                # K', K'' and K''' initialization to zeros only if there is an \
-                # interface between fluid_comp_r and fluid_comp_c; parameters usefull to \
-                # constuct recurrent coefficients of matrix S elements (cdp, 09/2020)
-                conductor.dict_Gauss_pt["K1"][interface_name] = np.zeros(XMED.shape)
-                conductor.dict_Gauss_pt["K2"][interface_name] = np.zeros(XMED.shape)
-                conductor.dict_Gauss_pt["K3"][interface_name] = np.zeros(XMED.shape)
-                # COMPUTE K', K'' AND K'''
-                Delta_p = np.abs(
-                    fluid_comp_r.coolant.dict_Gauss_pt["pressure"]
-                    - fluid_comp_c.coolant.dict_Gauss_pt["pressure"]
-                )
-                # array smart (cdp, 07/2020)
-                Delta_p[Delta_p < conductor.Delta_p_min] = conductor.Delta_p_min
-
-                # find index such that P_chan_c >= P_chan_r (cdp, 07/2020)
-                ind_a = np.nonzero(
-                    fluid_comp_c.coolant.dict_Gauss_pt["pressure"]
-                    >= fluid_comp_r.coolant.dict_Gauss_pt["pressure"]
-                )[0]
-                # find index such that P_chan_c < P_chan_r (cdp, 07/2020)
-                ind_b = np.nonzero(
-                    fluid_comp_c.coolant.dict_Gauss_pt["pressure"]
-                    < fluid_comp_r.coolant.dict_Gauss_pt["pressure"]
-                )[0]
-                # K' evaluation (cdp, 07/2020)
-                # K' = A_othogonal*sqrt(2*density/k_loc*abs(Delta_p))
-                conductor.dict_Gauss_pt["K1"][interface_name][
-                    ind_a
-                ] = conductor.dict_interf_peri["ch_ch"]["Open"][
-                    interface_name
-                ] * np.sqrt(
-                    2.0
-                    * fluid_comp_c.coolant.dict_Gauss_pt["total_density"][ind_a]
-                    / (conductor.k_loc * Delta_p[ind_a])
-                )
-                conductor.dict_Gauss_pt["K1"][interface_name][
-                    ind_b
-                ] = conductor.dict_interf_peri["ch_ch"]["Open"][
-                    interface_name
-                ] * np.sqrt(
-                    2.0
-                    * fluid_comp_r.coolant.dict_Gauss_pt["total_density"][ind_b]
-                    / (conductor.k_loc * Delta_p[ind_b])
-                )
-                # K'' evaluation (cdp, 07/2020)
-                # K'' = K'*lambda_v*velocity
-                conductor.dict_Gauss_pt["K2"][interface_name][ind_a] = (
-                    conductor.dict_Gauss_pt["K1"][interface_name][ind_a]
-                    * fluid_comp_c.coolant.dict_Gauss_pt["velocity"][ind_a]
-                    * conductor.lambda_v
-                )
-                conductor.dict_Gauss_pt["K2"][interface_name][ind_b] = (
-                    conductor.dict_Gauss_pt["K1"][interface_name][ind_b]
-                    * fluid_comp_r.coolant.dict_Gauss_pt["velocity"][ind_b]
-                    * conductor.lambda_v
-                )
-                # K''' evaluation (cdp, 07/2020)
-                # K''' = K'*(enthalpy + (velocity*lambda_v)^2/2)
-                conductor.dict_Gauss_pt["K3"][interface_name][
-                    ind_a
-                ] = conductor.dict_Gauss_pt["K1"][interface_name][ind_a] * (
-                    fluid_comp_c.coolant.dict_Gauss_pt["total_enthalpy"][ind_a]
-                    + (
-                        fluid_comp_c.coolant.dict_Gauss_pt["velocity"][ind_a]
-                        * conductor.lambda_v
-                    )
-                    ** 2
-                    / 2.0
-                )
-                conductor.dict_Gauss_pt["K3"][interface_name][
-                    ind_b
-                ] = conductor.dict_Gauss_pt["K1"][interface_name][ind_b] * (
-                    fluid_comp_r.coolant.dict_Gauss_pt["total_enthalpy"][ind_b]
-                    + (
-                        fluid_comp_r.coolant.dict_Gauss_pt["velocity"][ind_b]
-                        * conductor.lambda_v
-                    )
-                    ** 2
-                    / 2.0
-                )
-            # end if conductor.ict_df_coupling["contact_perimeter_flag"].iat[rr, cc] (cdp, 07/2020)
-        # end for cc (cdp, 07/2020)
-    # end for rr (cdp, 07/2020)
+        fluid_comp_c = conductor.dict_obj_inventory["FluidComponents"]["Objects"][cc]
+        # COMPUTE K', K'' AND K'''
+        Delta_p = np.abs(
+            fluid_comp_r.coolant.dict_Gauss_pt["pressure"]
+            - fluid_comp_c.coolant.dict_Gauss_pt["pressure"]
+        )
+        # array smart (cdp, 07/2020)
+        Delta_p[Delta_p < conductor.Delta_p_min] = conductor.Delta_p_min
+
+        # find index such that P_chan_c >= P_chan_r (cdp, 07/2020)
+        ind_a = np.nonzero(
+            fluid_comp_c.coolant.dict_Gauss_pt["pressure"]
+            >= fluid_comp_r.coolant.dict_Gauss_pt["pressure"]
+        )[0]
+        # find index such that P_chan_c < P_chan_r (cdp, 07/2020)
+        ind_b = np.nonzero(
+            fluid_comp_c.coolant.dict_Gauss_pt["pressure"]
+            < fluid_comp_r.coolant.dict_Gauss_pt["pressure"]
+        )[0]
+        # K' evaluation (cdp, 07/2020)
+        # K' = A_othogonal*sqrt(2*density/k_loc*abs(Delta_p))
+        conductor.dict_Gauss_pt["K1"][ii, ind_a] = conductor.dict_interf_table["ch_ch"][
+            "Open"
+        ][ii] * np.sqrt(
+            2.0
+            * fluid_comp_c.coolant.dict_Gauss_pt["total_density"][ind_a]
+            / (conductor.k_loc * Delta_p[ind_a])
+        )
+        conductor.dict_Gauss_pt["K1"][ii, ind_b] = conductor.dict_interf_table["ch_ch"][
+            "Open"
+        ][ii] * np.sqrt(
+            2.0
+            * fluid_comp_r.coolant.dict_Gauss_pt["total_density"][ind_b]
+            / (conductor.k_loc * Delta_p[ind_b])
+        )
+        # K'' evaluation (cdp, 07/2020)
+        # K'' = K'*lambda_v*velocity
+        conductor.dict_Gauss_pt["K2"][ii, ind_a] = (
+            conductor.dict_Gauss_pt["K1"][ii, ind_a]
+            * fluid_comp_c.coolant.dict_Gauss_pt["velocity"][ind_a]
+            * conductor.lambda_v
+        )
+        conductor.dict_Gauss_pt["K2"][ii, ind_b] = (
+            conductor.dict_Gauss_pt["K1"][ii, ind_b]
+            * fluid_comp_r.coolant.dict_Gauss_pt["velocity"][ind_b]
+            * conductor.lambda_v
+        )
+        # K''' evaluation (cdp, 07/2020)
+        # K''' = K'*(enthalpy + (velocity*lambda_v)^2/2)
+        conductor.dict_Gauss_pt["K3"][ii, ind_a] = conductor.dict_Gauss_pt["K1"][
+            ii, ind_a
+        ] * (
+            fluid_comp_c.coolant.dict_Gauss_pt["total_enthalpy"][ind_a]
+            + (
+                fluid_comp_c.coolant.dict_Gauss_pt["velocity"][ind_a]
+                * conductor.lambda_v
+            )
+            ** 2
+            / 2.0
+        )
+        conductor.dict_Gauss_pt["K3"][ii, ind_b] = conductor.dict_Gauss_pt["K1"][
+            ii, ind_b
+        ] * (
+            fluid_comp_r.coolant.dict_Gauss_pt["total_enthalpy"][ind_b]
+            + (
+                fluid_comp_r.coolant.dict_Gauss_pt["velocity"][ind_b]
+                * conductor.lambda_v
+            )
+            ** 2
+            / 2.0
+        )
+    # end for ii (cdp, 07/2020)
 
     # cl* * * * * * * * * * * * * * * * * * * * * * * * * * * * *
     # cl* add the turn-to-turn coupling
@@ -336,1239 +328,781 @@ def step(conductor, environment, qsource, num_step):
 
     # ** MATRICES CONSTRUCTION (cdp, 07/2020) **
 
-    # riscrivere in forma array smart una volta risolti tutti i dubbi, se possibile (cdp, 07/2020)
-    for ii in range(conductor.dict_discretization["Grid_input"]["NELEMS"]):
+    # Array smart construction: the M, A, K, S matrices and the S vector are \
+    # evaluated at all the Gauss points in a single shot and stored in stacked \
+    # arrays of shape (NELEMS, NODOFS, NODOFS) (and (NELEMS, NODOFS, 2) for S \
+    # vector); the element matrices are then scattered into the banded \
+    # matrices with one vectorized sum for each row of the element matrix \
+    # instead of the former loop on the elements. The arithmetic is the same \
+    # of the loop version, so the assembled matrices do not change.
+    NELEMS = conductor.dict_discretization["Grid_input"]["NELEMS"]
+    NODOFS = conductor.dict_N_equation["NODOFS"]
+    num_fluid_components = conductor.dict_obj_inventory["FluidComponents"]["Number"]
+    # Auxiliary matrices initialization to zeros at each Gauss point \
+    # (cdp, 08/2020)
+    MMAT = conductor.dict_Workspace["MMAT"]
+    MMAT[:] = 0.0
+    AMAT = conductor.dict_Workspace["AMAT"]
+    AMAT[:] = 0.0
+    KMAT = conductor.dict_Workspace["KMAT"]
+    KMAT[:] = 0.0
+    SMAT = conductor.dict_Workspace["SMAT"]
+    SMAT[:] = 0.0
+    for key in conductor.dict_Workspace["SVEC"].keys():
+        conductor.dict_Workspace["SVEC"][key][:] = 0.0
+    # End for key.
+    if conductor.cond_num_step == 1:
+        # To correctly apply the theta method (cdp, 10/2020)
+        # key 0 is for the initialization (time step number is 0);
+        # key 1 is for the first time step after the initialization \
+        # (cdp, 10/2020)
+        SVEC = conductor.dict_Workspace["SVEC"]
+    else:
+        SVEC = conductor.dict_Workspace["SVEC"][1]
 
-        # Auxiliary matrices initialization to zeros at each Gauss point \
-        # (cdp, 08/2020)
-        MMAT = np.zeros(
-            (conductor.dict_N_equation["NODOFS"], conductor.dict_N_equation["NODOFS"])
+    # (cdp, 07/2020)
+    # ** FORM THE M, A, K, S MATRICES AND S VECTOR AT THE GAUSS POINT, FLUID \
+    # COMPONENTS EQUATIONS **
+    # FORM THE M MATRIX AT THE GAUSS POINT (MASS AND CAPACITY)
+    # FluidComponents equation: array smart (cdp, 07/2020)
+    MMAT[
+        :,
+        0 : conductor.dict_N_equation["FluidComponents"],
+        0 : conductor.dict_N_equation["FluidComponents"],
+    ] = np.eye(conductor.dict_N_equation["FluidComponents"])
+    # END M MATRIX: fluid components equations (cdp, 07/2020)
+    for jj in range(num_fluid_components):
+        fluid_comp_j = conductor.dict_obj_inventory["FluidComponents"]["Objects"][jj]
+        # Alias of the dictionary with the fluid properties in Gauss points.
+        dict_fluid_gauss = fluid_comp_j.coolant.dict_Gauss_pt
+        # FORM THE A MATRIX AT THE GAUSS POINT (FLUX JACOBIAN)
+        # coefficients coming from velocity equation (cdp, 07/2020)
+        AMAT[:, jj, jj] = dict_fluid_gauss["velocity"]
+        AMAT[:, jj, jj + num_fluid_components] = 1 / dict_fluid_gauss["total_density"]
+        # cefficients coming from pressure equation (cdp, 07/2020)
+        AMAT[:, jj + num_fluid_components, jj] = (
+            dict_fluid_gauss["total_speed_of_sound"] ** 2
+            * dict_fluid_gauss["total_density"]
         )
-        AMAT = np.zeros(
-            (conductor.dict_N_equation["NODOFS"], conductor.dict_N_equation["NODOFS"])
+        AMAT[
+            :, jj + num_fluid_components, jj + num_fluid_components
+        ] = dict_fluid_gauss["velocity"]
+        # cefficients coming from temperature equation (cdp, 07/2020)
+        AMAT[:, jj + 2 * num_fluid_components, jj] = (
+            dict_fluid_gauss["Gruneisen"] * dict_fluid_gauss["temperature"]
         )
-        KMAT = np.zeros(
-            (conductor.dict_N_equation["NODOFS"], conductor.dict_N_equation["NODOFS"])
+        AMAT[
+            :, jj + 2 * num_fluid_components, jj + 2 * num_fluid_components
+        ] = dict_fluid_gauss["velocity"]
+        # END A MATRIX: fluid components equations (cdp, 07/2020)
+
+        # FORM THE K MATRIX AT THE GAUSS POINT (INCLUDING UPWIND)
+        # UPWIND differencing contribution a' la finite-difference
+        # This is necessary to guarantee numarical stability, do not came from \
+        # KMAT algebraic construction (cdp, 07/2020)
+        # velocity equation (cdp, 07/2020)
+        KMAT[:, jj, jj] = (
+            conductor.dict_discretization["Delta_x"]
+            * UPWEQT[jj]
+            * np.abs(dict_fluid_gauss["velocity"])
+            / 2.0
         )
-        SMAT = np.zeros(
-            (conductor.dict_N_equation["NODOFS"], conductor.dict_N_equation["NODOFS"])
+        # pressure equation (cdp, 07/2020)
+        KMAT[:, jj + num_fluid_components, jj + num_fluid_components] = (
+            conductor.dict_discretization["Delta_x"]
+            * UPWEQT[jj + num_fluid_components]
+            * np.abs(dict_fluid_gauss["velocity"])
+            / 2.0
         )
-        if conductor.cond_num_step == 1:
-            # To correctly apply the theta method (cdp, 10/2020)
-            # key 0 is for the initialization (time step number is 0);
-            # key 1 is for the first time step after the initialization \
-            # (cdp, 10/2020)
-            SVEC = {
-                0: np.zeros((conductor.dict_N_equation["NODOFS"], 2)),
-                1: np.zeros((conductor.dict_N_equation["NODOFS"], 2)),
-            }
-        else:
-            SVEC = np.zeros((conductor.dict_N_equation["NODOFS"], 2))
-        ELMMAT = np.zeros(
-            (
-                2 * conductor.dict_N_equation["NODOFS"],
-                2 * conductor.dict_N_equation["NODOFS"],
-            )
-        )
-        ELAMAT = np.zeros(
-            (
-                2 * conductor.dict_N_equation["NODOFS"],
-                2 * conductor.dict_N_equation["NODOFS"],
-            )
+        # temperature equation (cdp, 07/2020)
+        KMAT[:, jj + 2 * num_fluid_components, jj + 2 * num_fluid_components] = (
+            conductor.dict_discretization["Delta_x"]
+            * UPWEQT[jj + 2 * num_fluid_components]
+            * np.abs(dict_fluid_gauss["velocity"])
+            / 2.0
         )
-        ELSMAT = np.zeros(
-            (
-                2 * conductor.dict_N_equation["NODOFS"],
-                2 * conductor.dict_N_equation["NODOFS"],
-            )
+        # END K MATRIX: fluid components equations (cdp, 07/2020)
+
+        # FORM THE S MATRIX AT THE GAUSS POINT (SOURCE JACOBIAN)
+        # velocity equation: main diagonal elements construction (cdp, 07/2020)
+        # (j,j) [vel_j] (cdp, 07/2020)
+        # dict_friction_factor[False]["total"]: total friction factor in Gauss points (see __init__ of class Channel for details)
+        SMAT[:, jj, jj] = (
+            2.0
+            * fluid_comp_j.channel.dict_friction_factor[False]["total"]
+            * np.abs(dict_fluid_gauss["velocity"])
+            / fluid_comp_j.channel.dict_input["HYDIAMETER"]
         )
-        ELKMAT = np.zeros(
-            (
-                2 * conductor.dict_N_equation["NODOFS"],
-                2 * conductor.dict_N_equation["NODOFS"],
-            )
+        # pressure equation: elements below main diagonal \
+        # construction (cdp, 07/2020)
+        # (j+num_fluid_components,0:num_fluid_components) [Pres] (cdp, 07/2020)
+        SMAT[:, jj + num_fluid_components, jj] = (
+            -SMAT[:, jj, jj]
+            * dict_fluid_gauss["Gruneisen"]
+            * dict_fluid_gauss["total_density"]
+            * dict_fluid_gauss["velocity"]
         )
-        # To correctly apply the theta method (cdp, 10/2020)
-        # key 0 is for the initialization (time step number is 0);
-        # key 1 is for the first time step after the initialization \
-        # (cdp, 10/2020)
-        if conductor.cond_num_step == 1:
-            ELSLOD = {
-                0: np.zeros(2 * conductor.dict_N_equation["NODOFS"]),
-                1: np.zeros(2 * conductor.dict_N_equation["NODOFS"]),
-            }
-        else:
-            ELSLOD = np.zeros(2 * conductor.dict_N_equation["NODOFS"])
-        jump = conductor.dict_N_equation["NODOFS"] * ii
-
+        # temperature equation: elements below main diagonal \
+        # construction (cdp, 07/2020)
+        # (j+2*num_fluid_components,0:num_fluid_components) [Temp] \
         # (cdp, 07/2020)
-        # ** FORM THE M, A, K, S MATRICES AND S VECTOR AT THE GAUSS POINT, FLUID \
-        # COMPONENTS EQUATIONS **
-        # FORM THE M MATRIX AT THE GAUSS POINT (MASS AND CAPACITY)
-        # FluidComponents equation: array smart (cdp, 07/2020)
-        MMAT[
-            0 : conductor.dict_N_equation["FluidComponents"],
-            0 : conductor.dict_N_equation["FluidComponents"],
-        ] = np.eye(conductor.dict_N_equation["FluidComponents"])
-        # END M MATRIX: fluid components equations (cdp, 07/2020)
-        for jj in range(conductor.dict_obj_inventory["FluidComponents"]["Number"]):
-            fluid_comp_j = conductor.dict_obj_inventory["FluidComponents"]["Objects"][
-                jj
-            ]
-            # FORM THE A MATRIX AT THE GAUSS POINT (FLUX JACOBIAN)
-            # coefficients coming from velocity equation (cdp, 07/2020)
-            AMAT[jj, jj] = fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]
-            AMAT[jj, jj + conductor.dict_obj_inventory["FluidComponents"]["Number"]] = (
-                1 / fluid_comp_j.coolant.dict_Gauss_pt["total_density"][ii]
-            )
-            # cefficients coming from pressure equation (cdp, 07/2020)
-            AMAT[jj + conductor.dict_obj_inventory["FluidComponents"]["Number"], jj] = (
-                fluid_comp_j.coolant.dict_Gauss_pt["total_speed_of_sound"][ii] ** 2
-                * fluid_comp_j.coolant.dict_Gauss_pt["total_density"][ii]
-            )
-            AMAT[
-                jj + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                jj + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-            ] = fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]
-            # cefficients coming from temperature equation (cdp, 07/2020)
-            AMAT[
-                jj + 2 * conductor.dict_obj_inventory["FluidComponents"]["Number"], jj
-            ] = (
-                fluid_comp_j.coolant.dict_Gauss_pt["Gruneisen"][ii]
-                * fluid_comp_j.coolant.dict_Gauss_pt["temperature"][ii]
-            )
-            AMAT[
-                jj + 2 * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                jj + 2 * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-            ] = fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]
-            # END A MATRIX: fluid components equations (cdp, 07/2020)
-
-            # FORM THE K MATRIX AT THE GAUSS POINT (INCLUDING UPWIND)
-            # UPWIND differencing contribution a' la finite-difference
-            # This is necessary to guarantee numarical stability, do not came from \
-            # KMAT algebraic construction (cdp, 07/2020)
-            # velocity equation (cdp, 07/2020)
-            KMAT[jj, jj] = (
-                conductor.dict_discretization["Delta_x"][ii]
-                * UPWEQT[jj]
-                * np.abs(fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii])
-                / 2.0
-            )
-            # pressure equation (cdp, 07/2020)
-            KMAT[
-                jj + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                jj + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-            ] = (
-                conductor.dict_discretization["Delta_x"][ii]
-                * UPWEQT[jj + conductor.dict_obj_inventory["FluidComponents"]["Number"]]
-                * np.abs(fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii])
-                / 2.0
-            )
-            # temperature equation (cdp, 07/2020)
-            KMAT[
-                jj + 2 * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                jj + 2 * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-            ] = (
-                conductor.dict_discretization["Delta_x"][ii]
-                * UPWEQT[
-                    jj + 2 * conductor.dict_obj_inventory["FluidComponents"]["Number"]
-                ]
-                * np.abs(fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii])
-                / 2.0
-            )
-            # UPWIND differencing contribution a' la Taylor-Galerkin
-            # This is necessary to guarantee numarical stability, do not came from \
-            # KMAT algebraic construction (cdp, 07/2020)
-            # velocity equation (cdp, 07/2020)
-            # KMAT[jj, jj] = conductor.time_step*UPWEQT[jj]*\
-            # 														 fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]/2.
-            # pressure equation (cdp, 07/2020)
-            # KMAT[jj+conductor.dict_obj_inventory["FluidComponents"]["Number"], jj+\
-            # conductor.dict_obj_inventory["FluidComponents"]["Number"]] = conductor.time_step*\
-            # 													UPWEQT[jj+conductor.dict_obj_inventory["FluidComponents"]["Number"]]*\
-            # 													fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]/2.
-            # temperature equation (cdp, 07/2020)
-            # KMAT[jj+2*conductor.dict_obj_inventory["FluidComponents"]["Number"], jj+\
-            # 2*conductor.dict_obj_inventory["FluidComponents"]["Number"]] = conductor.time_step*\
-            # 												UPWEQT[jj+2*conductor.dict_obj_inventory["FluidComponents"]["Number"]]*\
-            # 												fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]/2.
-            # END K MATRIX: fluid components equations (cdp, 07/2020)
-
-            # FORM THE S MATRIX AT THE GAUSS POINT (SOURCE JACOBIAN)
-            # velocity equation: main diagonal elements construction (cdp, 07/2020)
-            # (j,j) [vel_j] (cdp, 07/2020)
-            # dict_friction_factor[False]["total"]: total friction factor in Gauss points (see __init__ of class Channel for details)
-            SMAT[jj, jj] = (
-                2.0
-                * fluid_comp_j.channel.dict_friction_factor[False]["total"][ii]
-                * np.abs(fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii])
-                / fluid_comp_j.channel.dict_input["HYDIAMETER"]
-            )
-            # pressure equation: elements below main diagonal \
-            # construction (cdp, 07/2020)
-            # (j+num_fluid_components,0:num_fluid_components) [Pres] (cdp, 07/2020)
-            SMAT[jj + conductor.dict_obj_inventory["FluidComponents"]["Number"], jj] = (
-                -SMAT[jj, jj]
-                * fluid_comp_j.coolant.dict_Gauss_pt["Gruneisen"][ii]
-                * fluid_comp_j.coolant.dict_Gauss_pt["total_density"][ii]
-                * fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]
-            )
-            # temperature equation: elements below main diagonal \
-            # construction (cdp, 07/2020)
-            # (j+2*num_fluid_components,0:num_fluid_components) [Temp] \
-            # (cdp, 07/2020)
-            SMAT[
-                jj + 2 * conductor.dict_obj_inventory["FluidComponents"]["Number"], jj
-            ] = (
-                -SMAT[jj, jj]
-                / fluid_comp_j.coolant.dict_Gauss_pt["total_isochoric_specific_heat"][
-                    ii
-                ]
-                * fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]
-            )
-            for kk in range(conductor.dict_obj_inventory["FluidComponents"]["Number"]):
-                if kk != jj:
-                    fluid_comp_k = conductor.dict_obj_inventory["FluidComponents"][
-                        "Objects"
-                    ][kk]
-
-                    # Construct interface name: it can be found also in \
-                    # dict_topology["ch_ch"] but a search in dictionaties \
-                    # "Hydraulic_parallel" and "Thermal_contact" should be performed, \
-                    # which makes thinks not easy to do; it is simpler to construct \
-                    # interface names combining channels ID (cdp, 09/2020)
-                    interface_name = natural_sort(fluid_comp_j, fluid_comp_k)
-                    flag_ch_ch_contact = conductor.dict_interf_peri["ch_ch"][
-                        "Open"
-                    ].get(interface_name, str_check)
-                    # It is allowed to compare float with string (cdp, 09/2020)
-                    if flag_ch_ch_contact != str_check:
-                        # Perform calculation only if there is an interface, this \
-                        # will reduce the computational time (cdp, 09/2020)
-                        # velocity equation: above/below main diagonal elements \
-                        # construction (cdp, 07/2020)
-                        # (j,j+num_fluid_components) [Pres_j] (cdp, 07/2020)
-                        SMAT[
-                            jj,
-                            jj
-                            + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ] = SMAT[
-                            jj,
-                            jj
-                            + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ] - (
-                            conductor.dict_Gauss_pt["K1"][interface_name][ii]
-                            * fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]
-                            - conductor.dict_Gauss_pt["K2"][interface_name][ii]
-                        ) / (
-                            fluid_comp_j.channel.dict_input["CROSSECTION"]
-                            * fluid_comp_j.coolant.dict_Gauss_pt["total_density"][ii]
-                        )
-                        # (j,k + num_fluid_components:2*num_fluid_components) [Pres_k] \
-                        # (cdp, 07/2020)
-                        SMAT[
-                            jj,
-                            kk
-                            + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ] = (
-                            conductor.dict_Gauss_pt["K1"][interface_name][ii]
-                            * fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]
-                            - conductor.dict_Gauss_pt["K2"][interface_name][ii]
-                        ) / (
-                            fluid_comp_j.channel.dict_input["CROSSECTION"]
-                            * fluid_comp_j.coolant.dict_Gauss_pt["total_density"][ii]
-                        )
-                        # pressure equation: main diagonal elements construction \
-                        # (cdp, 07/2020)
-                        # (j+num_fluid_components,j+num_fluid_components) [Pres_j] \
-                        # (cdp, 07/2020)
-                        SMAT[
-                            jj
-                            + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                            jj
-                            + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ] = SMAT[
-                            jj
-                            + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                            jj
-                            + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ] + (
-                            fluid_comp_j.coolant.dict_Gauss_pt["Gruneisen"][ii]
-                            / fluid_comp_j.channel.dict_input["CROSSECTION"]
-                        ) * (
-                            conductor.dict_Gauss_pt["K3"][interface_name][ii]
-                            - fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]
-                            * conductor.dict_Gauss_pt["K2"][interface_name][ii]
-                            - (
-                                fluid_comp_j.coolant.dict_Gauss_pt["total_enthalpy"][ii]
-                                - fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]
-                                ** 2
-                                / 2.0
-                                - fluid_comp_j.coolant.dict_Gauss_pt[
-                                    "total_speed_of_sound"
-                                ][ii]
-                                ** 2
-                                / fluid_comp_j.coolant.dict_Gauss_pt["Gruneisen"][ii]
-                            )
-                            * conductor.dict_Gauss_pt["K1"][interface_name][ii]
-                        )
-                        # pressure equation: above/below main diagonal elements \
-                        # construction (cdp, 07/2020)
-                        # (j+num_fluid_components,\
-                        # k + num_fluid_components:2*num_fluid_components) [Pres_k] \
-                        # (cdp, 07/2020)
-                        SMAT[
-                            jj
-                            + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                            kk
-                            + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ] = -(
-                            fluid_comp_j.coolant.dict_Gauss_pt["Gruneisen"][ii]
-                            / fluid_comp_j.channel.dict_input["CROSSECTION"]
-                        ) * (
-                            conductor.dict_Gauss_pt["K3"][interface_name][ii]
-                            - fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]
-                            * conductor.dict_Gauss_pt["K2"][interface_name][ii]
-                            - (
-                                fluid_comp_j.coolant.dict_Gauss_pt["total_enthalpy"][ii]
-                                - fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]
-                                ** 2
-                                / 2.0
-                                - fluid_comp_j.coolant.dict_Gauss_pt[
-                                    "total_speed_of_sound"
-                                ][ii]
-                                ** 2
-                                / fluid_comp_j.coolant.dict_Gauss_pt["Gruneisen"][ii]
-                            )
-                            * conductor.dict_Gauss_pt["K1"][interface_name][ii]
-                        )
-                        # (j+num_fluid_components,j+2*num_fluid_components) [Temp_j] I \
-                        # (cdp, 07/2020)
-                        SMAT[
-                            jj
-                            + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                            jj
-                            + 2
-                            * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ] = SMAT[
-                            jj
-                            + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                            jj
-                            + 2
-                            * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ] + (
-                            fluid_comp_j.coolant.dict_Gauss_pt["Gruneisen"][ii]
-                            / fluid_comp_j.channel.dict_input["CROSSECTION"]
-                        ) * (
-                            conductor.dict_interf_peri["ch_ch"]["Open"][interface_name]
-                            * conductor.dict_Gauss_pt["HTC"]["ch_ch"]["Open"][
-                                interface_name
-                            ][ii]
-                            + conductor.dict_interf_peri["ch_ch"]["Close"][
-                                interface_name
-                            ]
-                            * conductor.dict_Gauss_pt["HTC"]["ch_ch"]["Close"][
-                                interface_name
-                            ][ii]
-                        )
-                        # (j+num_fluid_components,\
-                        # k + 2*num_fluid_components:dict_N_equation["FluidComponents"]) [Temp_j] # (cdp, 07/2020)
-                        SMAT[
-                            jj
-                            + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                            kk
-                            + 2
-                            * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ] = -(
-                            fluid_comp_j.coolant.dict_Gauss_pt["Gruneisen"][ii]
-                            / fluid_comp_j.channel.dict_input["CROSSECTION"]
-                        ) * (
-                            conductor.dict_interf_peri["ch_ch"]["Open"][interface_name]
-                            * conductor.dict_Gauss_pt["HTC"]["ch_ch"]["Open"][
-                                interface_name
-                            ][ii]
-                            + conductor.dict_interf_peri["ch_ch"]["Close"][
-                                interface_name
-                            ]
-                            * conductor.dict_Gauss_pt["HTC"]["ch_ch"]["Close"][
-                                interface_name
-                            ][ii]
-                        )
-                        # temperature equation: elements below main diagonal \
-                        # construction (cdp, 07/2020)
-                        # (j+2*num_fluid_components,j+num_fluid_components) [Pres_j] \
-                        # (cdp, 07/2020)
-                        SMAT[
-                            jj
-                            + 2
-                            * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                            jj
-                            + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ] = SMAT[
-                            jj
-                            + 2
-                            * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                            jj
-                            + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ] + 1.0 / (
-                            fluid_comp_j.coolant.dict_Gauss_pt["total_density"][ii]
-                            * fluid_comp_j.coolant.dict_Gauss_pt[
-                                "total_isochoric_specific_heat"
-                            ][ii]
-                            * fluid_comp_j.channel.dict_input["CROSSECTION"]
-                        ) * (
-                            conductor.dict_Gauss_pt["K3"][interface_name][ii]
-                            - fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]
-                            * conductor.dict_Gauss_pt["K2"][interface_name][ii]
-                            - (
-                                fluid_comp_j.coolant.dict_Gauss_pt["total_enthalpy"][ii]
-                                - fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]
-                                ** 2
-                                / 2.0
-                                - fluid_comp_j.coolant.dict_Gauss_pt["Gruneisen"][ii]
-                                * fluid_comp_j.coolant.dict_Gauss_pt[
-                                    "total_isochoric_specific_heat"
-                                ][ii]
-                                * fluid_comp_j.coolant.dict_Gauss_pt["temperature"][ii]
-                            )
-                            * conductor.dict_Gauss_pt["K1"][interface_name][ii]
-                        )
-                        # (j+2*num_fluid_components,\
-                        # k + num_fluid_components:2*num_fluid_components) [Pres_k] \
-                        # (cdp, 07/2020)
-                        SMAT[
-                            jj
-                            + 2
-                            * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                            kk
-                            + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ] = (
-                            -1.0
-                            / (
-                                fluid_comp_j.coolant.dict_Gauss_pt["total_density"][ii]
-                                * fluid_comp_j.coolant.dict_Gauss_pt[
-                                    "total_isochoric_specific_heat"
-                                ][ii]
-                                * fluid_comp_j.channel.dict_input["CROSSECTION"]
-                            )
-                            * (
-                                conductor.dict_Gauss_pt["K3"][interface_name][ii]
-                                - fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]
-                                * conductor.dict_Gauss_pt["K2"][interface_name][ii]
-                                - (
-                                    fluid_comp_j.coolant.dict_Gauss_pt[
-                                        "total_enthalpy"
-                                    ][ii]
-                                    - fluid_comp_j.coolant.dict_Gauss_pt["velocity"][ii]
-                                    ** 2
-                                    / 2.0
-                                    - fluid_comp_j.coolant.dict_Gauss_pt["Gruneisen"][
-                                        ii
-                                    ]
-                                    * fluid_comp_j.coolant.dict_Gauss_pt[
-                                        "total_isochoric_specific_heat"
-                                    ][ii]
-                                    * fluid_comp_j.coolant.dict_Gauss_pt["temperature"][
-                                        ii
-                                    ]
-                                )
-                                * conductor.dict_Gauss_pt["K1"][interface_name][ii]
-                            )
-                        )
-                        # temperature equation: main diagonal element construction \
-                        # (cdp, 07/2020)
-                        # (j+2*num_fluid_components,j+2*num_fluid_components) \
-                        # [Temp_j] I (cdp, 07/2020)
-                        SMAT[
-                            jj
-                            + 2
-                            * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                            jj
-                            + 2
-                            * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ] = SMAT[
-                            jj
-                            + 2
-                            * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                            jj
-                            + 2
-                            * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ] + 1.0 / (
-                            fluid_comp_j.coolant.dict_Gauss_pt["total_density"][ii]
-                            * fluid_comp_j.coolant.dict_Gauss_pt[
-                                "total_isochoric_specific_heat"
-                            ][ii]
-                            * fluid_comp_j.channel.dict_input["CROSSECTION"]
-                        ) * (
-                            conductor.dict_interf_peri["ch_ch"]["Open"][interface_name]
-                            * conductor.dict_Gauss_pt["HTC"]["ch_ch"]["Open"][
-                                interface_name
-                            ][ii]
-                            + conductor.dict_interf_peri["ch_ch"]["Close"][
-                                interface_name
-                            ]
-                            * conductor.dict_Gauss_pt["HTC"]["ch_ch"]["Close"][
-                                interface_name
-                            ][ii]
-                        )
-                        # temperature equation: above/below main diagonal elements \
-                        # construction (cdp, 07/2020)
-                        # (j+2*num_fluid_components,k + 2*num_fluid_components) [Temp_k] \
-                        # (cdp, 07/2020)
-                        SMAT[
-                            jj
-                            + 2
-                            * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                            kk
-                            + 2
-                            * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ] = (
-                            -1.0
-                            / (
-                                fluid_comp_j.coolant.dict_Gauss_pt["total_density"][ii]
-                                * fluid_comp_j.coolant.dict_Gauss_pt[
-                                    "total_isochoric_specific_heat"
-                                ][ii]
-                                * fluid_comp_j.channel.dict_input["CROSSECTION"]
-                            )
-                            * (
-                                conductor.dict_interf_peri["ch_ch"]["Open"][
-                                    interface_name
-                                ]
-                                * conductor.dict_Gauss_pt["HTC"]["ch_ch"]["Open"][
-                                    interface_name
-                                ][ii]
-                                + conductor.dict_interf_peri["ch_ch"]["Close"][
-                                    interface_name
-                                ]
-                                * conductor.dict_Gauss_pt["HTC"]["ch_ch"]["Close"][
-                                    interface_name
-                                ][ii]
-                            )
-                        )
-                    # end if flag_ch_ch_contact (cdp, 09/2020)
-                # end if kk != jj (cdp, 07/2020)
-            # end for kk (cdp, 07/2020)
-            for ll in range(conductor.dict_obj_inventory["SolidComponents"]["Number"]):
-                s_comp = conductor.dict_obj_inventory["SolidComponents"]["Objects"][ll]
-                # chan_sol_topology is equivalent to \
-                # conductor.dict_topology["ch_sol"][fluid_comp_r.ID][s_comp.ID] \
-                # but it is shorter so I decide to use it here (cdp, 09/2020)
-                chan_sol_topology = f"{fluid_comp_j.ID}_{s_comp.ID}"
-                flag_chan_sol_contact = conductor.dict_interf_peri["ch_sol"].get(
-                    chan_sol_topology, str_check
-                )
-                if flag_chan_sol_contact != str_check:
+        SMAT[:, jj + 2 * num_fluid_components, jj] = (
+            -SMAT[:, jj, jj]
+            / dict_fluid_gauss["total_isochoric_specific_heat"]
+            * dict_fluid_gauss["velocity"]
+        )
+        for kk in range(num_fluid_components):
+            if kk != jj:
+                # Position of the interface in the table built by method \
+                # get_interface_table of class Conductors (-1 if there is no \
+                # interface).
+                ii = conductor.dict_interf_table["ch_ch"]["Index"][jj, kk]
+                if ii >= 0:
                     # Perform calculation only if there is an interface, this \
                     # will reduce the computational time (cdp, 09/2020)
-                    # pressure equation: above main diagonal elements
+                    interface_name = conductor.dict_interf_table["ch_ch"]["Name"][ii]
+                    K1 = conductor.dict_Gauss_pt["K1"][ii]
+                    K2 = conductor.dict_Gauss_pt["K2"][ii]
+                    K3 = conductor.dict_Gauss_pt["K3"][ii]
+                    # Heat transfer through the open and close perimeters.
+                    htc_peri = (
+                        conductor.dict_interf_table["ch_ch"]["Open"][ii]
+                        * conductor.dict_Gauss_pt["HTC"]["ch_ch"]["Open"][
+                            interface_name
+                        ]
+                        + conductor.dict_interf_table["ch_ch"]["Close"][ii]
+                        * conductor.dict_Gauss_pt["HTC"]["ch_ch"]["Close"][
+                            interface_name
+                        ]
+                    )
+                    # velocity equation: above/below main diagonal elements \
                     # construction (cdp, 07/2020)
-                    # (j+num_fluid_components,j+2*num_fluid_components) [Temp_j] \
-                    # II + III (cdp, 07/2020)
+                    # (j,j+num_fluid_components) [Pres_j] (cdp, 07/2020)
+                    SMAT[:, jj, jj + num_fluid_components] = SMAT[
+                        :, jj, jj + num_fluid_components
+                    ] - (K1 * dict_fluid_gauss["velocity"] - K2) / (
+                        fluid_comp_j.channel.dict_input["CROSSECTION"]
+                        * dict_fluid_gauss["total_density"]
+                    )
+                    # (j,k + num_fluid_components:2*num_fluid_components) [Pres_k] \
+                    # (cdp, 07/2020)
+                    SMAT[:, jj, kk + num_fluid_components] = (
+                        K1 * dict_fluid_gauss["velocity"] - K2
+                    ) / (
+                        fluid_comp_j.channel.dict_input["CROSSECTION"]
+                        * dict_fluid_gauss["total_density"]
+                    )
+                    # pressure equation: main diagonal elements construction \
+                    # (cdp, 07/2020)
+                    # (j+num_fluid_components,j+num_fluid_components) [Pres_j] \
+                    # (cdp, 07/2020)
                     SMAT[
-                        jj + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        jj
-                        + 2 * conductor.dict_obj_inventory["FluidComponents"]["Number"],
+                        :, jj + num_fluid_components, jj + num_fluid_components
                     ] = SMAT[
-                        jj + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        jj
-                        + 2 * conductor.dict_obj_inventory["FluidComponents"]["Number"],
+                        :, jj + num_fluid_components, jj + num_fluid_components
                     ] + (
-                        fluid_comp_j.coolant.dict_Gauss_pt["Gruneisen"][ii]
+                        dict_fluid_gauss["Gruneisen"]
                         / fluid_comp_j.channel.dict_input["CROSSECTION"]
                     ) * (
-                        conductor.dict_interf_peri["ch_sol"][chan_sol_topology]
-                        * conductor.dict_Gauss_pt["HTC"]["ch_sol"][chan_sol_topology][
-                            ii
-                        ]
+                        K3
+                        - dict_fluid_gauss["velocity"] * K2
+                        - (
+                            dict_fluid_gauss["total_enthalpy"]
+                            - dict_fluid_gauss["velocity"] ** 2 / 2.0
+                            - dict_fluid_gauss["total_speed_of_sound"] ** 2
+                            / dict_fluid_gauss["Gruneisen"]
+                        )
+                        * K1
                     )
-                    # (j+num_fluid_components,l + dict_N_equation["FluidComponents"]) [Temp_l] (cdp, 07/2020)
-                    SMAT[
-                        jj + conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ll + conductor.dict_N_equation["FluidComponents"],
-                    ] = -(
-                        fluid_comp_j.coolant.dict_Gauss_pt["Gruneisen"][ii]
+                    # pressure equation: above/below main diagonal elements \
+                    # construction (cdp, 07/2020)
+                    # (j+num_fluid_components,\
+                    # k + num_fluid_components:2*num_fluid_components) [Pres_k] \
+                    # (cdp, 07/2020)
+                    SMAT[:, jj + num_fluid_components, kk + num_fluid_components] = -(
+                        dict_fluid_gauss["Gruneisen"]
                         / fluid_comp_j.channel.dict_input["CROSSECTION"]
                     ) * (
-                        conductor.dict_interf_peri["ch_sol"][chan_sol_topology]
-                        * conductor.dict_Gauss_pt["HTC"]["ch_sol"][chan_sol_topology][
-                            ii
+                        K3
+                        - dict_fluid_gauss["velocity"] * K2
+                        - (
+                            dict_fluid_gauss["total_enthalpy"]
+                            - dict_fluid_gauss["velocity"] ** 2 / 2.0
+                            - dict_fluid_gauss["total_speed_of_sound"] ** 2
+                            / dict_fluid_gauss["Gruneisen"]
+                        )
+                        * K1
+                    )
+                    # (j+num_fluid_components,j+2*num_fluid_components) [Temp_j] I \
+                    # (cdp, 07/2020)
+                    SMAT[
+                        :, jj + num_fluid_components, jj + 2 * num_fluid_components
+                    ] = (
+                        SMAT[
+                            :, jj + num_fluid_components, jj + 2 * num_fluid_components
                         ]
+                        + (
+                            dict_fluid_gauss["Gruneisen"]
+                            / fluid_comp_j.channel.dict_input["CROSSECTION"]
+                        )
+                        * htc_peri
                     )
-                    # temperature equation: main diagonal element construction \
+                    # (j+num_fluid_components,\
+                    # k + 2*num_fluid_components:dict_N_equation["FluidComponents"]) [Temp_j] # (cdp, 07/2020)
+                    SMAT[
+                        :, jj + num_fluid_components, kk + 2 * num_fluid_components
+                    ] = (
+                        -(
+                            dict_fluid_gauss["Gruneisen"]
+                            / fluid_comp_j.channel.dict_input["CROSSECTION"]
+                        )
+                        * htc_peri
+                    )
+                    # temperature equation: elements below main diagonal \
+                    # construction (cdp, 07/2020)
+                    # (j+2*num_fluid_components,j+num_fluid_components) [Pres_j] \
                     # (cdp, 07/2020)
-                    # (j+2*num_fluid_components,j+2*num_fluid_components) [Temp_j] \
-                    # II + III (cdp, 07/2020)
                     SMAT[
-                        jj
-                        + 2 * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        jj
-                        + 2 * conductor.dict_obj_inventory["FluidComponents"]["Number"],
+                        :, jj + 2 * num_fluid_components, jj + num_fluid_components
                     ] = SMAT[
-                        jj
-                        + 2 * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        jj
-                        + 2 * conductor.dict_obj_inventory["FluidComponents"]["Number"],
+                        :, jj + 2 * num_fluid_components, jj + num_fluid_components
                     ] + 1.0 / (
-                        fluid_comp_j.coolant.dict_Gauss_pt["total_density"][ii]
-                        * fluid_comp_j.coolant.dict_Gauss_pt[
-                            "total_isochoric_specific_heat"
-                        ][ii]
+                        dict_fluid_gauss["total_density"]
+                        * dict_fluid_gauss["total_isochoric_specific_heat"]
                         * fluid_comp_j.channel.dict_input["CROSSECTION"]
                     ) * (
-                        conductor.dict_interf_peri["ch_sol"][chan_sol_topology]
-                        * conductor.dict_Gauss_pt["HTC"]["ch_sol"][chan_sol_topology][
-                            ii
-                        ]
+                        K3
+                        - dict_fluid_gauss["velocity"] * K2
+                        - (
+                            dict_fluid_gauss["total_enthalpy"]
+                            - dict_fluid_gauss["velocity"] ** 2 / 2.0
+                            - dict_fluid_gauss["Gruneisen"]
+                            * dict_fluid_gauss["total_isochoric_specific_heat"]
+                            * dict_fluid_gauss["temperature"]
+                        )
+                        * K1
                     )
-                    # temperature equation: above main diagonal elements
-                    # construction (cdp, 07/2020)
-                    # (j+2*num_fluid_components,l + dict_N_equation["FluidComponents"]) [Temp_l] (cdp, 07/2020)
+                    # (j+2*num_fluid_components,\
+                    # k + num_fluid_components:2*num_fluid_components) [Pres_k] \
+                    # (cdp, 07/2020)
                     SMAT[
-                        jj
-                        + 2 * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                        ll + conductor.dict_N_equation["FluidComponents"],
+                        :, jj + 2 * num_fluid_components, kk + num_fluid_components
                     ] = (
                         -1.0
                         / (
-                            fluid_comp_j.coolant.dict_Gauss_pt["total_density"][ii]
-                            * fluid_comp_j.coolant.dict_Gauss_pt[
-                                "total_isochoric_specific_heat"
-                            ][ii]
+                            dict_fluid_gauss["total_density"]
+                            * dict_fluid_gauss["total_isochoric_specific_heat"]
                             * fluid_comp_j.channel.dict_input["CROSSECTION"]
                         )
                         * (
-                            conductor.dict_interf_peri["ch_sol"][chan_sol_topology]
-                            * conductor.dict_Gauss_pt["HTC"]["ch_sol"][
-                                chan_sol_topology
-                            ][ii]
+                            K3
+                            - dict_fluid_gauss["velocity"] * K2
+                            - (
+                                dict_fluid_gauss["total_enthalpy"]
+                                - dict_fluid_gauss["velocity"] ** 2 / 2.0
+                                - dict_fluid_gauss["Gruneisen"]
+                                * dict_fluid_gauss["total_isochoric_specific_heat"]
+                                * dict_fluid_gauss["temperature"]
+                            )
+                            * K1
                         )
                     )
-                # end if flag_chan_sol_contact (cdp, 09/2020)
-            # end for ll (cdp, 07/2020)
-            # END S MATRIX: fluid components equations (cdp, 07/2020)
-
-            # FORM THE S VECTOR AT THE NODAL POINTS (SOURCE)
-            # Set to zeros in initialization (cdp, 08/2020)
-            # END S VECTOR: fluid components equations (cdp, 07/2020)
-        # end for jj (cdp, 07/2020)
-
-        # (cdp, 07/2020)
-        # * FORM THE M, A, K, S MATRICES AND S VECTOR AT THE GAUSS POINT, SOLID \
-        # COMPONENTS EQUATIONS *
-        for ll in range(conductor.dict_obj_inventory["SolidComponents"]["Number"]):
-            s_comp_l = conductor.dict_obj_inventory["SolidComponents"]["Objects"][ll]
-            neq = conductor.dict_N_equation["FluidComponents"] + ll
-            # FORM THE M MATRIX AT THE GAUSS POINT (MASS AND CAPACITY)
-            # SolidComponents equation (cdp, 07/2020)
-            # A_{s_comp}*rho_{s_comp,homo}*cp_{s_comp,homo}/cos(theta); \
-            # homo = homogenized (cdp, 07/2020)
-            MMAT[neq, neq] = (
-                s_comp_l.dict_input["CROSSECTION"]
-                * s_comp_l.dict_Gauss_pt["total_density"]
-                * s_comp_l.dict_Gauss_pt["total_isobaric_specific_heat"][ii]
-                / s_comp_l.dict_input["COSTETA"]
-            )
-            # END M MATRIX: solid components equation (cdp, 07/2020)
-
-            # FORM THE A MATRIX AT THE GAUSS POINT (FLUX JACOBIAN)
-            # No elements here (cdp, 07/2020)
-            # END A MATRIX: solid components equation (cdp, 07/2020)
-
-            # FORM THE K MATRIX AT THE GAUSS POINT (INCLUDING UPWIND)
-            # A_{s_comp}*k_{s_comp,homo}; homo = homogenized (cdp, 07/2020)
-            KMAT[neq, neq] = (
-                s_comp_l.dict_input["CROSSECTION"]
-                * s_comp_l.dict_Gauss_pt["total_thermal_conductivity"][ii]
-                / s_comp_l.dict_input["COSTETA"]
-            )
-            # KMAT[neq, neq] = s_comp_l.dict_input["CROSSECTION"]*\
-            # 								 s_comp_l.dict_Gauss_pt["total_thermal_conductivity"][ii]
-            # END K MATRIX: solid components equation (cdp, 07/2020)
-
-            # FORM THE S MATRIX AT THE GAUSS POINT (SOURCE JACOBIAN)
-            for mm in range(conductor.dict_obj_inventory["SolidComponents"]["Number"]):
-                if mm != ll:
-                    s_comp_m = conductor.dict_obj_inventory["SolidComponents"][
-                        "Objects"
-                    ][mm]
-                    # s_comp_topology is equivalent to \
-                    # conductor.dict_topology["sol_sol"][s_comp_m.ID][s_comp_l.ID] \
-                    # but it is shorter so I decide to use it here (cdp, 09/2020)
-                    s_comp_topology = natural_sort(s_comp_l, s_comp_m)
-                    flag_sol_sol_contact = conductor.dict_interf_peri["sol_sol"].get(
-                        s_comp_topology, str_check
-                    )
-                    if flag_sol_sol_contact != str_check:
-                        # Perform calculation only if there is an interface, this \
-                        # will reduce the computational time (cdp, 09/2020)
-                        # solid components conduction equation: main diagonal element \
-                        # construction (cdp, 07/2020)
-                        # (l + dict_N_equation["FluidComponents"],l + dict_N_equation["FluidComponents"]) [Temp_l] II + III # (cdp, 07/2020)
-                        SMAT[neq, neq] = (
-                            SMAT[neq, neq]
-                            + conductor.dict_interf_peri["sol_sol"][s_comp_topology]
-                            * conductor.dict_Gauss_pt["HTC"]["sol_sol"][
-                                s_comp_topology
-                            ]["cond"][ii]
+                    # temperature equation: main diagonal element construction \
+                    # (cdp, 07/2020)
+                    # (j+2*num_fluid_components,j+2*num_fluid_components) \
+                    # [Temp_j] I (cdp, 07/2020)
+                    SMAT[
+                        :, jj + 2 * num_fluid_components, jj + 2 * num_fluid_components
+                    ] = (
+                        SMAT[
+                            :,
+                            jj + 2 * num_fluid_components,
+                            jj + 2 * num_fluid_components,
+                        ]
+                        + 1.0
+                        / (
+                            dict_fluid_gauss["total_density"]
+                            * dict_fluid_gauss["total_isochoric_specific_heat"]
+                            * fluid_comp_j.channel.dict_input["CROSSECTION"]
                         )
-                        # solid components conduction equation: above/below main diagonal \
-                        # elements construction (cdp, 07/2020)
-                        # (l + dict_N_equation["FluidComponents"],m + dict_N_equation["FluidComponents"]) [Temp_m] (cdp, 07/2020)
-                        SMAT[neq, mm + conductor.dict_N_equation["FluidComponents"]] = (
-                            -conductor.dict_interf_peri["sol_sol"][s_comp_topology]
-                            * conductor.dict_Gauss_pt["HTC"]["sol_sol"][
-                                s_comp_topology
-                            ]["cond"][ii]
+                        * htc_peri
+                    )
+                    # temperature equation: above/below main diagonal elements \
+                    # construction (cdp, 07/2020)
+                    # (j+2*num_fluid_components,k + 2*num_fluid_components) [Temp_k] \
+                    # (cdp, 07/2020)
+                    SMAT[
+                        :, jj + 2 * num_fluid_components, kk + 2 * num_fluid_components
+                    ] = (
+                        -1.0
+                        / (
+                            dict_fluid_gauss["total_density"]
+                            * dict_fluid_gauss["total_isochoric_specific_heat"]
+                            * fluid_comp_j.channel.dict_input["CROSSECTION"]
                         )
-                    # end if flag_sol_sol_contact (cdp, 09/2020)
-                # end if mm != ll (cdp, 07/2020)
-            # end for mm (cdp, 07/2020)
-            for jj in range(conductor.dict_obj_inventory["FluidComponents"]["Number"]):
-                fluid_comp_j = conductor.dict_obj_inventory["FluidComponents"][
-                    "Objects"
-                ][jj]
-                chan_sol_topology = f"{fluid_comp_j.ID}_{s_comp_l.ID}"
-                flag_chan_sol_contact = conductor.dict_interf_peri["ch_sol"].get(
-                    chan_sol_topology, str_check
+                        * htc_peri
+                    )
+                # end if ii (cdp, 09/2020)
+            # end if kk != jj (cdp, 07/2020)
+        # end for kk (cdp, 07/2020)
+        for ll in range(conductor.dict_obj_inventory["SolidComponents"]["Number"]):
+            # Position of the interface in the table built by method \
+            # get_interface_table of class Conductors (-1 if there is no \
+            # interface).
+            ii = conductor.dict_interf_table["ch_sol"]["Index"][jj, ll]
+            if ii >= 0:
+                # Perform calculation only if there is an interface, this \
+                # will reduce the computational time (cdp, 09/2020)
+                # Heat transfer through the contact perimeter.
+                htc_peri = (
+                    conductor.dict_interf_table["ch_sol"]["Perimeter"][ii]
+                    * conductor.dict_Gauss_pt["HTC"]["ch_sol"][
+                        conductor.dict_interf_table["ch_sol"]["Name"][ii]
+                    ]
+                )
+                # pressure equation: above main diagonal elements
+                # construction (cdp, 07/2020)
+                # (j+num_fluid_components,j+2*num_fluid_components) [Temp_j] \
+                # II + III (cdp, 07/2020)
+                SMAT[:, jj + num_fluid_components, jj + 2 * num_fluid_components] = (
+                    SMAT[:, jj + num_fluid_components, jj + 2 * num_fluid_components]
+                    + (
+                        dict_fluid_gauss["Gruneisen"]
+                        / fluid_comp_j.channel.dict_input["CROSSECTION"]
+                    )
+                    * htc_peri
+                )
+                # (j+num_fluid_components,l + dict_N_equation["FluidComponents"]) [Temp_l] (cdp, 07/2020)
+                SMAT[
+                    :,
+                    jj + num_fluid_components,
+                    ll + conductor.dict_N_equation["FluidComponents"],
+                ] = (
+                    -(
+                        dict_fluid_gauss["Gruneisen"]
+                        / fluid_comp_j.channel.dict_input["CROSSECTION"]
+                    )
+                    * htc_peri
+                )
+                # temperature equation: main diagonal element construction \
+                # (cdp, 07/2020)
+                # (j+2*num_fluid_components,j+2*num_fluid_components) [Temp_j] \
+                # II + III (cdp, 07/2020)
+                SMAT[
+                    :, jj + 2 * num_fluid_components, jj + 2 * num_fluid_components
+                ] = (
+                    SMAT[
+                        :, jj + 2 * num_fluid_components, jj + 2 * num_fluid_components
+                    ]
+                    + 1.0
+                    / (
+                        dict_fluid_gauss["total_density"]
+                        * dict_fluid_gauss["total_isochoric_specific_heat"]
+                        * fluid_comp_j.channel.dict_input["CROSSECTION"]
+                    )
+                    * htc_peri
+                )
+                # temperature equation: above main diagonal elements
+                # construction (cdp, 07/2020)
+                # (j+2*num_fluid_components,l + dict_N_equation["FluidComponents"]) [Temp_l] (cdp, 07/2020)
+                SMAT[
+                    :,
+                    jj + 2 * num_fluid_components,
+                    ll + conductor.dict_N_equation["FluidComponents"],
+                ] = (
+                    -1.0
+                    / (
+                        dict_fluid_gauss["total_density"]
+                        * dict_fluid_gauss["total_isochoric_specific_heat"]
+                        * fluid_comp_j.channel.dict_input["CROSSECTION"]
+                    )
+                    * htc_peri
                 )
-                if flag_chan_sol_contact != str_check:
+            # end if ii (cdp, 09/2020)
+        # end for ll (cdp, 07/2020)
+        # END S MATRIX: fluid components equations (cdp, 07/2020)
+
+        # FORM THE S VECTOR AT THE NODAL POINTS (SOURCE)
+        # Set to zeros in initialization (cdp, 08/2020)
+        # END S VECTOR: fluid components equations (cdp, 07/2020)
+    # end for jj (cdp, 07/2020)
+
+    # (cdp, 07/2020)
+    # * FORM THE M, A, K, S MATRICES AND S VECTOR AT THE GAUSS POINT, SOLID \
+    # COMPONENTS EQUATIONS *
+    for ll in range(conductor.dict_obj_inventory["SolidComponents"]["Number"]):
+        s_comp_l = conductor.dict_obj_inventory["SolidComponents"]["Objects"][ll]
+        neq = conductor.dict_N_equation["FluidComponents"] + ll
+        # FORM THE M MATRIX AT THE GAUSS POINT (MASS AND CAPACITY)
+        # SolidComponents equation (cdp, 07/2020)
+        # A_{s_comp}*rho_{s_comp,homo}*cp_{s_comp,homo}/cos(theta); \
+        # homo = homogenized (cdp, 07/2020)
+        MMAT[:, neq, neq] = (
+            s_comp_l.dict_input["CROSSECTION"]
+            * s_comp_l.dict_Gauss_pt["total_density"]
+            * s_comp_l.dict_Gauss_pt["total_isobaric_specific_heat"]
+            / s_comp_l.dict_input["COSTETA"]
+        )
+        # END M MATRIX: solid components equation (cdp, 07/2020)
+
+        # FORM THE A MATRIX AT THE GAUSS POINT (FLUX JACOBIAN)
+        # No elements here (cdp, 07/2020)
+        # END A MATRIX: solid components equation (cdp, 07/2020)
+
+        # FORM THE K MATRIX AT THE GAUSS POINT (INCLUDING UPWIND)
+        # A_{s_comp}*k_{s_comp,homo}; homo = homogenized (cdp, 07/2020)
+        KMAT[:, neq, neq] = (
+            s_comp_l.dict_input["CROSSECTION"]
+            * s_comp_l.dict_Gauss_pt["total_thermal_conductivity"]
+            / s_comp_l.dict_input["COSTETA"]
+        )
+        # END K MATRIX: solid components equation (cdp, 07/2020)
+
+        # FORM THE S MATRIX AT THE GAUSS POINT (SOURCE JACOBIAN)
+        for mm in range(conductor.dict_obj_inventory["SolidComponents"]["Number"]):
+            if mm != ll:
+                # Position of the interface in the table built by method \
+                # get_interface_table of class Conductors (-1 if there is no \
+                # interface).
+                ii = conductor.dict_interf_table["sol_sol"]["Index"][ll, mm]
+                if ii >= 0:
                     # Perform calculation only if there is an interface, this \
                     # will reduce the computational time (cdp, 09/2020)
-                    # solid components conduction equation: main diagonal element \
-                    # construction (cdp, 07/2020)
-                    # (l + dict_N_equation["FluidComponents"],l + dict_N_equation["FluidComponents"]) [Temp_l] I (cdp, 07/2020)
-                    SMAT[neq, neq] = (
-                        SMAT[neq, neq]
-                        + conductor.dict_interf_peri["ch_sol"][chan_sol_topology]
-                        * conductor.dict_Gauss_pt["HTC"]["ch_sol"][chan_sol_topology][
-                            ii
-                        ]
+                    # Heat transfer through the contact perimeter.
+                    htc_peri = (
+                        conductor.dict_interf_table["sol_sol"]["Perimeter"][ii]
+                        * conductor.dict_Gauss_pt["HTC"]["sol_sol"][
+                            conductor.dict_interf_table["sol_sol"]["Name"][ii]
+                        ]["cond"]
                     )
-                    # solid components conduction equation: below main diagonal elements
+                    # solid components conduction equation: main diagonal element \
                     # construction (cdp, 07/2020)
-                    # (l + dict_N_equation["FluidComponents"],l + 2*num_fluid_components) [Temp_j] (cdp, 07/2020)
+                    # (l + dict_N_equation["FluidComponents"],l + dict_N_equation["FluidComponents"]) [Temp_l] II + III # (cdp, 07/2020)
+                    SMAT[:, neq, neq] = SMAT[:, neq, neq] + htc_peri
+                    # solid components conduction equation: above/below main diagonal \
+                    # elements construction (cdp, 07/2020)
+                    # (l + dict_N_equation["FluidComponents"],m + dict_N_equation["FluidComponents"]) [Temp_m] (cdp, 07/2020)
                     SMAT[
-                        neq,
-                        jj
-                        + 2 * conductor.dict_obj_inventory["FluidComponents"]["Number"],
-                    ] = (
-                        -conductor.dict_interf_peri["ch_sol"][chan_sol_topology]
-                        * conductor.dict_Gauss_pt["HTC"]["ch_sol"][chan_sol_topology][
-                            ii
+                        :, neq, mm + conductor.dict_N_equation["FluidComponents"]
+                    ] = -htc_peri
+                # end if ii (cdp, 09/2020)
+            # end if mm != ll (cdp, 07/2020)
+        # end for mm (cdp, 07/2020)
+        for jj in range(num_fluid_components):
+            fluid_comp_j = conductor.dict_obj_inventory["FluidComponents"]["Objects"][
+                jj
+            ]
+            ii = conductor.dict_interf_table["ch_sol"]["Index"][jj, ll]
+            if ii >= 0:
+                # Perform calculation only if there is an interface, this \
+                # will reduce the computational time (cdp, 09/2020)
+                # Heat transfer through the contact perimeter.
+                htc_peri = (
+                    conductor.dict_interf_table["ch_sol"]["Perimeter"][ii]
+                    * conductor.dict_Gauss_pt["HTC"]["ch_sol"][
+                        conductor.dict_interf_table["ch_sol"]["Name"][ii]
+                    ]
+                )
+                # solid components conduction equation: main diagonal element \
+                # construction (cdp, 07/2020)
+                # (l + dict_N_equation["FluidComponents"],l + dict_N_equation["FluidComponents"]) [Temp_l] I (cdp, 07/2020)
+                SMAT[:, neq, neq] = SMAT[:, neq, neq] + htc_peri
+                # solid components conduction equation: below main diagonal elements
+                # construction (cdp, 07/2020)
+                # (l + dict_N_equation["FluidComponents"],l + 2*num_fluid_components) [Temp_j] (cdp, 07/2020)
+                SMAT[:, neq, jj + 2 * num_fluid_components] = -htc_peri
+            # end if ii (cdp, 09/2020)
+        # end for jj (cdp, 07/2020)
+        # Convective heating with the external environment (implicit treatment).
+        if s_comp_l.NAME == conductor.dict_obj_inventory["Jacket"]["Name"]:
+            if (
+                conductor.dict_df_coupling["contact_perimeter_flag"].at[
+                    environment.KIND, s_comp_l.ID
+                ]
+                == 1
+            ):
+                if (
+                    conductor.dict_df_coupling["HTC_choice"].at[
+                        environment.KIND, s_comp_l.ID
+                    ]
+                    == 2
+                    and conductor.dict_input["Is_rectangular"]
+                ):
+                    # Rectangular duct.
+                    coef = 2 * conductor.dict_input["Height"] * conductor.dict_Gauss_pt[
+                        "HTC"
+                    ]["env_sol"][f"{environment.KIND}_{s_comp_l.ID}"]["conv"][
+                        "side"
+                    ] + conductor.dict_input[
+                        "width"
+                    ] * (
+                        conductor.dict_Gauss_pt["HTC"]["env_sol"][
+                            f"{environment.KIND}_{s_comp_l.ID}"
+                        ]["conv"]["bottom"]
+                        + conductor.dict_Gauss_pt["HTC"]["env_sol"][
+                            f"{environment.KIND}_{s_comp_l.ID}"
+                        ]["conv"]["top"]
+                    )
+                else:
+                    coef = (
+                        conductor.dict_interf_peri["env_sol"][
+                            f"{environment.KIND}_{s_comp_l.ID}"
                         ]
+                        * conductor.dict_Gauss_pt["HTC"]["env_sol"][
+                            f"{environment.KIND}_{s_comp_l.ID}"
+                        ]["conv"]
                     )
-                # end if flag_chan_sol_contact (cdp, 09/2020)
-            # end for jj (cdp, 07/2020)
-            # Convective heating with the external environment (implicit treatment).
-            if s_comp_l.NAME == conductor.dict_obj_inventory["Jacket"]["Name"]:
+                # End if conductor.dict_input["Is_rectangular"]
+                SMAT[:, neq, neq] = SMAT[:, neq, neq] + coef
+            # End if conductor.dict_df_coupling["contact_perimeter_flag"].at[environment.KIND, s_comp_l.ID]
+        # End s_comp_l.NAME
+
+        # END S MATRIX: solid components equation (cdp, 07/2020)
+
+        # FORM THE S VECTOR AT THE NODAL POINTS (SOURCE)
+        # cl modify august 24 2019
+        if s_comp_l.NAME != conductor.dict_obj_inventory["Jacket"]["Name"]:
+            # Strands objects (cdp, 08/2020)
+            # This is independent from the solution method thanks to the \
+            # escamotage of the dummy steady state corresponding to the \
+            # initialization (cdp, 10/2020)
+            if conductor.cond_num_step == 1:
+                # Current time step (cdp, 10/2020)
+                SVEC[1][:, neq, 0] = s_comp_l.dict_Gauss_pt["Q1"][:, 0]
+                SVEC[1][:, neq, 1] = s_comp_l.dict_Gauss_pt["Q2"][:, 0]
+                # Previous time step (cdp, 10/2020)
+                SVEC[0][:, neq, 0] = s_comp_l.dict_Gauss_pt["Q1"][:, 1]
+                SVEC[0][:, neq, 1] = s_comp_l.dict_Gauss_pt["Q2"][:, 1]
+            else:
+                # Compute only at the current time step (cdp, 10/2020)
+                SVEC[:, neq, 0] = s_comp_l.dict_Gauss_pt["Q1"][:, 0]
+                SVEC[:, neq, 1] = s_comp_l.dict_Gauss_pt["Q2"][:, 0]
+        else:
+            # Jackets objects (cdp, 08/2020)
+            # This is independent from the solution method thanks to the \
+            # escamotage of the dummy steady state corresponding to the \
+            # initialization (cdp, 10/2020)
+            # Column of qsource with the heat exchanged by the jacket.
+            col_qsource = ll - conductor.dict_N_equation["Strands"] - 1
+            if conductor.cond_num_step == 1:
+                # Current time step (cdp, 10/2020)
+                SVEC[1][:, neq, 0] = (
+                    s_comp_l.dict_Gauss_pt["Q1"][:, 0] - qsource[:NELEMS, col_qsource]
+                )
+                SVEC[1][:, neq, 1] = (
+                    s_comp_l.dict_Gauss_pt["Q2"][:, 0]
+                    - qsource[1 : NELEMS + 1, col_qsource]
+                )
+                # Previous time step (cdp, 10/2020)
+                SVEC[0][:, neq, 0] = (
+                    s_comp_l.dict_Gauss_pt["Q1"][:, 1] - qsource[:NELEMS, col_qsource]
+                )
+                SVEC[0][:, neq, 1] = (
+                    s_comp_l.dict_Gauss_pt["Q2"][:, 1]
+                    - qsource[1 : NELEMS + 1, col_qsource]
+                )
                 if (
                     conductor.dict_df_coupling["contact_perimeter_flag"].at[
                         environment.KIND, s_comp_l.ID
                     ]
                     == 1
                 ):
-                    if (
-                        conductor.dict_df_coupling["HTC_choice"].at[
-                            environment.KIND, s_comp_l.ID
-                        ]
-                        == 2
-                        and conductor.dict_input["Is_rectangular"]
-                    ):
-                        # Rectangular duct.
-                        SMAT[neq, neq] = (
-                            SMAT[neq, neq]
-                            + 2
-                            * conductor.dict_input["Height"]
-                            * conductor.dict_Gauss_pt["HTC"]["env_sol"][
-                                f"{environment.KIND}_{s_comp_l.ID}"
-                            ]["conv"]["side"][ii]
-                            + conductor.dict_input["width"]
-                            * (
-                                conductor.dict_Gauss_pt["HTC"]["env_sol"][
-                                    f"{environment.KIND}_{s_comp_l.ID}"
-                                ]["conv"]["bottom"][ii]
-                                + conductor.dict_Gauss_pt["HTC"]["env_sol"][
-                                    f"{environment.KIND}_{s_comp_l.ID}"
-                                ]["conv"]["top"][ii]
-                            )
-                        )
-                    else:
-                        SMAT[neq, neq] = (
-                            SMAT[neq, neq]
-                            + conductor.dict_interf_peri["env_sol"][
-                                f"{environment.KIND}_{s_comp_l.ID}"
-                            ]
-                            * conductor.dict_Gauss_pt["HTC"]["env_sol"][
-                                f"{environment.KIND}_{s_comp_l.ID}"
-                            ]["conv"][ii]
-                        )
-                # End if conductor.dict_df_coupling["contact_perimeter_flag"].at[environment.KIND, s_comp_l.ID]
-            # End s_comp_l.NAME
-
-            # END S MATRIX: solid components equation (cdp, 07/2020)
-
-            # FORM THE S VECTOR AT THE NODAL POINTS (SOURCE)
-            # cl modify august 24 2019
-            if s_comp_l.NAME != conductor.dict_obj_inventory["Jacket"]["Name"]:
-                # Strands objects (cdp, 08/2020)
-                # This is independent from the solution method thanks to the \
-                # escamotage of the dummy steady state corresponding to the \
-                # initialization (cdp, 10/2020)
-                if conductor.cond_num_step == 1:
-                    # Current time step (cdp, 10/2020)
-                    SVEC[1][neq, 0] = s_comp_l.dict_Gauss_pt["Q1"][ii, 0]
-                    SVEC[1][neq, 1] = s_comp_l.dict_Gauss_pt["Q2"][ii, 0]
-                    # Previous time step (cdp, 10/2020)
-                    SVEC[0][neq, 0] = s_comp_l.dict_Gauss_pt["Q1"][ii, 1]
-                    SVEC[0][neq, 1] = s_comp_l.dict_Gauss_pt["Q2"][ii, 1]
-                else:
-                    # Compute only at the current time step (cdp, 10/2020)
-                    SVEC[neq, 0] = s_comp_l.dict_Gauss_pt["Q1"][ii, 0]
-                    SVEC[neq, 1] = s_comp_l.dict_Gauss_pt["Q2"][ii, 0]
+                    # Add the contribution of the external heating by convection to the known term vector; coef is evaluated above in the S matrix construction.
+                    SVEC[1][:, neq, 0] = (
+                        SVEC[1][:, neq, 0]
+                        + coef * environment.dict_input["Temperature"]
+                    )  # W/m
+                    SVEC[1][:, neq, 1] = (
+                        SVEC[1][:, neq, 1]
+                        + coef * environment.dict_input["Temperature"]
+                    )  # W/m
+                    SVEC[0][:, neq, 0] = (
+                        SVEC[0][:, neq, 0]
+                        + coef * environment.dict_input["Temperature"]
+                    )  # W/m
+                    SVEC[0][:, neq, 1] = (
+                        SVEC[0][:, neq, 1]
+                        + coef * environment.dict_input["Temperature"]
+                    )  # W/m
+                # End if conductor.dict_df_coupling["contact_perimeter_flag"].at[environment.KIND, s_comp_l.ID] == 1
             else:
-                # Jackets objects (cdp, 08/2020)
-                # This is independent from the solution method thanks to the \
-                # escamotage of the dummy steady state corresponding to the \
-                # initialization (cdp, 10/2020)
-                if conductor.cond_num_step == 1:
-                    # Current time step (cdp, 10/2020)
-                    SVEC[1][neq, 0] = (
-                        s_comp_l.dict_Gauss_pt["Q1"][ii, 0]
-                        - qsource[ii, ll - conductor.dict_N_equation["Strands"] - 1]
-                    )
-                    SVEC[1][neq, 1] = (
-                        s_comp_l.dict_Gauss_pt["Q2"][ii, 0]
-                        - qsource[ii + 1, ll - conductor.dict_N_equation["Strands"] - 1]
-                    )
-                    # Previous time step (cdp, 10/2020)
-                    SVEC[0][neq, 0] = (
-                        s_comp_l.dict_Gauss_pt["Q1"][ii, 1]
-                        - qsource[ii, ll - conductor.dict_N_equation["Strands"] - 1]
-                    )
-                    SVEC[0][neq, 1] = (
-                        s_comp_l.dict_Gauss_pt["Q2"][ii, 1]
-                        - qsource[ii + 1, ll - conductor.dict_N_equation["Strands"] - 1]
-                    )
-                    if (
-                        conductor.dict_df_coupling["contact_perimeter_flag"].at[
-                            environment.KIND, s_comp_l.ID
-                        ]
-                        == 1
-                    ):
-                        # Add the contribution of the external heating by convection to the known term vector.
-                        if (
-                            conductor.dict_df_coupling["HTC_choice"].at[
-                                environment.KIND, s_comp_l.ID
-                            ]
-                            == 2
-                            and conductor.dict_input["Is_rectangular"]
-                        ):
-                            # Rectangular duct.
-                            coef = 2 * conductor.dict_input[
-                                "Height"
-                            ] * conductor.dict_Gauss_pt["HTC"]["env_sol"][
-                                f"{environment.KIND}_{s_comp_l.ID}"
-                            ][
-                                "conv"
-                            ][
-                                "side"
-                            ][
-                                ii
-                            ] + conductor.dict_input[
-                                "width"
-                            ] * (
-                                conductor.dict_Gauss_pt["HTC"]["env_sol"][
-                                    f"{environment.KIND}_{s_comp_l.ID}"
-                                ]["conv"]["bottom"][ii]
-                                + conductor.dict_Gauss_pt["HTC"]["env_sol"][
-                                    f"{environment.KIND}_{s_comp_l.ID}"
-                                ]["conv"]["top"][ii]
-                            )
-                        else:
-                            coef = (
-                                conductor.dict_interf_peri["env_sol"][
-                                    f"{environment.KIND}_{s_comp_l.ID}"
-                                ]
-                                * conductor.dict_Gauss_pt["HTC"]["env_sol"][
-                                    f"{environment.KIND}_{s_comp_l.ID}"
-                                ]["conv"][ii]
-                            )
-                        # End if conductor.dict_input["Is_rectangular"]
-
-                        SVEC[1][neq, 0] = (
-                            SVEC[1][neq, 0]
-                            + coef * environment.dict_input["Temperature"]
-                        )  # W/m
-                        SVEC[1][neq, 1] = (
-                            SVEC[1][neq, 1]
-                            + coef * environment.dict_input["Temperature"]
-                        )  # W/m
-                        SVEC[0][neq, 0] = (
-                            SVEC[0][neq, 0]
-                            + coef * environment.dict_input["Temperature"]
-                        )  # W/m
-                        SVEC[0][neq, 1] = (
-                            SVEC[0][neq, 1]
-                            + coef * environment.dict_input["Temperature"]
-                        )  # W/m
-                    # End if conductor.dict_df_coupling["contact_perimeter_flag"].at[environment.KIND, s_comp_l.ID] == 1
-                else:
-                    # Compute only at the current time step (cdp, 10/2020)
-                    SVEC[neq, 0] = (
-                        s_comp_l.dict_Gauss_pt["Q1"][ii, 0]
-                        - qsource[ii, ll - conductor.dict_N_equation["Strands"] - 1]
-                    )
-                    SVEC[neq, 1] = (
-                        s_comp_l.dict_Gauss_pt["Q2"][ii, 0]
-                        - qsource[ii + 1, ll - conductor.dict_N_equation["Strands"] - 1]
-                    )
-                    if (
-                        conductor.dict_df_coupling["contact_perimeter_flag"].at[
-                            environment.KIND, s_comp_l.ID
-                        ]
-                        == 1
-                    ):
-                        # Add the contribution of the external heating by convection to the known term vector.
-                        if (
-                            conductor.dict_df_coupling["HTC_choice"].at[
-                                environment.KIND, s_comp_l.ID
-                            ]
-                            == 2
-                            and conductor.dict_input["Is_rectangular"]
-                        ):
-                            # Rectangular duct.
-                            coef = 2 * conductor.dict_input[
-                                "Height"
-                            ] * conductor.dict_Gauss_pt["HTC"]["env_sol"][
-                                f"{environment.KIND}_{s_comp_l.ID}"
-                            ][
-                                "conv"
-                            ][
-                                "side"
-                            ][
-                                ii
-                            ] + conductor.dict_input[
-                                "width"
-                            ] * (
-                                conductor.dict_Gauss_pt["HTC"]["env_sol"][
-                                    f"{environment.KIND}_{s_comp_l.ID}"
-                                ]["conv"]["bottom"][ii]
-                                + conductor.dict_Gauss_pt["HTC"]["env_sol"][
-                                    f"{environment.KIND}_{s_comp_l.ID}"
-                                ]["conv"]["top"][ii]
-                            )
-                        else:
-                            coef = (
-                                conductor.dict_interf_peri["env_sol"][
-                                    f"{environment.KIND}_{s_comp_l.ID}"
-                                ]
-                                * conductor.dict_Gauss_pt["HTC"]["env_sol"][
-                                    f"{environment.KIND}_{s_comp_l.ID}"
-                                ]["conv"][ii]
-                            )
-                        # End if conductor.dict_input["Is_rectangular"]
-
-                        SVEC[neq, 0] = (
-                            SVEC[neq, 0] + coef * environment.dict_input["Temperature"]
-                        )  # W/m
-                        SVEC[neq, 1] = (
-                            SVEC[neq, 1] + coef * environment.dict_input["Temperature"]
-                        )  # W/m
-                    # End if conductor.dict_df_coupling["contact_perimeter_flag"].at[environment.KIND, s_comp_l.ID] == 1
-            # cl end august 24 2019
-            # END S VECTOR: solid components equation (cdp, 07/2020)
-        # end for ll (cdp, 07/2020)
+                # Compute only at the current time step (cdp, 10/2020)
+                SVEC[:, neq, 0] = (
+                    s_comp_l.dict_Gauss_pt["Q1"][:, 0] - qsource[:NELEMS, col_qsource]
+                )
+                SVEC[:, neq, 1] = (
+                    s_comp_l.dict_Gauss_pt["Q2"][:, 0]
+                    - qsource[1 : NELEMS + 1, col_qsource]
+                )
+                if (
+                    conductor.dict_df_coupling["contact_perimeter_flag"].at[
+                        environment.KIND, s_comp_l.ID
+                    ]
+                    == 1
+                ):
+                    # Add the contribution of the external heating by convection to the known term vector; coef is evaluated above in the S matrix construction.
+                    SVEC[:, neq, 0] = (
+                        SVEC[:, neq, 0] + coef * environment.dict_input["Temperature"]
+                    )  # W/m
+                    SVEC[:, neq, 1] = (
+                        SVEC[:, neq, 1] + coef * environment.dict_input["Temperature"]
+                    )  # W/m
+                # End if conductor.dict_df_coupling["contact_perimeter_flag"].at[environment.KIND, s_comp_l.ID] == 1
+        # cl end august 24 2019
+        # END S VECTOR: solid components equation (cdp, 07/2020)
+    # end for ll (cdp, 07/2020)
+
+    # Element lengths reshaped to be broadcasted on the stacked matrices.
+    Delta_x = conductor.dict_discretization["Delta_x"].reshape(NELEMS, 1, 1)
+
+    # COMPUTE THE MASS AND CAPACITY MATRIX
+    # array smart (cdp, 07/2020)
+    ELMMAT = conductor.dict_Workspace["ELMMAT"]
+    ELMMAT[:, 0:NODOFS, 0:NODOFS] = Delta_x * (1.0 / 3.0 + ALFA) * MMAT
+    ELMMAT[:, 0:NODOFS, NODOFS : 2 * NODOFS] = Delta_x * (1.0 / 6.0 - ALFA) * MMAT
+    ELMMAT[:, NODOFS : 2 * NODOFS, 0:NODOFS] = Delta_x * (1.0 / 6.0 - ALFA) * MMAT
+    ELMMAT[:, NODOFS : 2 * NODOFS, NODOFS : 2 * NODOFS] = (
+        Delta_x * (1.0 / 3.0 + ALFA) * MMAT
+    )
 
-        # COMPUTE THE MASS AND CAPACITY MATRIX
-        # array smart (cdp, 07/2020)
-        ELMMAT[
-            0 : conductor.dict_N_equation["NODOFS"],
-            0 : conductor.dict_N_equation["NODOFS"],
-        ] = (conductor.dict_discretization["Delta_x"][ii] * (1.0 / 3.0 + ALFA) * MMAT)
-        ELMMAT[
-            0 : conductor.dict_N_equation["NODOFS"],
-            conductor.dict_N_equation["NODOFS"] : 2
-            * conductor.dict_N_equation["NODOFS"],
-        ] = (conductor.dict_discretization["Delta_x"][ii] * (1.0 / 6.0 - ALFA) * MMAT)
-        ELMMAT[
-            conductor.dict_N_equation["NODOFS"] : 2
-            * conductor.dict_N_equation["NODOFS"],
-            0 : conductor.dict_N_equation["NODOFS"],
-        ] = (conductor.dict_discretization["Delta_x"][ii] * (1.0 / 6.0 - ALFA) * MMAT)
-        ELMMAT[
-            conductor.dict_N_equation["NODOFS"] : 2
-            * conductor.dict_N_equation["NODOFS"],
-            conductor.dict_N_equation["NODOFS"] : 2
-            * conductor.dict_N_equation["NODOFS"],
-        ] = (conductor.dict_discretization["Delta_x"][ii] * (1.0 / 3.0 + ALFA) * MMAT)
-
-        # COMPUTE THE CONVECTION MATRIX
-        # array smart (cdp, 07/2020)
-        ELAMAT[
-            0 : conductor.dict_N_equation["NODOFS"],
-            0 : conductor.dict_N_equation["NODOFS"],
-        ] = (-AMAT / 2.0)
-        ELAMAT[
-            0 : conductor.dict_N_equation["NODOFS"],
-            conductor.dict_N_equation["NODOFS"] : 2
-            * conductor.dict_N_equation["NODOFS"],
-        ] = (AMAT / 2.0)
-        ELAMAT[
-            conductor.dict_N_equation["NODOFS"] : 2
-            * conductor.dict_N_equation["NODOFS"],
-            0 : conductor.dict_N_equation["NODOFS"],
-        ] = (-AMAT / 2.0)
-        ELAMAT[
-            conductor.dict_N_equation["NODOFS"] : 2
-            * conductor.dict_N_equation["NODOFS"],
-            conductor.dict_N_equation["NODOFS"] : 2
-            * conductor.dict_N_equation["NODOFS"],
-        ] = (AMAT / 2.0)
-
-        # COMPUTE THE DIFFUSION MATRIX
-        # array smart (cdp, 07/2020)
-        ELKMAT[
-            0 : conductor.dict_N_equation["NODOFS"],
-            0 : conductor.dict_N_equation["NODOFS"],
-        ] = (KMAT / conductor.dict_discretization["Delta_x"][ii])
-        ELKMAT[
-            0 : conductor.dict_N_equation["NODOFS"],
-            conductor.dict_N_equation["NODOFS"] : 2
-            * conductor.dict_N_equation["NODOFS"],
-        ] = (-KMAT / conductor.dict_discretization["Delta_x"][ii])
-        ELKMAT[
-            conductor.dict_N_equation["NODOFS"] : 2
-            * conductor.dict_N_equation["NODOFS"],
-            0 : conductor.dict_N_equation["NODOFS"],
-        ] = (-KMAT / conductor.dict_discretization["Delta_x"][ii])
-        ELKMAT[
-            conductor.dict_N_equation["NODOFS"] : 2
-            * conductor.dict_N_equation["NODOFS"],
-            conductor.dict_N_equation["NODOFS"] : 2
-            * conductor.dict_N_equation["NODOFS"],
-        ] = (KMAT / conductor.dict_discretization["Delta_x"][ii])
-
-        # COMPUTE THE SOURCE MATRIX
-        # array smart (cdp, 07/2020)
-        ELSMAT[
-            0 : conductor.dict_N_equation["NODOFS"],
-            0 : conductor.dict_N_equation["NODOFS"],
-        ] = (SMAT * conductor.dict_discretization["Delta_x"][ii] / 3.0)
-        ELSMAT[
-            0 : conductor.dict_N_equation["NODOFS"],
-            conductor.dict_N_equation["NODOFS"] : 2
-            * conductor.dict_N_equation["NODOFS"],
-        ] = (SMAT * conductor.dict_discretization["Delta_x"][ii] / 6.0)
-        ELSMAT[
-            conductor.dict_N_equation["NODOFS"] : 2
-            * conductor.dict_N_equation["NODOFS"],
-            0 : conductor.dict_N_equation["NODOFS"],
-        ] = (SMAT * conductor.dict_discretization["Delta_x"][ii] / 6.0)
-        ELSMAT[
-            conductor.dict_N_equation["NODOFS"] : 2
-            * conductor.dict_N_equation["NODOFS"],
-            conductor.dict_N_equation["NODOFS"] : 2
-            * conductor.dict_N_equation["NODOFS"],
-        ] = (SMAT * conductor.dict_discretization["Delta_x"][ii] / 3.0)
-
-        # COMPUTE THE SOURCE VECTOR (ANALYTIC INTEGRATION)
-        # array smart (cdp, 07/2020)
-        # This is independent from the solution method thanks to the escamotage of \
-        # the dummy steady state corresponding to the initialization (cdp, 10/2020)
-        if conductor.cond_num_step == 1:
-            # Current time step (cdp, 10/2020)
-            ELSLOD[1][0 : conductor.dict_N_equation["NODOFS"]] = (
-                conductor.dict_discretization["Delta_x"][ii]
-                / 6.0
-                * (2.0 * SVEC[1][:, 0] + SVEC[1][:, 1])
-            )
-            ELSLOD[1][
-                conductor.dict_N_equation["NODOFS"] : 2
-                * conductor.dict_N_equation["NODOFS"]
-            ] = (
-                conductor.dict_discretization["Delta_x"][ii]
-                / 6.0
-                * (SVEC[1][:, 0] + 2.0 * SVEC[1][:, 1])
-            )
-            # Previous time step (cdp, 10/2020)
-            ELSLOD[0][0 : conductor.dict_N_equation["NODOFS"]] = (
-                conductor.dict_discretization["Delta_x"][ii]
-                / 6.0
-                * (2.0 * SVEC[0][:, 0] + SVEC[0][:, 1])
+    # COMPUTE THE CONVECTION MATRIX
+    # array smart (cdp, 07/2020)
+    ELAMAT = conductor.dict_Workspace["ELAMAT"]
+    ELAMAT[:, 0:NODOFS, 0:NODOFS] = -AMAT / 2.0
+    ELAMAT[:, 0:NODOFS, NODOFS : 2 * NODOFS] = AMAT / 2.0
+    ELAMAT[:, NODOFS : 2 * NODOFS, 0:NODOFS] = -AMAT / 2.0
+    ELAMAT[:, NODOFS : 2 * NODOFS, NODOFS : 2 * NODOFS] = AMAT / 2.0
+
+    # COMPUTE THE DIFFUSION MATRIX
+    # array smart (cdp, 07/2020)
+    ELKMAT = conductor.dict_Workspace["ELKMAT"]
+    ELKMAT[:, 0:NODOFS, 0:NODOFS] = KMAT / Delta_x
+    ELKMAT[:, 0:NODOFS, NODOFS : 2 * NODOFS] = -KMAT / Delta_x
+    ELKMAT[:, NODOFS : 2 * NODOFS, 0:NODOFS] = -KMAT / Delta_x
+    ELKMAT[:, NODOFS : 2 * NODOFS, NODOFS : 2 * NODOFS] = KMAT / Delta_x
+
+    # COMPUTE THE SOURCE MATRIX
+    # array smart (cdp, 07/2020)
+    ELSMAT = conductor.dict_Workspace["ELSMAT"]
+    ELSMAT[:, 0:NODOFS, 0:NODOFS] = SMAT * Delta_x / 3.0
+    ELSMAT[:, 0:NODOFS, NODOFS : 2 * NODOFS] = SMAT * Delta_x / 6.0
+    ELSMAT[:, NODOFS : 2 * NODOFS, 0:NODOFS] = SMAT * Delta_x / 6.0
+    ELSMAT[:, NODOFS : 2 * NODOFS, NODOFS : 2 * NODOFS] = SMAT * Delta_x / 3.0
+
+    # COMPUTE THE SOURCE VECTOR (ANALYTIC INTEGRATION)
+    # array smart (cdp, 07/2020)
+    # This is independent from the solution method thanks to the escamotage of \
+    # the dummy steady state corresponding to the initialization (cdp, 10/2020)
+    Delta_x = conductor.dict_discretization["Delta_x"].reshape(NELEMS, 1)
+    if conductor.cond_num_step == 1:
+        ELSLOD = conductor.dict_Workspace["ELSLOD"]
+        for key in ELSLOD.keys():
+            # key 1: current time step; key 0: previous time step (cdp, 10/2020)
+            ELSLOD[key][:, 0:NODOFS] = (
+                Delta_x / 6.0 * (2.0 * SVEC[key][:, :, 0] + SVEC[key][:, :, 1])
             )
-            ELSLOD[0][
-                conductor.dict_N_equation["NODOFS"] : 2
-                * conductor.dict_N_equation["NODOFS"]
-            ] = (
-                conductor.dict_discretization["Delta_x"][ii]
-                / 6.0
-                * (SVEC[0][:, 0] + 2.0 * SVEC[0][:, 1])
+            ELSLOD[key][:, NODOFS : 2 * NODOFS] = (
+                Delta_x / 6.0 * (SVEC[key][:, :, 0] + 2.0 * SVEC[key][:, :, 1])
             )
-        else:
-            # Compute only at the current time step (cdp, 10/2020)
-            ELSLOD[0 : conductor.dict_N_equation["NODOFS"]] = (
-                conductor.dict_discretization["Delta_x"][ii]
-                / 6.0
-                * (2.0 * SVEC[:, 0] + SVEC[:, 1])
-            )
-            ELSLOD[
-                conductor.dict_N_equation["NODOFS"] : 2
-                * conductor.dict_N_equation["NODOFS"]
-            ] = (
-                conductor.dict_discretization["Delta_x"][ii]
-                / 6.0
-                * (SVEC[:, 0] + 2.0 * SVEC[:, 1])
-            )
-        # ASSEMBLE THE MATRICES AND THE LOAD VECTOR
-        # array smart (cdp, 07/2020) check ok
-        for iii in range(conductor.dict_band["Half"]):
-            # This will not work properly, even if may look correct (cdp, 09/2020)
-            # MASMAT[conductor.dict_band["Half"] - iii - 1:conductor.dict_band["Full"] - iii, \
-            # 	jump:jump + conductor.dict_band["Half"]] = \
-            # 	MASMAT[conductor.dict_band["Half"] - iii - 1:conductor.dict_band["Full"] - iii, \
-            # 	jump:jump + conductor.dict_band["Half"]] + ELMMAT
-            MASMAT[
-                conductor.dict_band["Half"]
-                - iii
-                - 1 : conductor.dict_band["Full"]
-                - iii,
-                jump + iii,
-            ] = (
-                MASMAT[
-                    conductor.dict_band["Half"]
-                    - iii
-                    - 1 : conductor.dict_band["Full"]
-                    - iii,
-                    jump + iii,
-                ]
-                + ELMMAT[iii, :]
-            )
-            FLXMAT[
-                conductor.dict_band["Half"]
-                - iii
-                - 1 : conductor.dict_band["Full"]
-                - iii,
-                jump + iii,
-            ] = (
-                FLXMAT[
-                    conductor.dict_band["Half"]
-                    - iii
-                    - 1 : conductor.dict_band["Full"]
-                    - iii,
-                    jump + iii,
-                ]
-                + ELAMAT[iii, :]
-            )
-            DIFMAT[
-                conductor.dict_band["Half"]
-                - iii
-                - 1 : conductor.dict_band["Full"]
-                - iii,
-                jump + iii,
-            ] = (
-                DIFMAT[
-                    conductor.dict_band["Half"]
-                    - iii
-                    - 1 : conductor.dict_band["Full"]
-                    - iii,
-                    jump + iii,
-                ]
-                + ELKMAT[iii, :]
-            )
-            SORMAT[
-                conductor.dict_band["Half"]
-                - iii
-                - 1 : conductor.dict_band["Full"]
-                - iii,
-                jump + iii,
-            ] = (
-                SORMAT[
-                    conductor.dict_band["Half"]
-                    - iii
-                    - 1 : conductor.dict_band["Full"]
-                    - iii,
-                    jump + iii,
-                ]
-                + ELSMAT[iii, :]
-            )
-        if (
-            conductor.dict_input["METHOD"] == "BE"
-            or conductor.dict_input["METHOD"] == "CN"
-        ):
-            # Backward Euler or Crank-Nicolson (cdp, 10, 2020)
-            if conductor.cond_num_step == 1:
-                # Construct key SYSLOD of dictionary dict_Step (cdp, 10/2020)
+    else:
+        # Compute only at the current time step (cdp, 10/2020)
+        ELSLOD = conductor.dict_Workspace["ELSLOD"][1]
+        ELSLOD[:, 0:NODOFS] = Delta_x / 6.0 * (2.0 * SVEC[:, :, 0] + SVEC[:, :, 1])
+        ELSLOD[:, NODOFS : 2 * NODOFS] = (
+            Delta_x / 6.0 * (SVEC[:, :, 0] + 2.0 * SVEC[:, :, 1])
+        )
+
+    # ASSEMBLE THE MATRICES AND THE LOAD VECTOR
+    # Row iii of the element matrix of element ii goes in column \
+    # NODOFS*ii + iii of the banded matrix, so for a fixed iii the columns of \
+    # all the elements are taken with a slice of step NODOFS and there is no \
+    # overlap among elements. Elements ii and ii + 1 share a node: the \
+    # contributions of both are summed because they are assembled at \
+    # different values of iii.
+    for iii in range(conductor.dict_band["Half"]):
+        band_rows = slice(
+            conductor.dict_band["Half"] - iii - 1, conductor.dict_band["Full"] - iii
+        )
+        band_cols = slice(iii, iii + NODOFS * NELEMS, NODOFS)
+        MASMAT[band_rows, band_cols] = (
+            MASMAT[band_rows, band_cols] + ELMMAT[:, iii, :].T
+        )
+        FLXMAT[band_rows, band_cols] = (
+            FLXMAT[band_rows, band_cols] + ELAMAT[:, iii, :].T
+        )
+        DIFMAT[band_rows, band_cols] = (
+            DIFMAT[band_rows, band_cols] + ELKMAT[:, iii, :].T
+        )
+        SORMAT[band_rows, band_cols] = (
+            SORMAT[band_rows, band_cols] + ELSMAT[:, iii, :].T
+        )
+    # end for iii
+
+    # Load vector: the node shared by elements ii and ii + 1 receives first the \
+    # contribution of element ii (second half of ELSLOD) and then the one of \
+    # element ii + 1 (first half of ELSLOD), as in the loop on the elements.
+    nodes_second = slice(NODOFS, NODOFS * (NELEMS + 1))
+    nodes_first = slice(0, NODOFS * NELEMS)
+    if conductor.dict_input["METHOD"] == "BE" or conductor.dict_input["METHOD"] == "CN":
+        # Backward Euler or Crank-Nicolson (cdp, 10, 2020)
+        if conductor.cond_num_step == 1:
+            # Construct key SYSLOD of dictionary dict_Step (cdp, 10/2020)
+            for nodes, half in zip(
+                (nodes_second, nodes_first),
+                (slice(NODOFS, 2 * NODOFS), slice(0, NODOFS)),
+            ):
                 # Current time step (cdp, 10/2020)
-                conductor.dict_Step["SYSLOD"][
-                    jump : jump + conductor.dict_band["Half"], 0
-                ] = (
-                    ELSLOD[1]
-                    + conductor.dict_Step["SYSLOD"][
-                        jump : jump + conductor.dict_band["Half"], 0
-                    ]
+                conductor.dict_Step["SYSLOD"][nodes, 0] = (
+                    ELSLOD[1][:, half].flatten()
+                    + conductor.dict_Step["SYSLOD"][nodes, 0]
                 )
                 # Previous time step (cdp, 10/2020)
-                conductor.dict_Step["SYSLOD"][
-                    jump : jump + conductor.dict_band["Half"], 1
-                ] = (
-                    ELSLOD[0]
-                    + conductor.dict_Step["SYSLOD"][
-                        jump : jump + conductor.dict_band["Half"], 1
-                    ]
+                conductor.dict_Step["SYSLOD"][nodes, 1] = (
+                    ELSLOD[0][:, half].flatten()
+                    + conductor.dict_Step["SYSLOD"][nodes, 1]
                 )
-            else:
-                # Update only the first column, that correspond to the current time \
-                # step (cdp, 10/2020)
-                conductor.dict_Step["SYSLOD"][
-                    jump : jump + conductor.dict_band["Half"], 0
-                ] = (
-                    ELSLOD
-                    + conductor.dict_Step["SYSLOD"][
-                        jump : jump + conductor.dict_band["Half"], 0
-                    ]
+        else:
+            # Update only the first column, that correspond to the current time \
+            # step (cdp, 10/2020)
+            for nodes, half in zip(
+                (nodes_second, nodes_first),
+                (slice(NODOFS, 2 * NODOFS), slice(0, NODOFS)),
+            ):
+                conductor.dict_Step["SYSLOD"][nodes, 0] = (
+                    ELSLOD[:, half].flatten() + conductor.dict_Step["SYSLOD"][nodes, 0]
                 )
-        elif conductor.dict_input["METHOD"] == "AM4":
-            # Adams-Moulton order 4 (cdp, 10/2020)
-            if conductor.cond_num_step == 1:
-                # Construct key SYSLOD of dictionary dict_Step (cdp, 10/2020)
+    elif conductor.dict_input["METHOD"] == "AM4":
+        # Adams-Moulton order 4 (cdp, 10/2020)
+        if conductor.cond_num_step == 1:
+            # Construct key SYSLOD of dictionary dict_Step (cdp, 10/2020)
+            for nodes, half in zip(
+                (nodes_second, nodes_first),
+                (slice(NODOFS, 2 * NODOFS), slice(0, NODOFS)),
+            ):
                 # Current time step (cdp, 10/2020)
-                conductor.dict_Step["SYSLOD"][
-                    jump : jump + conductor.dict_band["Half"], 0
-                ] = (
-                    ELSLOD[1]
-                    + conductor.dict_Step["SYSLOD"][
-                        jump : jump + conductor.dict_band["Half"], 0
-                    ]
+                conductor.dict_Step["SYSLOD"][nodes, 0] = (
+                    ELSLOD[1][:, half].flatten()
+                    + conductor.dict_Step["SYSLOD"][nodes, 0]
                 )
                 for cc in range(conductor.dict_Step["SYSLOD"].shape[1]):
                     # Dummy initial steady state (cdp, 10/2020)
-                    conductor.dict_Step["SYSLOD"][
-                        jump : jump + conductor.dict_band["Half"], cc
-                    ] = (
-                        ELSLOD[0]
-                        + conductor.dict_Step["SYSLOD"][
-                            jump : jump + conductor.dict_band["Half"], cc
-                        ]
+                    conductor.dict_Step["SYSLOD"][nodes, cc] = (
+                        ELSLOD[0][:, half].flatten()
+                        + conductor.dict_Step["SYSLOD"][nodes, cc]
                     )
-            else:
-                # Shift the colums by one towards right and compute the new first \
-                # column at the current time step (cdp, 10/2020)
-                conductor.dict_Step["SYSLOD"][:, 1:4] = conductor.dict_Step["SYSLOD"][
-                    :, 0:3
-                ].copy()
-                conductor.dict_Step["SYSLOD"][
-                    jump : jump + conductor.dict_band["Half"], 0
-                ] = (
-                    ELSLOD
-                    + conductor.dict_Step["SYSLOD"][
-                        jump : jump + conductor.dict_band["Half"], 0
-                    ]
+        else:
+            # The columns are shifted by one towards right at the beginning of \
+            # the time step, here only the new first column at the current \
+            # time step is computed.
+            for nodes, half in zip(
+                (nodes_second, nodes_first),
+                (slice(NODOFS, 2 * NODOFS), slice(0, NODOFS)),
+            ):
+                conductor.dict_Step["SYSLOD"][nodes, 0] = (
+                    ELSLOD[:, half].flatten() + conductor.dict_Step["SYSLOD"][nodes, 0]
                 )
-            # end if conductor.cond_num_step (cdp, 10/2020)
-        # end conductor.dict_input["METHOD"] (cdp, 10/2020)
-
-    # end for ii (cdp, 07/2020)
+        # end if conductor.cond_num_step (cdp, 10/2020)
+    # end conductor.dict_input["METHOD"] (cdp, 10/2020)
     # ** END MATRICES CONSTRUCTION (cdp, 07/2020) **
 
     # SCRIPT TO SAVE MATRICES MASMAT, FLXMAT, DIFMAT, SORMAT, SYSVAR, SYSLOD.
@@ -1603,30 +1137,32 @@ def step(conductor, environment, qsource, num_step):
     #     np.savetxt(writer, conductor.dict_Step["SYSLOD"], delimiter = "\t")
 
     # ** COMPUTE SYSTEM MATRIX **
+    # Sum of the convection, diffusion and source matrices, evaluated once in \
+    # the workspace.
+    FDSMAT = conductor.dict_Workspace["FDSMAT"]
+    np.add(FLXMAT, DIFMAT, out=FDSMAT)
+    FDSMAT += SORMAT
     if conductor.dict_input["METHOD"] == "BE" or conductor.dict_input["METHOD"] == "CN":
         # Backward Euler or Crank-Nicolson (cdp, 10, 2020)
-        SYSMAT = MASMAT / conductor.time_step + conductor.theta_method * (
-            FLXMAT + DIFMAT + SORMAT
-        )
+        np.divide(MASMAT, conductor.time_step, out=SYSMAT)
+        SYSMAT += conductor.theta_method * FDSMAT
     elif conductor.dict_input["METHOD"] == "AM4":
         # Adams-Moulton order 4 (cdp, 10, 2020)
         if conductor.cond_num_step == 1:
             # This is due to the dummy initial steady state (cdp, 10/2020)
             for cc in range(conductor.dict_Step["AM4_AA"].shape[2]):
-                conductor.dict_Step["AM4_AA"][:, :, cc] = FLXMAT + DIFMAT + SORMAT
+                conductor.dict_Step["AM4_AA"][:, :, cc] = FDSMAT
         else:
             # Shift the matrices by one towards right and compute the new first \
             # matrix at the current time step (cdp, 10/2020)
             conductor.dict_Step["AM4_AA"][:, :, 1:4] = conductor.dict_Step["AM4_AA"][
                 :, :, 0:3
             ]
-            conductor.dict_Step["AM4_AA"][:, :, 0] = FLXMAT + DIFMAT + SORMAT
+            conductor.dict_Step["AM4_AA"][:, :, 0] = FDSMAT
         # end if conductor.cond_num_step (cdp, 10/2020)
         # compute SYSMAT
-        SYSMAT = (
-            MASMAT / conductor.time_step
-            + 9 / 24 * conductor.dict_Step["AM4_AA"][:, :, 0]
-        )
+        np.divide(MASMAT, conductor.time_step, out=SYSMAT)
+        SYSMAT += 9 / 24 * conductor.dict_Step["AM4_AA"][:, :, 0]
     # end conductor.dict_input["METHOD"] (cdp, 10/2020)
 
     # 	# lines of code to save SYSMAT and SYSLOD in .dat files
@@ -1636,83 +1172,54 @@ def step(conductor, environment, qsource, num_step):
     # 		np.savetxt(writer, SYSMAT, delimiter = "	")
 
     # ADD THE LOAD CONTRIBUTION FROM PREVIOUS STEP
-    # array smart optimization (cdp, 07/2020)
-    # check optimization (cdp, 09/2020)
-    for I in range(conductor.dict_N_equation["Total"]):
-        if I <= conductor.dict_band["Half"] - 1:
-            # remember that arange stops before the stop value: \
-            # last value = stop - step (cdp, 07/2020)
-            J = np.arange(
-                start=0, stop=conductor.dict_band["Half"] + I, step=1, dtype=int
-            )
-        elif I >= conductor.dict_N_equation["Total"] - (
-            conductor.dict_band["Half"] - 1
-        ):
-            J = np.arange(
-                start=I - (conductor.dict_band["Half"] - 1),
-                stop=conductor.dict_N_equation["Total"],
-                step=1,
-                dtype=int,
-            )
-        else:
-            J = np.arange(
-                start=I - (conductor.dict_band["Half"] - 1),
-                stop=I + conductor.dict_band["Half"],
-                step=1,
-                dtype=int,
-            )
-        JJ = J - I + conductor.dict_band["Half"] - 1
-        if (
-            conductor.dict_input["METHOD"] == "BE"
-            or conductor.dict_input["METHOD"] == "CN"
-        ):
-            # Backward Euler or Crank-Nicolson (cdp, 10, 2020)
-            # Matrix vector product contribution (cdp, 10, 2020)
-            Known[I] = np.sum(
-                (
-                    MASMAT[JJ, I] / conductor.time_step
-                    - (1.0 - conductor.theta_method)
-                    * (FLXMAT[JJ, I] + DIFMAT[JJ, I] + SORMAT[JJ, I])
-                )
-                * conductor.dict_Step["SYSVAR"][J, 0]
+    # The matrix vector products are evaluated by band_matvec diagonal by \
+    # diagonal directly in the band storage, instead of the former loop on \
+    # the equations.
+    if conductor.dict_input["METHOD"] == "BE" or conductor.dict_input["METHOD"] == "CN":
+        # Backward Euler or Crank-Nicolson (cdp, 10, 2020)
+        # Matrix vector product contribution (cdp, 10, 2020)
+        # The auxiliary matrix of the workspace is overwritten.
+        AUXMAT = conductor.dict_Workspace["AUXMAT"]
+        np.divide(MASMAT, conductor.time_step, out=AUXMAT)
+        AUXMAT -= (1.0 - conductor.theta_method) * FDSMAT
+        band_matvec(conductor, AUXMAT, conductor.dict_Step["SYSVAR"][:, 0], Known)
+    elif conductor.dict_input["METHOD"] == "AM4":
+        # Adams-Moulton order 4 (cdp, 10, 2020)
+        # Matrices vectors product contribution (cdp, 10, 2020)
+        # The auxiliary matrix of the workspace is overwritten.
+        AUXMAT = conductor.dict_Workspace["AUXMAT"]
+        np.divide(MASMAT, conductor.time_step, out=AUXMAT)
+        AUXMAT -= 19 / 24 * conductor.dict_Step["AM4_AA"][:, :, 1]
+        band_matvec(conductor, AUXMAT, conductor.dict_Step["SYSVAR"][:, 0], Known)
+        Known += (
+            5
+            / 24
+            * band_matvec(
+                conductor,
+                conductor.dict_Step["AM4_AA"][:, :, 2],
+                conductor.dict_Step["SYSVAR"][:, 1],
             )
-        elif conductor.dict_input["METHOD"] == "AM4":
-            # Adams-Moulton order 4 (cdp, 10, 2020)
-            # Matrices vectors product contribution (cdp, 10, 2020)
-            Known[I] = np.sum(
-                (
-                    MASMAT[JJ, I] / conductor.time_step
-                    - 19 / 24 * conductor.dict_Step["AM4_AA"][JJ, I, 1]
-                )
-                * conductor.dict_Step["SYSVAR"][J, 0]
-                + 5
-                / 24
-                * conductor.dict_Step["AM4_AA"][JJ, I, 2]
-                * conductor.dict_Step["SYSVAR"][J, 1]
-                - 1
-                / 24
-                * conductor.dict_Step["AM4_AA"][JJ, I, 3]
-                * conductor.dict_Step["SYSVAR"][J, 2]
+            - 1
+            / 24
+            * band_matvec(
+                conductor,
+                conductor.dict_Step["AM4_AA"][:, :, 3],
+                conductor.dict_Step["SYSVAR"][:, 2],
             )
-    # end for I (cdp, 07/2020)
+        )
+    # end conductor.dict_input["METHOD"]
     if conductor.dict_input["METHOD"] == "BE" or conductor.dict_input["METHOD"] == "CN":
         # Backward Euler or Crank-Nicolson (cdp, 10, 2020)
         # External sources (SYSLOD) contribution (cdp, 10, 2020)
-        Known = (
-            Known
-            + conductor.theta_method * conductor.dict_Step["SYSLOD"][:, 0]
-            + (1.0 - conductor.theta_method) * conductor.dict_Step["SYSLOD"][:, 1]
-        )
+        Known += conductor.theta_method * conductor.dict_Step["SYSLOD"][:, 0]
+        Known += (1.0 - conductor.theta_method) * conductor.dict_Step["SYSLOD"][:, 1]
     elif conductor.dict_input["METHOD"] == "AM4":
         # Adams-Moulton order 4 (cdp, 10, 2020)
         # External sources (SYSLOD) contribution (cdp, 10, 2020)
-        Known = (
-            Known
-            + 9 / 24 * conductor.dict_Step["SYSLOD"][:, 0]
-            + 19 / 24 * conductor.dict_Step["SYSLOD"][:, 1]
-            - 5 / 24 * conductor.dict_Step["SYSLOD"][:, 2]
-            + 1 / 24 * conductor.dict_Step["SYSLOD"][:, 3]
-        )
+        Known += 9 / 24 * conductor.dict_Step["SYSLOD"][:, 0]
+        Known += 19 / 24 * conductor.dict_Step["SYSLOD"][:, 1]
+        Known -= 5 / 24 * conductor.dict_Step["SYSLOD"][:, 2]
+        Known += 1 / 24 * conductor.dict_Step["SYSLOD"][:, 3]
 
     # 	# lines of code to save SYSLOD in .dat files
     # 	SYSLOD_f_name = f"C:/Users/Daniele Placido/Desktop/Temporanei/per_tesi/\
@@ -2215,7 +1722,8 @@ def step(conductor, environment, qsource, num_step):
     # DIAGONAL ROW SCALING
 
     # SELECT THE MAX FOR EACH ROW
-    ASCALING = abs(SYSMAT).max(0)
+    ASCALING = conductor.dict_Workspace["ASCALING"]
+    np.max(np.abs(SYSMAT), axis=0, out=ASCALING)
     ind_ASCALING = np.nonzero(ASCALING == 0.0)
     # ind_ASCALING = np.nonzero(ASCALING <= 1e-6)
     if ind_ASCALING[0].shape == 0:
@@ -2225,10 +1733,10 @@ def step(conductor, environment, qsource, num_step):
         )
 
     # SCALE THE SYSTEM MATRIX
-    SYSMAT = SYSMAT / ASCALING
+    SYSMAT /= ASCALING
 
     # SCALE THE LOAD VECTOR
-    Known = Known / ASCALING
+    Known /= ASCALING
 
     old_temperature_gauss = {
         obj.ID: obj.coolant.dict_Gauss_pt["temperature"]
@@ -2241,19 +1749,43 @@ def step(conductor, environment, qsource, num_step):
         }
     )
 
-    SYSMAT = gredub(conductor, SYSMAT)
-    # Compute the solution at current time stepand overwrite key SYSVAR of \
-    # dict_Step (cdp, 10/2020)
-    conductor.dict_Step["SYSVAR"][:, 0] = gbacsb(conductor, SYSMAT, Known)
+    if conductor.dict_input["SOLVER"] == "LAPACK" and conductor.dict_input[
+        "FROZEN_JACOBIAN"
+    ]:
+        # Solution with the factorization of a previous time step, if it is \
+        # still accurate enough, otherwise with a new factorization; Known is \
+        # overwritten by the solution as done by gbacsb.
+        Known = frozen_jacobian_solution(conductor, SYSMAT, Known, ASCALING)
+        conductor.dict_Step["SYSVAR"][:, 0] = Known
+    elif conductor.dict_input["SOLVER"] == "LAPACK":
+        # Banded LU factorization with partial pivoting (LAPACK dgbtrf); the \
+        # factorization is stored in key LU of dict_Step to be reused with \
+        # other right hand side vectors.
+        conductor.dict_Step["LU"] = band_lu_factorization(conductor, SYSMAT)
+        # Solution of the factorized system (LAPACK dgbtrs); Known is \
+        # overwritten by the solution as done by gbacsb.
+        Known = band_lu_solution(conductor, conductor.dict_Step["LU"], Known)
+        # Compute the solution at current time step and overwrite key SYSVAR \
+        # of dict_Step.
+        conductor.dict_Step["SYSVAR"][:, 0] = Known
+    elif conductor.dict_input["SOLVER"] == "GREDUB":
+        # Reference solver: translation of the Fortran subroutines GREDUB and \
+        # GBACSB.
+        SYSMAT = gredub(conductor, SYSMAT)
+        # Compute the solution at current time stepand overwrite key SYSVAR of \
+        # dict_Step (cdp, 10/2020)
+        conductor.dict_Step["SYSVAR"][:, 0] = gbacsb(conductor, SYSMAT, Known)
+    # End if conductor.dict_input["SOLVER"]
 
     # SYSVAR = solve_banded((15, 15), SYSMAT, Known)
 
     # COMPUTE THE NORM OF THE SOLUTION AND OF THE SOLUTION CHANGE (START)
     # array smart optimization (cdp, 08/2020)
 
-    SOL = np.zeros(conductor.dict_N_equation["Total"])
-    CHG = np.zeros(conductor.dict_N_equation["Total"])
-    EIG = np.zeros(conductor.dict_N_equation["Total"])
+    # All the values of SOL are assigned below.
+    SOL = conductor.dict_Workspace["SOL"]
+    CHG = conductor.dict_Workspace["CHG"]
+    EIG = conductor.dict_Workspace["EIG"]
 
     for jj in range(conductor.dict_obj_inventory["FluidComponents"]["Number"]):
         # velocity (cdp, 08/2020)
@@ -2368,8 +1900,8 @@ def step(conductor, environment, qsource, num_step):
     # VARIABLES FROM THE SYSTEM SOLUTION (START)
 
     # Those are arrays (cdp, 08/2020)
-    CHG = Known - conductor.dict_Step["SYSVAR"][:, 0]
-    EIG = abs(CHG / conductor.time_step) / (abs(SOL) + TINY)
+    np.subtract(Known, conductor.dict_Step["SYSVAR"][:, 0], out=CHG)
+    np.divide(abs(CHG / conductor.time_step), abs(SOL) + TINY, out=EIG)
 
     for jj in range(conductor.dict_obj_inventory["FluidComponents"]["Number"]):
         fluid_comp = conductor.dict_obj_inventory["FluidComponents"]["Objects"][jj]
@@ -2522,6 +2054,72 @@ def step(conductor, environment, qsource, num_step):
     # VARIABLES FROM THE SYSTEM SOLUTION (END)
 
 
+def allocate_step_workspace(conductor):
+
+    """
+    ##############################################################################
+    #    allocate_step_workspace(conductor)
+    ##############################################################################
+    #
+    # Function that allocates the matrices and the vectors used by function \
+    # step, sized according to conductor.dict_band and \
+    # conductor.dict_N_equation. The workspace is created by method \
+    # initialization of class Conductors and is allocated again by step only \
+    # if the size of the problem changes (key Size); at each time step the \
+    # arrays are set to zero in place.
+    #
+    ##############################################################################
+    # VARIABLE    I/O    TYPE              DESCRIPTION                      UNIT
+    # --------------------------------------------------------------------------
+    # conductor   I      object            python object of class
+    #                                      Conductors                       -
+    # dict_ws     O      dictionary        workspace                        -
+    ##############################################################################
+    """
+
+    NELEMS = conductor.dict_discretization["Grid_input"]["NELEMS"]
+    NODOFS = conductor.dict_N_equation["NODOFS"]
+    band_shape = (conductor.dict_band["Full"], conductor.dict_N_equation["Total"])
+    dict_ws = dict(Size=(NELEMS, NODOFS) + band_shape)
+    # Banded matrices.
+    for key in ["MASMAT", "FLXMAT", "SORMAT", "DIFMAT", "SYSMAT", "FDSMAT", "AUXMAT"]:
+        dict_ws[key] = np.zeros(band_shape)
+    # End for key.
+    # Array factorized in place by LAPACK (see band_lu_factorization).
+    dict_ws["AB"] = np.zeros(
+        (
+            conductor.dict_band["Full"] + conductor.dict_band["Main_diag"],
+            conductor.dict_N_equation["Total"],
+        ),
+        order="F",
+    )
+    # Vectors.
+    for key in ["Known", "ASCALING", "SOL", "CHG", "EIG"]:
+        dict_ws[key] = np.zeros(conductor.dict_N_equation["Total"])
+    # End for key.
+    dict_ws["UPWEQT"] = np.zeros(NODOFS)
+    # Matrices evaluated at the Gauss points of all the elements.
+    for key in ["MMAT", "AMAT", "KMAT", "SMAT"]:
+        dict_ws[key] = np.zeros((NELEMS, NODOFS, NODOFS))
+    # End for key.
+    # Element matrices.
+    for key in ["ELMMAT", "ELAMAT", "ELKMAT", "ELSMAT"]:
+        dict_ws[key] = np.zeros((NELEMS, 2 * NODOFS, 2 * NODOFS))
+    # End for key.
+    # Key 0 is used only at the first time step for the initialization.
+    dict_ws["SVEC"] = {ii: np.zeros((NELEMS, NODOFS, 2)) for ii in range(2)}
+    dict_ws["ELSLOD"] = {ii: np.zeros((NELEMS, 2 * NODOFS)) for ii in range(2)}
+    # K', K'' and K''' (one row for each interface between channels).
+    for key in ["K1", "K2", "K3"]:
+        dict_ws[key] = np.zeros(
+            (len(conductor.dict_interf_table["ch_ch"]["Pairs"]), NELEMS)
+        )
+    # End for key.
+    return dict_ws
+
+    # end of the function allocate_step_workspace
+
+
 def gredub(conductor, A):
 
     """
@@ -2731,27 +2329,309 @@ def gbacsb(conductor, A, B):
     # end of the function GBACSB
 
 
-def natural_sort(comp_a, comp_b):
-    # Use the regexes to sort naturally (human like) the IDs of the components to be able to deal with all the interfaces in a general way.
-    match_a = re.search(
-        r"(?P<Fluid_component>CHAN)?(?P<Mixed_sc_stab>STR_MIX)?(?P<Super_conductor>STR_SC)?(?P<Stabilizer>STR_STAB)?(?P<Jacket>Z_JACKET)?_(\d+)",
-        comp_a.ID,
+def band_lu_factorization(conductor, A):
+
+    """
+    ##############################################################################
+    #    band_lu_factorization(conductor, A)
+    ##############################################################################
+    #
+    # LU factorization with partial pivoting of the banded system matrix A by \
+    # means of the LAPACK subroutine DGBTRF.
+    # In A the coefficients of row I of the system matrix are stored in column \
+    # I, within the band conductor.dict_band["Main_diag"] (same storage of \
+    # gredub): A(J - I + conductor.dict_band["Main_diag"], I) = a(I, J). \
+    # This is the LAPACK band storage of the transpose of the system matrix, \
+    # which is factorized here; the system is then solved with the transposed \
+    # factors by band_lu_solution.
+    #
+    ##############################################################################
+    # VARIABLE    I/O    TYPE              DESCRIPTION                      UNIT
+    # --------------------------------------------------------------------------
+    # conductor   I      object            python object of class
+    #                                      Conductors                       -
+    # A           I      np 2 dimensional  banded system matrix
+    #                    array float       (dict_band["Full"] x
+    #                                      dict_N_equation["Total"])       -
+    # LU          O      dictionary        LU factors in LAPACK band
+    #                                      storage (key "Factor") and
+    #                                      pivot indices (key "Pivot")      -
+    ##############################################################################
+    # N.B. A is not overwritten; the factors are stored in \
+    # conductor.dict_Workspace["AB"].
+    ##############################################################################
+    """
+
+    # LAPACK requires dict_band["Main_diag"] additional rows on top of the \
+    # band to store the fill in due to the row interchanges. The Fortran \
+    # ordered array of the workspace is used, so that LAPACK overwrites it \
+    # without copies.
+    AB = conductor.dict_Workspace["AB"]
+    AB[: conductor.dict_band["Main_diag"], :] = 0.0
+    AB[conductor.dict_band["Main_diag"] :, :] = A
+    Factor, Pivot, info = dgbtrf(
+        AB,
+        conductor.dict_band["Main_diag"],
+        conductor.dict_band["Main_diag"],
+        overwrite_ab=1,
     )
-    # r'((CHAN)?(STR_MIX)?(STR_SC)?(STR_STAB)?(Z_JACKET)?)_(\d)+'
-    match_b = re.search(
-        r"(?P<Fluid_component>CHAN)?(?P<Mixed_sc_stab>STR_MIX)?(?P<Super_conductor>STR_SC)?(?P<Stabilizer>STR_STAB)?(?P<Jacket>Z_JACKET)?_(\d+)",
-        comp_b.ID,
+    if info > 0:
+        raise ValueError(
+            f"ERROR in {band_lu_factorization.__name__}: matrix is singular at line {info - 1}: U({info - 1}, {info - 1}) = 0.0\n"
+        )
+    elif info < 0:
+        raise ValueError(
+            f"ERROR in {band_lu_factorization.__name__}: illegal value of argument {-info} of LAPACK subroutine DGBTRF.\n"
+        )
+    # End if info.
+    return dict(Factor=Factor, Pivot=Pivot)
+
+    # end of the function band_lu_factorization
+
+
+def band_lu_solution(conductor, LU, B):
+
+    """
+    ##############################################################################
+    #    band_lu_solution(conductor, LU, B)
+    ##############################################################################
+    #
+    # Solution of the system A X = B by means of the LAPACK subroutine DGBTRS, \
+    # given the factorization LU of A evaluated by band_lu_factorization. \
+    # Since the factors are those of the transpose of the system matrix, the \
+    # transposed system is solved (TRANS = "T").
+    #
+    ##############################################################################
+    # VARIABLE    I/O    TYPE              DESCRIPTION                      UNIT
+    # --------------------------------------------------------------------------
+    # conductor   I      object            python object of class
+    #                                      Conductors                       -
+    # LU          I      dictionary        output of band_lu_factorization  -
+    # B           I      np array float    known terms vector               -
+    # X           O      np array float    solution vector                  -
+    ##############################################################################
+    """
+
+    X, info = dgbtrs(
+        LU["Factor"],
+        conductor.dict_band["Main_diag"],
+        conductor.dict_band["Main_diag"],
+        B,
+        LU["Pivot"],
+        trans=1,
     )
+    if info < 0:
+        raise ValueError(
+            f"ERROR in {band_lu_solution.__name__}: illegal value of argument {-info} of LAPACK subroutine DGBTRS.\n"
+        )
+    # End if info.
+    return X
+
+    # end of the function band_lu_solution
+
+
+def band_matvec(conductor, A, X, Y=None):
 
-    if match_a.group(comp_a.KIND) < match_b.group(comp_b.KIND):
-        return f"{comp_a.ID}_{comp_b.ID}"
-    elif match_a.group(comp_a.KIND) > match_b.group(comp_b.KIND):
-        return f"{comp_b.ID}_{comp_a.ID}"
+    """
+    ##############################################################################
+    #    band_matvec(conductor, A, X, Y=None)
+    ##############################################################################
+    #
+    # Product of the banded matrix A by the vector X. A has the storage used \
+    # in step (and in gredub): the coefficients of row I are stored in column \
+    # I, A(J - I + conductor.dict_band["Main_diag"], I) = a(I, J).
+    # The product is evaluated diagonal by diagonal: each row of A is a \
+    # diagonal of the matrix, that multiplies X shifted by the distance of \
+    # the diagonal from the main one.
+    #
+    ##############################################################################
+    # VARIABLE    I/O    TYPE              DESCRIPTION                      UNIT
+    # --------------------------------------------------------------------------
+    # conductor   I      object            python object of class
+    #                                      Conductors                       -
+    # A           I      np 2 dimensional  banded matrix
+    #                    array float       (dict_band["Full"] x
+    #                                      dict_N_equation["Total"])       -
+    # X           I      np array float    vector                           -
+    # Y           I/O    np array float    result of the product; if given
+    #                                      it is overwritten (optional)     -
+    ##############################################################################
+    """
+
+    if Y is None:
+        Y = np.zeros(conductor.dict_N_equation["Total"])
     else:
-        # Equal string part, sort by number
-        if int(match_a.group(6)) < int(match_b.group(6)):
-            return f"{comp_a.ID}_{comp_b.ID}"
+        Y[:] = 0.0
+    # End if Y.
+    for rr in range(conductor.dict_band["Full"]):
+        # Distance of the diagonal from the main diagonal.
+        shift = rr - conductor.dict_band["Main_diag"]
+        if shift >= 0:
+            Y[: conductor.dict_N_equation["Total"] - shift] = (
+                Y[: conductor.dict_N_equation["Total"] - shift]
+                + A[rr, : conductor.dict_N_equation["Total"] - shift] * X[shift:]
+            )
+        else:
+            Y[-shift:] = (
+                Y[-shift:]
+                + A[rr, -shift:] * X[: conductor.dict_N_equation["Total"] + shift]
+            )
+        # End if shift.
+    # End for rr.
+    return Y
+
+    # end of the function band_matvec
+
+
+def get_jacobian_properties(conductor):
+
+    """
+    ##############################################################################
+    #    get_jacobian_properties(conductor)
+    ##############################################################################
+    #
+    # Function that collects a copy of the properties in Gauss points that \
+    # mostly affect the system matrix: density and speed of sound of the \
+    # fluid components, total friction factor of the channels and heat \
+    # transfer coefficients of all the interfaces. Used by \
+    # frozen_jacobian_solution to decide if the system matrix should be \
+    # factorized again.
+    #
+    ##############################################################################
+    """
+
+    dict_properties = dict()
+    for fluid_comp in conductor.dict_obj_inventory["FluidComponents"]["Objects"]:
+        for prop in ["total_density", "total_speed_of_sound"]:
+            dict_properties[f"{fluid_comp.ID}_{prop}"] = np.array(
+                fluid_comp.coolant.dict_Gauss_pt[prop], dtype=float
+            )
+        # End for prop.
+        dict_properties[f"{fluid_comp.ID}_friction_factor"] = np.array(
+            fluid_comp.channel.dict_friction_factor[False]["total"], dtype=float
+        )
+    # End for fluid_comp.
+    # Heat transfer coefficients are stored in nested dictionaries: explore \
+    # them until arrays are found.
+    list_htc = [("HTC", conductor.dict_Gauss_pt["HTC"])]
+    while list_htc:
+        key, value = list_htc.pop()
+        if isinstance(value, dict):
+            list_htc.extend((f"{key}_{kk}", vv) for kk, vv in value.items())
         else:
-            return f"{comp_b.ID}_{comp_a.ID}"
-        # end if
-    # end if
+            dict_properties[key] = np.array(value, dtype=float)
+        # End if isinstance.
+    # End while list_htc.
+    return dict_properties
+
+    # end of the function get_jacobian_properties
+
+
+def frozen_jacobian_solution(conductor, A, B, ASCALING):
+
+    """
+    ##############################################################################
+    #    frozen_jacobian_solution(conductor, A, B, ASCALING)
+    ##############################################################################
+    #
+    # Solution of the system A X = B reusing the LU factorization stored in \
+    # conductor.dict_Step["LU"] (frozen Jacobian). The factorization is \
+    # evaluated again if:
+    # 1) there is no factorization yet or the time step changed;
+    # 2) it was evaluated more than conductor.dict_input["JACOBIAN_NSTEP"] \
+    # time steps ago;
+    # 3) the maximum relative change of the properties collected by \
+    # get_jacobian_properties is larger than \
+    # conductor.dict_input["JACOBIAN_TOL"];
+    # 4) the iterative refinement of the solution carried out with the old \
+    # factors does not reduce the componentwise relative residual below \
+    # conductor.dict_input["RESIDUAL_TOL"]: the residual of each equation is \
+    # compared with the size of its own terms, max_i |R_i| / (|A| |X| + \
+    # |B|)_i, so that all the unknowns (velocity, pressure and temperature) \
+    # are checked whatever their order of magnitude.
+    # The number of factorizations and of reuses of the factorization are \
+    # stored in conductor.dict_Step["Jacobian_counter"].
+    #
+    ##############################################################################
+    # VARIABLE    I/O    TYPE              DESCRIPTION                      UNIT
+    # --------------------------------------------------------------------------
+    # conductor   I      object            python object of class
+    #                                      Conductors                       -
+    # A           I      np 2 dimensional  scaled banded system matrix      -
+    #                    array float
+    # B           I      np array float    scaled known terms vector        -
+    # ASCALING    I      np array float    rows scaling factors of A and B  -
+    # X           O      np array float    solution vector                  -
+    ##############################################################################
+    """
+
+    TINY = 1.0e-20
+    # Maximum number of iterations of the iterative refinement.
+    MAX_ITER = 5
+    dict_properties = get_jacobian_properties(conductor)
+    LU = conductor.dict_Step.get("LU")
+    counter = conductor.dict_Step.setdefault(
+        "Jacobian_counter", dict(factorization=0, reuse=0)
+    )
+    flag_reuse = (
+        LU is not None
+        and "Properties" in LU
+        and LU["time_step"] == conductor.time_step
+        and LU["Age"] < conductor.dict_input["JACOBIAN_NSTEP"]
+    )
+    if flag_reuse:
+        for key, value in dict_properties.items():
+            old_value = LU["Properties"].get(key)
+            if old_value is None or old_value.shape != value.shape:
+                flag_reuse = False
+                break
+            # End if old_value.
+            change = np.max(
+                np.abs(value - old_value)
+                / np.maximum(np.maximum(np.abs(value), np.abs(old_value)), TINY),
+                initial=0.0,
+            )
+            if change > conductor.dict_input["JACOBIAN_TOL"]:
+                flag_reuse = False
+                break
+            # End if change.
+        # End for key.
+    # End if flag_reuse.
+    if flag_reuse:
+        # Iterative refinement with the old factors: the residual is evaluated \
+        # with the current system matrix; the factors refer to the matrix \
+        # scaled with the old ASCALING, so the residual is scaled accordingly.
+        X = np.zeros(conductor.dict_N_equation["Total"])
+        R = B.copy()
+        A_abs = np.abs(A)
+        B_abs = np.abs(B)
+        for _ in range(MAX_ITER):
+            X = X + band_lu_solution(conductor, LU, R * ASCALING / LU["ASCALING"])
+            R = B - band_matvec(conductor, A, X)
+            # Componentwise relative residual (backward error) of each \
+            # equation.
+            residual = np.max(
+                np.abs(R)
+                / np.maximum(band_matvec(conductor, A_abs, np.abs(X)) + B_abs, TINY)
+            )
+            if residual <= conductor.dict_input["RESIDUAL_TOL"]:
+                LU["Age"] = LU["Age"] + 1
+                counter["reuse"] = counter["reuse"] + 1
+                return X
+            # End if np.max.
+        # End for _.
+    # End if flag_reuse.
+    # New factorization.
+    LU = band_lu_factorization(conductor, A)
+    LU.update(
+        ASCALING=ASCALING.copy(),
+        time_step=conductor.time_step,
+        Age=0,
+        Properties=dict_properties,
+    )
+    conductor.dict_Step["LU"] = LU
+    counter["factorization"] = counter["factorization"] + 1
+    return band_lu_solution(conductor, LU, B)
+
+    # end of the function frozen_jacobian_solution
+
@@ -10,7 +10,7 @@ class Channel(FluidComponentsInput):
 
     KIND = "Channel"
 
-    def __init__(self, sheet, sheetOpar, dict_file_path, identifier):
+    def __init__(self, sheet, sheetOpar, dict_sheets, identifier):
         """[summary]
 
         Args:
@@ -19,7 +19,7 @@ class Channel(FluidComponentsInput):
             cond ([type]): [description]
             identifier ([type]): [description]
         """
-        super().__init__(sheet, sheetOpar, dict_file_path, identifier)
+        super().__init__(sheet, sheetOpar, dict_sheets, identifier)
         # Identifier of the channel.
         self.identifier = f"{self.KIND}_{identifier.split('_')[1]}"
         # Assign the type of channel (hole or bundle) to the attribute self.kind
@@ -1,6 +1,5 @@
 # Import packages
 from functools import singledispatchmethod
-from openpyxl import load_workbook
 import numpy as np
 from scipy import constants
 import pandas as pd
@@ -22,10 +21,11 @@ from UtilityFunctions.auxiliary_functions import (
     check_object_number,
     set_diagnostic,
 )
+from UtilityFunctions.case_cache import cached_load_workbook, cached_read_excel
 from UtilityFunctions.initialization_functions import conductor_spatial_discretization
 from UtilityFunctions.gen_flow import gen_flow
 from UtilityFunctions.output import save_properties, save_convergence_data
-from UtilityFunctions.plots import update_real_time_plots, create_legend_rtp
+from UtilityFunctions.transient_solution_functions import allocate_step_workspace
 from UtilityFunctions.solid_components_initialization import (
     solid_components_temperature_initialization,
 )
@@ -72,7 +72,7 @@ class Conductors:
         # dict_input dictionary initialization (cdp, 06/2020)
         self.dict_input = dict()
         # Load the sheet CONDUCTOR_files form file conducor_definition.xlsx as a disctionary.
-        self.file_input = pd.read_excel(
+        self.file_input = cached_read_excel(
             os.path.join(self.BASE_PATH, simulation.transient_input["MAGNET"]),
             sheet_name=sheetConductorsList[0].title,
             skiprows=2,
@@ -81,7 +81,7 @@ class Conductors:
             usecols=["Variable name", self.ID],
         )[self.ID].to_dict()
         # Load the sheet CONDUCTOR_input form file conducor_definition.xlsx as a disctionary.
-        self.dict_input = pd.read_excel(
+        self.dict_input = cached_read_excel(
             os.path.join(self.BASE_PATH, simulation.transient_input["MAGNET"]),
             sheet_name=sheetConductorsList[1].title,
             skiprows=2,
@@ -95,7 +95,7 @@ class Conductors:
         del self.dict_input["NAME"]
 
         # Load all the sheets in file conductor_coupling.xlsx as a dictionary of dataframes.
-        self.dict_df_coupling = pd.read_excel(
+        self.dict_df_coupling = cached_read_excel(
             os.path.join(self.BASE_PATH, self.file_input["STRUCTURE_COUPLING"]),
             sheet_name=None,
             skiprows=1,
@@ -120,7 +120,7 @@ class Conductors:
 
         # CREATE grid for the i-th conductor
         self.dict_discretization = dict()
-        self.dict_discretization["Grid_input"] = pd.read_excel(
+        self.dict_discretization["Grid_input"] = cached_read_excel(
             os.path.join(self.BASE_PATH, self.file_input["GRID_DEFINITION"]),
             sheet_name="GRID",
             skiprows=2,
@@ -146,6 +146,103 @@ class Conductors:
             # questo valore è provvisorio e sicuramente poco corretto, da ragionare e approfondire
             self.theta_method = 1.0 / 24.0
 
+        # Solver of the linear system in function step (flag SOLVER, optional \
+        # row of sheet CONDUCTOR_input):
+        # "LAPACK": banded LU factorization and solution with LAPACK \
+        # subroutines DGBTRF and DGBTRS (default);
+        # "GREDUB": translation of the Fortran subroutines GREDUB and GBACSB, \
+        # kept as reference for validation.
+        if pd.isna(self.dict_input.get("SOLVER", np.nan)):
+            self.dict_input["SOLVER"] = "LAPACK"
+        # End if pd.isna.
+        if self.dict_input["SOLVER"] not in ["LAPACK", "GREDUB"]:
+            raise ValueError(
+                f"ERROR in method {self.__init__.__name__} of class {self.__class__.__name__}: SOLVER must be LAPACK or GREDUB; User defined {self.dict_input['SOLVER']}.\nPlease check sheet {sheetConductorsList[1].title} of file {simulation.transient_input['MAGNET']}.\n"
+            )
+        # End if self.dict_input["SOLVER"].
+
+        # Frozen Jacobian time stepping (optional rows of sheet \
+        # CONDUCTOR_input, available only with SOLVER = LAPACK and \
+        # IADAPTIME = 0):
+        # FROZEN_JACOBIAN: flag to reuse the LU factorization of the system \
+        # matrix of a previous time step (default False);
+        # JACOBIAN_TOL: maximum relative change of the properties in Gauss \
+        # points (density, speed of sound, friction factor and heat transfer \
+        # coefficients) before a new factorization (default 1e-2);
+        # JACOBIAN_NSTEP: maximum number of time steps with the same \
+        # factorization (default 20);
+        # RESIDUAL_TOL: maximum componentwise relative residual (residual of \
+        # each equation divided by the size of its terms) of the system \
+        # solution obtained with the frozen factorization, otherwise a new \
+        # factorization is carried out (default 1e-12).
+        dict_frozen_jacobian_default = dict(
+            FROZEN_JACOBIAN=False,
+            JACOBIAN_TOL=1e-2,
+            JACOBIAN_NSTEP=20,
+            RESIDUAL_TOL=1e-12,
+        )
+        for key, value in dict_frozen_jacobian_default.items():
+            if pd.isna(self.dict_input.get(key, np.nan)):
+                self.dict_input[key] = value
+            # End if pd.isna.
+        # End for key.
+        if self.dict_input["FROZEN_JACOBIAN"] and (
+            self.dict_input["SOLVER"] != "LAPACK"
+            or simulation.transient_input["IADAPTIME"] != 0
+        ):
+            warnings.warn(
+                f"Conductor {self.ID}: FROZEN_JACOBIAN is available only with SOLVER = LAPACK and IADAPTIME = 0; the system matrix will be factorized at each time step.\n"
+            )
+            self.dict_input["FROZEN_JACOBIAN"] = False
+        # End if self.dict_input["FROZEN_JACOBIAN"].
+
+        # Event triggered capture of the spatial distributions (optional rows \
+        # of sheet CONDUCTOR_input, see module capture):
+        # CAPTURE_NSTEP: number of spatial states kept in memory (ring \
+        # buffer) and saved when the capture is triggered; 0 disables the \
+        # capture (default 0);
+        # CAPTURE_POST_NSTEP: number of time steps saved after the trigger \
+        # (default CAPTURE_NSTEP);
+        # CAPTURE_T_CS: trigger when the temperature of a strand is larger \
+        # than its current sharing temperature in any node (default True);
+        # CAPTURE_TMAX: trigger when the temperature of a component is larger \
+        # than the given value in K (default 0, not used);
+        # CAPTURE_DTDT: trigger when the rate of change of the temperature of a \
+        # component is larger than the given value in K/s (default 0, not \
+        # used);
+        # CAPTURE_MAX_NUMBER: maximum number of captures (default 1).
+        dict_capture_default = dict(
+            CAPTURE_NSTEP=0,
+            CAPTURE_POST_NSTEP=np.nan,
+            CAPTURE_T_CS=True,
+            CAPTURE_TMAX=0.0,
+            CAPTURE_DTDT=0.0,
+            CAPTURE_MAX_NUMBER=1,
+        )
+        for key, value in dict_capture_default.items():
+            if pd.isna(self.dict_input.get(key, np.nan)):
+                self.dict_input[key] = value
+            # End if pd.isna.
+        # End for key.
+        if pd.isna(self.dict_input["CAPTURE_POST_NSTEP"]):
+            self.dict_input["CAPTURE_POST_NSTEP"] = self.dict_input["CAPTURE_NSTEP"]
+        # End if pd.isna.
+        for key in ["CAPTURE_NSTEP", "CAPTURE_POST_NSTEP", "CAPTURE_MAX_NUMBER"]:
+            if self.dict_input[key] < 0:
+                raise ValueError(
+                    f"ERROR in method {self.__init__.__name__} of class {self.__class__.__name__}: {key} must be a non negative integer; User defined {self.dict_input[key]}.\nPlease check sheet {sheetConductorsList[1].title} of file {simulation.transient_input['MAGNET']}.\n"
+                )
+            # End if self.dict_input[key].
+            self.dict_input[key] = int(self.dict_input[key])
+        # End for key.
+        # State of the capture: ring buffer (dictionary of arrays with one row \
+        # for each stored time step), index of the next row to be written and \
+        # number of stored rows, current capture window and its filled rows, \
+        # flag of the trigger armed and number of captures.
+        self.dict_capture = dict(
+            Ring=None, Head=0, Count=0, Window=None, Row=0, Armed=True, Number=0
+        )
+
         ## Evaluate parameters useful in function \
         # Transient_solution_functions.py\STEP (cdp, 07/2020)
         # dict_N_equation keys meaning:
@@ -196,7 +293,7 @@ class Conductors:
         path_diagnostic = os.path.join(self.BASE_PATH, self.file_input["OUTPUT"])
         # Load the content of column self.ID of sheet Space in file conductors_disgnostic.xlsx as a series and convert to numpy array of float.
         self.Space_save = (
-            pd.read_excel(
+            cached_read_excel(
                 path_diagnostic,
                 sheet_name="Space",
                 skiprows=2,
@@ -222,9 +319,12 @@ class Conductors:
         self.i_save = 0
         # list of number of time steps at wich save the spatial discretization
         self.num_step_save = np.zeros(self.Space_save.shape, dtype=int)
+        # Datasets of the binary store of the spatial distributions, created \
+        # by function save_simulation_space (module output).
+        self.dict_space_store = dict()
         # Load the content of column self.ID of sheet Time in file conductors_disgnostic.xlsx as a series and convert to numpy array of float.
         self.Time_save = (
-            pd.read_excel(
+            cached_read_excel(
                 path_diagnostic,
                 sheet_name="Time",
                 skiprows=2,
@@ -246,6 +346,11 @@ class Conductors:
                 f"File {self.file_input['OUTPUT']}, sheet Time, conductor {self.ID}: impossible to save time evolutions at axial coordinate {self.Time_save.max()} s since it is ouside the computational domain of the simulation [0, {self.dict_input['XLENGTH']}] m.\n"
             )
         # End if self.Time_save.max() > self.dict_input["XLENGTH"]
+        # Probes of the time evolutions: indexes of the nodes corresponding to \
+        # self.Time_save, spatial discretization used to evaluate them and \
+        # row of the buffers to be filled (see function save_simulation_time \
+        # of module output).
+        self.dict_probe = dict(index=None, xcoord=None, row=0)
 
         # declare dictionaries to store Figure and axes objects to constructi real \
         # time figures (cdp, 10/2020)
@@ -262,6 +367,17 @@ class Conductors:
     def __repr__(self):
         return f"{self.__class__.__name__}(Type: {self.KIND}, ID: {self.ID})"
 
+    def __getstate__(self):
+        """Method that returns the attributes to be pickled (checkpoints of the simulation, see module checkpoint): the memory maps of the binary store of the spatial distributions are replaced by None (the datasets are opened again by function save_simulation_space) and the figures of the animations are not pickled."""
+        state = self.__dict__.copy()
+        state["dict_space_store"] = dict.fromkeys(self.dict_space_store.keys())
+        state["dict_Figure_animation"] = dict(T_max=dict(), mfr=dict())
+        state["dict_axes_animation"] = dict(T_max=dict(), mfr=dict())
+        state["dict_canvas"] = dict(T_max=dict(), mfr=dict())
+        return state
+
+    # End method __getstate__.
+
     def conductor_components_instance(self, simulation):
         """
         Method that makes instances of the conductor components defined with workbook conductorc_input.xlsx and conductcor_operation.xlsx (cdp, 11/2020)
@@ -271,9 +387,21 @@ class Conductors:
             operation=os.path.join(self.BASE_PATH, self.file_input["OPERATION"]),
         )
         # Load workbook conductor_input.xlsx.
-        wb_input = load_workbook(dict_file_path["input"], data_only=True)
+        wb_input = cached_load_workbook(dict_file_path["input"], data_only=True)
         # Load workbook conductor_operation.xlsx.
-        wb_operations = load_workbook(dict_file_path["operation"], data_only=True)
+        wb_operations = cached_load_workbook(
+            dict_file_path["operation"], data_only=True
+        )
+        # Registry of the sheets of conductor_input.xlsx and \
+        # conductor_operation.xlsx: each workbook is parsed only once (all the \
+        # sheets) and the DataFrames are shared by the checks and by the \
+        # constructors of the conductor components.
+        dict_sheets = {
+            key: cached_read_excel(
+                path, sheet_name=None, skiprows=2, header=0, index_col=0
+            )
+            for key, path in dict_file_path.items()
+        }
 
         listOfComponents = wb_input.get_sheet_names()
         self.dict_obj_inventory["FluidComponents"] = dict()
@@ -303,13 +431,7 @@ class Conductors:
             # Call function check_repeated_headings to check if there are repeaded headings in sheet of file conductor_operation.xlsx.
             check_repeated_headings(dict_file_path["operation"], sheetOpar)
             # Call function check_headers to check if sheets of file conductor_input.xlsx and conductor_operation.xlsx have exactly the same headers.
-            check_headers(
-                self,
-                dict_file_path["input"],
-                dict_file_path["operation"],
-                sheet,
-                sheetOpar,
-            )
+            check_headers(self, dict_sheets, sheet, sheetOpar)
             kindObj = sheet.cell(row=1, column=1).value  # sheet["A1"].value
             numObj = int(sheet.cell(row=1, column=2).value)  # sheet["B1"].value
             if kindObj == "CHAN":
@@ -324,7 +446,7 @@ class Conductors:
                     # ["Conductor_components"]["Objects"] list of all objects \
                     # (cdp, 09/2020)
                     self.dict_obj_inventory["FluidComponents"]["Objects"].append(
-                        FluidComponents(sheet, sheetOpar, ii, dict_file_path)
+                        FluidComponents(sheet, sheetOpar, ii, dict_sheets)
                     )
                     self.dict_obj_inventory["Conductor_components"]["Objects"].append(
                         self.dict_obj_inventory["FluidComponents"]["Objects"][ii - 1]
@@ -344,7 +466,7 @@ class Conductors:
                     # ["Conductor_components"]["Objects"]: list of all objects
                     # (cdp, 09/2020)
                     self.dict_obj_inventory["MixSCStabilizer"]["Objects"].append(
-                        MixSCStabilizer(simulation, sheet, ii, kindObj, dict_file_path)
+                        MixSCStabilizer(simulation, sheet, ii, kindObj, dict_sheets)
                     )
                     self.dict_obj_inventory["Strands"]["Objects"].append(
                         self.dict_obj_inventory["MixSCStabilizer"]["Objects"][ii - 1]
@@ -370,7 +492,7 @@ class Conductors:
                     # ["Conductor_components"]["Objects"]: list of all objects
                     # (cdp, 09/2020)
                     self.dict_obj_inventory["SuperConductor"]["Objects"].append(
-                        SuperConductor(simulation, sheet, ii, kindObj, dict_file_path)
+                        SuperConductor(simulation, sheet, ii, kindObj, dict_sheets)
                     )
                     self.dict_obj_inventory["Strands"]["Objects"].append(
                         self.dict_obj_inventory["SuperConductor"]["Objects"][ii - 1]
@@ -396,7 +518,7 @@ class Conductors:
                     # ["Conductor_components"]["Objects"]: list of all objects
                     # (cdp, 09/2020)
                     self.dict_obj_inventory["Stabilizer"]["Objects"].append(
-                        Stabilizer(simulation, sheet, ii, kindObj, dict_file_path)
+                        Stabilizer(simulation, sheet, ii, kindObj, dict_sheets)
                     )
                     self.dict_obj_inventory["Strands"]["Objects"].append(
                         self.dict_obj_inventory["Stabilizer"]["Objects"][ii - 1]
@@ -422,7 +544,7 @@ class Conductors:
                     # ["Conductor_components"]["Objects"]: list of all objects
                     # (cdp, 09/2020)
                     self.dict_obj_inventory["Jacket"]["Objects"].append(
-                        Jacket(simulation, sheet, ii, kindObj, dict_file_path)
+                        Jacket(simulation, sheet, ii, kindObj, dict_sheets)
                     )
                     self.dict_obj_inventory["SolidComponents"]["Objects"].append(
                         self.dict_obj_inventory["Jacket"]["Objects"][ii - 1]
@@ -728,6 +850,98 @@ class Conductors:
                 # End if s_comp_r.dict_input["Jacket_kind"]
         # end for rr (cdp, 09/2020)
         self.dict_topology.update(sol_sol=dict_topology_dummy_sol)
+        # Call method get_interface_table to build the integer indexed table \
+        # of the interfaces used in the hot loops of the solver.
+        self.get_interface_table()
+
+    def get_interface_table(self):
+
+        """
+        Method that builds, once, the integer indexed table of the interfaces (dict_interf_table), to be used by function step and by method eval_transp_coeff instead of the search by name in dict_interf_peri and in dict_df_coupling. The table is subdivided into three sub dictionaries with the same keys of dict_interf_peri ("ch_ch", "ch_sol", "sol_sol"); each of them has keys:
+        1) Pairs: list of tuples with the indexes of the components in contact (in dict_obj_inventory["FluidComponents"]["Objects"] or dict_obj_inventory["SolidComponents"]["Objects"]);
+        2) Name: list with the interface names, the keys of dict_interf_peri and of the HTC dictionaries;
+        3) Index: integer matrix with the position of the interface in the above lists (-1 means no interface); for "ch_ch" and "sol_sol" it is symmetric;
+        4) HTC_choice: array with the values of self.dict_df_coupling["HTC_choice"];
+        5) the contact perimeters: keys Open and Close for "ch_ch", key Perimeter for "ch_sol" and "sol_sol".
+        The position of an interface in the lists is also the row of the arrays K1, K2 and K3 used in function step.
+        """
+
+        dict_kind = dict(
+            ch_ch=("FluidComponents", "FluidComponents"),
+            ch_sol=("FluidComponents", "SolidComponents"),
+            sol_sol=("SolidComponents", "SolidComponents"),
+        )
+        self.dict_interf_table = dict()
+        for kind, (comp_r_kind, comp_c_kind) in dict_kind.items():
+            self.dict_interf_table[kind] = dict(
+                Pairs=list(),
+                Name=list(),
+                Index=np.full(
+                    (
+                        self.dict_obj_inventory[comp_r_kind]["Number"],
+                        self.dict_obj_inventory[comp_c_kind]["Number"],
+                    ),
+                    -1,
+                    dtype=int,
+                ),
+                HTC_choice=list(),
+            )
+            if kind == "ch_ch":
+                dict_peri = self.dict_interf_peri[kind]["Open"]
+            else:
+                dict_peri = self.dict_interf_peri[kind]
+            # End if kind.
+            for rr, comp_r in enumerate(
+                self.dict_obj_inventory[comp_r_kind]["Objects"]
+            ):
+                # Only the upper triangle for interfaces between components \
+                # of the same kind, consistently with the interface names.
+                cc_start = rr + 1 if comp_r_kind == comp_c_kind else 0
+                for cc in range(
+                    cc_start, self.dict_obj_inventory[comp_c_kind]["Number"]
+                ):
+                    comp_c = self.dict_obj_inventory[comp_c_kind]["Objects"][cc]
+                    interface_name = f"{comp_r.ID}_{comp_c.ID}"
+                    if interface_name in dict_peri:
+                        self.dict_interf_table[kind]["Index"][rr, cc] = len(
+                            self.dict_interf_table[kind]["Pairs"]
+                        )
+                        if comp_r_kind == comp_c_kind:
+                            self.dict_interf_table[kind]["Index"][cc, rr] = len(
+                                self.dict_interf_table[kind]["Pairs"]
+                            )
+                        # End if comp_r_kind.
+                        self.dict_interf_table[kind]["Pairs"].append((rr, cc))
+                        self.dict_interf_table[kind]["Name"].append(interface_name)
+                        self.dict_interf_table[kind]["HTC_choice"].append(
+                            self.dict_df_coupling["HTC_choice"].at[comp_r.ID, comp_c.ID]
+                        )
+                    # End if interface_name.
+                # End for cc.
+            # End for rr.
+            self.dict_interf_table[kind]["HTC_choice"] = np.array(
+                self.dict_interf_table[kind]["HTC_choice"]
+            )
+        # End for kind.
+        # Contact perimeters, ordered as the interfaces in the table.
+        for key in ["Open", "Close"]:
+            self.dict_interf_table["ch_ch"][key] = np.array(
+                [
+                    self.dict_interf_peri["ch_ch"][key][interface_name]
+                    for interface_name in self.dict_interf_table["ch_ch"]["Name"]
+                ]
+            )
+        # End for key.
+        for kind in ["ch_sol", "sol_sol"]:
+            self.dict_interf_table[kind]["Perimeter"] = np.array(
+                [
+                    self.dict_interf_peri[kind][interface_name]
+                    for interface_name in self.dict_interf_table[kind]["Name"]
+                ]
+            )
+        # End for kind.
+
+    # end method get_interface_table
 
     def chan_sol_interfaces(
         self, comp_r, comp_c, dict_comp_interface, list_linked_comp
@@ -1631,6 +1845,9 @@ class Conductors:
                 ),
             )
         # end if self.dict_input
+        # Matrices and vectors used by function step, allocated once and \
+        # reused at each time step.
+        self.dict_Workspace = allocate_step_workspace(self)
 
         # Assign initial values to key SYSVAR (cdp, 10/2020)
         for jj in range(self.dict_obj_inventory["FluidComponents"]["Number"]):
@@ -1684,9 +1901,13 @@ class Conductors:
         )
         print("Saved initialization")
 
-        # Call function update_real_time_plot
-        update_real_time_plots(self)
-        create_legend_rtp(self)
+        if simulation.flag_plots:
+            from UtilityFunctions.plots import update_real_time_plots, create_legend_rtp
+
+            # Call function update_real_time_plot
+            update_real_time_plots(self)
+            create_legend_rtp(self)
+        # End if simulation.flag_plots.
 
     # end method initialization
 
@@ -2060,19 +2281,18 @@ class Conductors:
             }
             # Read the submatrix containing information about channel - solid objects iterfaces (cdp, 06/2020)
             # nested loop on channel - solid objects (cpd 06/2020)
-            for s_comp in self.dict_obj_inventory["SolidComponents"]["Objects"]:
+            for ss, s_comp in enumerate(
+                self.dict_obj_inventory["SolidComponents"]["Objects"]
+            ):
                 dict_dummy_comp = {
                     True: s_comp.dict_node_pt,
                     False: s_comp.dict_Gauss_pt,
                 }
                 # Rationale: compute dictionary vaules only if there is an interface \
-                # (cdp, 09/2020)
-                if (
-                    self.dict_df_coupling["contact_perimeter_flag"].at[
-                        fluid_comp_r.ID, s_comp.ID
-                    ]
-                    == 1
-                ):
+                # (cdp, 09/2020); the interface is found in the integer indexed \
+                # table built by method get_interface_table.
+                ii = self.dict_interf_table["ch_sol"]["Index"][rr, ss]
+                if ii >= 0:
                     htc_len = htc_len + 1
                     # new channel-solid interface (cdp, 09/2020)
                     htc_Kapitza = np.zeros(
@@ -2084,12 +2304,7 @@ class Conductors:
                     htc_full_transient = np.zeros(
                         dict_dummy_chan_r[flag_nodal]["temperature"].shape
                     )
-                    if (
-                        self.dict_df_coupling["HTC_choice"].at[
-                            fluid_comp_r.ID, s_comp.ID
-                        ]
-                        == 2
-                    ):
+                    if self.dict_interf_table["ch_sol"]["HTC_choice"][ii] == 2:
                         htc_Kapitza = (
                             200.0
                             * (
@@ -2130,19 +2345,14 @@ class Conductors:
                         ]
                         # Assign to the HTC key of dictionary dict_dummy the dictionary whit the information about heat trasfer coefficient betweent channel fluid_comp_r and solid s_comp. Interface identification is given by the key name itself: f"{fluid_comp_r.ID}_{s_comp.ID}". This inner dictionary consists of a single key-value pair. (cdp, 07/2020)
                         dict_dummy["HTC"]["ch_sol"][
-                            self.dict_topology["ch_sol"][fluid_comp_r.ID][s_comp.ID]
+                            self.dict_interf_table["ch_sol"]["Name"][ii]
                         ] = np.maximum(
                             fluid_comp_r.channel.dict_htc_steady[flag_nodal] * mlt,
                             htc_full_transient,
                         )
-                    elif (
-                        self.dict_df_coupling["HTC_choice"].at[
-                            fluid_comp_r.ID, s_comp.ID
-                        ]
-                        == -2
-                    ):
+                    elif self.dict_interf_table["ch_sol"]["HTC_choice"][ii] == -2:
                         dict_dummy["HTC"]["ch_sol"][
-                            self.dict_topology["ch_sol"][fluid_comp_r.ID][s_comp.ID]
+                            self.dict_interf_table["ch_sol"]["Name"][ii]
                         ] = self.dict_df_coupling["contact_HTC"].at[
                             fluid_comp_r.ID, s_comp.ID
                         ] * np.ones(
@@ -2158,22 +2368,14 @@ class Conductors:
                     True: fluid_comp_c.coolant.dict_node_pt,
                     False: fluid_comp_c.coolant.dict_Gauss_pt,
                 }
-                if (
-                    self.dict_df_coupling["contact_perimeter_flag"].at[
-                        fluid_comp_r.ID, fluid_comp_c.ID
-                    ]
-                    == 1
-                ):
+                ii = self.dict_interf_table["ch_ch"]["Index"][rr, cc]
+                if ii >= 0:
                     # new channel-channel interface (cdp, 09/2020)
                     htc_len = htc_len + 1
-                    # Construct interface name: it can be found also in dict_topology["ch_ch"] but a search in dictionaties "Hydraulic_parallel" and "Thermal_contact" should be performed, which makes thinks not easy to do; it is simpler to construct interface names combining channels ID (cdp, 09/2020)
-                    interface_name = f"{fluid_comp_r.ID}_{fluid_comp_c.ID}"
-                    if (
-                        self.dict_df_coupling["HTC_choice"].at[
-                            fluid_comp_r.ID, fluid_comp_c.ID
-                        ]
-                        == 2
-                    ):
+                    # Interface name from the table built by method \
+                    # get_interface_table.
+                    interface_name = self.dict_interf_table["ch_ch"]["Name"][ii]
+                    if self.dict_interf_table["ch_ch"]["HTC_choice"][ii] == 2:
                         # dummy
                         htc1 = fluid_comp_r.channel.dict_htc_steady[flag_nodal]
                         # dummy
@@ -2200,12 +2402,7 @@ class Conductors:
                         dict_dummy["HTC"]["ch_ch"]["Close"][interface_name] = mlt / (
                             1 / htc1 + 1 / htc2 + R_wall
                         )
-                    elif (
-                        self.dict_df_coupling["HTC_choice"].at[
-                            fluid_comp_r.ID, fluid_comp_c.ID
-                        ]
-                        == -2
-                    ):
+                    elif self.dict_interf_table["ch_ch"]["HTC_choice"][ii] == -2:
                         # in this case it is assumed that both open and close hct have the same value (cdp, 07/2020)
                         dict_dummy["HTC"]["ch_ch"]["Open"][
                             interface_name
@@ -2238,14 +2435,10 @@ class Conductors:
                     True: s_comp_c.dict_node_pt,
                     False: s_comp_c.dict_Gauss_pt,
                 }
-                if (
-                    self.dict_df_coupling["contact_perimeter_flag"].at[
-                        s_comp_r.ID, s_comp_c.ID
-                    ]
-                    == 1
-                ):
+                ii = self.dict_interf_table["sol_sol"]["Index"][rr, cc]
+                if ii >= 0:
                     dict_dummy["HTC"]["sol_sol"][
-                        self.dict_topology["sol_sol"][s_comp_r.ID][s_comp_c.ID]
+                        self.dict_interf_table["sol_sol"]["Name"][ii]
                     ] = dict(
                         cond=np.zeros(
                             dict_dummy_comp_r[flag_nodal]["temperature"].shape
@@ -2256,17 +2449,14 @@ class Conductors:
                     )
                     # New solid-solid interface (cdp, 09/2020)
                     htc_len = htc_len + 1
-                    if (
-                        self.dict_df_coupling["HTC_choice"].at[s_comp_r.ID, s_comp_c.ID]
-                        == 1
-                    ):
+                    if self.dict_interf_table["sol_sol"]["HTC_choice"][ii] == 1:
                         # Thermal contact.
                         htc_solid = 500.0
                         mlt = self.dict_df_coupling["HTC_multiplier"].at[
                             s_comp_r.ID, s_comp_c.ID
                         ]
                         dict_dummy["HTC"]["sol_sol"][
-                            self.dict_topology["sol_sol"][s_comp_r.ID][s_comp_c.ID]
+                            self.dict_interf_table["sol_sol"]["Name"][ii]
                         ]["cond"] = (
                             mlt
                             * htc_solid
@@ -2274,22 +2464,16 @@ class Conductors:
                                 dict_dummy_comp_r[flag_nodal]["temperature"].shape
                             )
                         )
-                    elif (
-                        self.dict_df_coupling["HTC_choice"].at[s_comp_r.ID, s_comp_c.ID]
-                        == -1
-                    ):
+                    elif self.dict_interf_table["sol_sol"]["HTC_choice"][ii] == -1:
                         # Thermal contact.
                         dict_dummy["HTC"]["sol_sol"][
-                            self.dict_topology["sol_sol"][s_comp_r.ID][s_comp_c.ID]
+                            self.dict_interf_table["sol_sol"]["Name"][ii]
                         ]["cond"] = self.dict_df_coupling["contact_HTC"].at[
                             s_comp_r.ID, s_comp_c.ID
                         ] * np.ones(
                             dict_dummy_comp_r[flag_nodal]["temperature"].shape
                         )
-                    elif (
-                        self.dict_df_coupling["HTC_choice"].at[s_comp_r.ID, s_comp_c.ID]
-                        == 3
-                    ):
+                    elif self.dict_interf_table["sol_sol"]["HTC_choice"][ii] == 3:
                         # Radiative heat transfer.
                         if (
                             s_comp_r.dict_input["Emissivity"] > 0.0
@@ -2316,9 +2500,7 @@ class Conductors:
                                     s_comp_r.ID, s_comp_c.ID
                                 ] = s_comp_r.dict_input["Outer_perimeter"]
                                 dict_dummy["HTC"]["sol_sol"][
-                                    self.dict_topology["sol_sol"][s_comp_r.ID][
-                                        s_comp_c.ID
-                                    ]
+                                    self.dict_interf_table["sol_sol"]["Name"][ii]
                                 ]["rad"] = self._inner_radiative_htc(
                                     s_comp_r,
                                     s_comp_c,
@@ -2335,9 +2517,7 @@ class Conductors:
                                     s_comp_r.ID, s_comp_c.ID
                                 ] = s_comp_c.dict_input["Outer_perimeter"]
                                 dict_dummy["HTC"]["sol_sol"][
-                                    self.dict_topology["sol_sol"][s_comp_r.ID][
-                                        s_comp_c.ID
-                                    ]
+                                    self.dict_interf_table["sol_sol"]["Name"][ii]
                                 ]["rad"] = self._inner_radiative_htc(
                                     s_comp_c,
                                     s_comp_r,
@@ -2347,19 +2527,16 @@ class Conductors:
                                 )
                             # End if s_comp_r.dict_input["Outer_perimeter"].
                         # End if emissivity.
-                    elif (
-                        self.dict_df_coupling["HTC_choice"].at[s_comp_r.ID, s_comp_c.ID]
-                        == -3
-                    ):
+                    elif self.dict_interf_table["sol_sol"]["HTC_choice"][ii] == -3:
                         # Radiative heat transfer from sheet contact_HTC of file conductor_coupling.xlsx.
                         dict_dummy["HTC"]["sol_sol"][
-                            self.dict_topology["sol_sol"][s_comp_r.ID][s_comp_c.ID]
+                            self.dict_interf_table["sol_sol"]["Name"][ii]
                         ]["rad"] = self.dict_df_coupling["contact_HTC"].at[
                             s_comp_r.ID, s_comp_c.ID
                         ] * np.ones(
                             dict_dummy_comp_r[flag_nodal]["temperature"].shape
                         )
-                    # End if self.dict_df_coupling["HTC_choice"].at[s_comp_r.ID, s_comp_c.ID]
+                    # End if self.dict_interf_table["sol_sol"]["HTC_choice"][ii]
             # end for loop cc
 
             key = f"{simulation.environment.KIND}_{s_comp_r.ID}"
@@ -2760,9 +2937,24 @@ class Conductors:
         file_extension = self.file_input[key].split(".")[1]
         # Build the path to the file
         fname = os.path.join(self.BASE_PATH, self.file_input[key])
-        # Call function used to open the file
-        return simulation.func_open_aux[file_extension](
-            fname, col_name, simulation.default_vals[file_extension]
-        )
+        delimiter = simulation.default_vals[file_extension]
+        # The file is read only the first time, or if it is modified; the \
+        # stored array is read only since it is shared by all the calls.
+        cache_key = (os.path.abspath(fname), col_name, delimiter)
+        mtime = os.path.getmtime(fname)
+        cached = simulation.dict_user_quantity_cache.get(cache_key)
+        if cached is None or cached["mtime"] != mtime:
+            simulation.user_quantity_counter["Misses"] += 1
+            # Call function used to open the file
+            vector, length = simulation.func_open_aux[file_extension](
+                fname, col_name, delimiter
+            )
+            vector.setflags(write=False)
+            cached = dict(mtime=mtime, data=(vector, length))
+            simulation.dict_user_quantity_cache[cache_key] = cached
+        else:
+            simulation.user_quantity_counter["Hits"] += 1
+        # End if cached.
+        return cached["data"]
 
         # End method load_user_defined_quantity.
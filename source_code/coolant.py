@@ -1,17 +1,25 @@
 import numpy as np
+import pandas as pd
 import warnings
-from CoolProp.CoolProp import PropsSI
+from CoolProp.CoolProp import AbstractState, PropsSI, PT_INPUTS, get_parameter_index
 
 from fluid_components import FluidComponentsInput
+from UtilityFunctions.fluid_property_tables import (
+    TABLE_ALIASES,
+    get_property_table,
+    interp_property_table,
+)
 
 
 class Coolant(FluidComponentsInput):
     """docstring for Coolant."""
 
     KIND = "Coolant"
+    # Allowed values of the optional input key PROPERTY_BACKEND.
+    property_backends = ("PropsSI", "HEOS", "BICUBIC&HEOS", "TTSE&HEOS", "TABLES")
 
-    def __init__(self, sheet, sheetOpar, dict_file_path, identifier):
-        super().__init__(sheet, sheetOpar, dict_file_path, identifier)
+    def __init__(self, sheet, sheetOpar, dict_sheets, identifier):
+        super().__init__(sheet, sheetOpar, dict_sheets, identifier)
         # Kind of the coolant; make it lowercase to be userd as alias in PropsSI.
         self.type = self.dict_input["FLUID_TYPE"].lower()
         # Identifier of the coolant.
@@ -20,30 +28,46 @@ class Coolant(FluidComponentsInput):
         self.dict_node_pt = dict()
         # Dictionary dict_Gauss_pt declaration.
         self.dict_Gauss_pt = dict()
-        # Empty dictionary of list to save variable time evolutions at selected spatial coordinates.
+        # Dictionary of the buffers used to save variable time evolutions at selected spatial coordinates (allocated by function save_simulation_time of module output).
         self.time_evol = dict(
             velocity=dict(),
             pressure=dict(),
             temperature=dict(),
             total_density=dict(),
         )
-        headers_inl_out = [
-            "time (s)",
-            "velocity_inl (m/s)",
-            "pressure_inl (Pa)",
-            "temperature_inl (K)",
-            "total_density_inl (kg/m^3)",
-            "mass_flow_rate_inl (kg/s)",
-            "velocity_out (m/s)",
-            "pressure_out (Pa)",
-            "temperature_out (K)",
-            "total_density_out (kg/m^3)",
-            "mass_flow_rate_out (kg/s)",
-        ]
-        # Empty dictionary of list to save variable time evolutions at inlet and outlet spatial coordinates.
-        self.time_evol_io = {key: list() for key in headers_inl_out}
+        # Buffer used to save variable time evolutions at inlet and outlet spatial coordinates (allocated by function save_simulation_time of module output).
+        self.time_evol_io = None
         # Remove key FLUID_TYPE from self.dict_input (it becomes attribute of object coolant); removes also for object channel.
         del self.dict_input["FLUID_TYPE"]
+        # Backend used to evaluate the coolant properties (optional key PROPERTY_BACKEND): "PropsSI" calls function PropsSI once for each property, the other values are the backends of the CoolProp low-level interface AbstractState, that evaluates all the properties with a single state update in each point. Tabular backends (BICUBIC&HEOS, TTSE&HEOS) are faster but less accurate close to the critical point; "TABLES" interpolates the tables of module fluid_property_tables, stored on disk and shared by all the simulations.
+        if pd.isna(self.dict_input.get("PROPERTY_BACKEND", np.nan)):
+            self.dict_input["PROPERTY_BACKEND"] = "HEOS"
+        # End if pd.isna.
+        if self.dict_input["PROPERTY_BACKEND"] not in self.property_backends:
+            raise ValueError(
+                f"ERROR! {self.identifier}: PROPERTY_BACKEND must be one of {self.property_backends}; current value is {self.dict_input['PROPERTY_BACKEND']}.\n"
+            )
+        # End if self.dict_input["PROPERTY_BACKEND"].
+        # The AbstractState object is built at the first call of method _get_abstract_state.
+        self._abstract_state = None
+        if self.dict_input["PROPERTY_BACKEND"] == "TABLES":
+            self._set_property_table_input()
+        # End if self.dict_input["PROPERTY_BACKEND"].
+        # The property table is loaded at the first call of method _get_property_table.
+        self._property_table = None
+        # Relative tolerance of the incremental evaluation of the properties (optional key PROPERTY_REFRESH_TOL): properties are evaluated again only in the points where the relative change of temperature or pressure, with respect to the values of the last evaluation, exceeds the tolerance; in the other points the stored values are used. Default is 0, i.e. properties are evaluated in all the points.
+        if pd.isna(self.dict_input.get("PROPERTY_REFRESH_TOL", np.nan)):
+            self.dict_input["PROPERTY_REFRESH_TOL"] = 0.0
+        # End if pd.isna.
+        # Temperature, pressure and properties of the last evaluation in nodal and Gauss points.
+        self._property_cache = dict(nodal=None, Gauss=None)
+        # Counters of the evaluations in nodal and Gauss points, to tune PROPERTY_REFRESH_TOL: cumulative number of calls of method _eval_properties, of refreshed points and of total points, and number of refreshed and total points of the latest call (to see the refresh bursts during the transients).
+        self.property_refresh_counter = {
+            location: dict(
+                calls=0, refreshed=0, points=0, last_refreshed=0, last_points=0
+            )
+            for location in ["nodal", "Gauss"]
+        }
 
     # End method __init__.
 
@@ -52,6 +76,15 @@ class Coolant(FluidComponentsInput):
 
     # End method __repr__
 
+    def __getstate__(self):
+        """Method that returns the attributes to be pickled (checkpoints of the simulation, see module checkpoint): the AbstractState object and the property table can not be pickled, they are built again at the first use."""
+        state = self.__dict__.copy()
+        state["_abstract_state"] = None
+        state["_property_table"] = None
+        return state
+
+    # End method __getstate__.
+
     def eval_coolant_density_din_viscosity_gen_flow(self, pressure, temperature):
         """[summary]
 
@@ -109,13 +142,8 @@ class Coolant(FluidComponentsInput):
             [self.dict_operation["TEMINL"], self.dict_operation["TEMOUT"]],
         )
         # Compute density according to the mode (needed to compute the velocity from mass flow rate)
-        self.dict_node_pt["total_density"] = PropsSI(
-            "Dmass",
-            "T",
-            self.dict_node_pt["temperature"],
-            "P",
-            self.dict_node_pt["pressure"],
-            self.type,
+        self.dict_node_pt["total_density"] = self._eval_single_property(
+            "Dmass", self.dict_node_pt["temperature"], self.dict_node_pt["pressure"]
         )
         # Compute velocity form mass flow rate, the sing is determined from mass flow rate.
         self.dict_node_pt["velocity"] = self.dict_operation["MDTIN"] / (
@@ -183,33 +211,81 @@ class Coolant(FluidComponentsInput):
         """
         # Properties evaluation in each nodal point
         if nodal:
-            self.dict_node_pt = self._eval_properties(self.dict_node_pt, aliases)
+            self.dict_node_pt = self._eval_properties(
+                self.dict_node_pt, aliases, "nodal"
+            )
         # Properties evaluation in each Gauss point
         else:
             # Evaluate pressure temperature and velocity in Gauss point (still to be decided where to really put this line of code)
             self._eval_gauss_pressure_temperature_velocity(conductor)
-            self.dict_Gauss_pt = self._eval_properties(self.dict_Gauss_pt, aliases)
+            self.dict_Gauss_pt = self._eval_properties(
+                self.dict_Gauss_pt, aliases, "Gauss"
+            )
         # End if nodal
 
     # End method _eval_properties_nodal_gauss
 
-    def _eval_properties(self, dict_dummy, aliases):
+    def _eval_properties(self, dict_dummy, aliases, location):
         """
         Method that actually evaluate density, specific_heat and thermal
         conductivity of FluidComponents class objects regardless of the location
         (nodal or Gauss points) (cdp, 09/2020)
+        If PROPERTY_REFRESH_TOL > 0 properties are evaluated only in the points where temperature or pressure changed more than the tolerance since the last evaluation in the same location (nodal or Gauss); stored values are used elsewhere.
         """
-        # Evaluate density, dynamic viscosity, Gruneisen, enthalpy, isobaric specific heat, isochoric specific heat, speed of sound and thermal conductivity with MatLab functions and data base
-        for prop_name, alias in aliases.items():
-            dict_dummy[prop_name] = PropsSI(
-                alias,
-                "T",
-                dict_dummy["temperature"],
-                "P",
-                dict_dummy["pressure"],
-                self.type,
+        temperature = np.atleast_1d(dict_dummy["temperature"])
+        pressure = np.atleast_1d(dict_dummy["pressure"])
+        cache = self._property_cache[location]
+        tol = self.dict_input["PROPERTY_REFRESH_TOL"]
+        if (
+            tol > 0.0
+            and cache is not None
+            and cache["temperature"].size == temperature.size
+            and cache["aliases"] == aliases
+        ):
+            # Points where the state changed more than the tolerance with respect to the last evaluation.
+            ind = np.nonzero(
+                (
+                    np.abs(temperature - cache["temperature"])
+                    > tol * np.abs(cache["temperature"])
+                )
+                | (
+                    np.abs(pressure - cache["pressure"])
+                    > tol * np.abs(cache["pressure"])
+                )
+            )[0]
+            if ind.size > 0:
+                dict_refresh = self._eval_properties_points(
+                    temperature[ind], pressure[ind], aliases
+                )
+                for prop_name in aliases:
+                    cache[prop_name][ind] = dict_refresh[prop_name]
+                # End for prop_name.
+                cache["temperature"][ind] = temperature[ind]
+                cache["pressure"][ind] = pressure[ind]
+            # End if ind.size.
+        else:
+            # Evaluate density, dynamic viscosity, Gruneisen, enthalpy, isobaric specific heat, isochoric specific heat, speed of sound and thermal conductivity in all the points.
+            ind = np.arange(temperature.size)
+            cache = self._eval_properties_points(temperature, pressure, aliases)
+            cache.update(
+                temperature=temperature.copy(),
+                pressure=pressure.copy(),
+                aliases=dict(aliases),
             )
-        # End for prop_name, function
+            if tol > 0.0:
+                self._property_cache[location] = cache
+            # End if tol.
+        # End if tol.
+        counter = self.property_refresh_counter[location]
+        counter["calls"] += 1
+        counter["refreshed"] += ind.size
+        counter["points"] += temperature.size
+        counter["last_refreshed"] = ind.size
+        counter["last_points"] = temperature.size
+        # Copies, so that the stored values are not modified by the other methods.
+        for prop_name in aliases:
+            dict_dummy[prop_name] = cache[prop_name].copy()
+        # End for prop_name.
         # Compute Reynolds and Prandtl dimensionless number invoking method self.eval_dimensionless_numbers
         dict_dummy = self.eval_dimensionless_numbers(dict_dummy)
 
@@ -217,6 +293,138 @@ class Coolant(FluidComponentsInput):
 
     # End method _eval_properties.
 
+    def _eval_properties_points(self, temperature, pressure, aliases):
+        """
+        Method that evaluates the properties in aliases (dictionary with property names as keys and CoolProp aliases as values) in the (temperature, pressure) points with the backend selected by input key PROPERTY_BACKEND. Returns a dictionary with the same keys of aliases.
+        """
+        if self.dict_input["PROPERTY_BACKEND"] == "PropsSI":
+            return {
+                prop_name: np.atleast_1d(
+                    PropsSI(alias, "T", temperature, "P", pressure, self.type)
+                )
+                for prop_name, alias in aliases.items()
+            }
+        elif self.dict_input["PROPERTY_BACKEND"] == "TABLES":
+            return self._eval_properties_table(temperature, pressure, aliases)
+        else:
+            # Single state update for each point, all the properties are obtained from it.
+            return self._eval_properties_abstract_state(temperature, pressure, aliases)
+        # End if self.dict_input["PROPERTY_BACKEND"].
+
+    # End method _eval_properties_points.
+
+    def _get_abstract_state(self):
+        """
+        Method that returns the CoolProp AbstractState object of the coolant, building it at the first call with the backend selected by input key PROPERTY_BACKEND.
+        """
+        if self._abstract_state is None:
+            self._abstract_state = AbstractState(
+                self.dict_input["PROPERTY_BACKEND"], self.type
+            )
+        # End if self._abstract_state.
+        return self._abstract_state
+
+    # End method _get_abstract_state.
+
+    def _set_property_table_input(self):
+        """
+        Method that assigns the default values of the optional input keys of the property table (backend "TABLES"): temperature range TABLE_TMIN, TABLE_TMAX (K), pressure range TABLE_PMIN, TABLE_PMAX (Pa) and number of grid points TABLE_NT, TABLE_NP. The default ranges include the inlet and outlet operating conditions with a margin.
+        """
+        t_min = min(self.dict_operation["TEMINL"], self.dict_operation["TEMOUT"])
+        p_min = min(self.dict_operation["PREINL"], self.dict_operation["PREOUT"])
+        p_max = max(self.dict_operation["PREINL"], self.dict_operation["PREOUT"])
+        default = dict(
+            # Limited by the minimum temperature of the CoolProp equation of state.
+            TABLE_TMIN=max(0.9 * t_min, AbstractState("HEOS", self.type).Tmin()),
+            TABLE_TMAX=300.0,
+            TABLE_PMIN=0.5 * p_min,
+            TABLE_PMAX=2.0 * p_max,
+            TABLE_NT=1000,
+            TABLE_NP=300,
+        )
+        for key, value in default.items():
+            if pd.isna(self.dict_input.get(key, np.nan)):
+                self.dict_input[key] = value
+            # End if pd.isna.
+        # End for key.
+
+    # End method _set_property_table_input.
+
+    def _get_property_table(self):
+        """
+        Method that returns the property table of the coolant, loading it (or building it if it is not available on disk) at the first call.
+        """
+        if self._property_table is None:
+            self._property_table = get_property_table(
+                self.type,
+                (self.dict_input["TABLE_TMIN"], self.dict_input["TABLE_TMAX"]),
+                (self.dict_input["TABLE_PMIN"], self.dict_input["TABLE_PMAX"]),
+                int(self.dict_input["TABLE_NT"]),
+                int(self.dict_input["TABLE_NP"]),
+            )
+        # End if self._property_table.
+        return self._property_table
+
+    # End method _get_property_table.
+
+    def _eval_properties_table(self, temperature, pressure, aliases):
+        """
+        Method that evaluates the properties in aliases (dictionary with property names as keys and CoolProp aliases as values) interpolating the property table of the coolant. Returns a dictionary with the same keys of aliases.
+        """
+        for alias in aliases.values():
+            if alias not in TABLE_ALIASES:
+                raise ValueError(
+                    f"ERROR! {self.identifier}: property {alias} is not available in the property tables; available properties are {TABLE_ALIASES}.\n"
+                )
+            # End if alias.
+        # End for alias.
+        values = interp_property_table(
+            self._get_property_table(), temperature, pressure
+        )
+        return {
+            prop_name: values[TABLE_ALIASES.index(alias)]
+            for prop_name, alias in aliases.items()
+        }
+
+    # End method _eval_properties_table.
+
+    def _eval_properties_abstract_state(self, temperature, pressure, aliases):
+        """
+        Method that evaluates the properties in aliases (dictionary with property names as keys and CoolProp aliases as values) with the CoolProp low-level interface: the state is updated once for each (temperature, pressure) point and all the properties are obtained from that single update. Returns a dictionary with the same keys of aliases.
+        """
+        abstract_state = self._get_abstract_state()
+        keys = [get_parameter_index(alias) for alias in aliases.values()]
+        temperature = np.atleast_1d(temperature)
+        pressure = np.atleast_1d(pressure)
+        values = np.zeros((len(keys), temperature.size))
+        for ii in range(temperature.size):
+            abstract_state.update(PT_INPUTS, pressure[ii], temperature[ii])
+            for jj, key in enumerate(keys):
+                values[jj, ii] = abstract_state.keyed_output(key)
+            # End for jj.
+        # End for ii.
+        return {prop_name: values[jj] for jj, prop_name in enumerate(aliases)}
+
+    # End method _eval_properties_abstract_state.
+
+    def _eval_single_property(self, alias, temperature, pressure):
+        """
+        Method that evaluates a single property (CoolProp alias) with the backend selected by input key PROPERTY_BACKEND.
+        """
+        if self.dict_input["PROPERTY_BACKEND"] == "PropsSI":
+            return PropsSI(alias, "T", temperature, "P", pressure, self.type)
+        elif self.dict_input["PROPERTY_BACKEND"] == "TABLES":
+            return self._eval_properties_table(temperature, pressure, dict(prop=alias))[
+                "prop"
+            ]
+        else:
+            return self._eval_properties_abstract_state(
+                temperature, pressure, dict(prop=alias)
+            )["prop"]
+        # End if self.dict_input["PROPERTY_BACKEND"].
+
+    # End method _eval_single_property.
+
     def _compute_density_and_mass_flow_rates_nodal_gauss(self, conductor, nodal=True):
         """
         Method that evaluates channel density and mass flow rate in nodal points or in Gauss point according to options value, after that solution is evaluated with function STEP, to make plots of spatial distribution and time evolution. This function is also invoked in method Conductor.Initialization. (cdp, 10/2020)
@@ -243,13 +451,8 @@ class Coolant(FluidComponentsInput):
     def _compute_density_and_mass_flow_rates(self, dict_dummy, conductor):
         if conductor.cond_num_step > 0:
             # Compute density spatial distribution in nodal points or in Gauss points, only in if conductor.num_time_step > 0 since at the Initialization phase it is evaluated calling method _eval_properties_nodal_gauss
-            dict_dummy["total_density"] = PropsSI(
-                "Dmass",
-                "T",
-                dict_dummy["temperature"],
-                "P",
-                dict_dummy["pressure"],
-                self.type,
+            dict_dummy["total_density"] = self._eval_single_property(
+                "Dmass", dict_dummy["temperature"], dict_dummy["pressure"]
             )
         # end if conductor.num_time_step > 0
         # Compute mass flow rate spatial distribution
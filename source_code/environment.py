@@ -1,7 +1,7 @@
 # Import library packages.
 import warnings
 import numpy as np
-import pandas as pd
+from UtilityFunctions.case_cache import cached_read_excel
 from scipy import constants
 from CoolProp.CoolProp import PropsSI
 
@@ -22,7 +22,7 @@ class Environment:
         # self.dict_node_pt = dict()
         # self.dict_Gauss_pt = dict()
         # Dictionary initialization: dict_input.
-        self.dict_input = pd.read_excel(
+        self.dict_input = cached_read_excel(
             f_path,
             sheet_name="ENVIRONMENT",
             header=0,
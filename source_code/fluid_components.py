@@ -13,14 +13,13 @@ properties:
 -htc: Heat transfer coefficient (equivalent to area per unit length) with the (M-1) fluid components	Typically in [W/m2K] NON SOLO NUMERI QUI, MA ANCHE FUNZIONI
 """
 
-import pandas as pd
 import os
 
 
 class FluidComponentsInput:
     """Interface class used to get the input data for fluid components objects. Attributes dict_input and dict_operation are inherited from this class by Coolant and Channel class. Being an interface, this class has only the constructror (__init__) method."""
 
-    def __init__(self, sheet, sheetOpar, dict_file_path, identifier):
+    def __init__(self, sheet, sheetOpar, dict_sheets, identifier):
         """[summary]
 
         Args:
@@ -33,23 +32,11 @@ class FluidComponentsInput:
         self.dict_input = dict()
         self.dict_operation = dict()
         # Dictionary initialization: dict_input.
-        self.dict_input = pd.read_excel(
-            dict_file_path["input"],
-            sheet_name=sheet.title,
-            skiprows=2,
-            header=0,
-            index_col=0,
-            usecols=["Variable name", identifier],
-        )[identifier].to_dict()
+        self.dict_input = dict_sheets["input"][sheet.title][identifier].to_dict()
         # Dictionary initialization: dict_operation.
-        self.dict_operation = pd.read_excel(
-            dict_file_path["operation"],
-            sheet_name=sheetOpar.title,
-            skiprows=2,
-            header=0,
-            index_col=0,
-            usecols=["Variable name", identifier],
-        )[identifier].to_dict()
+        self.dict_operation = dict_sheets["operation"][sheetOpar.title][
+            identifier
+        ].to_dict()
         # Tuning input and operational parameters according to input flags value
         if self.dict_input["ISRECTANGULAR"] == False:
             # Remove keys SIDE1 and SIDE2 from dict_input
@@ -71,7 +58,7 @@ class FluidComponents:
     # class variable shared by all instances
     KIND = "Fluid_component"
 
-    def __init__(self, sheet, sheetOpar, icomp, dict_file_path):
+    def __init__(self, sheet, sheetOpar, icomp, dict_sheets):
         """[summary]
 
         Args:
@@ -83,9 +70,9 @@ class FluidComponents:
         # Get channels ID consistently with user definition (cdp, 09/2020)
         self.ID = sheet.cell(row=3, column=4 + icomp).value
         # Instance of class Channel (build a coolant object)
-        self.channel = Channel(sheet, sheetOpar, dict_file_path, self.ID)
+        self.channel = Channel(sheet, sheetOpar, dict_sheets, self.ID)
         # Instance of class Coolant (build a coolant object)
-        self.coolant = Coolant(sheet, sheetOpar, dict_file_path, self.ID)
+        self.coolant = Coolant(sheet, sheetOpar, dict_sheets, self.ID)
 
     # End method __init__.
 
@@ -104,5 +91,22 @@ class FluidComponents:
 
     # End method __str__.
 
+    def __getstate__(self):
+        """Method that returns the attributes to be pickled (checkpoints of the simulation, see module checkpoint): the figures of the real time plots are not pickled, they are built again by function create_real_time_plots."""
+        state = self.__dict__.copy()
+        for key in [
+            "figure_max_temp",
+            "axes_max_temp",
+            "figure_io_mfr",
+            "axes_io_mfr",
+            "rtp_max_temp",
+            "rtp_io_mfr",
+        ]:
+            state.pop(key, None)
+        # End for key.
+        return state
+
+    # End method __getstate__.
+
 
 # End class FluidComponents.
@@ -1,5 +1,4 @@
 from solid_components import SolidComponents
-import pandas as pd
 import numpy as np
 
 
@@ -24,7 +23,7 @@ class Jacket(SolidComponents):
 
     KIND = "Jacket"
 
-    def __init__(self, simulation, sheet, icomp, name, dict_file_path):
+    def __init__(self, simulation, sheet, icomp, name, dict_sheets):
 
         self.NAME = name
         # get channels ID consistently with user definition (cdp, 09/2020)
@@ -38,26 +37,12 @@ class Jacket(SolidComponents):
         self.dict_num_step = dict()
         self.radiative_heat_env = ""
         self.radiative_heat_inn = dict()
-        # Empty dictionary of list to save variable time evolutions at selected spatial coordinates.
+        # Dictionary of the buffers used to save variable time evolutions at selected spatial coordinates (allocated by function save_simulation_time of module output).
         self.time_evol = dict(temperature=dict())
         # Dictionary initialization: dict_input.
-        self.dict_input = pd.read_excel(
-            dict_file_path["input"],
-            sheet_name=sheet.title,
-            skiprows=2,
-            header=0,
-            index_col=0,
-            usecols=["Variable name", self.ID],
-        )[self.ID].to_dict()
+        self.dict_input = dict_sheets["input"][sheet.title][self.ID].to_dict()
         # Dictionary initialization: dict_operation.
-        self.dict_operation = pd.read_excel(
-            dict_file_path["operation"],
-            sheet_name=sheet.title,
-            skiprows=2,
-            header=0,
-            index_col=0,
-            usecols=["Variable name", self.ID],
-        )[self.ID].to_dict()
+        self.dict_operation = dict_sheets["operation"][sheet.title][self.ID].to_dict()
 
         if self.dict_operation["IBIFUN"] != -1:
             # Remove key B_field_units.
@@ -0,0 +1,163 @@
+"""Headless entry point of OPENSC2: runs one or more simulations without the \
+graphical user interface, e.g. on compute nodes without display.
+
+Usage:
+    python simulation_batch.py INPUT_DIR [INPUT_DIR ...] [--output-dir DIR] [--plots]
+        [--figures] [--figure-workers N] [--checkpoint-steps N]
+        [--checkpoint-walltime S] [--restart]
+
+Each INPUT_DIR is a folder with the .xlsx input files of a simulation (like \
+the ones in Description_of_Components); results of each simulation are saved \
+in DIR/<name of INPUT_DIR> or, without --output-dir, in \
+Simulations_results/<SIMULATION>. Plots are disabled by default: matplotlib \
+is not even imported. With --plots the real time plots are made and the \
+figures are saved with the non interactive backend Agg; with --figures only \
+the figures of initialization and post processing are saved. Figures are \
+rendered at the end of the simulation by a pool of N processes \
+(--figure-workers, default is 1, i.e. by the main process) and the time spent \
+for each figure is printed. With --checkpoint-steps and/or \
+--checkpoint-walltime the state of the simulation is saved every N time \
+steps and/or every S seconds (overriding keys CHECKPOINT_STEPS and \
+CHECKPOINT_WALLTIME of the transient input); with --restart the simulation \
+goes on from its latest checkpoint.
+"""
+
+import argparse
+import os
+import time
+
+# Select the non interactive backend before UtilityFunctions.plots is \
+# (eventually) imported.
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from simulations import Simulations
+
+
+def run_simulation(
+    base_path,
+    main_dir=None,
+    plots=False,
+    restart=False,
+    checkpoint_steps=None,
+    checkpoint_walltime=None,
+    figures=None,
+    figure_workers=1,
+):
+    """Function that runs the simulation with input files in folder base_path, \
+    saving the results in folder main_dir (default is folder \
+    Simulations_results/<SIMULATION>). If restart is True the simulation goes \
+    on from its latest checkpoint. Figures are made if figures is True (by \
+    default if plots is True) by figure_workers processes. Returns the \
+    Simulations object."""
+
+    simulation = Simulations(
+        base_path,
+        plots=plots,
+        restart=restart,
+        figures=figures,
+        figure_workers=figure_workers,
+    )
+    # Intervals of the checkpoints given by the user override the ones of the \
+    # transient input.
+    if checkpoint_steps is not None:
+        simulation.dict_checkpoint["Steps"] = checkpoint_steps
+    # End if checkpoint_steps.
+    if checkpoint_walltime is not None:
+        simulation.dict_checkpoint["Walltime"] = checkpoint_walltime
+    # End if checkpoint_walltime.
+    if main_dir is None:
+        main_dir = os.path.join(
+            simulation.dict_path["Results_dir"],
+            simulation.transient_input["SIMULATION"],
+        )
+    # End if main_dir.
+    simulation.dict_path["Main_dir"] = main_dir
+    simulation.flag_start = True
+    print(f"Launched simulation called {simulation.transient_input['SIMULATION']}\n")
+    # Same sequence of method run_simulation of class OPENSC2_GUI, without gui.
+    simulation.conductor_instance()
+    simulation.simulation_folders_manager()
+    simulation.conductor_initialization(None)
+    simulation.conductor_solution(None)
+    simulation.conductor_post_processing()
+    return simulation
+
+    # End function run_simulation.
+
+
+def main(argv=None):
+    """Function that parses the command line arguments and runs the \
+    simulations one after the other."""
+
+    parser = argparse.ArgumentParser(
+        description="Run OPENSC2 simulations without the graphical user interface."
+    )
+    parser.add_argument(
+        "input_dirs", nargs="+", help="folders with the .xlsx input files"
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=None,
+        help="folder of the results (default is Simulations_results)",
+    )
+    parser.add_argument(
+        "--plots",
+        action="store_true",
+        help="make the real time plots and save the figures (backend Agg)",
+    )
+    parser.add_argument(
+        "--figures",
+        action="store_true",
+        help="save the figures without making the real time plots",
+    )
+    parser.add_argument(
+        "--figure-workers",
+        type=int,
+        default=1,
+        help="number of processes that render the figures (default is 1)",
+    )
+    parser.add_argument(
+        "--checkpoint-steps",
+        type=int,
+        default=None,
+        help="save a checkpoint every given number of time steps",
+    )
+    parser.add_argument(
+        "--checkpoint-walltime",
+        type=float,
+        default=None,
+        help="save a checkpoint every given number of seconds",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="restart the simulations from their latest checkpoint",
+    )
+    args = parser.parse_args(argv)
+    for base_path in args.input_dirs:
+        main_dir = None
+        if args.output_dir is not None:
+            # One subfolder for each simulation, named after the input folder.
+            main_dir = os.path.join(
+                args.output_dir, os.path.basename(os.path.normpath(base_path))
+            )
+        # End if args.output_dir.
+        t_start = time.perf_counter()
+        run_simulation(
+            os.path.abspath(base_path),
+            main_dir,
+            args.plots,
+            args.restart,
+            args.checkpoint_steps,
+            args.checkpoint_walltime,
+            args.plots or args.figures,
+            args.figure_workers,
+        )
+        print(f"Elapsed time: {time.perf_counter() - t_start:.1f} s\n")
+    # End for base_path.
+
+    # End function main.
+
+
+if __name__ == "__main__":
+    main()
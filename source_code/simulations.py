@@ -1,6 +1,4 @@
-from openpyxl import load_workbook
 import numpy as np
-import pandas as pd
 import os
 import warnings
 
@@ -9,22 +7,31 @@ from environment import Environment
 from UtilityFunctions.auxiliary_functions import (
     check_repeated_headings,
     check_object_number,
+    clear_interp_file_cache,
     with_read_csv,
     with_read_excel,
 )
+from UtilityFunctions.capture import capture_spatial_states, close_capture
+from UtilityFunctions.checkpoint import (
+    is_checkpoint_due,
+    load_checkpoint,
+    save_checkpoint,
+    set_checkpoint_input,
+)
+from UtilityFunctions.case_cache import (
+    cached_load_workbook,
+    cached_read_excel,
+    open_case,
+    save_case,
+)
 from UtilityFunctions.transient_solution_functions import get_time_step, step
 from UtilityFunctions.output import (
     save_simulation_space,
-    reorganize_spatial_distribution,
+    export_spatial_distribution,
     save_simulation_time,
     save_properties,
 )
-from UtilityFunctions.plots import (
-    plot_properties,
-    make_plots,
-    create_real_time_plots,
-    update_real_time_plots,
-)
+from UtilityFunctions.output_writer import OutputWriter
 
 
 class Simulations:
@@ -32,7 +39,9 @@ class Simulations:
     # Current working directory
     CWD = os.getcwd()
 
-    def __init__(self, base_path):
+    def __init__(
+        self, base_path, plots=True, restart=False, figures=None, figure_workers=1
+    ):
 
         # Current working directory: SCMagnetCode (cdp, 10/2020)
         # self.cwd = os.getcwd()
@@ -44,13 +53,35 @@ class Simulations:
         # Create directory Simulations_results if it does not exist yet
         os.makedirs(self.dict_path["Results_dir"], exist_ok=True)
         self.basePath = base_path
+        # Flag to make the real time plots; if False and flag_figures is False \
+        # module UtilityFunctions.plots (and matplotlib) is never imported.
+        self.flag_plots = plots
+        # Flag to make the figures of initialization and post processing (by \
+        # default same value of flag_plots); if False no figure is made.
+        self.flag_figures = plots if figures is None else figures
+        # Number of processes that render the figures (see module \
+        # UtilityFunctions.figure_pool); with 1 figures are made by the main \
+        # process.
+        self.figure_workers = figure_workers
+        # Thread that writes the output files during the transient solution \
+        # (see methods conductor_initialization and conductor_solution); None \
+        # means that files are written by the main thread.
+        self.output_writer = None
+        # Flag to restart the simulation from the latest checkpoint (see \
+        # method conductor_initialization and module checkpoint).
+        self.flag_restart = restart
+        # Data of the interpolation files are cached for the whole simulation.
+        clear_interp_file_cache()
+        # Data of the .xlsx input files are read from the case file if none of \
+        # them changed after it was written (see method conductor_instance).
+        open_case(self.basePath)
         # loop inside self.basePath (cdp, 10/2020)
         input_files = os.listdir(self.basePath)
         for f_name in input_files:
             if "transitory_input" in f_name:
                 self.starter_file = f_name
         # Load input file transitory_input.xlsx and convert to a dictionary.
-        self.transient_input = pd.read_excel(
+        self.transient_input = cached_read_excel(
             os.path.join(self.basePath, self.starter_file),
             sheet_name="TRANSIENT",
             skiprows=1,
@@ -59,6 +90,9 @@ class Simulations:
             usecols=["Variable name", "Value"],
         )["Value"].to_dict()
         self.flag_start = False
+        # Intervals of the checkpoints (optional keys CHECKPOINT_STEPS, \
+        # CHECKPOINT_WALLTIME and CHECKPOINT_KEEP of sheet TRANSIENT).
+        set_checkpoint_input(self)
         # get the order of maginitude of the minimum time step to make proper rounds to when saving data and figures of solution spatial distribution at default or User defined times.
         self.n_digit = abs(int(np.floor(np.log10(self.transient_input["STPMIN"]))))
         self.list_of_Conductors = list()
@@ -75,6 +109,12 @@ class Simulations:
             tsv=with_read_csv,
             xlsx=with_read_excel,
         )
+        # Data loaded by method load_user_defined_quantity of class Conductors, \
+        # with keys (file, column, delimiter); each value stores also the \
+        # modification time of the file. Counters of the hits and misses of the \
+        # cache are stored for diagnostics.
+        self.dict_user_quantity_cache = dict()
+        self.user_quantity_counter = dict(Hits=0, Misses=0)
 
         self.fluid_prop_aliases = dict(
             isobaric_expansion_coefficient="isobaric_expansion_coefficient",
@@ -105,16 +145,16 @@ class Simulations:
             # End if "grid".
         # End for f_name.
         # Load workbook conductor_definition.xlsx.
-        conductorsSpec = load_workbook(conductor_defn, data_only=True)
+        conductorsSpec = cached_load_workbook(conductor_defn, data_only=True)
         list_conductor_sheet = [
             conductorsSpec["CONDUCTOR_files"],
             conductorsSpec["CONDUCTOR_input"],
         ]
 
         # Load the workbook in file conductor_grid.xlsx.
-        gridCond = load_workbook(dict_file["GRID"], data_only=True)
+        gridCond = cached_load_workbook(dict_file["GRID"], data_only=True)
         # Load the workbook in file conductor_diagnostic.xlsx.
-        wb_diagno = load_workbook(dict_file["Space"], data_only=True)
+        wb_diagno = cached_load_workbook(dict_file["Space"], data_only=True)
         # Loop to check if user define conductors with the same identifier.
         for sheet in list_conductor_sheet:
             check_repeated_headings(conductor_defn, sheet)
@@ -145,26 +185,39 @@ class Simulations:
             conductor = Conductors(self, list_conductor_sheet, ii)
             self.list_of_Conductors.append(conductor)
         # end for ii (cdp, 12/2020)
-        self.contactBetweenConductors = pd.read_excel(
+        self.contactBetweenConductors = cached_read_excel(
             conductor_defn, sheet_name="CONDUCTOR_COUPLING", header=0, index_col=0
         )
+        # All the .xlsx input files are read: write the case file to reuse the \
+        # data in the next simulations.
+        save_case()
 
-        # Loop to create the attributes required to make the real time plots (shortly rtp).
-        for conductor in self.list_of_Conductors:
-            create_real_time_plots(self, conductor)
-        # End for conductor.
+        if self.flag_plots:
+            from UtilityFunctions.plots import create_real_time_plots
+
+            # Loop to create the attributes required to make the real time plots (shortly rtp).
+            for conductor in self.list_of_Conductors:
+                create_real_time_plots(self, conductor)
+            # End for conductor.
+        # End if self.flag_plots.
 
     # end method Conductor_instance
 
     def conductor_initialization(self, gui):
+        # Start the thread that writes the output files.
+        self.output_writer = OutputWriter()
+        if self.flag_restart:
+            # The state of the conductors, the time and step counters and the \
+            # output files are restored from the latest checkpoint.
+            self._restore_checkpoint()
+            return
+        # End if self.flag_restart.
         for cond in self.list_of_Conductors:
             # ** INITIALIZATION **
             # s time @ which simulation is started (cdp, 07/2020)
             self.simulation_time = [0.0]
             self.num_step = 0
             cond.initialization(self, gui)
-            # plot conductor initialization spatial distribution (cdp, 12/2020)
-            plot_properties(self, cond)
             save_simulation_time(self, cond)
             # ** END INITIALIZATION **
         # end for cond (cdp, 12/202)
@@ -223,10 +276,28 @@ class Simulations:
 
     # end method Conductor_initialization
 
+    def _restore_checkpoint(self):
+        """Private method that restores the simulation from the latest checkpoint, in place of the initialization; the figures of the real time plots are built again for the restored conductors."""
+        path = load_checkpoint(self)
+        if self.flag_plots:
+            from UtilityFunctions.plots import create_real_time_plots, create_legend_rtp
+
+            for conductor in self.list_of_Conductors:
+                create_real_time_plots(self, conductor)
+                create_legend_rtp(conductor)
+            # End for conductor.
+        # End if self.flag_plots.
+        print(
+            f"Restarted simulation {self.transient_input['SIMULATION']} from checkpoint {path} at time {self.simulation_time[-1]} s (time step {self.num_step})\n"
+        )
+
+    # End method _restore_checkpoint.
+
     def conductor_solution(self, gui):
+        if self.flag_plots:
+            from UtilityFunctions.plots import update_real_time_plots
+        # End if self.flag_plots.
         # ** TRANSIENT SOLUTION **
-        num_step_store = 100
-        count_store = 1
         stoptime = 0  # flag to stop simulation if some problems (like quench) \
         # arise (cdp, 07/2020)
         # Time step initialization (cdp, 08/2020)
@@ -243,12 +314,16 @@ class Simulations:
             # get the times at which users saves the solution spatial distribution \
             # (cdp, 10/2020)
             # list_values = list(conductor.dict_Space_save.values())
-            # Save of the solution spatial distribution at 0.0 s (cdp, 12/2020)
-            save_simulation_space(
-                conductor,
-                self.dict_path[f"Output_Space_{conductor.ID}_dir"],
-                abs(self.n_digit),
-            )
+            if self.num_step == 0:
+                # Save of the solution spatial distribution at 0.0 s (cdp, 12/2020); \
+                # not done if the simulation is restarted from a checkpoint.
+                save_simulation_space(
+                    conductor,
+                    self.dict_path[f"Output_Space_{conductor.ID}_dir"],
+                    abs(self.n_digit),
+                    self.output_writer,
+                )
+            # End if self.num_step.
         # end for ii (cdp, 10/2020)
         # while loop to solve transient at each timestep (cdp, 07/2020)
         while (
@@ -352,12 +427,10 @@ class Simulations:
                 # Compute radiative heat exchanged outer jacket and environment.
                 conductor.compute_heat_exchange_jk_env(self.environment)
 
-                update_real_time_plots(conductor)
+                if self.flag_plots:
+                    update_real_time_plots(conductor)
+                # End if self.flag_plots.
 
-                if self.num_step == num_step_store * count_store:
-                    # Update counter to store the state of the simulation, still to come \
-                    # (cdp, 08/2020)
-                    count_store = count_store + 1
                 if (
                     conductor.i_save < len(conductor.Space_save) - 1
                     and abs(
@@ -371,8 +444,12 @@ class Simulations:
                         conductor,
                         self.dict_path[f"Output_Space_{conductor.ID}_dir"],
                         abs(self.n_digit),
+                        self.output_writer,
                     )
                 # end if isave
+                # Store the spatial state in the ring buffer of the event \
+                # triggered capture (see module capture).
+                capture_spatial_states(self, conductor)
                 ##
                 # end if conductor.i_save_space[i_save]
                 # for key in list(conductor.dict_Space_save.keys()):
@@ -403,38 +480,81 @@ class Simulations:
                 save_simulation_time(self, conductor)
                 # call sensor to plot results at any time the user asks (cdp, 07/2020)
             # End for conductor (cdp, 07/2020)
+            # Store the state of the simulation at the intervals given in the \
+            # transient input (see module checkpoint).
+            if is_checkpoint_due(self):
+                save_checkpoint(self)
+            # End if is_checkpoint_due.
         # end while (cdp, 07/2020)
+        if self.flag_plots:
+            from UtilityFunctions.plots import close_real_time_plots
+
+            # Final draw of the real time plots, with all the stored values.
+            for cond in self.list_of_Conductors:
+                close_real_time_plots(cond)
+            # End for cond.
+        # End if self.flag_plots.
         # Loop on conductors (cdp, 12/2020)
         for cond in self.list_of_Conductors:
+            # Save the capture window still open, if any.
+            close_capture(self, cond)
             # save simulation spatial distribution at TEND (cdp, 01/2021)
             save_simulation_space(
-                cond, self.dict_path[f"Output_Space_{cond.ID}_dir"], abs(self.n_digit)
+                cond,
+                self.dict_path[f"Output_Space_{cond.ID}_dir"],
+                abs(self.n_digit),
+                self.output_writer,
             )
             # Call function Save_properties to save the conductor final solution \
             # (cdp, 12/2020)
             save_properties(cond, self.dict_path[f"Output_Solution_{cond.ID}_dir"])
         # end for cond (cdp, 12/2020)
+        # Wait until all the output files are written and stop the thread; \
+        # errors of the thread are raised here.
+        self.output_writer.close()
+        self.output_writer = None
         print("Saved final solution\n")
         print("End simulation called " + self.transient_input["SIMULATION"] + "\n")
 
     # end method Conductor_solution (cdp, 09/2020)
 
     def conductor_post_processing(self):
+        if self.flag_figures:
+            from UtilityFunctions.figure_pool import render_figures
+            from UtilityFunctions.plots import (
+                distribution_figure_tasks,
+                properties_figure_tasks,
+            )
+        # End if self.flag_figures.
+        # Figure tasks of all the conductors, rendered together at the end in \
+        # a single pool.
+        figure_tasks = list()
         # loop to save the norm of the solution at the end of the transient for \
         # each conductor, usefull to make space convergence (cdp, 09/2020)
         # t_end = np.array([self.transient_input["TEND"]])
         for cond in self.list_of_Conductors:
             cond.post_processing(self)
-            reorganize_spatial_distribution(
+            # Write the .tsv files of the spatial distributions from the binary \
+            # store.
+            export_spatial_distribution(
                 cond, self.dict_path[f"Output_Space_{cond.ID}_dir"], self.n_digit
             )
-            # Plot conductor solution spatial distribution (cdp, 12/2020)
-            plot_properties(self, cond, what="solution")
+            if self.flag_figures:
+                # Plot conductor initialization spatial distribution (cdp, 12/2020)
+                figure_tasks.extend(properties_figure_tasks(self, cond))
+                # Plot conductor solution spatial distribution (cdp, 12/2020)
+                figure_tasks.extend(
+                    properties_figure_tasks(self, cond, what="solution")
+                )
+            # End if self.flag_figures.
         # end for cond (cdp, 12/2020)
-        # Call function Make_plots to make plot of spatial distribution and time \
-        # evolution (cdp, 11/2020)
-        make_plots(self, kind="Space_distr")
-        make_plots(self, kind="Time_evol")
+        if self.flag_figures:
+            # Make plot of spatial distribution and time evolution.
+            figure_tasks.extend(distribution_figure_tasks(self, kind="Space_distr"))
+            figure_tasks.extend(distribution_figure_tasks(self, kind="Time_evol"))
+            render_figures(figure_tasks, self.figure_workers)
+            print("Plotted initialization and solution\n")
+        # End if self.flag_figures.
 
     # end method Conductor_post_processing (cdp, 09/2020)
 
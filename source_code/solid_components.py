@@ -1,7 +1,12 @@
 import numpy as np
 import os
+import pandas as pd
 
 from UtilityFunctions.auxiliary_functions import get_from_xlsx
+from UtilityFunctions.material_property_tables import (
+    get_material_table,
+    interp_material_table,
+)
 
 # Cu properties
 from Properties_of_materials.copper import (
@@ -81,6 +86,37 @@ from Properties_of_materials.aluminium import (
 
 
 class SolidComponents:
+    # Material functions of temperature only that can be replaced by the interpolation of their tables (input key MATERIAL_TABLES).
+    material_functions_t = (
+        isobaric_specific_heat_cu_nist,
+        thermal_conductivity_nbti,
+        thermal_conductivity_nb3sn,
+        thermal_conductivity_re123,
+        isobaric_specific_heat_re123,
+        thermal_conductivity_ss,
+        isobaric_specific_heat_ss,
+        electrical_resistivity_ss,
+        thermal_conductivity_ge,
+        isobaric_specific_heat_ge,
+        thermal_conductivity_ag,
+        isobaric_specific_heat_ag,
+        electrical_resistivity_ag,
+        thermal_conductivity_hc276,
+        isobaric_specific_heat_hc276,
+        electrical_resistivity_hc276,
+        thermal_conductivity_sn60pb40,
+        isobaric_specific_heat_sn60pb40,
+        electrical_resistivity_sn60pb40,
+        thermal_conductivity_al,
+        isobaric_specific_heat_al,
+        electrical_resistivity_al,
+    )
+    # Material functions of temperature and magnetic field (at fixed RRR) that can be replaced by the interpolation of their tables.
+    material_functions_tb = (
+        thermal_conductivity_cu_nist,
+        electrical_resistivity_cu_nist,
+    )
+
     def __init__(self, simulation, s_comp):
 
         """
@@ -111,9 +147,40 @@ class SolidComponents:
                 # Time adaptivity on
                 print("Still to be decided what to do there (cdp, 11/2020)\n")
         # End s_comp.dict_operation["IQFUN"].
+        # Optional keys of the material property tables: if MATERIAL_TABLES is True the material functions are replaced by the linear interpolation of tables sampled on a grid of MATERIAL_TABLE_NT points equally spaced in log(temperature) between MATERIAL_TABLE_TMIN and MATERIAL_TABLE_TMAX (K) and, for functions of the magnetic field, of MATERIAL_TABLE_NB points between 0 and MATERIAL_TABLE_BMAX (T).
+        default = dict(
+            MATERIAL_TABLES=False,
+            MATERIAL_TABLE_TMIN=4.0,
+            MATERIAL_TABLE_TMAX=300.0,
+            MATERIAL_TABLE_NT=2000,
+            MATERIAL_TABLE_BMAX=20.0,
+            MATERIAL_TABLE_NB=201,
+        )
+        for key, value in default.items():
+            if pd.isna(s_comp.dict_input.get(key, np.nan)):
+                s_comp.dict_input[key] = value
+            # End if pd.isna.
+        # End for key.
+        # Dictionary of the material functions, built at the first call of method get_material_functions.
+        s_comp.dict_material_functions = None
 
     # end method __init__ (cdp, 11/2020)
 
+    def __getstate__(self):
+
+        """
+        Method that returns the attributes to be pickled (checkpoints of the simulation, see module checkpoint): the material functions (that may be closures on the material property tables) are built again at the first call of method get_material_functions and the figures of the real time plots are built again by function create_real_time_plots.
+        """
+
+        state = self.__dict__.copy()
+        state["dict_material_functions"] = None
+        for key in ["figure_max_temp", "axes_max_temp", "rtp_max_temp"]:
+            state.pop(key, None)
+        # End for key.
+        return state
+
+    # end method __getstate__
+
     def eval_sol_comp_properties(self, dict_obj_inventory, nodal=True):
 
         """
@@ -129,11 +196,73 @@ class SolidComponents:
             dict_dummy = self.dict_Gauss_pt
             self.dict_Gauss_pt = self.eval_properties(dict_dummy, dict_obj_inventory)
 
+    def get_material_functions(self):
+
+        """
+        Method that returns the dictionary of the material functions used by method eval_properties, with the names of the functions as keys. If input key MATERIAL_TABLES is True the functions in material_functions_t and material_functions_tb are replaced by the interpolation of their tables.
+        """
+        if self.dict_material_functions is None:
+            self.dict_material_functions = dict()
+            for function in self.material_functions_t:
+                self.dict_material_functions[function.__name__] = (
+                    self._tabulated_function(function, field_dependent=False)
+                    if self.dict_input["MATERIAL_TABLES"]
+                    else function
+                )
+            # End for function.
+            for function in self.material_functions_tb:
+                self.dict_material_functions[function.__name__] = (
+                    self._tabulated_function(function, field_dependent=True)
+                    if self.dict_input["MATERIAL_TABLES"]
+                    else function
+                )
+            # End for function.
+        # End if self.dict_material_functions.
+        return self.dict_material_functions
+
+    # end method get_material_functions
+
+    def _tabulated_function(self, function, field_dependent):
+
+        """
+        Method that returns a function with the same arguments of function that interpolates its table; tables are loaded (or built) at the first call, one for each value of the additional arguments (e.g. RRR).
+        """
+        tables = dict()
+        t_range = (
+            self.dict_input["MATERIAL_TABLE_TMIN"],
+            self.dict_input["MATERIAL_TABLE_TMAX"],
+        )
+        b_range = (0.0, self.dict_input["MATERIAL_TABLE_BMAX"])
+
+        def tabulated(temperature, *args):
+            if field_dependent:
+                field, args = args[0], args[1:]
+            else:
+                field = None
+            # End if field_dependent.
+            if args not in tables:
+                tables[args] = get_material_table(
+                    function,
+                    t_range,
+                    int(self.dict_input["MATERIAL_TABLE_NT"]),
+                    b_range if field_dependent else None,
+                    int(self.dict_input["MATERIAL_TABLE_NB"]),
+                    args,
+                )
+            # End if args.
+            return interp_material_table(tables[args], temperature, field)
+
+        return tabulated
+
+    # end method _tabulated_function
+
     def eval_properties(self, dict_dummy, dict_obj_inventory):
 
         """
         Method that actually evaluate total_density, specific_heat and thermal conductivity of SolidComponents class objects regardless of the location (nodal or Gauss points) (cdp, 07/2020)
         """
+        # Material functions, analytic or tabulated according to input key MATERIAL_TABLES.
+        mat = self.get_material_functions()
         # keys = list(self.dict_input.keys())
         if self.NAME == dict_obj_inventory["MixSCStabilizer"]["Name"]:
             # STR_MIX: stabilizer and superconductor strand (cdp, 07/2020)
@@ -152,50 +281,36 @@ class SolidComponents:
                         # (cdp, 07/2020)
                         if self.dict_input["ISTABILIZER"] == "Cu":  # Cu (cdp, 07/2020)
                             rho_num = rho_num + density_cu() * R_stab_non_stab
-                            cp_num = (
-                                cp_num
-                                + density_cu()
-                                * R_stab_non_stab
-                                * isobaric_specific_heat_cu_nist(
-                                    dict_dummy["temperature"]
-                                )
-                            )
-                            kk_num = (
-                                kk_num
-                                + R_stab_non_stab
-                                * thermal_conductivity_cu_nist(
-                                    dict_dummy["temperature"],
-                                    dict_dummy["B_field"],
-                                    self.dict_input["RRR"],
-                                )
+                            cp_num = cp_num + density_cu() * R_stab_non_stab * mat[
+                                "isobaric_specific_heat_cu_nist"
+                            ](dict_dummy["temperature"])
+                            kk_num = kk_num + R_stab_non_stab * mat[
+                                "thermal_conductivity_cu_nist"
+                            ](
+                                dict_dummy["temperature"],
+                                dict_dummy["B_field"],
+                                self.dict_input["RRR"],
                             )
-                            rhoe_num = (
-                                rhoe_num
-                                + R_stab_non_stab
-                                * electrical_resistivity_cu_nist(
-                                    dict_dummy["temperature"],
-                                    dict_dummy["B_field"],
-                                    self.dict_input["RRR"],
-                                )
+                            rhoe_num = rhoe_num + R_stab_non_stab * mat[
+                                "electrical_resistivity_cu_nist"
+                            ](
+                                dict_dummy["temperature"],
+                                dict_dummy["B_field"],
+                                self.dict_input["RRR"],
                             )
                         elif (
                             self.dict_input["ISTABILIZER"] == "Al"
                         ):  # Al (cdp, 07/2020)
                             rho_num = rho_num + density_al() * R_stab_non_stab
-                            cp_num = (
-                                cp_num
-                                + density_al()
-                                * R_stab_non_stab
-                                * isobaric_specific_heat_al(dict_dummy["temperature"])
-                            )
-                            kk_num = kk_num + R_stab_non_stab * thermal_conductivity_al(
-                                dict_dummy["temperature"]
-                            )
-                            rhoe_num = (
-                                rhoe_num
-                                + R_stab_non_stab
-                                * electrical_resistivity_al(dict_dummy["temperature"])
-                            )
+                            cp_num = cp_num + density_al() * R_stab_non_stab * mat[
+                                "isobaric_specific_heat_al"
+                            ](dict_dummy["temperature"])
+                            kk_num = kk_num + R_stab_non_stab * mat[
+                                "thermal_conductivity_al"
+                            ](dict_dummy["temperature"])
+                            rhoe_num = rhoe_num + R_stab_non_stab * mat[
+                                "electrical_resistivity_al"
+                            ](dict_dummy["temperature"])
                         else:
                             raise ValueError(
                                 f"""ERROR: material corresponding to
@@ -211,44 +326,36 @@ class SolidComponents:
                         A_stab = self.dict_input["CROSSECTION"] - Ar_tot
                         if self.dict_input["ISTABILIZER"] == "Cu":  # Cu (cdp, 07/2020)
                             rho_num = rho_num + density_cu() * A_stab
-                            cp_num = (
-                                cp_num
-                                + density_cu()
-                                * A_stab
-                                * isobaric_specific_heat_cu_nist(
-                                    dict_dummy["temperature"]
-                                )
-                            )
-                            kk_num = kk_num + A_stab * thermal_conductivity_cu_nist(
+                            cp_num = cp_num + density_cu() * A_stab * mat[
+                                "isobaric_specific_heat_cu_nist"
+                            ](dict_dummy["temperature"])
+                            kk_num = kk_num + A_stab * mat[
+                                "thermal_conductivity_cu_nist"
+                            ](
                                 dict_dummy["temperature"],
                                 dict_dummy["B_field"],
                                 self.dict_input["RRR"],
                             )
-                            rhoe_num = (
-                                rhoe_num
-                                + A_stab
-                                * electrical_resistivity_cu_nist(
-                                    dict_dummy["temperature"],
-                                    dict_dummy["B_field"],
-                                    self.dict_input["RRR"],
-                                )
+                            rhoe_num = rhoe_num + A_stab * mat[
+                                "electrical_resistivity_cu_nist"
+                            ](
+                                dict_dummy["temperature"],
+                                dict_dummy["B_field"],
+                                self.dict_input["RRR"],
                             )
                         elif (
                             self.dict_input["ISTABILIZER"] == "Al"
                         ):  # Al (cdp, 07/2020)
                             rho_num = rho_num + density_al() * A_stab
-                            cp_num = (
-                                cp_num
-                                + density_al()
-                                * A_stab
-                                * isobaric_specific_heat_al(dict_dummy["temperature"])
-                            )
-                            kk_num = kk_num + A_stab * thermal_conductivity_al(
-                                dict_dummy["temperature"]
-                            )
-                            rhoe_num = rhoe_num + A_stab * electrical_resistivity_al(
+                            cp_num = cp_num + density_al() * A_stab * mat[
+                                "isobaric_specific_heat_al"
+                            ](dict_dummy["temperature"])
+                            kk_num = kk_num + A_stab * mat["thermal_conductivity_al"](
                                 dict_dummy["temperature"]
                             )
+                            rhoe_num = rhoe_num + A_stab * mat[
+                                "electrical_resistivity_al"
+                            ](dict_dummy["temperature"])
                         else:
                             raise ValueError(
                                 f"""ERROR: material corresponding to
@@ -266,7 +373,7 @@ class SolidComponents:
                             dict_dummy["T_cur_sharing_min"],
                             dict_dummy["T_critical"],
                         )
-                        kk_num = kk_num + thermal_conductivity_nbti(
+                        kk_num = kk_num + mat["thermal_conductivity_nbti"](
                             dict_dummy["temperature"]
                         )
                     elif self.dict_input["ISUPERCONDUCTOR"] == "Nb3Sn":
@@ -282,7 +389,7 @@ class SolidComponents:
                                 self.dict_input["Tc0m"],
                             )
                         )
-                        kk_num = kk_num + thermal_conductivity_nb3sn(
+                        kk_num = kk_num + mat["thermal_conductivity_nb3sn"](
                             dict_dummy["temperature"]
                         )
                     elif self.dict_input["ISUPERCONDUCTOR"] == "HTS":
@@ -295,33 +402,52 @@ class SolidComponents:
                         )
                         cp_num = cp_num + (
                             density_re123()
-                            * isobaric_specific_heat_re123(dict_dummy["temperature"])
+                            * mat["isobaric_specific_heat_re123"](
+                                dict_dummy["temperature"]
+                            )
                             * Ar_sc
                             + density_hc276()
-                            * isobaric_specific_heat_hc276(dict_dummy["temperature"])
+                            * mat["isobaric_specific_heat_hc276"](
+                                dict_dummy["temperature"]
+                            )
                             * Ar_hs
                             + density_sn60pb40()
-                            * isobaric_specific_heat_sn60pb40(dict_dummy["temperature"])
+                            * mat["isobaric_specific_heat_sn60pb40"](
+                                dict_dummy["temperature"]
+                            )
                             * Ar_so
                             + density_ag()
-                            * isobaric_specific_heat_ag(dict_dummy["temperature"])
+                            * mat["isobaric_specific_heat_ag"](
+                                dict_dummy["temperature"]
+                            )
                             * Ar_ag
                         )
                         kk_num = kk_num + (
-                            thermal_conductivity_re123(dict_dummy["temperature"])
+                            mat["thermal_conductivity_re123"](dict_dummy["temperature"])
                             * Ar_sc
-                            + thermal_conductivity_hc276(dict_dummy["temperature"])
+                            + mat["thermal_conductivity_hc276"](
+                                dict_dummy["temperature"]
+                            )
                             * Ar_hs
-                            + thermal_conductivity_sn60pb40(dict_dummy["temperature"])
+                            + mat["thermal_conductivity_sn60pb40"](
+                                dict_dummy["temperature"]
+                            )
                             * Ar_so
-                            + thermal_conductivity_ag(dict_dummy["temperature"]) * Ar_ag
+                            + mat["thermal_conductivity_ag"](dict_dummy["temperature"])
+                            * Ar_ag
                         )
                         rhoe_num = rhoe_num + (
-                            electrical_resistivity_hc276(dict_dummy["temperature"])
+                            mat["electrical_resistivity_hc276"](
+                                dict_dummy["temperature"]
+                            )
                             * Ar_hs
-                            + electrical_resistivity_sn60pb40(dict_dummy["temperature"])
+                            + mat["electrical_resistivity_sn60pb40"](
+                                dict_dummy["temperature"]
+                            )
                             * Ar_so
-                            + electrical_resistivity_ag(dict_dummy["temperature"])
+                            + mat["electrical_resistivity_ag"](
+                                dict_dummy["temperature"]
+                            )
                             * Ar_ag
                         )
                     elif self.dict_input["ISUPERCONDUCTOR"] == "scaling.dat":
@@ -374,7 +500,7 @@ class SolidComponents:
                     )
                 )
                 dict_dummy.update(
-                    total_thermal_conductivity=thermal_conductivity_nbti(
+                    total_thermal_conductivity=mat["thermal_conductivity_nbti"](
                         dict_dummy["temperature"]
                     )
                 )
@@ -390,7 +516,7 @@ class SolidComponents:
                     )
                 )
                 dict_dummy.update(
-                    total_thermal_conductivity=thermal_conductivity_nb3sn(
+                    total_thermal_conductivity=mat["thermal_conductivity_nb3sn"](
                         dict_dummy["temperature"]
                     )
                 )
@@ -411,36 +537,45 @@ class SolidComponents:
                 cp_num = (
                     density_re123()
                     * Ar_sc
-                    * isobaric_specific_heat_re123(dict_dummy["temperature"])
+                    * mat["isobaric_specific_heat_re123"](dict_dummy["temperature"])
                     + density_hc276()
                     * Ar_hs
-                    * isobaric_specific_heat_hc276(dict_dummy["temperature"])
+                    * mat["isobaric_specific_heat_hc276"](dict_dummy["temperature"])
                     + density_sn60pb40()
                     * Ar_so
-                    * isobaric_specific_heat_sn60pb40(dict_dummy["temperature"])
+                    * mat["isobaric_specific_heat_sn60pb40"](dict_dummy["temperature"])
                     + density_ag()
                     * Ar_ag
-                    * isobaric_specific_heat_ag(dict_dummy["temperature"])
+                    * mat["isobaric_specific_heat_ag"](dict_dummy["temperature"])
                 )
                 dict_dummy.update(total_density=rho_num / Ar_tot)
                 dict_dummy.update(total_isobaric_specific_heat=cp_num / rho_num)
                 dict_dummy.update(
                     total_thermal_conductivity=(
-                        thermal_conductivity_re123(dict_dummy["temperature"]) * Ar_sc
-                        + thermal_conductivity_hc276(dict_dummy["temperature"]) * Ar_hs
-                        + thermal_conductivity_sn60pb40(dict_dummy["temperature"])
+                        mat["thermal_conductivity_re123"](dict_dummy["temperature"])
+                        * Ar_sc
+                        + mat["thermal_conductivity_hc276"](dict_dummy["temperature"])
+                        * Ar_hs
+                        + mat["thermal_conductivity_sn60pb40"](
+                            dict_dummy["temperature"]
+                        )
                         * Ar_so
-                        + thermal_conductivity_ag(dict_dummy["temperature"]) * Ar_ag
+                        + mat["thermal_conductivity_ag"](dict_dummy["temperature"])
+                        * Ar_ag
                     )
                     / Ar_tot
                 )
 
                 dict_dummy.update(
                     total_electrical_resistivity=(
-                        electrical_resistivity_hc276(dict_dummy["temperature"]) * Ar_hs
-                        + electrical_resistivity_sn60pb40(dict_dummy["temperature"])
+                        mat["electrical_resistivity_hc276"](dict_dummy["temperature"])
+                        * Ar_hs
+                        + mat["electrical_resistivity_sn60pb40"](
+                            dict_dummy["temperature"]
+                        )
                         * Ar_so
-                        + electrical_resistivity_ag(dict_dummy["temperature"]) * Ar_ag
+                        + mat["electrical_resistivity_ag"](dict_dummy["temperature"])
+                        * Ar_ag
                     )
                     / Ar_tot
                 )
@@ -461,19 +596,19 @@ class SolidComponents:
                 # Cu strand (cdp, 07/2020)
                 dict_dummy.update(total_density=density_cu())
                 dict_dummy.update(
-                    total_isobaric_specific_heat=isobaric_specific_heat_cu_nist(
+                    total_isobaric_specific_heat=mat["isobaric_specific_heat_cu_nist"](
                         dict_dummy["temperature"]
                     )
                 )
                 dict_dummy.update(
-                    total_thermal_conductivity=thermal_conductivity_cu_nist(
+                    total_thermal_conductivity=mat["thermal_conductivity_cu_nist"](
                         dict_dummy["temperature"],
                         dict_dummy["B_field"],
                         self.dict_input["RRR"],
                     )
                 )
                 dict_dummy.update(
-                    total_electrical_resistivity=electrical_resistivity_cu_nist(
+                    total_electrical_resistivity=mat["electrical_resistivity_cu_nist"](
                         dict_dummy["temperature"],
                         dict_dummy["B_field"],
                         self.dict_input["RRR"],
@@ -483,17 +618,17 @@ class SolidComponents:
                 # Al strand (cdp, 07/2020)
                 dict_dummy.update(total_density=density_al())
                 dict_dummy.update(
-                    total_isobaric_specific_heat=isobaric_specific_heat_al(
+                    total_isobaric_specific_heat=mat["isobaric_specific_heat_al"](
                         dict_dummy["temperature"]
                     )
                 )
                 dict_dummy.update(
-                    total_thermal_conductivity=thermal_conductivity_al(
+                    total_thermal_conductivity=mat["thermal_conductivity_al"](
                         dict_dummy["temperature"]
                     )
                 )
                 dict_dummy.update(
-                    total_electrical_resistivity=electrical_resistivity_al(
+                    total_electrical_resistivity=mat["electrical_resistivity_al"](
                         dict_dummy["temperature"]
                     )
                 )
@@ -527,17 +662,21 @@ class SolidComponents:
                         cp_num = (
                             cp_num
                             + density_ss()
-                            * isobaric_specific_heat_ss(dict_dummy["temperature"])
+                            * mat["isobaric_specific_heat_ss"](
+                                dict_dummy["temperature"]
+                            )
                             * self.dict_input["CROSSECTION_JK"]
                         )
                         kk_num = (
                             kk_num
-                            + thermal_conductivity_ss(dict_dummy["temperature"])
+                            + mat["thermal_conductivity_ss"](dict_dummy["temperature"])
                             * self.dict_input["CROSSECTION_JK"]
                         )
                         rhoe_num = (
                             rhoe_num
-                            + electrical_resistivity_ss(dict_dummy["temperature"])
+                            + mat["electrical_resistivity_ss"](
+                                dict_dummy["temperature"]
+                            )
                             * self.dict_input["CROSSECTION_JK"]
                         )
                     else:
@@ -556,12 +695,14 @@ class SolidComponents:
                         cp_num = (
                             cp_num
                             + density_ge()
-                            * isobaric_specific_heat_ge(dict_dummy["temperature"])
+                            * mat["isobaric_specific_heat_ge"](
+                                dict_dummy["temperature"]
+                            )
                             * self.dict_input["CROSSECTION_IN"]
                         )
                         kk_num = (
                             kk_num
-                            + thermal_conductivity_ge(dict_dummy["temperature"])
+                            + mat["thermal_conductivity_ge"](dict_dummy["temperature"])
                             * self.dict_input["CROSSECTION_IN"]
                         )
                         # dummy value for electrical resistivity, high value since it is \
@@ -587,17 +728,23 @@ class SolidComponents:
                             cp_num = (
                                 cp_num
                                 + density_ss()
-                                * isobaric_specific_heat_ss(dict_dummy["temperature"])
+                                * mat["isobaric_specific_heat_ss"](
+                                    dict_dummy["temperature"]
+                                )
                                 * self.dict_input["CROSSECTION_JK"]
                             )
                             kk_num = (
                                 kk_num
-                                + thermal_conductivity_ss(dict_dummy["temperature"])
+                                + mat["thermal_conductivity_ss"](
+                                    dict_dummy["temperature"]
+                                )
                                 * self.dict_input["CROSSECTION_JK"]
                             )
                             rhoe_num = (
                                 rhoe_num
-                                + electrical_resistivity_ss(dict_dummy["temperature"])
+                                + mat["electrical_resistivity_ss"](
+                                    dict_dummy["temperature"]
+                                )
                                 * self.dict_input["CROSSECTION_JK"]
                             )
                         else:
@@ -620,12 +767,16 @@ class SolidComponents:
                             cp_num = (
                                 cp_num
                                 + density_ge()
-                                * isobaric_specific_heat_ge(dict_dummy["temperature"])
+                                * mat["isobaric_specific_heat_ge"](
+                                    dict_dummy["temperature"]
+                                )
                                 * self.dict_input["CROSSECTION_IN"]
                             )
                             kk_num = (
                                 kk_num
-                                + thermal_conductivity_ge(dict_dummy["temperature"])
+                                + mat["thermal_conductivity_ge"](
+                                    dict_dummy["temperature"]
+                                )
                                 * self.dict_input["CROSSECTION_IN"]
                             )
                             # dummy value for electrical resistivity, high value since it is \
@@ -1,6 +1,5 @@
 from solid_components import SolidComponents
 from strands import Strands
-import pandas as pd
 
 
 class Stabilizer(Strands):
@@ -24,7 +23,7 @@ class Stabilizer(Strands):
 
     KIND = "Stabilizer"
 
-    def __init__(self, simulation, sheet, icomp, name, dict_file_path):
+    def __init__(self, simulation, sheet, icomp, name, dict_sheets):
 
         self.NAME = name
         # get channels ID consistently with user definition (cdp, 09/2020)
@@ -36,27 +35,13 @@ class Stabilizer(Strands):
         self.dict_node_pt = dict()
         self.dict_Gauss_pt = dict()
         self.dict_num_step = dict()
-        # Empty dictionary of list to save variable time evolutions at selected spatial coordinates.
+        # Dictionary of the buffers used to save variable time evolutions at selected spatial coordinates (allocated by function save_simulation_time of module output).
         self.time_evol = dict(temperature=dict(), B_field=dict())
         self.dict_scaling_input = dict()
         # Dictionary initialization: dict_input.
-        self.dict_input = pd.read_excel(
-            dict_file_path["input"],
-            sheet_name=sheet.title,
-            skiprows=2,
-            header=0,
-            index_col=0,
-            usecols=["Variable name", self.ID],
-        )[self.ID].to_dict()
+        self.dict_input = dict_sheets["input"][sheet.title][self.ID].to_dict()
         # Dictionary initialization: dict_operation.
-        self.dict_operation = pd.read_excel(
-            dict_file_path["operation"],
-            sheet_name=sheet.title,
-            skiprows=2,
-            header=0,
-            index_col=0,
-            usecols=["Variable name", self.ID],
-        )[self.ID].to_dict()
+        self.dict_operation = dict_sheets["operation"][sheet.title][self.ID].to_dict()
 
         # Call SolidComponents class constructor to deal with Stabilizer time \
         # steps for current, external heating and so on (cdp, 11/2020)
@@ -2,7 +2,13 @@ from solid_components import SolidComponents
 from openpyxl import load_workbook
 import numpy as np
 import os
+import pandas as pd
 from UtilityFunctions.auxiliary_functions import get_from_xlsx
+from UtilityFunctions.current_sharing_tables import (
+    build_cur_sharing_table,
+    interp_cur_sharing_table,
+    newton_cur_sharing,
+)
 
 # from UtilityFunctions.InitializationFunctions import Read_input_file
 # NbTi properties
@@ -38,6 +44,12 @@ class Strands(SolidComponents):
     # inherited from class SolidComponents
 
     KIND = "Strand"
+    # Critical current density function used to build the table of each current sharing temperature function (input key TCS_TABLE).
+    cur_sharing_jc_functions = dict(
+        current_sharing_temperature_nbti=critical_current_density_nbti,
+        current_sharing_temperature_nb3sn=critical_current_density_nb3sn,
+        current_sharing_temperature_re123=critical_current_density_re123,
+    )
 
     def get_magnetic_field_gradient(self, conductor, nodal=True):
 
@@ -153,14 +165,22 @@ class Strands(SolidComponents):
         # Variable where is necessary to correctly evaluate EPSILON calling method \
         # Get_EPS (cdp, 07/2020)
         if nodal:
-            self.dict_node_pt = self.eval_critical_properties(self.dict_node_pt)
+            self.dict_node_pt = self.eval_critical_properties(
+                self.dict_node_pt, "nodal"
+            )
         # Properties evaluation in each Gauss point (cdp, 07/2020)
         elif nodal == False:
-            self.dict_Gauss_pt = self.eval_critical_properties(self.dict_Gauss_pt)
+            self.dict_Gauss_pt = self.eval_critical_properties(
+                self.dict_Gauss_pt, "Gauss"
+            )
 
     # End of Method get_superconductor_critical_prop
 
-    def eval_critical_properties(self, dict_dummy):
+    def eval_critical_properties(self, dict_dummy, location):
+
+        """
+        Method that evaluates critical temperature, critical current density and current sharing temperature in nodal or Gauss points (location). The current sharing temperature does not depend on temperature, so it is evaluated only if field, strain or current changed (method _eval_cur_sharing_temperature).
+        """
 
         self.JOP = np.abs(self.dict_node_pt["IOP"][0]) / (
             self.ASC * self.dict_input["COSTETA"]
@@ -180,14 +200,20 @@ class Strands(SolidComponents):
                 self.dict_input["Bc20m"],
                 self.dict_input["c0"],
             )
-            dict_dummy["T_cur_sharing"] = current_sharing_temperature_nbti(
+            dict_dummy["T_cur_sharing"] = self._eval_cur_sharing_temperature(
+                location,
+                "T_cur_sharing",
+                current_sharing_temperature_nbti,
                 dict_dummy["B_field"],
                 self.JOP,
                 self.dict_input["Tc0m"],
                 self.dict_input["Bc20m"],
                 self.dict_input["c0"],
             )
-            dict_dummy["T_cur_sharing_min"] = current_sharing_temperature_nbti(
+            dict_dummy["T_cur_sharing_min"] = self._eval_cur_sharing_temperature(
+                location,
+                "T_cur_sharing_min",
+                current_sharing_temperature_nbti,
                 bmax,
                 self.JOP,
                 self.dict_input["Tc0m"],
@@ -209,7 +235,10 @@ class Strands(SolidComponents):
                 self.dict_input["Bc20m"],
                 self.dict_input["c0"],
             )
-            dict_dummy["T_cur_sharing"] = current_sharing_temperature_nb3sn(
+            dict_dummy["T_cur_sharing"] = self._eval_cur_sharing_temperature(
+                location,
+                "T_cur_sharing",
+                current_sharing_temperature_nb3sn,
                 dict_dummy["B_field"],
                 dict_dummy["Epsilon"],
                 self.JOP,
@@ -217,7 +246,10 @@ class Strands(SolidComponents):
                 self.dict_input["Bc20m"],
                 self.dict_input["c0"],
             )
-            dict_dummy["T_cur_sharing_min"] = current_sharing_temperature_nb3sn(
+            dict_dummy["T_cur_sharing_min"] = self._eval_cur_sharing_temperature(
+                location,
+                "T_cur_sharing_min",
+                current_sharing_temperature_nb3sn,
                 bmax,
                 dict_dummy["Epsilon"],
                 self.JOP,
@@ -236,14 +268,20 @@ class Strands(SolidComponents):
                 self.dict_input["Bc20m"],
                 self.dict_input["c0"],
             )
-            dict_dummy["T_cur_sharing"] = current_sharing_temperature_re123(
+            dict_dummy["T_cur_sharing"] = self._eval_cur_sharing_temperature(
+                location,
+                "T_cur_sharing",
+                current_sharing_temperature_re123,
                 dict_dummy["B_field"],
                 self.JOP,
                 self.dict_input["Tc0m"],
                 self.dict_input["Bc20m"],
                 self.dict_input["c0"],
             )
-            dict_dummy["T_cur_sharing_min"] = current_sharing_temperature_re123(
+            dict_dummy["T_cur_sharing_min"] = self._eval_cur_sharing_temperature(
+                location,
+                "T_cur_sharing_min",
+                current_sharing_temperature_re123,
                 bmax,
                 self.JOP,
                 self.dict_input["Tc0m"],
@@ -259,6 +297,114 @@ class Strands(SolidComponents):
 
     # end method Eval_critical_properties (cdp, 10/2020)
 
+    def _eval_cur_sharing_temperature(self, location, key, function, *args):
+
+        """
+        Method that evaluates the current sharing temperature key (T_cur_sharing or T_cur_sharing_min) in location calling function(*args) only if at least one of the arguments is changed since the last call; otherwise the stored value is returned.
+        """
+        cache = self.dict_cur_sharing_cache[location].get(key)
+        if (
+            cache is not None
+            and len(cache["args"]) == len(args)
+            and all(np.array_equal(old, new) for old, new in zip(cache["args"], args))
+        ):
+            self.cur_sharing_counter["Reuses"] += 1
+        else:
+            # Arguments are copied before the evaluation, so that later changes of the arrays of the caller do not affect the comparison.
+            cache = dict(args=[np.array(arg, copy=True) for arg in args])
+            self.dict_cur_sharing_cache[location][key] = cache
+            if self.dict_input["TCS_TABLE"]:
+                cache["value"] = self._interp_cur_sharing_temperature(function, *args)
+            else:
+                cache["value"] = function(*args)
+            # End if self.dict_input["TCS_TABLE"].
+            self.cur_sharing_counter["Evaluations"] += 1
+        # End if cache.
+        # Copy, so that the stored value is not modified by the other methods.
+        return np.array(cache["value"], copy=True)
+
+    # end method _eval_cur_sharing_temperature
+
+    def set_cur_sharing_table_input(self):
+
+        """
+        Method that assigns the default values of the optional input keys of the tables of the current sharing temperature: TCS_TABLE (True to interpolate the tables instead of the iterative inversion), number of grid points in field, strain and current density (TCS_TABLE_NB, TCS_TABLE_NEPS, TCS_TABLE_NJ), maximum field TCS_TABLE_BMAX (T, default Bc20m), strain range TCS_TABLE_EPSMIN and TCS_TABLE_EPSMAX (Nb3Sn only), maximum current density TCS_TABLE_JMAX (A/m^2, by default twice the operating current density, the table is built again if it is exceeded) and number of Newton iterations TCS_TABLE_NEWTON used to refine the interpolated values.
+        """
+        default = dict(
+            TCS_TABLE=False,
+            TCS_TABLE_NB=201,
+            TCS_TABLE_NEPS=16,
+            TCS_TABLE_NJ=51,
+            TCS_TABLE_BMAX=self.dict_input["Bc20m"],
+            TCS_TABLE_EPSMIN=-0.01,
+            TCS_TABLE_EPSMAX=0.005,
+            TCS_TABLE_JMAX=np.nan,
+            TCS_TABLE_NEWTON=2,
+        )
+        for key, value in default.items():
+            if pd.isna(self.dict_input.get(key, np.nan)):
+                self.dict_input[key] = value
+            # End if pd.isna.
+        # End for key.
+        # Tables of the current sharing temperature, built at the first call of method _interp_cur_sharing_temperature.
+        self.dict_cur_sharing_table = dict()
+
+    # end method set_cur_sharing_table_input
+
+    def _interp_cur_sharing_temperature(self, function, *args):
+
+        """
+        Method that evaluates the current sharing temperature interpolating the table of function over (field, strain, current density) followed by TCS_TABLE_NEWTON Newton iterations on the critical current density. The table is built, from the critical current density function, at the first call and again if the current density exceeds the table range (if TCS_TABLE_JMAX is not given).
+        """
+        # The arguments of function are the field arguments (field and, for Nb3Sn, strain), JOP and the material constants (Tc0m, Bc20m, c0).
+        field_args, jop, constants = args[:-4], args[-4], args[-3:]
+        jc_function = self.cur_sharing_jc_functions[function.__name__]
+        table = self.dict_cur_sharing_table.get(function.__name__)
+        if table is None or (
+            pd.isna(self.dict_input["TCS_TABLE_JMAX"]) and jop > table["Grids"][-1][-1]
+        ):
+            grids = [
+                np.linspace(
+                    0.0,
+                    self.dict_input["TCS_TABLE_BMAX"],
+                    int(self.dict_input["TCS_TABLE_NB"]),
+                )
+            ]
+            if len(field_args) == 2:
+                grids.append(
+                    np.linspace(
+                        self.dict_input["TCS_TABLE_EPSMIN"],
+                        self.dict_input["TCS_TABLE_EPSMAX"],
+                        int(self.dict_input["TCS_TABLE_NEPS"]),
+                    )
+                )
+            # End if len(field_args).
+            if pd.isna(self.dict_input["TCS_TABLE_JMAX"]):
+                # Minimum value to have a valid grid when the current is zero.
+                j_max = max(2.0 * jop, 1.0)
+            else:
+                j_max = self.dict_input["TCS_TABLE_JMAX"]
+            # End if pd.isna.
+            grids.append(np.linspace(0.0, j_max, int(self.dict_input["TCS_TABLE_NJ"])))
+            # The bisection bracket includes Tc0m, above which the critical current density is zero.
+            table = build_cur_sharing_table(
+                jc_function, grids, constants, 1.5 * self.dict_input["Tc0m"]
+            )
+            self.dict_cur_sharing_table[function.__name__] = table
+        # End if table.
+        coords = np.broadcast_arrays(*field_args, jop)
+        temperature = interp_cur_sharing_table(table, coords)
+        return newton_cur_sharing(
+            jc_function,
+            temperature,
+            coords[:-1],
+            jop,
+            constants,
+            int(self.dict_input["TCS_TABLE_NEWTON"]),
+        )
+
+    # end method _interp_cur_sharing_temperature
+
     def get_eps(self, conductor, nodal=True):
         # For each strand of type MixSCStabilizer or SuperConductor (cdp, 06/2020)
         if nodal:
@@ -0,0 +1,6 @@
+# The modules of OPENSC2 are imported from folder source_code.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
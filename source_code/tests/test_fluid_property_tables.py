@@ -0,0 +1,108 @@
+# Tests of module UtilityFunctions.fluid_property_tables.
+
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from CoolProp.CoolProp import AbstractState, PQ_INPUTS, PT_INPUTS, get_parameter_index
+
+# Module coolant imports module fluid_components, that imports class Coolant.
+from fluid_components import Coolant
+from UtilityFunctions.fluid_property_tables import (
+    TABLE_ALIASES,
+    TABLE_TOLERANCE,
+    build_property_table,
+    get_property_table,
+    interp_property_table,
+)
+
+# Saturation pressure of helium (Pa) and corresponding temperature (K).
+P_SAT = 1e5
+_state = AbstractState("HEOS", "helium")
+_state.update(PQ_INPUTS, P_SAT, 0.0)
+T_SAT = _state.T()
+# Operating conditions of example CASE_1_ITER_like_LTS.
+OPERATION = dict(TEMINL=4.5, TEMOUT=4.5, PREINL=5.9e5, PREOUT=6e5)
+# Point of the default table of CASE_1_ITER_like_LTS where CoolProp gives \
+# NaN conductivity (close to the critical point).
+T_NAN = 5.942305116883606
+P_NAN = 342299.0703979631
+
+
+@pytest.fixture(scope="module")
+def default_table(tmp_path_factory):
+    # Table with the default input values assigned by the coolant.
+    coolant = SimpleNamespace(
+        dict_operation=OPERATION, dict_input=dict(), type="helium"
+    )
+    Coolant._set_property_table_input(coolant)
+    inp = coolant.dict_input
+    with pytest.warns(UserWarning, match="NaN values"):
+        return get_property_table(
+            "helium",
+            (inp["TABLE_TMIN"], inp["TABLE_TMAX"]),
+            (inp["TABLE_PMIN"], inp["TABLE_PMAX"]),
+            int(inp["TABLE_NT"]),
+            int(inp["TABLE_NP"]),
+            tmp_path_factory.mktemp("tables"),
+        )
+
+
+def test_build_property_table_nan_on_saturation_line():
+    # Grid point (T_SAT, P_SAT) is on the saturation line: CoolProp raises \
+    # ValueError there and the table stores NaN values.
+    table = build_property_table("helium", (T_SAT, 8.0), (P_SAT, 4e5), 5, 4)
+    assert np.all(np.isnan(table["Values"][:, 0, 0]))
+    assert np.all(table["N_nan"] >= 1)
+    assert np.isfinite(table["Values"][:, -1, -1]).all()
+
+
+def test_get_property_table_warns_nan(tmp_path):
+    with pytest.warns(UserWarning, match="NaN values"):
+        get_property_table("helium", (T_SAT, 8.0), (P_SAT, 4e5), 5, 4, tmp_path)
+
+
+def test_interp_property_table_out_of_range(tmp_path):
+    table = get_property_table("helium", (5.0, 10.0), (5e5, 1e6), 6, 4, tmp_path)
+    with pytest.warns(UserWarning, match="out of the property table range"):
+        values = interp_property_table(table, [20.0, 10.0], [2e6, 1e6])
+    # Values out of range are clipped to the table boundary.
+    assert values.shape == (len(TABLE_ALIASES), 2)
+    np.testing.assert_allclose(values[:, 0], values[:, 1])
+
+
+def test_default_table_tolerance(default_table):
+    # Random points on the whole table and close to the operating point.
+    rng = np.random.default_rng(0)
+    log_t = np.append(default_table["log_temperature"][[0, -1]], np.log(8.0))
+    temperature = np.exp(
+        np.concatenate(
+            (
+                rng.uniform(log_t[0], log_t[1], 2000),
+                rng.uniform(log_t[0], log_t[2], 2000),
+            )
+        )
+    )
+    pressure = rng.uniform(*default_table["pressure"][[0, -1]], temperature.size)
+    state = AbstractState("HEOS", "helium")
+    keys = [get_parameter_index(alias) for alias in TABLE_ALIASES]
+    reference = np.full((len(TABLE_ALIASES), temperature.size), np.nan)
+    for ii in range(temperature.size):
+        try:
+            state.update(PT_INPUTS, pressure[ii], temperature[ii])
+            reference[:, ii] = [state.keyed_output(key) for key in keys]
+        except ValueError:
+            pass
+        # End try.
+    # End for ii.
+    # Points where CoolProp itself fails are not checked.
+    valid = np.all(np.isfinite(reference), axis=0)
+    assert valid.mean() > 0.99
+    values = interp_property_table(default_table, temperature[valid], pressure[valid])
+    error = np.abs(values - reference[:, valid]) / np.abs(reference[:, valid])
+    assert np.max(error) <= TABLE_TOLERANCE
+
+
+def test_interp_property_table_coolprop_nan(default_table):
+    # The cell of the point is evaluated with CoolProp, that gives NaN.
+    with pytest.raises(ValueError, match="can not evaluate the properties"):
+        interp_property_table(default_table, [4.5, T_NAN], [6e5, P_NAN])